@@ -0,0 +1,80 @@
+"""
+Benchmark the cost of exporting auditor metrics.
+
+Registers one result counter per (rule, status) and the process probe
+summary, then times a scrape of unchanged metrics, a scrape after one audit
+cycle updated every sample, and the cycle's own updates.
+
+Run from the project root:
+
+    python benchmarks/bench_metrics_scrape.py [rules] [processes] [scrapes]
+
+Defaults: 1k rules, 500 processes, 200 scrapes.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.metrics.auditor_metrics import AuditorMetrics
+
+DEFAULT_RULES = 1_000
+DEFAULT_PROCESSES = 500
+DEFAULT_SCRAPES = 200
+STATUSES = ("passed", "failed")
+
+
+def cycle(metrics: AuditorMetrics, rules: list[SimpleNamespace], n_processes: int) -> None:
+    """Update the metrics as one audit cycle does."""
+    for _ in range(n_processes):
+        metrics.observe_probe("process", random.random() / 1000)  # noqa: S311 - synthetic benchmark data
+    metrics.count_results(
+        (rule, pid, random.choice(STATUSES))  # noqa: S311 - synthetic benchmark data
+        for rule in rules
+        for pid in range(n_processes)
+    )
+    for stage in ("collect", "parse", "evaluate", "report"):
+        metrics.observe_stage(stage, random.random())  # noqa: S311 - synthetic benchmark data
+    metrics.update_process()
+
+
+def main(n_rules: int, n_processes: int, scrapes: int) -> None:
+    """Run the benchmark and print the time per scrape."""
+    metrics = AuditorMetrics()
+    rules = [SimpleNamespace(id=f"RUL-{i:05d}") for i in range(n_rules)]
+
+    start = time.perf_counter()
+    cycle(metrics, rules, n_processes)
+    cycle_time = time.perf_counter() - start
+    size = len(metrics.registry.render())
+
+    start = time.perf_counter()
+    for _ in range(scrapes):
+        metrics.registry.render()
+    cached = (time.perf_counter() - start) / scrapes
+
+    changed = 0.0
+    for _ in range(scrapes // 10 or 1):
+        cycle(metrics, rules, n_processes)
+        start = time.perf_counter()
+        metrics.registry.render()
+        changed += time.perf_counter() - start
+    changed /= scrapes // 10 or 1
+
+    print(f"{n_rules} rules x {n_processes} processes: {size / 1024:,.0f} KiB of metrics")
+    print(f"cycle updates ({n_rules * n_processes:,} results): {cycle_time * 1000:8.2f} ms")
+    print(f"scrape, unchanged:                {cached * 1000:8.3f} ms")
+    print(f"scrape, after a cycle:            {changed * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else DEFAULT_RULES,
+        int(args[1]) if len(args) > 1 else DEFAULT_PROCESSES,
+        int(args[2]) if len(args) > 2 else DEFAULT_SCRAPES,
+    )
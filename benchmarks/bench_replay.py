@@ -0,0 +1,118 @@
+"""
+Benchmark replaying a recording through fact parsing and rule evaluation.
+
+A recording of one audited process is written first: one snapshot per cycle,
+with values that move from cycle to cycle. It is then replayed against
+generated rules with no pacing, so the numbers are the engine's maximum
+throughput on recorded data, reproducible from run to run.
+
+Run from the project root:
+
+    python benchmarks/bench_replay.py [rules] [cycles]
+
+Defaults: 500 rules, 20k cycles (a little over a day at a 5 second interval).
+The recording is written to a temporary directory and removed.
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.compliance_engine import ComplianceEngine
+from core.fact_processor.fact_processor import FactProcessor
+from core.probes.snapshot.process_snapshot.process_snapshot import (
+    CpuSnapshot,
+    MemorySnapshot,
+    ProcessSnapshot,
+)
+from core.recording.snapshot_recorder import SnapshotRecorder
+from core.replay.replay import Replay, read_recording
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.rule_builder.combinators import all_of, any_of
+from core.rules_engine.rule_builder.parsers import cond
+
+DEFAULT_RULES = 500
+DEFAULT_CYCLES = 20_000
+INTERVAL = 5.0
+
+
+def generate_rules(size: int) -> dict[str, Rule]:
+    """Build `size` rules over the built-in process facts."""
+    action = Action(name="noop", execute=lambda: None)
+    rules = {}
+    for i in range(size):
+        threshold = i % 100
+        if i % 2:
+            condition = all_of(cond(f"cpu.percent < {threshold}"), cond("memory.percent > 50"))
+        else:
+            condition = any_of(cond(f"memory.percent >= {threshold}"), cond(f"pid != {i}"))
+        rule = Rule(f"rule {i}", f"generated rule {i}", condition, action, SourceEnum.PROCESS)
+        rules[rule.id] = rule
+    return rules
+
+
+def record(directory: str, cycles: int) -> None:
+    """Record `cycles` snapshots of one process."""
+    recorder = SnapshotRecorder(directory)
+    start = 1_700_000_000.0
+    for cycle in range(cycles):
+        snapshot = ProcessSnapshot(
+            pid=4242,
+            name="service",
+            create_time=start,
+            snapshot_time=start + cycle * INTERVAL,
+            is_running=True,
+        )
+        snapshot.cpu = CpuSnapshot(
+            percent=round(random.random() * 100, 1),  # noqa: S311 - synthetic benchmark data
+            times={"user": cycle * 0.5, "system": cycle * 0.1},
+            affinity=[0, 1],
+            cpu_num=cycle % 2,
+        )
+        snapshot.memory = MemorySnapshot(
+            percent=round(random.random() * 100, 1),  # noqa: S311 - synthetic benchmark data
+            info={"rss": 50_000_000, "vms": 300_000_000},
+            full_info=None,
+            maps=[],
+        )
+        recorder.record({"process": [snapshot]})
+    recorder.close()
+
+
+def main(n_rules: int, cycles: int) -> None:
+    """Record, then replay and print the throughput."""
+    random.seed(1)
+    fact_processor = FactProcessor()
+    fact_processor.get_all_facts()
+    rules = generate_rules(n_rules)
+    with tempfile.TemporaryDirectory() as tmp:
+        begin = time.perf_counter()
+        record(tmp, cycles)
+        print(f"recorded {cycles} cycles in {time.perf_counter() - begin:.2f} s")
+
+        begin = time.perf_counter()
+        read = sum(1 for _ in read_recording(tmp))
+        decode = time.perf_counter() - begin
+
+        replay = Replay(fact_processor, ComplianceEngine(), rules)
+        stats = replay.run(read_recording(tmp))
+        recorded_span = cycles * INTERVAL
+        print(f"decode only: {read / decode:,.0f} snapshots/s")
+        print(
+            f"replay: {stats.snapshots} snapshots x {n_rules} rules in {stats.elapsed:.2f} s, "
+            f"{stats.rate:,.0f} snapshots/s, {stats.rate * n_rules:,.0f} rule checks/s, "
+            f"{recorded_span / stats.elapsed:,.0f}x real time",
+        )
+        print(", ".join(f"{status}: {count}" for status, count in stats.statuses.items()))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else DEFAULT_RULES,
+        int(args[1]) if len(args) > 1 else DEFAULT_CYCLES,
+    )
@@ -0,0 +1,59 @@
+"""
+Benchmark bulk rule validation on generated rule sets.
+
+Run from the project root:
+
+    python benchmarks/bench_rule_validation.py [sizes ...]
+
+Default sizes are 1k, 10k and 100k rules.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.fact_processor.fact_processor import FactProcessor
+from core.rules_engine.model.condition import Condition
+from core.rules_engine.model.field import FieldRef
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.rule_builder.combinators import all_of, any_of
+from core.rules_engine.rule_builder.parsers import cond
+from core.rules_engine.rules_engine import RulesEngine
+from shared._common.operators import Operator
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def generate_rules(size: int) -> dict[str, Rule]:
+    """Build `size` rules over the built-in process facts, one in ten invalid."""
+    action = Action(name="noop", execute=lambda: None)
+    rules = {}
+    for i in range(size):
+        threshold = i % 100
+        if i % 10 == 0:
+            condition = Condition(FieldRef("gpu.percent", float), Operator.GT, threshold)
+        elif i % 2:
+            condition = all_of(cond(f"cpu.percent < {threshold}"), cond("memory.percent > 50"))
+        else:
+            condition = any_of(cond(f"memory.percent >= {threshold}"), cond(f"pid != {i}"))
+        rule = Rule(f"rule {i}", f"generated rule {i}", condition, action, SourceEnum.PROCESS)
+        rules[f"{i}"] = rule
+    return rules
+
+
+def main(sizes: list[int]) -> None:
+    """Run the benchmark for each size and print a summary table."""
+    facts = FactProcessor().get_all_facts()
+    print(f"{'rules':>8} {'time (s)':>10} {'invalid':>8}")
+    for size in sizes:
+        rules = generate_rules(size)
+        start = time.perf_counter()
+        report = RulesEngine.check_rules(rules, facts)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>8} {elapsed:>10.3f} {len(report.errors):>8}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES))
@@ -0,0 +1,83 @@
+"""
+Benchmark RulesEngine start-up on generated TOML rule packs.
+
+Run from the project root:
+
+    python benchmarks/bench_rules_engine_load.py [sizes ...]
+
+Default sizes are 1k, 10k and 100k rules.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.fact_processor.fact_processor import FactProcessor
+from core.rules_engine.cache.rule_cache import RuleCache
+from core.rules_engine.rule_builder.parsers import _parse_condition
+from core.rules_engine.rules_engine import RulesEngine
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+_TEMPLATES = (
+    'model = "cpu.percent > {a}"',
+    'model = "memory.percent < {a}"',
+    '[rules.model]\noperator = "all"\nconditions = ["cpu.percent < {a}", "memory.percent > {b}"]',
+    '[rules.model]\noperator = "any"\nconditions = ["cpu.percent >= {a}", "pid != {b}"]',
+)
+
+
+def generate_pack(path: Path, size: int) -> None:
+    """Write a TOML rule pack with `size` rules over the built-in process facts."""
+    chunks = []
+    for i in range(size):
+        template = _TEMPLATES[i % len(_TEMPLATES)]
+        chunks.append(
+            "[[rules]]\n"
+            f'name = "Generated rule {i}"\n'
+            f'description = "Generated benchmark rule number {i}"\n'
+            'source = "process"\n'
+            f"priority = {i % 10}\n"
+            'action = "log"\n' + template.format(a=(i % 100) + i / 1_000_000, b=i) + "\n",
+        )
+    path.write_text("\n".join(chunks))
+
+
+def bench(size: int, directory: Path) -> tuple[float, float, float, int]:
+    """Return cold, warm and cached load times for `size` rules and the loaded rule count."""
+    path = directory / f"rules_{size}.toml"
+    generate_pack(path, size)
+    fact_processor = FactProcessor()
+
+    _parse_condition.cache_clear()
+    start = time.perf_counter()
+    engine = RulesEngine(fact_processor.get_all_facts, toml_rules_path=path, builtin_rules=[])
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    RulesEngine(fact_processor.get_all_facts, toml_rules_path=path, builtin_rules=[])
+    warm = time.perf_counter() - start
+
+    cache = RuleCache(directory / f"rules_{size}.bin")
+    RulesEngine(fact_processor.get_all_facts, toml_rules_path=path, builtin_rules=[], cache=cache)
+    start = time.perf_counter()
+    RulesEngine(fact_processor.get_all_facts, toml_rules_path=path, builtin_rules=[], cache=cache)
+    cached = time.perf_counter() - start
+
+    return cold, warm, cached, len(engine.rules)
+
+
+def main(sizes: list[int]) -> None:
+    """Run the benchmark for each pack size and print a summary table."""
+    print(f"{'rules':>8} {'cold (s)':>10} {'warm (s)':>10} {'cached (s)':>10} {'loaded':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            cold, warm, cached, loaded = bench(size, Path(tmp))
+            print(f"{size:>8} {cold:>10.3f} {warm:>10.3f} {cached:>10.3f} {loaded:>8}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES))
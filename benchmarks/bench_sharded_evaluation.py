@@ -0,0 +1,105 @@
+"""
+Benchmark sharded rule evaluation against in-process evaluation.
+
+Compares the serial path, the process pool and, on Python 3.14+, the
+subinterpreter pool.
+
+Run from the project root:
+
+    python benchmarks/bench_sharded_evaluation.py [rules] [rows] [workers ...]
+
+Defaults: 10k rules, 100 rows (audited processes), 1, 2 and 4 workers.
+Evaluations per second are reported; sharded throughput should scale with the
+number of physical cores available.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.compliance_engine import (
+    ComplianceEngine,
+    InterpreterComplianceEngine,
+    ShardedComplianceEngine,
+)
+from core.compliance_engine.sharding.interpreter_engine import InterpreterPoolExecutor
+from core.fact_processor.fact_processor import FactProcessor
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.rule_builder.combinators import all_of, any_of
+from core.rules_engine.rule_builder.parsers import cond
+
+DEFAULT_RULES = 10_000
+DEFAULT_ROWS = 100
+DEFAULT_WORKERS = (1, 2, 4)
+CYCLES = 3
+
+
+def generate_rules(size: int) -> dict[str, Rule]:
+    """Build `size` rules over the built-in process facts."""
+    action = Action(name="noop", execute=lambda: None)
+    rules = {}
+    for i in range(size):
+        threshold = i % 100
+        if i % 2:
+            condition = all_of(cond(f"cpu.percent < {threshold}"), cond("memory.percent > 50"))
+        else:
+            condition = any_of(cond(f"memory.percent >= {threshold}"), cond(f"pid != {i}"))
+        rule = Rule(f"rule {i}", f"generated rule {i}", condition, action, SourceEnum.PROCESS)
+        rules[rule.id] = rule
+    return rules
+
+
+def generate_rows(count: int) -> list[dict]:
+    """Build `count` flat process factsheets."""
+    return [
+        {"pid": i, "cpu.percent": float(i % 100), "memory.percent": float((i * 7) % 100)}
+        for i in range(count)
+    ]
+
+
+def timed(run: object) -> float:
+    """Return the mean wall time of `CYCLES` calls after one warm-up call."""
+    run()
+    start = time.perf_counter()
+    for _ in range(CYCLES):
+        run()
+    return (time.perf_counter() - start) / CYCLES
+
+
+def main(n_rules: int, n_rows: int, workers: list[int]) -> None:
+    """Run the benchmark and print a summary table."""
+    FactProcessor().get_all_facts()
+    rules = generate_rules(n_rules)
+    rows = generate_rows(n_rows)
+    evaluations = n_rules * n_rows
+    print(f"{n_rules} rules x {n_rows} rows on {os.cpu_count()} CPUs")
+    print(f"{'mode':>24} {'cycle (s)':>10} {'evals/s':>12}")
+
+    engine = ComplianceEngine()
+    elapsed = timed(lambda: [engine.run(rules, {"process": row}) for row in rows])
+    print(f"{'in process':>24} {elapsed:>10.3f} {evaluations / elapsed:>12.0f}")
+
+    backends = [ShardedComplianceEngine]
+    if InterpreterPoolExecutor is not None:
+        backends.append(InterpreterComplianceEngine)
+    for backend in backends:
+        for count in workers:
+            sharded = backend(workers=count)
+            try:
+                elapsed = timed(lambda: sharded.run(rules, {"process": rows}))  # noqa: B023
+            finally:
+                sharded.close()
+            label = f"{count} {backend.backend} workers"
+            print(f"{label:>24} {elapsed:>10.3f} {evaluations / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(
+        args[0] if args else DEFAULT_RULES,
+        args[1] if len(args) > 1 else DEFAULT_ROWS,
+        args[2:] or list(DEFAULT_WORKERS),
+    )
@@ -0,0 +1,128 @@
+"""
+Benchmark recording process snapshots to compressed segment files.
+
+Each cycle records one snapshot per process, with the slowly changing data of a
+real process (counters that grow, a CPU percentage that moves, memory maps that
+rarely change). The table shows the time spent recording each cycle, the disk
+used per snapshot, the disk a week of recording would take at the audit
+interval, and how fast the segments read back: all of them, and one process
+over ten minutes.
+
+Run from the project root:
+
+    python benchmarks/bench_snapshot_recorder.py [processes] [cycles] [interval]
+
+Defaults: 200 processes, 720 cycles (one hour at the default 5 second interval).
+The segments are written to a temporary directory and removed.
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.probes.snapshot.process_snapshot.process_snapshot import (
+    CpuSnapshot,
+    MemorySnapshot,
+    ProcessSnapshot,
+)
+from core.recording.segment_reader import read_snapshots
+from core.recording.snapshot_codec import CODECS
+from core.recording.snapshot_recorder import SnapshotRecorder
+
+DEFAULT_PROCESSES = 200
+DEFAULT_CYCLES = 720
+DEFAULT_INTERVAL = 5.0
+WEEK = 7 * 86400
+
+
+def make_snapshot(pid: int, cycle: int, ts: float) -> ProcessSnapshot:
+    """Build the snapshot of process `pid` at `cycle`."""
+    snapshot = ProcessSnapshot(
+        pid=pid,
+        name=f"worker-{pid}",
+        create_time=1_700_000_000.0,
+        snapshot_time=ts,
+        is_running=True,
+    )
+    snapshot.identity.update(
+        {
+            "ppid": 1,
+            "exe": "/usr/bin/python3",
+            "cmdline": ["python3", "-m", "service", f"--id={pid}"],
+            "cwd": "/srv/app",
+            "username": "app",
+            "status": "sleeping",
+        },
+    )
+    snapshot.cpu = CpuSnapshot(
+        percent=round(random.random() * 10, 1),  # noqa: S311 - synthetic benchmark data
+        times={"user": pid + cycle * 0.05, "system": pid + cycle * 0.01},
+        affinity=[0, 1, 2, 3],
+        cpu_num=pid % 4,
+    )
+    snapshot.memory = MemorySnapshot(
+        percent=round(1 + (cycle // 60) * 0.01, 2),
+        info={"rss": 50_000_000 + (cycle // 60) * 4096, "vms": 300_000_000},
+        full_info=None,
+        maps=[
+            {"path": f"/usr/lib/lib{i}.so", "rss": 4096 * i, "size": 8192 * i}
+            for i in range(20)
+        ],
+    )
+    snapshot.io = {"read_bytes": cycle * 1024, "write_bytes": cycle * 512}
+    snapshot.relationships.update({"parents": [1], "children": []})
+    return snapshot
+
+
+def main(n_processes: int, cycles: int, interval: float) -> None:
+    """Record `cycles` cycles with each codec and print one line per codec."""
+    random.seed(1)
+    print(f"{n_processes} processes, {cycles} cycles, {interval} s interval")
+    print(
+        f"{'codec':>5} {'record ms/cycle':>16} {'bytes/snapshot':>15} {'week MB':>9} "
+        f"{'read all/s':>11} {'1 pid, 10 min ms':>17}",
+    )
+    start = 1_700_000_000.0
+    for codec in CODECS:
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = SnapshotRecorder(tmp, codec=codec)
+            elapsed = 0.0
+            for cycle in range(cycles):
+                ts = start + cycle * interval
+                snapshots = {
+                    "process": [make_snapshot(pid, cycle, ts) for pid in range(n_processes)],
+                }
+                begin = time.perf_counter()
+                recorder.record(snapshots)
+                elapsed += time.perf_counter() - begin
+            recorder.close()
+
+            size = sum(path.stat().st_size for path in recorder.segments())
+            per_snapshot = size / (n_processes * cycles)
+            week = per_snapshot * n_processes * WEEK / interval
+
+            begin = time.perf_counter()
+            count = sum(1 for _ in read_snapshots(tmp))
+            read_all = count / (time.perf_counter() - begin)
+            middle = start + cycles * interval / 2
+            begin = time.perf_counter()
+            sum(1 for _ in read_snapshots(tmp, middle - 300, middle + 300, pids=[n_processes // 2]))
+            one_pid = time.perf_counter() - begin
+
+            print(
+                f"{codec:>5} {elapsed / cycles * 1000:>16.1f} {per_snapshot:>15.1f} "
+                f"{week / 1e6:>9,.0f} {read_all:>11,.0f} {one_pid * 1000:>17.1f}",
+            )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else DEFAULT_PROCESSES,
+        int(args[1]) if len(args) > 1 else DEFAULT_CYCLES,
+        float(args[2]) if len(args) > 2 else DEFAULT_INTERVAL,
+    )
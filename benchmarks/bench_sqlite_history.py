@@ -0,0 +1,95 @@
+"""
+Benchmark sustained inserts into the SQLite compliance history.
+
+Each cycle records one result per (rule, process) and one fact row per process,
+as the engine does with a history attached. The cycle is written by the writer
+thread while the next one is prepared; the table shows how long each cycle took
+to record and write, against the audit interval.
+
+Run from the project root:
+
+    python benchmarks/bench_sqlite_history.py [processes] [rules] [cycles] [interval]
+
+Defaults: 1k processes x 1k rules (1M results per cycle), 5 cycles, 5 second
+interval. The database is written to a temporary directory and removed.
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.fact_processor.fact_processor import FactProcessor
+from core.history.sqlite_history import SqliteHistory
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.rule_builder.combinators import all_of
+from core.rules_engine.rule_builder.parsers import cond
+
+DEFAULT_PROCESSES = 1_000
+DEFAULT_RULES = 1_000
+DEFAULT_CYCLES = 5
+DEFAULT_INTERVAL = 5.0
+STATUSES = ("passed", "failed")
+
+
+def generate_rules(size: int) -> list[Rule]:
+    """Build `size` rules over the built-in process facts."""
+    action = Action(name="noop", execute=lambda: None)
+    return [
+        Rule(
+            f"rule {i}",
+            f"generated rule {i}",
+            all_of(cond(f"cpu.percent < {i % 100}"), cond("memory.percent > 50")),
+            action,
+            SourceEnum.PROCESS,
+        )
+        for i in range(size)
+    ]
+
+
+def main(n_processes: int, n_rules: int, cycles: int, interval: float) -> None:
+    """Run the benchmark and print one line per cycle."""
+    FactProcessor().get_all_facts()
+    rules = generate_rules(n_rules)
+    rows = [
+        {"pid": pid, "cpu.percent": random.random() * 100, "memory.percent": 40.0}  # noqa: S311 - synthetic benchmark data
+        for pid in range(n_processes)
+    ]
+    factsheets = {"process": rows}
+    results = [
+        (rule, row["pid"], random.choice(STATUSES))  # noqa: S311 - synthetic benchmark data
+        for rule in rules
+        for row in rows
+    ]
+    print(f"{n_processes} processes x {n_rules} rules = {len(results)} results per cycle")
+    print(f"{'cycle':>5} {'record s':>9} {'write s':>8} {'rows/s':>11} {'of interval':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = SqliteHistory(Path(tmp) / "history.db")
+        for cycle in range(1, cycles + 1):
+            start = time.perf_counter()
+            history.record(results, factsheets)
+            queued = time.perf_counter()
+            history.flush()
+            done = time.perf_counter()
+            total = done - start
+            print(
+                f"{cycle:>5} {queued - start:>9.2f} {done - queued:>8.2f} "
+                f"{len(results) / total:>11,.0f} {total / interval:>12.0%}",
+            )
+        history.close()
+        size = (Path(tmp) / "history.db").stat().st_size
+        print(f"database size: {size / 1e6:.0f} MB for {cycles} cycles")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else DEFAULT_PROCESSES,
+        int(args[1]) if len(args) > 1 else DEFAULT_RULES,
+        int(args[2]) if len(args) > 2 else DEFAULT_CYCLES,
+        float(args[3]) if len(args) > 3 else DEFAULT_INTERVAL,
+    )
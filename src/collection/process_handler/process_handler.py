@@ -1,22 +1,31 @@
 """Process Handler."""
 
+import threading
+
 from collection.process_handler.audited_process import AuditedProcess
 from shared.services import logger
 
 
 class ProcessHandler:
-    """Manages processes."""
+    """
+    Manages processes.
+
+    Thread-safe: the tracked processes are kept in a tuple that is replaced under
+    a lock, so readers in other threads never see a partially updated list.
+    """
 
     def __init__(self) -> None:
         """Initialise the ProcessHandler."""
-        self._processes: list[AuditedProcess] = []
+        self._processes: tuple[AuditedProcess, ...] = ()
+        self._lock = threading.Lock()
 
     def add_process(self, process: AuditedProcess) -> None:
         """Track an existing process."""
         if not isinstance(process, AuditedProcess):
             msg = "Expected an AuditedProcess instance"
             raise TypeError(msg)
-        self._processes.append(process)
+        with self._lock:
+            self._processes = (*self._processes, process)
 
     def num_active(self) -> int:
         """Return the number of active processes."""
@@ -31,7 +40,7 @@ class ProcessHandler:
 
     def get_processes(self) -> list[AuditedProcess]:
         """Return the list of all processes."""
-        return self._processes
+        return list(self._processes)
 
     def shutdown_all(self, *, timeout: float = 5.0, force: bool = False) -> None:
         """Shutdown all tracked processes safely."""
@@ -52,7 +61,8 @@ class ProcessHandler:
 
         Warning: Does not shutdown a created process.
         """
-        self._processes = []
+        with self._lock:
+            self._processes = ()
 
 
 if __name__ == "__main__":
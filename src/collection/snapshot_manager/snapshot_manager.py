@@ -1,8 +1,13 @@
 """Snapshot Manager."""
 
+import threading
+import time
 from typing import TYPE_CHECKING, Any, Protocol
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from core.metrics.auditor_metrics import AuditorMetrics
     from core.probes.snapshot.base import BaseSnapshot
 
 
@@ -17,30 +22,54 @@ class Probe(Protocol):
 
 
 class SnapshotManager:
-    """Track probes and get snapshots of their data."""
+    """
+    Track probes and get snapshots of their data.
+
+    Thread-safe: probes are kept in a tuple that is replaced under a lock, so a
+    collection running in another thread works on a consistent set of probes.
+    With `metrics`, the collection time of each probe is recorded.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, metrics: AuditorMetrics | None = None) -> None:
         """Initialize the manager."""
-        self._probes: list[Probe] = []
+        self._probes: tuple[Probe, ...] = ()
+        self._lock = threading.Lock()
+        self.metrics = metrics
 
-    def get_all_snapshots(self) -> dict[str, list[BaseSnapshot]]:
+    def get_all_snapshots(
+        self,
+        sources: Collection[str] | None = None,
+    ) -> dict[str, list[BaseSnapshot]]:
         """
         Return a dict of snapshots from all tracked probes.
 
+        Args:
+            sources: names of the probes to collect from; all probes if None.
+
         Returns:
             dict[str, list[BaseSnapshot]]: source: list[snapshots from source]
 
         """
         returndict = {}
+        metrics = self.metrics
         for probe in self._probes:
-            returndict.setdefault(probe.name, []).append(probe.collect())
+            if sources is not None and probe.name not in sources:
+                continue
+            if metrics is None:
+                returndict.setdefault(probe.name, []).append(probe.collect())
+                continue
+            start = time.perf_counter()
+            snapshot = probe.collect()
+            elapsed = time.perf_counter() - start
+            metrics.observe_probe(probe.name, elapsed)
+            returndict.setdefault(probe.name, []).append(snapshot)
         return returndict
 
     def add_probe(self, probe: Probe) -> None:
         """Add a probe to this manager."""
-        self._probes.append(probe)
+        self.add_probes([probe])
 
     def add_probes(self, probes: list[Probe]) -> None:
         """Add a list of probes to this manager."""
-        for probe in probes:
-            self.add_probe(probe)
+        with self._lock:
+            self._probes = (*self._probes, *probes)
@@ -1 +1,3 @@
 from .compliance_engine import ComplianceEngine as ComplianceEngine
+from .sharding.interpreter_engine import InterpreterComplianceEngine as InterpreterComplianceEngine
+from .sharding.sharded_engine import ShardedComplianceEngine as ShardedComplianceEngine
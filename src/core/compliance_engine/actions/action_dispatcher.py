@@ -0,0 +1,281 @@
+"""Asynchronous execution of rule actions."""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from shared.services import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from core.rules_engine.model import Rule
+
+_Key = tuple[str, int | None]
+
+
+class OverflowPolicy(Enum):
+    """What to do with a new action when the queue is full."""
+
+    DROP_NEW = "drop_new"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+
+@dataclass(slots=True)
+class DispatcherMetrics:
+    """Counters of an action dispatcher."""
+
+    submitted: int = 0
+    executed: int = 0
+    errors: int = 0
+    deduplicated: int = 0
+    cooled_down: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    total_run: float = 0.0
+    max_run: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        """Return the mean time an action waited in the queue, in seconds."""
+        return self.total_wait / self.executed if self.executed else 0.0
+
+    @property
+    def mean_run(self) -> float:
+        """Return the mean run time of an action, in seconds."""
+        return self.total_run / self.executed if self.executed else 0.0
+
+
+@dataclass(slots=True)
+class _Job:
+    """A queued action of one rule, run once on behalf of every (rule, PID) key merged into it."""
+
+    rule: Rule
+    keys: list[_Key]
+    enqueued: float
+
+
+class ActionDispatcher:
+    """
+    Run rule actions on a pool of worker threads, off the evaluation path.
+
+    `submit` never blocks. Actions are keyed by (rule id, PID):
+
+    - a key already waiting in the queue is not queued again (deduplication),
+    - a key is not queued again within `cooldown` seconds of its last submission,
+    - when `max_queue` actions are waiting, `policy` decides: DROP_NEW rejects the
+      new action, DROP_OLDEST discards the oldest waiting one, COALESCE rejects
+      it. Under COALESCE a rule also has at most one waiting action: a new key of
+      the rule is merged into it (one run covers every process), whether or not
+      the queue is full, until that action starts.
+
+    `metrics` reports queue depth, queue wait and run time of the actions.
+    Exceptions raised by actions are logged and counted, never propagated.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        workers: int = 2,
+        max_queue: int = 1024,
+        cooldown: float = 0.0,
+        policy: OverflowPolicy = OverflowPolicy.DROP_NEW,
+        max_cooldown_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the dispatcher. Worker threads start with the first submission.
+
+        Args:
+            workers: worker threads running actions.
+            max_queue: actions waiting before `policy` applies.
+            cooldown: seconds during which a (rule, PID) key is not queued again.
+            policy: overflow policy when the queue is full.
+            max_cooldown_keys: cap on the keys remembered for cooldown.
+            clock: monotonic clock for cooldowns and latencies.
+
+        """
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.cooldown = cooldown
+        self.policy = OverflowPolicy(policy)
+        self.max_cooldown_keys = max_cooldown_keys
+        self.clock = clock
+        self._metrics = DispatcherMetrics()
+        self._queue: deque[_Job] = deque()
+        self._pending: dict[_Key, _Job] = {}
+        # Waiting job of each rule, under COALESCE, until a worker takes it.
+        self._by_rule: dict[str, _Job] = {}
+        # Insertion order doubles as LRU order: refreshed keys are re-inserted.
+        self._last_submitted: dict[_Key, float] = {}
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+        self._running = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+
+    def submit(self, rule: Rule, pid: int | None = None) -> bool:
+        """
+        Queue the action of `rule` for process `pid`, without blocking.
+
+        Returns:
+            bool: True if the action was queued or merged into a queued action.
+
+        """
+        key = (rule.id, pid)
+        with self._lock:
+            if self._closed:
+                return False
+            metrics = self._metrics
+            metrics.submitted += 1
+            if key in self._pending:
+                metrics.deduplicated += 1
+                return False
+            now = self.clock()
+            last = self._last_submitted.get(key)
+            if last is not None and now - last < self.cooldown:
+                metrics.cooled_down += 1
+                return False
+
+            waiting = self._by_rule.get(rule.id)
+            if waiting is not None:
+                waiting.keys.append(key)
+                self._pending[key] = waiting
+                metrics.coalesced += 1
+            else:
+                if len(self._queue) >= self.max_queue and not self._make_room():
+                    return False
+                job = _Job(rule, [key], now)
+                self._queue.append(job)
+                self._pending[key] = job
+                if self.policy is OverflowPolicy.COALESCE:
+                    self._by_rule[rule.id] = job
+            self._remember(key, now)
+
+            metrics.queue_depth = len(self._queue)
+            metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
+            if not self._threads:
+                self._start()
+            self._ready.notify()
+            return True
+
+    def _make_room(self) -> bool:
+        """Apply the overflow policy. Must hold the lock. Return False to reject the new job."""
+        metrics = self._metrics
+        metrics.dropped += 1
+        if self.policy is OverflowPolicy.DROP_OLDEST:
+            self._discard(self._queue.popleft())
+            return True
+        return False
+
+    def _remember(self, key: _Key, now: float) -> None:
+        """Record the submission time of `key` for its cooldown. Must hold the lock."""
+        if not self.cooldown:
+            return
+        self._last_submitted.pop(key, None)
+        self._last_submitted[key] = now
+        while len(self._last_submitted) > self.max_cooldown_keys:
+            oldest = next(iter(self._last_submitted))
+            del self._last_submitted[oldest]
+
+    def _discard(self, job: _Job) -> None:
+        """Forget a job leaving the queue. Must hold the lock."""
+        for key in job.keys:
+            if self._pending.get(key) is job:
+                del self._pending[key]
+        if self._by_rule.get(job.rule.id) is job:
+            del self._by_rule[job.rule.id]
+
+    def metrics(self) -> DispatcherMetrics:
+        """Return a copy of the current metrics."""
+        with self._lock:
+            return DispatcherMetrics(**{
+                name: getattr(self._metrics, name)
+                for name in DispatcherMetrics.__dataclass_fields__
+            })
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until every queued action ran. Return False on timeout."""
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._lock:
+            while self._queue or self._running:
+                remaining = None if deadline is None else deadline - self.clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+            return True
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Stop accepting actions, run the queued ones for up to `timeout` seconds and stop."""
+        with self._lock:
+            self._closed = True
+            self._ready.notify_all()
+        if not self.join(timeout):
+            logger.warning("Action dispatcher closed with actions still queued")
+        with self._lock:
+            for job in list(self._queue):
+                self._discard(job)
+            self._queue.clear()
+            self._ready.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        metrics = self.metrics()
+        logger.info(
+            f"Actions: {metrics.executed} run, {metrics.errors} failed, "
+            f"{metrics.deduplicated + metrics.cooled_down} deduplicated, "
+            f"{metrics.dropped} dropped, {metrics.coalesced} coalesced; "
+            f"mean wait {metrics.mean_wait * 1000:.1f}ms, max {metrics.max_wait * 1000:.1f}ms",
+        )
+
+    def _start(self) -> None:
+        """Start the worker threads. Must hold the lock."""
+        self._threads = [
+            threading.Thread(target=self._work, name=f"action-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self) -> None:
+        """Run queued actions until the dispatcher is closed and drained."""
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._ready.wait()
+                if not self._queue:
+                    return
+                job = self._queue.popleft()
+                self._discard(job)
+                self._running += 1
+                self._metrics.queue_depth = len(self._queue)
+
+            start = self.clock()
+            failed = False
+            try:
+                job.rule.action.execute()
+            except Exception as err:  # noqa: BLE001 - actions must not stop the workers
+                failed = True
+                logger.warning(f"Action of rule {job.rule.name} ({job.rule.id}) failed: {err}")
+            end = self.clock()
+
+            with self._lock:
+                metrics = self._metrics
+                self._running -= 1
+                metrics.executed += 1
+                metrics.errors += failed
+                wait, run = start - job.enqueued, end - start
+                metrics.total_wait += wait
+                metrics.max_wait = max(metrics.max_wait, wait)
+                metrics.total_run += run
+                metrics.max_run = max(metrics.max_run, run)
+                if not self._queue and not self._running:
+                    self._idle.notify_all()
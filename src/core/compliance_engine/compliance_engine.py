@@ -1,61 +1,525 @@
 """Compliance Engine."""
 
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
+from core.compliance_engine.profiling.rule_profiler import ProfilingEvaluator, RuleProfiler
+from core.compliance_engine.temporal.temporal_tracker import DEFAULT_MAX_STATES, TemporalTracker
+from core.reporting.aggregate import aggregate
 from core.rules_engine.eval.condition_evaluator import ConditionEvaluator
+from shared.custom_exceptions.custom_exception import InvalidRuleDataError
+from shared.services import logger
 
 if TYPE_CHECKING:
-    import datetime
+    from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
 
+    from core.compliance_engine.actions.action_dispatcher import ActionDispatcher
+    from core.compliance_engine.events.fail_event_store import FailEventStore
+    from core.compliance_engine.transitions.transition_tracker import (
+        Transition,
+        TransitionTracker,
+    )
+    from core.history.sqlite_history import SqliteHistory
+    from core.metrics.auditor_metrics import AuditorMetrics
+    from core.reporting.aggregate import RuleAggregate
     from core.rules_engine.model import Rule
-    from core.rules_engine.rules_engine import FactCheck
+    from core.rules_engine.model.condition import Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class FailEvent:
-    """Information about a rule failure."""
+    """
+    Information about a rule failure.
+
+    `time_occured` is when the failing facts were collected (their
+    `snapshot_time`, if available), `time_registered` when the engine recorded
+    the failure; both in seconds since the epoch.
+    """
 
-    pid: int
+    pid: int | None
     proc_name: str
-    rule_id: int
+    rule_id: str
     rule_name: str
     rule_message: str
-    time_registered: datetime.datetime
-    time_occured: datetime.datetime
-    failed_condition: FactCheck
+    time_registered: float
+    time_occured: float
+    failed_condition: Expression
+
+    @classmethod
+    def from_rule(cls, rule: Rule, facts: Mapping[str, Any], now: float) -> FailEvent:
+        """Build the failure of `rule` on `facts`, registered at `now`."""
+        return cls(
+            pid=facts.get("pid"),
+            proc_name=facts.get("name", ""),
+            rule_id=rule.id,
+            rule_name=rule.name,
+            rule_message=rule.description,
+            time_registered=now,
+            time_occured=facts.get("snapshot_time", now),
+            failed_condition=rule.condition,
+        )
+
+
+@dataclass(slots=True)
+class CycleReport:
+    """Coverage and staleness of one budgeted evaluation cycle."""
+
+    cycle: int
+    evaluated: int
+    total: int
+    elapsed: float
+    deferred: list[str] = field(default_factory=list)
+    max_staleness: int = 0
+
+    @property
+    def coverage(self) -> float:
+        """Return the fraction of rules evaluated this cycle."""
+        return self.evaluated / self.total if self.total else 1.0
 
 
 class ComplianceEngine:
     """
     Compliance Engine class.
 
-    Checks that facts match rules.
+    Checks that facts match rules. `run` may be called from several threads at
+    once. State is kept across cycles whether or not a budget is set: temporal
+    rule state, and that of the transition tracker, event store, history and
+    metrics when given. Each of these locks its own updates, and the
+    round-robin state of budgeted evaluation is updated under the engine's lock.
     """
 
-    def __init__(self, condition_evaluator: ConditionEvaluator = ConditionEvaluator) -> None:
-        """Initialize the ComplianceEngine class."""
+    def __init__(  # noqa: PLR0913
+        self,
+        condition_evaluator: ConditionEvaluator = ConditionEvaluator,
+        *,
+        budget: float | None = None,
+        min_stale: int = 1,
+        clock: Callable[[], float] = time.perf_counter,
+        temporal_clock: Callable[[], float] = time.monotonic,
+        max_temporal_states: int = DEFAULT_MAX_STATES,
+        profiler: RuleProfiler | None = None,
+        dispatcher: ActionDispatcher | None = None,
+        transitions: TransitionTracker | None = None,
+        events: FailEventStore | None = None,
+        history: SqliteHistory | None = None,
+        metrics: AuditorMetrics | None = None,
+        aggregate_top_k: int | None = None,
+    ) -> None:
+        """
+        Initialize the ComplianceEngine class.
+
+        Args:
+            condition_evaluator: evaluator of rule conditions.
+            budget: per-cycle time budget in seconds. None evaluates every rule each cycle.
+            min_stale: rules still evaluated after the budget runs out, taken from the
+                least recently checked. Guarantees every rule is eventually checked.
+            clock: monotonic clock used to enforce the budget.
+            temporal_clock: monotonic clock timing the failures of temporal rules.
+            max_temporal_states: cap on the (rule, PID) states kept for temporal rules.
+            profiler: records per-rule (and per-leaf) evaluation statistics. None disables
+                profiling at no cost.
+            dispatcher: runs actions of failed rules on worker threads. None runs them
+                inline, during evaluation.
+            transitions: tracks the result of each (rule, PID) so `run` returns only
+                what changed since the previous cycle. None returns every result.
+            events: stores a `FailEvent` for every failure. None keeps no failures.
+            history: persists every (rule, PID) result and the facts rules refer to.
+            metrics: counts every (rule, PID) result by status.
+            aggregate_top_k: aggregates every cycle's results per rule, keeping this many
+                top offenders (see `last_aggregates`). None does not aggregate.
+
+        """
         self.condition_evaluator = condition_evaluator
+        self.budget = budget
+        self.min_stale = min_stale
+        self.clock = clock
+        self.last_cycle: CycleReport | None = None
+        self._cycle = 0
+        self._last_checked: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.temporal_clock = temporal_clock
+        self.temporal = TemporalTracker(max_temporal_states)
+        self.profiler = profiler
+        self.dispatcher = dispatcher
+        self.transitions = transitions
+        self.last_transitions: list[Transition] = []
+        self.events = events
+        self.history = history
+        self.metrics = metrics
+        self.aggregate_top_k = aggregate_top_k
+        self._local = threading.local()
+        if profiler is not None and profiler.leaves:
+            self.condition_evaluator = ProfilingEvaluator(profiler, condition_evaluator)
 
-    def run(self, rules: dict[str, Rule], factsheets: dict[str, dict[str, Any]]) -> dict:
+    def run(
+        self,
+        rules: dict[str, Rule],
+        factsheets: dict[str, dict[str, Any]],
+        budget: float | None = None,
+        due: Collection[str] | None = None,
+        *,
+        retain_temporal: bool = True,
+    ) -> dict:
         """
         Check that facts are as defined in Rules.
 
+        Rules sharing a `mutually_exclusive_group` are evaluated together by
+        descending priority, and the group stops at its first failing rule: only
+        that rule's action runs, and the lower-priority members are reported as
+        suppressed. Members share leaf evaluations, so a condition common to
+        several tiers is evaluated once per group.
+
+        A rule with a temporal qualifier fails only once the qualifier is met for
+        the audited process (the factsheet's `pid`); until then a failing
+        evaluation reports it as pending. Temporal state of processes absent from
+        `factsheets` is dropped, unless `retain_temporal` is False.
+
+        With a transition tracker, only the rules whose result changed for some
+        process are returned, under their new result, plus the rules that are
+        gone; checkpoint cycles return every result (see `_diff`). Rules not due
+        this cycle keep their last result, as deferred rules do.
+
         Args:
-            rules: dict[rule.path, Rule]. container of all rules to check
+            rules: dict[rule.path, Rule]. container of all active rules
             factsheets: dict[fact.source, dict[fact.path, Any]].
+            budget: time budget for this cycle, overriding the engine budget.
+            due: ids of the rules to check this cycle. None checks every rule.
+            retain_temporal: drop the temporal state of processes absent from
+                `factsheets`. A caller checking one cycle in several calls passes
+                False, then calls `retain_processes` once the cycle is done.
 
         """
+        budget = self.budget if budget is None else budget
+        rules, idle = self._split_due(rules, due)
+        units = self._plan(rules)
+        if budget is not None:
+            result = self._run_budgeted(rules, units, factsheets, budget, idle)
+        else:
+            result = {
+                "passed": [],
+                "failed": [],
+                "pending": [],
+                "suppressed": [],
+            }
+            for unit in units:
+                self._check(unit, rules, factsheets, result)
+
+        result = self._finish_cycle(result, factsheets, idle)
+        if retain_temporal:
+            self._retain_temporal(factsheets)
+        if self.profiler is not None:
+            self.profiler.tick()
+        return result
+
+    @property
+    def last_aggregates(self) -> tuple[RuleAggregate, ...]:
+        """Return the per-rule aggregates of the last cycle run by the calling thread."""
+        return getattr(self._local, "aggregates", ())
+
+    def close(self) -> None:
+        """Run the queued actions, write a last rule profile and close the history."""
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+        if self.profiler is not None:
+            self.profiler.tick(force=True)
+        if self.history is not None:
+            self.history.close()
+
+    def forget_process(self, pid: int) -> None:
+        """Drop the temporal rule state of a process that is no longer audited."""
+        self.temporal.forget_process(pid)
+
+    def retain_processes(self, pids: Iterable[int | None]) -> None:
+        """Drop the temporal rule state of every process not in `pids`."""
+        self.temporal.retain_processes(pids)
+
+    def _evaluate(self, rule: Rule, facts: Mapping[str, Any], *memo: dict) -> bool:
+        """Evaluate the condition of `rule`, timing it when profiling."""
+        if self.profiler is None:
+            return self.condition_evaluator.evaluate(rule.condition, facts, *memo)
+        start = time.perf_counter_ns()
+        ok = self.condition_evaluator.evaluate(rule.condition, facts, *memo)
+        self.profiler.record_rule(rule, ok=ok, elapsed_ns=time.perf_counter_ns() - start)
+        return ok
+
+    def _fire(self, rule: Rule, pid: int | None = None) -> None:
+        """
+        Run the action of a failed rule, or hand it to the dispatcher.
+
+        An inline import-path action that cannot be resolved is logged, as the
+        dispatcher logs failing actions, so one broken rule does not stop the cycle.
+        """
+        if self.profiler is not None:
+            self.profiler.record_fired(rule)
+        if self.dispatcher is not None:
+            self.dispatcher.submit(rule, pid)
+            return
+        try:
+            rule.action.execute()
+        except InvalidRuleDataError as err:
+            logger.error(f"Action of rule {rule.name} ({rule.id}) failed: {err}")
+
+    def _record_failure(self, rule: Rule, facts: Mapping[str, Any]) -> None:
+        """Store the failure of `rule` on `facts`, if storing failures."""
+        if self.events is not None:
+            self.events.add(FailEvent.from_rule(rule, facts, time.time()))
+
+    def _outcome(self, rule: Rule, facts: Mapping[str, Any], *, ok: bool) -> str:
+        """Return the result key of an evaluated rule: passed, failed or pending."""
+        if rule.temporal is None:
+            return "passed" if ok else "failed"
+        pid = facts.get("pid")
+        if self.temporal.observe(rule.id, rule.temporal, pid, ok=ok, now=self.temporal_clock()):
+            return "failed"
+        return "passed" if ok else "pending"
+
+    def _retain_temporal(self, factsheets: dict[str, Any]) -> None:
+        """Drop temporal state of processes without facts this cycle."""
+        if not len(self.temporal):
+            return
+        pids = set()
+        for sheet in factsheets.values():
+            for row in sheet if isinstance(sheet, list) else [sheet]:
+                pids.add(row.get("pid"))
+        self.temporal.retain_processes(pids)
+
+    def _result_facts(
+        self,
+        result: dict[str, list[Rule]],
+        factsheets: dict[str, Any],
+    ) -> Iterator[tuple[Rule, Mapping[str, Any], str]]:
+        """Yield `(rule, facts, result)` of every rule evaluated this cycle."""
+        for status, rules in result.items():
+            if status == "deferred":
+                continue
+            for rule in rules:
+                yield rule, factsheets.get(rule.source.value, {}), status
+
+    def _result_rows(
+        self,
+        result: dict[str, list[Rule]],
+        factsheets: dict[str, Any],
+    ) -> Iterator[tuple[Rule, int | None, str]]:
+        """Yield `(rule, pid, result)` of every rule evaluated this cycle."""
+        for rule, facts, status in self._result_facts(result, factsheets):
+            yield rule, facts.get("pid"), status
+
+    @staticmethod
+    def _split_due(
+        rules: dict[str, Rule],
+        due: Collection[str] | None,
+    ) -> tuple[dict[str, Rule], dict[str, Rule]]:
+        """Return the rules of `rules` due this cycle, and the others."""
+        if due is None:
+            return rules, {}
+        return (
+            {rule_id: rule for rule_id, rule in rules.items() if rule_id in due},
+            {rule_id: rule for rule_id, rule in rules.items() if rule_id not in due},
+        )
+
+    def _finish_cycle(
+        self,
+        result: dict[str, list[Rule]],
+        factsheets: dict[str, Any],
+        idle: dict[str, Rule],
+    ) -> dict:
+        """
+        Record the full result in the history, metrics and aggregates, then reduce it.
+
+        `idle` holds the active rules not due this cycle.
+        """
+        if self.aggregate_top_k is not None:
+            self._local.aggregates = aggregate(
+                self._result_facts(result, factsheets),
+                time.time(),
+                self.aggregate_top_k,
+            )
+        if self.history is not None:
+            self.history.record(self._result_rows(result, factsheets), factsheets)
+        if self.metrics is not None:
+            self.metrics.count_results(self._result_rows(result, factsheets))
+        if self.transitions is not None:
+            return self._diff(result, factsheets, idle)
+        return result
+
+    def _diff(
+        self,
+        result: dict[str, list[Rule]],
+        factsheets: dict[str, Any],
+        idle: dict[str, Rule],
+    ) -> dict:
+        """
+        Reduce `result` to the rules whose result changed, keyed by their new result.
+
+        Rules of which some (rule, PID) pair disappeared are listed under "gone".
+        Deferred rules and the `idle` rules, not due this cycle, keep their last
+        result. On checkpoint cycles the full result is returned, with "gone" added.
+        """
+        keep = {rule.id for rule in (*idle.values(), *result.get("deferred", ()))}
+        transitions, checkpoint = self.transitions.update(
+            self._result_rows(result, factsheets),
+            keep,
+        )
+        self.last_transitions = transitions
+
+        diff: dict[str, list[Rule]] = {status: [] for status in result}
+        diff["gone"] = []
+        seen = set()
+        for transition in transitions:
+            status = transition.current or "gone"
+            key = (status, transition.rule.id)
+            if (checkpoint and status != "gone") or key in seen:
+                continue
+            seen.add(key)
+            diff[status].append(transition.rule)
+        if checkpoint:
+            logger.info(f"Checkpoint: full results of cycle {self.transitions.cycle}")
+            return {**result, "gone": diff["gone"]}
+        return diff
+
+    @staticmethod
+    def _plan(rules: dict[str, Rule]) -> list[tuple[str, ...]]:
+        """
+        Split rules into evaluation units, in order of first appearance.
+
+        A unit is a single ungrouped rule, or the members of one mutually exclusive
+        group sorted by descending priority.
+        """
+        units: list[tuple[str, ...] | list[str]] = []
+        groups: dict[str, list[str]] = {}
+        for rule_id, rule in rules.items():
+            group = rule.mutually_exclusive_group
+            if not group:
+                units.append((rule_id,))
+            elif group in groups:
+                groups[group].append(rule_id)
+            else:
+                groups[group] = [rule_id]
+                units.append(groups[group])
+        return [
+            tuple(sorted(unit, key=lambda rule_id: -rules[rule_id].priority))
+            if isinstance(unit, list)
+            else unit
+            for unit in units
+        ]
+
+    def _check(
+        self,
+        unit: tuple[str, ...],
+        rules: dict[str, Rule],
+        factsheets: dict[str, dict[str, Any]],
+        result: dict,
+    ) -> None:
+        """Evaluate one unit, running the action of its failing rule."""
+        if len(unit) == 1:
+            rule = rules[unit[0]]
+            facts = factsheets[rule.source.value]
+            ok = self._evaluate(rule, facts)
+            outcome = self._outcome(rule, facts, ok=ok)
+            if outcome == "failed":
+                self._fire(rule, facts.get("pid"))
+                self._record_failure(rule, facts)
+            result[outcome].append(rule)
+            return
+
+        # Leaf results are shared per source within the group.
+        memos: dict[str, dict] = {}
+        for i, rule_id in enumerate(unit):
+            rule = rules[rule_id]
+            source = rule.source.value
+            memo = memos.setdefault(source, {})
+            ok = self._evaluate(rule, factsheets[source], memo)
+            outcome = self._outcome(rule, factsheets[source], ok=ok)
+            result[outcome].append(rule)
+            if outcome == "failed":
+                self._fire(rule, factsheets[source].get("pid"))
+                self._record_failure(rule, factsheets[source])
+                result["suppressed"].extend(rules[r] for r in unit[i + 1 :])
+                return
+
+    def _run_budgeted(
+        self,
+        rules: dict[str, Rule],
+        units: list[tuple[str, ...]],
+        factsheets: dict[str, dict[str, Any]],
+        budget: float,
+        idle: dict[str, Rule],
+    ) -> dict:
+        """
+        Evaluate rules by descending priority until the cycle budget runs out.
+
+        Within a priority, the least recently checked rules go first, so rules
+        deferred by one cycle lead their priority in the next (round-robin). Once
+        the budget is spent, `min_stale` more units are taken from the least
+        recently checked of the remainder, so low-priority rules are not starved.
+        A mutually exclusive group is scheduled as one unit at its top priority.
+        The `idle` rules, not due this cycle, keep their staleness.
+        """
+        with self._lock:
+            return self._run_budgeted_locked(rules, units, factsheets, budget, idle)
+
+    def _run_budgeted_locked(
+        self,
+        rules: dict[str, Rule],
+        units: list[tuple[str, ...]],
+        factsheets: dict[str, dict[str, Any]],
+        budget: float,
+        idle: dict[str, Rule],
+    ) -> dict:
+        """Run one budgeted cycle. Must hold `_lock`: cycles share the staleness state."""
+        start = self.clock()
+        self._cycle += 1
+        cycle = self._cycle
+        # Rules seen for the first time count as checked in the previous cycle.
+        last_checked = {rule_id: self._last_checked.get(rule_id, cycle - 1) for rule_id in rules}
+
+        def staleness(unit: tuple[str, ...]) -> int:
+            return min(last_checked[rule_id] for rule_id in unit)
+
+        order = sorted(units, key=lambda unit: (-rules[unit[0]].priority, staleness(unit)))
         result = {
             "passed": [],
             "failed": [],
+            "pending": [],
+            "suppressed": [],
+            "deferred": [],
         }
-        for rule in rules.values():
-            factgroup = factsheets[rule.source.value]
-            if not self.condition_evaluator.evaluate(rule.condition, factgroup):
-                rule.action.execute()
-                result["failed"].append(rule)
-            else:
-                result["passed"].append(rule)
 
+        evaluated = 0
+        for unit in order:
+            if self.clock() - start >= budget:
+                break
+            self._check(unit, rules, factsheets, result)
+            last_checked.update(dict.fromkeys(unit, cycle))
+            evaluated += 1
+
+        remaining = order[evaluated:]
+        for unit in sorted(remaining, key=staleness)[: self.min_stale]:
+            self._check(unit, rules, factsheets, result)
+            last_checked.update(dict.fromkeys(unit, cycle))
+
+        deferred = [r for unit in remaining for r in unit if last_checked[r] != cycle]
+        result["deferred"] = [rules[rule_id] for rule_id in deferred]
+        # Rules no longer active are forgotten.
+        self._last_checked = {
+            **{r: self._last_checked[r] for r in idle if r in self._last_checked},
+            **last_checked,
+        }
+        self.last_cycle = CycleReport(
+            cycle=cycle,
+            evaluated=len(rules) - len(deferred),
+            total=len(rules),
+            elapsed=self.clock() - start,
+            deferred=deferred,
+            max_staleness=max((cycle - last_checked[r] for r in deferred), default=0),
+        )
+        if deferred:
+            report = self.last_cycle
+            logger.info(
+                f"Cycle {cycle}: evaluated {report.evaluated}/{report.total} rules "
+                f"({report.coverage:.0%}) in {report.elapsed:.3f}s, {len(deferred)} deferred, "
+                f"max staleness {report.max_staleness} cycles",
+            )
         return result
@@ -0,0 +1,157 @@
+"""Bounded in-memory store of rule failures."""
+
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.compliance_engine.compliance_engine import FailEvent
+
+DEFAULT_CAPACITY = 10_000
+
+
+class _SeqIndex:
+    """Sequence numbers of the stored events of one rule or PID, oldest first."""
+
+    __slots__ = ("head", "seqs")
+
+    def __init__(self) -> None:
+        self.head = 0
+        self.seqs: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.seqs) - self.head
+
+    def pop_oldest(self) -> None:
+        """Drop the oldest sequence number, compacting once half the list is dropped."""
+        self.head += 1
+        if self.head > len(self.seqs) // 2:
+            del self.seqs[: self.head]
+            self.head = 0
+
+
+class FailEventStore:
+    """
+    The last `capacity` fail events, indexed by rule id, PID and time.
+
+    Events live in a ring buffer: once full, each new event overwrites the
+    oldest one, so memory stays bounded. Each rule id and PID keeps the sequence
+    numbers of its stored events, oldest first, so per-rule and per-PID queries
+    only touch that rule's or PID's events. Time ranges are found by binary
+    search over the registration times, kept alongside the events: a
+    registration time earlier than the previous one is indexed as the previous
+    one, so the index stays sorted. The stored events themselves are not modified.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Initialize an empty store.
+
+        Raises:
+            ValueError: if `capacity` is not positive.
+
+        """
+        if capacity <= 0:
+            msg = f"Capacity must be positive, got {capacity}"
+            raise ValueError(msg)
+        self.capacity = capacity
+        self._ring: list[FailEvent | None] = [None] * capacity
+        # Indexed registration time of each slot's event, never decreasing with seq.
+        self._times: list[float] = [0.0] * capacity
+        self._next = 0  # Sequence number of the next event.
+        self._by_rule: dict[str, _SeqIndex] = {}
+        self._by_pid: dict[int | None, _SeqIndex] = {}
+        self._last_time = float("-inf")
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of stored events."""
+        return min(self._next, self.capacity)
+
+    def add(self, event: FailEvent) -> None:
+        """Store `event`, evicting the oldest event when full."""
+        with self._lock:
+            self._last_time = max(event.time_registered, self._last_time)
+            seq = self._next
+            slot = seq % self.capacity
+            evicted = self._ring[slot]
+            if evicted is not None:
+                self._unindex(self._by_rule, evicted.rule_id)
+                self._unindex(self._by_pid, evicted.pid)
+            self._ring[slot] = event
+            self._times[slot] = self._last_time
+            self._by_rule.setdefault(event.rule_id, _SeqIndex()).seqs.append(seq)
+            self._by_pid.setdefault(event.pid, _SeqIndex()).seqs.append(seq)
+            self._next += 1
+
+    def last(self, rule_id: str, n: int = 10) -> list[FailEvent]:
+        """Return the last `n` failures of a rule, newest first."""
+        with self._lock:
+            index = self._by_rule.get(rule_id)
+            if index is None or n <= 0:
+                return []
+            start = max(index.head, len(index.seqs) - n)
+            return [self._event(seq) for seq in reversed(index.seqs[start:])]
+
+    def for_pid(
+        self,
+        pid: int | None,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[FailEvent]:
+        """Return the failures of a process registered in [start, end], oldest first."""
+        with self._lock:
+            index = self._by_pid.get(pid)
+            if index is None:
+                return []
+            return self._range(index.seqs, index.head, start, end)
+
+    def between(self, start: float | None = None, end: float | None = None) -> list[FailEvent]:
+        """Return every failure registered in [start, end], oldest first."""
+        with self._lock:
+            seqs = range(self._next)
+            return self._range(seqs, max(0, self._next - self.capacity), start, end)
+
+    def top_rules(self, n: int = 10) -> list[tuple[str, int]]:
+        """Return the `n` rule ids with the most stored failures, with their counts."""
+        with self._lock:
+            counts = ((rule_id, len(index)) for rule_id, index in self._by_rule.items())
+            return heapq.nlargest(n, counts, key=lambda item: item[1])
+
+    def clear(self) -> None:
+        """Drop every event."""
+        with self._lock:
+            self._ring = [None] * self.capacity
+            self._next = 0
+            self._by_rule.clear()
+            self._by_pid.clear()
+            self._last_time = float("-inf")
+
+    def _event(self, seq: int) -> FailEvent:
+        """Return the event with sequence number `seq`."""
+        return self._ring[seq % self.capacity]
+
+    def _time(self, seq: int) -> float:
+        """Return the indexed registration time of the event with sequence number `seq`."""
+        return self._times[seq % self.capacity]
+
+    def _range(
+        self,
+        seqs: list[int] | range,
+        lo: int,
+        start: float | None,
+        end: float | None,
+    ) -> list[FailEvent]:
+        """Return the events of `seqs[lo:]` registered in [start, end]."""
+        first = lo if start is None else bisect_left(seqs, start, lo=lo, key=self._time)
+        last = len(seqs) if end is None else bisect_right(seqs, end, lo=first, key=self._time)
+        return [self._event(seq) for seq in seqs[first:last]]
+
+    @staticmethod
+    def _unindex(indexes: dict, key: object) -> None:
+        """Drop the oldest sequence number of `key`, and its index once empty."""
+        index = indexes[key]
+        index.pop_oldest()
+        if not index:
+            del indexes[key]
@@ -0,0 +1,323 @@
+"""Per-rule and per-leaf evaluation statistics."""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from core.rules_engine.eval.condition_evaluator import ConditionEvaluator
+from core.rules_engine.model.condition import Condition, ConditionSet, NotCondition
+from shared._common.operators import GroupOperator
+from shared.services import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+
+    from core.rules_engine.model import Rule
+    from core.rules_engine.model.condition import Expression
+
+
+@dataclass(slots=True)
+class RuleStats:
+    """Evaluation statistics of one rule."""
+
+    name: str = ""
+    evaluations: int = 0
+    passed: int = 0
+    failed: int = 0
+    fired: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    last_failure: float | None = None
+
+    @property
+    def mean_ns(self) -> float:
+        """Return the mean evaluation time in nanoseconds."""
+        return self.total_ns / self.evaluations if self.evaluations else 0.0
+
+    def merge(self, other: RuleStats) -> None:
+        """Add the counters of `other` to these."""
+        self.name = self.name or other.name
+        self.evaluations += other.evaluations
+        self.passed += other.passed
+        self.failed += other.failed
+        self.fired += other.fired
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        if other.last_failure is not None:
+            self.last_failure = max(self.last_failure or other.last_failure, other.last_failure)
+
+
+@dataclass(slots=True)
+class LeafStats:
+    """Evaluation statistics of one leaf condition. Memoized results are not counted."""
+
+    evaluations: int = 0
+    passed: int = 0
+    failed: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    last_failure: float | None = None
+
+    @property
+    def mean_ns(self) -> float:
+        """Return the mean evaluation time in nanoseconds."""
+        return self.total_ns / self.evaluations if self.evaluations else 0.0
+
+    def merge(self, other: LeafStats) -> None:
+        """Add the counters of `other` to these."""
+        self.evaluations += other.evaluations
+        self.passed += other.passed
+        self.failed += other.failed
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        if other.last_failure is not None:
+            self.last_failure = max(self.last_failure or other.last_failure, other.last_failure)
+
+
+class _Counters:
+    """Statistics recorded by one thread."""
+
+    __slots__ = ("leaves", "rules")
+
+    def __init__(self) -> None:
+        self.rules: dict[str, RuleStats] = {}
+        self.leaves: dict[Condition, LeafStats] = {}
+
+
+def leaf_label(condition: Condition) -> str:
+    """Return a readable label of a leaf condition, as written in rule models."""
+    return f"{condition.field.path} {condition.operator.value} {condition.value!r}"
+
+
+class RuleProfiler:
+    """
+    Evaluation statistics per rule and per leaf condition.
+
+    Records evaluation time, evaluation count, pass/fail counts and the time of
+    the last failure. Each thread records into its own counters, so recording takes no lock; the
+    statistics are merged when read. Times are measured with `perf_counter_ns`,
+    last failures are wall-clock timestamps. Pass a profiler to
+    `ComplianceEngine(profiler=...)` to enable it.
+
+    With a `dump_path`, `tick` (called by the engine after each cycle) writes the
+    statistics as JSON every `dump_interval` seconds and logs the slowest rules.
+    """
+
+    def __init__(
+        self,
+        *,
+        leaves: bool = True,
+        dump_path: Path | None = None,
+        dump_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            leaves: also profile each leaf condition. Costs a timer per leaf.
+            dump_path: JSON file the statistics are periodically written to.
+            dump_interval: seconds between two dumps.
+            clock: monotonic clock scheduling the dumps.
+
+        """
+        self.leaves = leaves
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.clock = clock
+        self._next_dump = clock() + dump_interval
+        self._local = threading.local()
+        self._all: list[_Counters] = []
+        self._lock = threading.Lock()
+
+    def _counters(self) -> _Counters:
+        try:
+            return self._local.counters
+        except AttributeError:
+            counters = self._local.counters = _Counters()
+            with self._lock:
+                self._all.append(counters)
+            return counters
+
+    # ── Recording ────────────────────────────────────────────
+
+    def record_rule(self, rule: Rule, *, ok: bool, elapsed_ns: int) -> None:
+        """Record one evaluation of `rule`'s condition."""
+        rules = self._counters().rules
+        stats = rules.get(rule.id)
+        if stats is None:
+            stats = rules[rule.id] = RuleStats(name=rule.name)
+        stats.evaluations += 1
+        stats.total_ns += elapsed_ns
+        stats.max_ns = max(stats.max_ns, elapsed_ns)
+        if ok:
+            stats.passed += 1
+        else:
+            stats.failed += 1
+            stats.last_failure = time.time()
+
+    def record_fired(self, rule: Rule) -> None:
+        """Record that `rule` failed and its action ran."""
+        rules = self._counters().rules
+        stats = rules.get(rule.id)
+        if stats is None:
+            stats = rules[rule.id] = RuleStats(name=rule.name)
+        stats.fired += 1
+
+    def record_leaf(self, condition: Condition, *, ok: bool, elapsed_ns: int) -> None:
+        """Record one evaluation of a leaf condition."""
+        leaves = self._counters().leaves
+        try:
+            stats = leaves.get(condition)
+        except TypeError:  # unhashable value
+            return
+        if stats is None:
+            stats = leaves[condition] = LeafStats()
+        stats.evaluations += 1
+        stats.total_ns += elapsed_ns
+        stats.max_ns = max(stats.max_ns, elapsed_ns)
+        if ok:
+            stats.passed += 1
+        else:
+            stats.failed += 1
+            stats.last_failure = time.time()
+
+    # ── Reading ──────────────────────────────────────────────
+
+    def rule_stats(self) -> dict[str, RuleStats]:
+        """Return merged statistics by rule id."""
+        merged: dict[str, RuleStats] = {}
+        with self._lock:
+            counters = list(self._all)
+        for thread_counters in counters:
+            for rule_id, stats in list(thread_counters.rules.items()):
+                merged.setdefault(rule_id, RuleStats()).merge(stats)
+        return merged
+
+    def leaf_stats(self) -> dict[Condition, LeafStats]:
+        """Return merged statistics by leaf condition."""
+        merged: dict[Condition, LeafStats] = {}
+        with self._lock:
+            counters = list(self._all)
+        for thread_counters in counters:
+            for condition, stats in list(thread_counters.leaves.items()):
+                merged.setdefault(condition, LeafStats()).merge(stats)
+        return merged
+
+    def slowest(self, n: int = 10, *, by: str = "total_ns") -> list[tuple[str, RuleStats]]:
+        """Return the `n` rules with the highest `by` ("total_ns", "mean_ns" or "max_ns")."""
+        stats = self.rule_stats()
+        return sorted(stats.items(), key=lambda item: getattr(item[1], by), reverse=True)[:n]
+
+    def slowest_leaves(self, n: int = 10, *, by: str = "total_ns") -> list[tuple[str, LeafStats]]:
+        """Return the `n` leaf conditions with the highest `by`, labelled as in rule models."""
+        stats = self.leaf_stats()
+        ranked = sorted(stats.items(), key=lambda item: getattr(item[1], by), reverse=True)[:n]
+        return [(leaf_label(condition), leaf) for condition, leaf in ranked]
+
+    def never_fired(self, rule_ids: Iterable[str]) -> list[str]:
+        """Return the ids among `rule_ids` whose action never ran."""
+        stats = self.rule_stats()
+        return [rule_id for rule_id in rule_ids if rule_id not in stats or not stats[rule_id].fired]
+
+    def reset(self) -> None:
+        """Drop every recorded statistic."""
+        with self._lock:
+            for counters in self._all:
+                counters.rules = {}
+                counters.leaves = {}
+
+    # ── Dumping ──────────────────────────────────────────────
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the statistics as JSON-serializable data."""
+        leaves: dict[str, dict] = {}
+        for condition, stats in self.leaf_stats().items():
+            leaves[leaf_label(condition)] = {**asdict(stats), "mean_ns": stats.mean_ns}
+        return {
+            "time": time.time(),
+            "rules": {
+                rule_id: {**asdict(stats), "mean_ns": stats.mean_ns}
+                for rule_id, stats in self.rule_stats().items()
+            },
+            "leaves": leaves,
+        }
+
+    def dump(self, path: Path | None = None) -> None:
+        """Write the statistics to `path` (default: `dump_path`) as JSON, atomically."""
+        path = path or self.dump_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.snapshot(), indent=1))
+        tmp.replace(path)
+
+    def tick(self, *, force: bool = False) -> None:
+        """Dump the statistics and log the slowest rules when the dump interval elapsed."""
+        if self.dump_path is None or (not force and self.clock() < self._next_dump):
+            return
+        self._next_dump = self.clock() + self.dump_interval
+        try:
+            self.dump()
+        except OSError as err:
+            logger.warning(f"Could not write rule profile to {self.dump_path}: {err}")
+            return
+        slowest = ", ".join(
+            f"{stats.name} ({stats.total_ns / 1e6:.1f}ms/{stats.evaluations})"
+            for _, stats in self.slowest(5)
+        )
+        logger.info(f"Rule profile written to {self.dump_path}. Slowest: {slowest}")
+
+
+class ProfilingEvaluator:
+    """Condition evaluator timing every leaf condition into a `RuleProfiler`."""
+
+    def __init__(
+        self,
+        profiler: RuleProfiler,
+        condition_evaluator: ConditionEvaluator = ConditionEvaluator,
+    ) -> None:
+        """Wrap `condition_evaluator`, whose leaf evaluation and operators are reused."""
+        self.profiler = profiler
+        self.condition_evaluator = condition_evaluator
+
+    def evaluate(self, expression: Expression, facts: dict, memo: dict | None = None) -> bool:
+        """Evaluate like `ConditionEvaluator.evaluate`, recording each leaf evaluation."""
+        if isinstance(expression, Condition):
+            if memo is not None:
+                try:
+                    return memo[expression]
+                except KeyError:
+                    result = memo[expression] = self._leaf(expression, facts)
+                    return result
+                except TypeError:  # unhashable value
+                    pass
+            return self._leaf(expression, facts)
+
+        if isinstance(expression, NotCondition):
+            return not self.evaluate(expression.condition, facts, memo)
+
+        if isinstance(expression, ConditionSet):
+            results = (self.evaluate(c, facts, memo) for c in expression.conditions)
+            if expression.group_operator == GroupOperator.ALL:
+                return all(results)
+            if expression.group_operator == GroupOperator.ANY:
+                return any(results)
+            msg = f"Unsupported GroupOperator: {expression.group_operator}"
+            raise ValueError(msg)
+
+        msg = f"Unknown expression type: {type(expression)}"
+        raise TypeError(msg)
+
+    def _leaf(self, condition: Condition, facts: dict) -> bool:
+        start = time.perf_counter_ns()
+        result = self.condition_evaluator.evaluate(condition, facts)
+        self.profiler.record_leaf(
+            condition,
+            ok=result,
+            elapsed_ns=time.perf_counter_ns() - start,
+        )
+        return result
@@ -0,0 +1,182 @@
+"""Columnar fact buffers in shared memory."""
+
+import itertools
+import marshal
+import pickle
+import struct
+from array import array
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from multiprocessing.shared_memory import SharedMemory
+
+_LENGTH = struct.Struct("<Q")
+_ALIGN = 8
+
+# Per-row status of a column slot.
+_MISSING, _VALUE, _NONE = 0, 1, 2
+
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+
+def _align(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def _column_kind(values: list[Any]) -> str:  # noqa: PLR0911
+    """Pick the most compact encoding able to hold every value of a column."""
+    types = {type(v) for v in values}
+    if not types:
+        return "b"
+    if types == {bool}:
+        return "b"
+    if types == {int}:
+        if all(_INT64_MIN <= v <= _INT64_MAX for v in values):
+            return "q"
+        return "p"
+    if types <= {int, float}:
+        return "d"
+    if types == {str}:
+        return "s"
+    return "p"
+
+
+def _encode_column(kind: str, values: list[Any]) -> list[bytes]:
+    """Encode the present values of a column into its data sections."""
+    if kind in "bqd":
+        return [array(kind, values).tobytes()]
+    if kind == "s":
+        encoded = [v.encode() for v in values]
+        offsets = array("q", [0])
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        return [offsets.tobytes(), b"".join(encoded)]
+    return [pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)]
+
+
+class FactColumns:
+    """
+    Rows of flat factsheets packed column by column into one shared memory block.
+
+    Every fact path becomes a column holding a status byte per row (missing, value
+    or None) and the present values in the most compact encoding that fits them:
+    packed int64, float64 or bool arrays, offset-indexed UTF-8 for strings and a
+    pickle for anything else. A worker process attaches by name and decodes the
+    rows without the factsheets being pickled per task. The same layout is
+    available as plain bytes through `encode` / `decode`.
+
+    Layout: header length, marshalled header, then 8-byte aligned sections whose
+    offsets in the header are relative to the end of the header.
+    """
+
+    def __init__(self, shm: SharedMemory, *, owner: bool) -> None:
+        """Wrap a shared memory block. The owner unlinks it on close."""
+        self._shm = shm
+        self._owner = owner
+
+    @property
+    def name(self) -> str:
+        """Return the name workers attach to."""
+        return self._shm.name
+
+    @classmethod
+    def pack(cls, rows: Sequence[Mapping[str, Any]]) -> FactColumns:
+        """Pack `rows` into a new shared memory block."""
+        # Imported on use: subinterpreter workers only decode bytes.
+        from multiprocessing.shared_memory import SharedMemory  # noqa: PLC0415
+
+        data = cls.encode(rows)
+        shm = SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[: len(data)] = data
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> FactColumns:
+        """Attach to a block packed by another process."""
+        from multiprocessing.shared_memory import SharedMemory  # noqa: PLC0415
+
+        return cls(SharedMemory(name=name, track=False), owner=False)
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Decode the packed rows into flat factsheets."""
+        return self.decode(self._shm.buf)
+
+    @staticmethod
+    def encode(rows: Sequence[Mapping[str, Any]]) -> bytes:
+        """Encode `rows` into the columnar layout, for transports other than shared memory."""
+        paths = list(dict.fromkeys(path for row in rows for path in row))
+        sections: list[bytes] = []
+        columns = []
+        offset = 0
+
+        def add(data: bytes) -> tuple[int, int]:
+            nonlocal offset
+            start = offset
+            sections.append(data)
+            sections.append(bytes(_align(len(data)) - len(data)))
+            offset = _align(offset + len(data))
+            return start, len(data)
+
+        for path in paths:
+            status = bytearray(len(rows))
+            present = []
+            for i, row in enumerate(rows):
+                if path not in row:
+                    continue
+                value = row[path]
+                if value is None:
+                    status[i] = _NONE
+                else:
+                    status[i] = _VALUE
+                    present.append(value)
+            kind = _column_kind(present)
+            spans = [add(bytes(status))] + [add(data) for data in _encode_column(kind, present)]
+            columns.append((path, kind, spans))
+
+        header = marshal.dumps((len(rows), columns))
+        padding = bytes(_align(_LENGTH.size + len(header)) - _LENGTH.size - len(header))
+        return b"".join([_LENGTH.pack(len(header)), header, padding, *sections])
+
+    @staticmethod
+    def decode(buf: bytes | memoryview) -> list[dict[str, Any]]:
+        """Decode rows from a buffer in the columnar layout."""
+        (length,) = _LENGTH.unpack_from(buf, 0)
+        header = bytes(buf[_LENGTH.size : _LENGTH.size + length])
+        n_rows, columns = marshal.loads(header)  # noqa: S302 - written by encode()
+        base = _align(_LENGTH.size + length)
+
+        def read(span: tuple[int, int]) -> bytes:
+            start, size = span
+            return bytes(buf[base + start : base + start + size])
+
+        rows: list[dict[str, Any]] = [{} for _ in range(n_rows)]
+        for path, kind, spans in columns:
+            status = read(spans[0])
+            if kind in "bqd":
+                values = array(kind, read(spans[1])).tolist()
+            elif kind == "s":
+                offsets = array("q", read(spans[1]))
+                blob = read(spans[2])
+                values = [
+                    blob[start:stop].decode()
+                    for start, stop in itertools.pairwise(offsets)
+                ]
+            else:
+                values = pickle.loads(read(spans[1]))  # noqa: S301 - written by encode()
+            if kind == "b":
+                values = [bool(v) for v in values]
+
+            present = iter(values)
+            for row, state in zip(rows, status, strict=True):
+                if state == _VALUE:
+                    row[path] = next(present)
+                elif state == _NONE:
+                    row[path] = None
+        return rows
+
+    def close(self) -> None:
+        """Detach from the block, and free it if this process created it."""
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
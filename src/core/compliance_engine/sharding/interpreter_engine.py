@@ -0,0 +1,111 @@
+"""Compliance engine evaluating rule shards in subinterpreters."""
+
+import pickle
+import sys
+from typing import TYPE_CHECKING, Any
+
+from core.compliance_engine.sharding.fact_columns import FactColumns
+from core.compliance_engine.sharding.sharded_engine import ShardedComplianceEngine
+from shared.services import logger
+
+try:
+    from concurrent.futures import InterpreterPoolExecutor
+except ImportError:  # Python < 3.14
+    InterpreterPoolExecutor = None
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Executor
+
+    from core.compliance_engine.actions.action_dispatcher import ActionDispatcher
+    from core.compliance_engine.events.fail_event_store import FailEventStore
+    from core.compliance_engine.sharding.worker import Unit
+    from core.compliance_engine.transitions.transition_tracker import TransitionTracker
+    from core.history.sqlite_history import SqliteHistory
+    from core.metrics.auditor_metrics import AuditorMetrics
+
+# Run in each new interpreter: subinterpreters start from the interpreter's
+# initial sys.path, so the paths added at runtime are restored before the
+# worker module is imported. The shards arrive pickled, as bytes, and are only
+# unpickled once their classes can be imported.
+_BOOTSTRAP = """
+import pickle
+import sys
+sys.path[:] = paths
+from core.compliance_engine.sharding import worker
+worker.init_worker(pickle.loads(shards))
+"""
+
+
+def bootstrap_args(shards: list[list[Unit]]) -> tuple[str, dict[str, Any]]:
+    """Return the `exec` arguments starting a worker interpreter holding `shards`."""
+    return _BOOTSTRAP, {"paths": list(sys.path), "shards": pickle.dumps(shards)}
+
+
+class InterpreterComplianceEngine(ShardedComplianceEngine):
+    """
+    Sharded compliance engine running its workers in subinterpreters.
+
+    Each worker is a subinterpreter with its own GIL in this process
+    (`concurrent.futures.InterpreterPoolExecutor`), so shards are evaluated on
+    several cores without starting processes. Factsheets are encoded once per
+    cycle with `FactColumns.encode` and handed over as bytes; the executor still
+    pickles each task's arguments, so every worker copies the cycle's bytes.
+
+    Experimental: the backend needs Python 3.14, has not been validated or
+    benchmarked against the process backend (see
+    `benchmarks/bench_sharded_evaluation.py`), and cannot be selected in the
+    project configuration yet.
+    """
+
+    backend = "interpreter"
+
+    def __init__(  # noqa: PLR0913
+        self,
+        workers: int | None = None,
+        shards: int | None = None,
+        *,
+        dispatcher: ActionDispatcher | None = None,
+        transitions: TransitionTracker | None = None,
+        events: FailEventStore | None = None,
+        history: SqliteHistory | None = None,
+        metrics: AuditorMetrics | None = None,
+        aggregate_top_k: int | None = None,
+    ) -> None:
+        """
+        Initialize the subinterpreter engine. Arguments as for `ShardedComplianceEngine`.
+
+        Raises:
+            RuntimeError: if subinterpreters are unavailable (Python < 3.14).
+
+        """
+        if InterpreterPoolExecutor is None:
+            msg = "Subinterpreter evaluation requires Python 3.14 or later"
+            raise RuntimeError(msg)
+        logger.warning("The subinterpreter evaluation backend is experimental")
+        super().__init__(
+            workers,
+            shards,
+            dispatcher=dispatcher,
+            transitions=transitions,
+            events=events,
+            history=history,
+            metrics=metrics,
+            aggregate_top_k=aggregate_top_k,
+        )
+
+    def _make_pool(self, shards: list[list[Unit]]) -> Executor:
+        """Start subinterpreters holding `shards`."""
+        return InterpreterPoolExecutor(
+            max_workers=self.workers,
+            initializer=exec,
+            initargs=bootstrap_args(shards),
+        )
+
+    @staticmethod
+    def _publish(
+        rows: dict[str, list[dict[str, Any]]],
+    ) -> tuple[dict[str, str | bytes], Callable[[], None]]:
+        """Encode this cycle's rows as bytes; nothing to release."""
+        buffers = {source: FactColumns.encode(source_rows) for source, source_rows in rows.items()}
+        return buffers, lambda: None
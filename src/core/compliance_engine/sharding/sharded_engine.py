@@ -0,0 +1,331 @@
+"""Compliance engine evaluating rule shards in worker processes."""
+
+import heapq
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from core.compliance_engine.compliance_engine import ComplianceEngine
+from core.compliance_engine.sharding import worker
+from core.compliance_engine.sharding.fact_columns import FactColumns
+from shared.services import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterator
+
+    from core.compliance_engine.actions.action_dispatcher import ActionDispatcher
+    from core.compliance_engine.events.fail_event_store import FailEventStore
+    from core.compliance_engine.sharding.worker import Unit
+    from core.compliance_engine.transitions.transition_tracker import TransitionTracker
+    from core.history.sqlite_history import SqliteHistory
+    from core.metrics.auditor_metrics import AuditorMetrics
+    from core.rules_engine.model import Rule
+
+
+# Status of a rule over all rows: the first of these found on some row, else passed.
+_STATUS_ORDER = ("failed", "pending", "suppressed")
+
+
+class ShardedComplianceEngine(ComplianceEngine):
+    """
+    Compliance engine partitioning the active rules across worker processes.
+
+    Rules are split into shards of evaluation units (a single rule, or a whole
+    mutually exclusive group) balanced by rule count. The compiled shards are sent
+    once, when the worker pool starts, and stay resident until the active rule
+    set changes; a cycle evaluating only the rules due in it sends their ids.
+    Each cycle the factsheets are packed into shared memory
+    (`FactColumns`), the shards are evaluated in parallel and the results are
+    merged back; actions always run in this process.
+
+    A factsheet may be a single mapping, as produced by
+    `FactProcessor.parse_facts`, or a list of rows (one per audited process), as
+    produced by `FactProcessor.parse_fact_rows`. Each row is decided on its own,
+    as the in-process engine decides each process: a group member suppressed on
+    one row may still fail on another, and its action runs for every failing row.
+    A rule is reported failed when it fails on any row, else pending, suppressed
+    or passed; `last_failures` records the failing rows of each rule. Temporal
+    qualifiers are applied here per row. Workers stop evaluating a group at its
+    first failing member without a temporal qualifier; the group is then walked
+    here row by row, as `ComplianceEngine._check` does, so a pending temporal
+    tier does not suppress the lower tiers.
+    """
+
+    backend = "process"
+
+    def __init__(  # noqa: PLR0913
+        self,
+        workers: int | None = None,
+        shards: int | None = None,
+        *,
+        dispatcher: ActionDispatcher | None = None,
+        transitions: TransitionTracker | None = None,
+        events: FailEventStore | None = None,
+        history: SqliteHistory | None = None,
+        metrics: AuditorMetrics | None = None,
+        aggregate_top_k: int | None = None,
+    ) -> None:
+        """
+        Initialize the sharded engine.
+
+        Args:
+            workers: worker processes. Defaults to the number of CPUs.
+            shards: rule shards. Defaults to the number of workers.
+            dispatcher: runs actions of failed rules on threads of this process.
+            transitions: reduces results to changes, per (rule, row PID).
+            events: stores a `FailEvent` per failing row of each failed rule.
+            history: persists the result of every (rule, row PID).
+            metrics: counts the result of every (rule, row PID) by status.
+            aggregate_top_k: aggregates the results of every row per rule, keeping this
+                many top offenders.
+
+        """
+        super().__init__(
+            dispatcher=dispatcher,
+            transitions=transitions,
+            events=events,
+            history=history,
+            metrics=metrics,
+            aggregate_top_k=aggregate_top_k,
+        )
+        self.workers = workers or os.cpu_count() or 1
+        self.shards = shards or self.workers
+        self.last_failures: dict[str, list[int]] = {}
+        self._pool: ProcessPoolExecutor | None = None
+        self._loaded: list[Rule] = []
+        self._n_shards = 0
+        self._cycle = 0
+
+    def run(
+        self,
+        rules: dict[str, Rule],
+        factsheets: dict[str, dict[str, Any] | list[dict[str, Any]]],
+        budget: float | None = None,
+        due: Collection[str] | None = None,
+        *,
+        retain_temporal: bool = True,
+    ) -> dict:
+        """
+        Check that facts are as defined in Rules, evaluating shards in parallel.
+
+        Raises:
+            ValueError: if a time budget is given; budgeted evaluation runs in process.
+
+        """
+        if budget is not None:
+            msg = "Budgeted evaluation is not supported by the sharded engine"
+            raise ValueError(msg)
+        active = rules
+        rules, idle = self._split_due(rules, due)
+        due_ids = frozenset(rules) if idle else None
+        rows = {
+            source: sheet if isinstance(sheet, list) else [sheet]
+            for source, sheet in factsheets.items()
+        }
+        # One cycle at a time: workers key their decoded rows by cycle.
+        with self._lock:
+            self._ensure_pool(active)
+            self._cycle += 1
+            buffers, release = self._publish(rows)
+            failed: dict[str, list[int]] = {}
+            try:
+                futures = [
+                    self._pool.submit(
+                        worker.evaluate_shard,
+                        index,
+                        self._cycle,
+                        buffers,
+                        due_ids,
+                    )
+                    for index in range(self._n_shards)
+                ]
+                for future in futures:
+                    failed.update(future.result())
+            finally:
+                release()
+
+        result = {
+            "passed": [],
+            "failed": [],
+            "pending": [],
+            "suppressed": [],
+        }
+        row_statuses: dict[str, dict[int, str]] = {}
+        for unit in self._plan(rules):
+            if len(unit) == 1:
+                rule = rules[unit[0]]
+                row_statuses[rule.id] = self._row_statuses(
+                    rule,
+                    rows.get(rule.source.value, ()),
+                    failed.get(rule.id, ()),
+                )
+            else:
+                row_statuses.update(self._group_statuses(unit, rules, rows, failed))
+        for rule_id, rule in rules.items():
+            statuses = row_statuses[rule_id].values()
+            result[next((s for s in _STATUS_ORDER if s in statuses), "passed")].append(rule)
+        self.last_failures = {
+            rule_id: sorted(index for index, status in statuses.items() if status == "failed")
+            for rule_id, statuses in row_statuses.items()
+            if "failed" in statuses.values()
+        }
+        self._local.row_statuses = row_statuses
+        result = self._finish_cycle(result, rows, idle)
+        if retain_temporal:
+            self._retain_temporal(rows)
+        return result
+
+    def _result_facts(
+        self,
+        result: dict[str, list[Rule]],
+        factsheets: dict[str, list[dict[str, Any]]],
+    ) -> Iterator[tuple[Rule, dict[str, Any], str]]:
+        """Yield `(rule, row, result)` per row, with the result decided for that row."""
+        row_statuses = getattr(self._local, "row_statuses", {})
+        for rules in result.values():
+            for rule in rules:
+                statuses = row_statuses.get(rule.id, {})
+                for index, row in enumerate(factsheets.get(rule.source.value, ())):
+                    yield rule, row, statuses.get(index, "passed")
+
+    def _row_statuses(
+        self,
+        rule: Rule,
+        rows: list[dict[str, Any]],
+        failing_rows: list[int],
+    ) -> dict[int, str]:
+        """
+        Decide the result of an ungrouped rule on each row, running its action per failing row.
+
+        Returns the status of every row not passing the rule: failed, or pending
+        under a temporal qualifier not met yet.
+        """
+        statuses: dict[int, str] = {}
+        for index in failing_rows:
+            row = rows[index]
+            status = self._outcome(rule, row, ok=False)
+            statuses[index] = status
+            if status == "failed":
+                self._fire(rule, row.get("pid"))
+                self._record_failure(rule, row)
+        if rule.temporal is not None:
+            for index, row in enumerate(rows):
+                if index not in statuses:
+                    self._outcome(rule, row, ok=True)
+        return statuses
+
+    def _group_statuses(
+        self,
+        unit: tuple[str, ...],
+        rules: dict[str, Rule],
+        rows: dict[str, list[dict[str, Any]]],
+        failed: dict[str, list[int]],
+    ) -> dict[str, dict[int, str]]:
+        """
+        Decide the results of a mutually exclusive group on each row.
+
+        Members are taken by descending priority until one fails on the row; its
+        action runs and the lower members are suppressed on that row.
+        """
+        statuses: dict[str, dict[int, str]] = {rule_id: {} for rule_id in unit}
+        failing = {rule_id: set(failed.get(rule_id, ())) for rule_id in unit}
+        n_rows = max(len(rows.get(rules[rule_id].source.value, ())) for rule_id in unit)
+        for index in range(n_rows):
+            for position, rule_id in enumerate(unit):
+                rule = rules[rule_id]
+                source_rows = rows.get(rule.source.value, ())
+                if index >= len(source_rows):
+                    continue
+                row = source_rows[index]
+                status = self._outcome(rule, row, ok=index not in failing[rule_id])
+                if status == "passed":
+                    continue
+                statuses[rule_id][index] = status
+                if status == "failed":
+                    self._fire(rule, row.get("pid"))
+                    self._record_failure(rule, row)
+                    for later_id in unit[position + 1 :]:
+                        statuses[later_id][index] = "suppressed"
+                    break
+        return statuses
+
+    def close(self) -> None:
+        """Shut the worker pool down and run the queued actions."""
+        self._shutdown_pool()
+        super().close()
+
+    def _shutdown_pool(self) -> None:
+        """Shut the worker pool down."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+                self._loaded = []
+
+    def _ensure_pool(self, rules: dict[str, Rule]) -> None:
+        """Start the worker pool, restarting it when the active rule set changed."""
+        current = list(rules.values())
+        if (
+            self._pool is not None
+            and len(current) == len(self._loaded)
+            and all(a is b for a, b in zip(current, self._loaded, strict=True))
+        ):
+            return
+
+        self._shutdown_pool()
+        shards = self._partition(rules)
+        self._n_shards = len(shards)
+        self._pool = self._make_pool(shards)
+        self._loaded = current
+        logger.info(
+            f"Sharded {len(rules)} rules into {self._n_shards} shards "
+            f"over {self.workers} {self.backend} workers",
+        )
+
+    def _make_pool(self, shards: list[list[Unit]]) -> Executor:
+        """Start the executor whose workers hold `shards`."""
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=worker.init_worker,
+            initargs=(shards,),
+        )
+
+    @staticmethod
+    def _publish(
+        rows: dict[str, list[dict[str, Any]]],
+    ) -> tuple[dict[str, str | bytes], Callable[[], None]]:
+        """
+        Make this cycle's rows available to the workers.
+
+        Returns:
+            (buffer reference by source, callable releasing the buffers).
+
+        """
+        columns = {source: FactColumns.pack(source_rows) for source, source_rows in rows.items()}
+
+        def release() -> None:
+            for buffer in columns.values():
+                buffer.close()
+
+        return {source: buffer.name for source, buffer in columns.items()}, release
+
+    def _partition(self, rules: dict[str, Rule]) -> list[list[Unit]]:
+        """Split the evaluation units into shards balanced by rule count."""
+        n_shards = max(1, min(self.shards, len(rules)))
+        shards: list[list[Unit]] = [[] for _ in range(n_shards)]
+        loads = [(0, index) for index in range(n_shards)]
+        for unit in self._plan(rules):
+            load, index = heapq.heappop(loads)
+            shards[index].append(
+                tuple(
+                    (
+                        rule_id,
+                        rules[rule_id].source.value,
+                        rules[rule_id].condition,
+                        rules[rule_id].temporal is not None,
+                    )
+                    for rule_id in unit
+                ),
+            )
+            heapq.heappush(loads, (load + len(unit), index))
+        return shards
@@ -0,0 +1,107 @@
+"""Worker-side state and tasks of sharded evaluation."""
+
+from typing import TYPE_CHECKING, Any
+
+from core.compliance_engine.sharding.fact_columns import FactColumns
+from core.rules_engine.eval.condition_evaluator import ConditionEvaluator
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from core.rules_engine.model.condition import Expression
+
+# (rule id, source, condition, has a temporal qualifier) of every member of a
+# unit, in evaluation order.
+Unit = tuple[tuple[str, str, "Expression", bool], ...]
+# Failing rows by rule id.
+ShardResult = dict[str, list[int]]
+
+_shards: list[list[Unit]] = []
+_rows: tuple[int, dict[str, list[dict[str, Any]]]] | None = None
+
+
+def init_worker(shards: list[list[Unit]]) -> None:
+    """Keep the compiled shards resident for the lifetime of the worker."""
+    global _shards, _rows  # noqa: PLW0603
+    _shards = shards
+    _rows = None
+
+
+def _load_rows(cycle: int, buffers: dict[str, str | bytes]) -> dict[str, list[dict[str, Any]]]:
+    """Decode the rows of this cycle's buffers, once per worker per cycle."""
+    global _rows  # noqa: PLW0603
+    if _rows is None or _rows[0] != cycle:
+        rows = {}
+        for source, buffer in buffers.items():
+            if isinstance(buffer, bytes):
+                rows[source] = FactColumns.decode(buffer)
+                continue
+            columns = FactColumns.attach(buffer)
+            try:
+                rows[source] = columns.rows()
+            finally:
+                columns.close()
+        _rows = (cycle, rows)
+    return _rows[1]
+
+
+def _due_units(units: list[Unit], due: frozenset[str] | None) -> Iterator[Unit]:
+    """Yield the members of `units` due this cycle, skipping units without any."""
+    if due is None:
+        yield from units
+        return
+    for unit in units:
+        members = tuple(member for member in unit if member[0] in due)
+        if members:
+            yield members
+
+
+def evaluate_shard(
+    index: int,
+    cycle: int,
+    buffers: dict[str, str | bytes],
+    due: frozenset[str] | None = None,
+) -> ShardResult:
+    """
+    Evaluate one shard against every row of the cycle's factsheets.
+
+    Args:
+        index: shard to evaluate.
+        cycle: evaluation cycle, identifying the buffers.
+        buffers: packed rows by source, as a shared memory name or as encoded bytes.
+        due: ids of the rules due this cycle. None evaluates every rule of the shard.
+
+    Returns:
+        the rows failing each rule's condition, by rule id. Rules absent passed
+        on every row they were evaluated on.
+
+    """
+    rows_by_source = _load_rows(cycle, buffers)
+    failed: dict[str, list[int]] = {}
+    evaluate = ConditionEvaluator.evaluate
+
+    for unit in _due_units(_shards[index], due):
+        if len(unit) == 1:
+            rule_id, source, condition, _ = unit[0]
+            for row_index, row in enumerate(rows_by_source.get(source, ())):
+                if not evaluate(condition, row):
+                    failed.setdefault(rule_id, []).append(row_index)
+            continue
+
+        # A mutually exclusive group: members share leaf results. A failing member
+        # without a temporal qualifier fails the row, so the lower tiers are not
+        # evaluated; whether a temporal member fails is only decided by the
+        # engine, so the group goes on past it.
+        n_rows = max(len(rows_by_source.get(source, ())) for _, source, _, _ in unit)
+        for row_index in range(n_rows):
+            memos: dict[str, dict] = {}
+            for rule_id, source, condition, temporal in unit:
+                rows = rows_by_source.get(source, ())
+                if row_index >= len(rows):
+                    continue
+                memo = memos.setdefault(source, {})
+                if not evaluate(condition, rows[row_index], memo):
+                    failed.setdefault(rule_id, []).append(row_index)
+                    if not temporal:
+                        break
+    return failed
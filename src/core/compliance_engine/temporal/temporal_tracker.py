@@ -0,0 +1,154 @@
+"""State of temporal rules."""
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING
+
+from core.rules_engine.model.temporal import Temporal, TemporalKind
+from shared.services import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+DEFAULT_MAX_STATES = 100_000
+
+
+class _State:
+    """Incremental state of one temporal rule for one process."""
+
+    __slots__ = ("hits", "since", "streak", "temporal")
+
+    def __init__(self, temporal: Temporal, now: float) -> None:
+        self.temporal = temporal
+        self.since = now
+        self.streak = 0
+        self.hits: deque[float] | None = (
+            deque(maxlen=temporal.count) if temporal.kind is TemporalKind.WITHIN else None
+        )
+
+    def fail(self, now: float) -> bool:
+        """Record a failed evaluation. Return True if the qualifier is now met."""
+        temporal = self.temporal
+        if temporal.kind is TemporalKind.FOR:
+            return now - self.since >= temporal.seconds
+        if temporal.kind is TemporalKind.CONSECUTIVE:
+            self.streak += 1
+            return self.streak >= temporal.count
+        self.hits.append(now)
+        return len(self.hits) == temporal.count and now - self.hits[0] <= temporal.seconds
+
+    def expired(self, now: float) -> bool:
+        """Return True once a passed evaluation leaves nothing worth keeping."""
+        if self.hits is None:
+            return True
+        return not self.hits or now - self.hits[-1] > self.temporal.seconds
+
+
+class TemporalTracker:
+    """
+    Per-(rule, PID) counters and timers of temporal rules.
+
+    Every state is O(1): a start time (FOR), a failure streak (CONSECUTIVE) or the
+    timestamps of the last `count` failures (WITHIN, `count` is bounded). State
+    only exists while a rule is failing, or within the window of its last failure
+    for WITHIN. The number of states is capped; beyond `max_states` the least
+    recently updated are evicted. States of a process are dropped when it is no
+    longer audited (see `retain_processes`).
+    """
+
+    def __init__(self, max_states: int = DEFAULT_MAX_STATES) -> None:
+        """Initialize an empty tracker holding at most `max_states` states."""
+        self.max_states = max_states
+        self.evicted = 0
+        # Insertion order doubles as LRU order: updated states are re-inserted.
+        self._states: dict[tuple[str, int | None], _State] = {}
+        self._by_pid: dict[int | None, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of tracked (rule, PID) states."""
+        return len(self._states)
+
+    def observe(
+        self,
+        rule_id: str,
+        temporal: Temporal,
+        pid: int | None,
+        *,
+        ok: bool,
+        now: float,
+    ) -> bool:
+        """
+        Record one evaluation of a temporal rule for a process.
+
+        Args:
+            rule_id: id of the evaluated rule.
+            temporal: qualifier of the rule. A changed qualifier restarts the state.
+            pid: audited process the facts came from.
+            ok: whether the condition held.
+            now: monotonic time of the evaluation, in seconds.
+
+        Returns:
+            bool: True if the rule fails, i.e. the qualifier is met.
+
+        """
+        key = (rule_id, pid)
+        with self._lock:
+            state = self._states.pop(key, None)
+            if state is not None and state.temporal != temporal:
+                state = None
+            if ok:
+                if state is not None and not state.expired(now):
+                    state.streak = 0
+                    self._states[key] = state
+                else:
+                    self._unindex(key)
+                return False
+
+            if state is None:
+                state = _State(temporal, now)
+                self._by_pid.setdefault(pid, set()).add(rule_id)
+            self._states[key] = state
+            failed = state.fail(now)
+            if len(self._states) > self.max_states:
+                self._evict()
+            return failed
+
+    def retain_processes(self, pids: Iterable[int | None]) -> None:
+        """Drop the states of every process not in `pids`."""
+        alive = set(pids)
+        with self._lock:
+            for pid in [pid for pid in self._by_pid if pid not in alive]:
+                self._forget(pid)
+
+    def forget_process(self, pid: int | None) -> None:
+        """Drop the states of one process."""
+        with self._lock:
+            self._forget(pid)
+
+    def clear(self) -> None:
+        """Drop every state."""
+        with self._lock:
+            self._states.clear()
+            self._by_pid.clear()
+
+    def _forget(self, pid: int | None) -> None:
+        for rule_id in self._by_pid.pop(pid, ()):
+            self._states.pop((rule_id, pid), None)
+
+    def _unindex(self, key: tuple[str, int | None]) -> None:
+        rule_id, pid = key
+        rules = self._by_pid.get(pid)
+        if rules is not None:
+            rules.discard(rule_id)
+            if not rules:
+                del self._by_pid[pid]
+
+    def _evict(self) -> None:
+        """Evict the least recently updated states down to `max_states`."""
+        while len(self._states) > self.max_states:
+            key = next(iter(self._states))
+            del self._states[key]
+            self._unindex(key)
+            self.evicted += 1
+        logger.debug(f"Temporal state limit {self.max_states} reached, evicted oldest")
@@ -0,0 +1,99 @@
+"""Result transitions between evaluation cycles."""
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+
+    from core.rules_engine.model import Rule
+
+# (rule id, PID)
+StateKey = tuple[str, int | None]
+
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    """A change of the result of a rule for one process."""
+
+    rule: Rule
+    pid: int | None
+    previous: str | None
+    current: str | None
+
+    @property
+    def kind(self) -> str:
+        """Return "new", "gone" or "changed"."""
+        if self.previous is None:
+            return "new"
+        if self.current is None:
+            return "gone"
+        return "changed"
+
+
+class TransitionTracker:
+    """
+    The last result (passed, failed, pending, suppressed) of each (rule, PID).
+
+    `update` compares a cycle's results with the previous ones and returns only
+    what changed: new pairs, changed results, and pairs that are gone (the rule
+    was removed, or the process is no longer audited). Every
+    `checkpoint_interval` cycles, `update` reports a checkpoint so the caller can
+    emit the full state; 0 disables checkpoints.
+    """
+
+    def __init__(self, checkpoint_interval: int = 0) -> None:
+        """Initialize a tracker without state."""
+        self.checkpoint_interval = checkpoint_interval
+        self.cycle = 0
+        self._states: dict[StateKey, tuple[Rule, str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of tracked (rule, PID) pairs."""
+        return len(self._states)
+
+    def update(
+        self,
+        results: Iterable[tuple[Rule, int | None, str]],
+        keep: Collection[str] = (),
+    ) -> tuple[list[Transition], bool]:
+        """
+        Record one cycle of `(rule, pid, result)` and return its transitions.
+
+        Pairs absent from `results` are gone, unless their rule id is in `keep`
+        (rules not evaluated this cycle keep their last result).
+
+        Returns:
+            tuple: the transitions, and whether this cycle is a checkpoint.
+
+        """
+        with self._lock:
+            self.cycle += 1
+            previous = self._states
+            states: dict[StateKey, tuple[Rule, str]] = {}
+            transitions = []
+            for rule, pid, current in results:
+                key = (rule.id, pid)
+                states[key] = (rule, current)
+                before = previous.get(key)
+                if before is None or before[1] != current:
+                    transitions.append(
+                        Transition(rule, pid, None if before is None else before[1], current),
+                    )
+            for key, (rule, result) in previous.items():
+                if key in states:
+                    continue
+                if key[0] in keep:
+                    states[key] = (rule, result)
+                else:
+                    transitions.append(Transition(rule, key[1], result, None))
+            self._states = states
+            interval = self.checkpoint_interval
+            return transitions, bool(interval) and self.cycle % interval == 0
+
+    def clear(self) -> None:
+        """Forget every result; the next cycle reports every pair as new."""
+        with self._lock:
+            self._states = {}
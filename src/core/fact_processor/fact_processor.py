@@ -86,3 +86,39 @@ class FactProcessor:
                         raise FactNotFoundError(msg) from err
 
         return factsheets
+
+    def parse_fact_rows(
+        self,
+        snapshots: dict[str, list[object | dict]],
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Get fact data from snapshots, one factsheet per snapshot.
+
+        Unlike `parse_facts`, snapshots of the same source (one per audited
+        process) are kept apart rather than merged into one factsheet.
+
+        Args:
+            snapshots (dict[str, list[object | dict]]): A dict of key (snapshot_source)
+                    value list(snapshot)
+
+        Returns:
+            dict[str, list[dict[str, Any]]]: A dict of key (source) value list of FactSheet
+
+        Exception:
+            FactNotFoundException: if no data can be found for a particular fact.
+
+        """
+        rows = {}
+        for src, snapshotslist in snapshots.items():
+            facts = self.get_facts_by_source(src)
+            rows[src] = []
+            for snapshot in snapshotslist:
+                factsheet = {}
+                for fact in facts.values():
+                    try:
+                        factsheet[fact.path] = resolve_path(snapshot, fact.path)
+                    except ValueError as err:
+                        msg = f"{fact.path} is not a valid path for {type(snapshot).__name__}"
+                        raise FactNotFoundError(msg) from err
+                rows[src].append(factsheet)
+        return rows
@@ -1,5 +1,6 @@
 """Fact registry."""
 
+import threading
 import typing
 from typing import TYPE_CHECKING, Any
 
@@ -12,9 +13,16 @@ if TYPE_CHECKING:
 
 
 class FactRegistry:
-    """Registry of all known possible fact specifications."""
+    """
+    Registry of all known possible fact specifications.
+
+    Thread-safe: writers hold a lock and swap in a new dict (copy-on-write), so
+    readers always see a complete registry without locking.
+    """
 
     _registry: typing.ClassVar[dict[str, FactSpec]] = {}
+    _version: typing.ClassVar[int] = 0
+    _lock: typing.ClassVar[threading.Lock] = threading.Lock()
 
     @classmethod
     def register_raw(  # noqa: PLR0913
@@ -27,9 +35,6 @@ class FactRegistry:
         allowed_values: set[str] | None = None,
     ) -> None:  # creates instance of rule in fun, params required.
         """Register a fact from data."""
-        if path in cls._registry:
-            msg = f"Fact '{path}' is already registered"
-            raise ValueError(msg)
         fact = FactSpec(
             path=path,
             type=type_,
@@ -38,30 +43,37 @@ class FactRegistry:
             allowed_operators=allowed_operators or set(),
             allowed_values=allowed_values or set(),
         )
-
-        cls._registry[path] = fact
+        cls.register_fact(fact)
 
     @classmethod
     def register_fact(cls, fact: FactSpec) -> None:
         """Register a fact object in cls._registry."""
-        if fact.path in cls._registry:
-            msg = f"Fact '{fact.path}' is already registered"
-            raise ValueError(msg)
-        cls._registry[fact.path] = fact
+        with cls._lock:
+            if fact.path in cls._registry:
+                msg = f"Fact '{fact.path}' is already registered"
+                raise ValueError(msg)
+            cls._registry = {**cls._registry, fact.path: fact}
+            cls._version += 1
 
     @classmethod
     def get_fact(cls, path: str) -> FactSpec:
         """Get a fact by its path."""
-        if path not in cls._registry:
+        try:
+            return cls._registry[path]
+        except KeyError as err:
             msg = f"Fact '{path}' is not registered"
-            raise KeyError(msg)
-        return cls._registry[path]
+            raise KeyError(msg) from err
 
     @classmethod
     def all_facts(cls) -> dict[str, FactSpec]:
         """Return all registered facts."""
         return dict(cls._registry)
 
+    @classmethod
+    def version(cls) -> int:
+        """Return a counter that changes whenever the registered facts change."""
+        return cls._version
+
     @classmethod
     def validate(cls, path: str, value: Any) -> bool:  # noqa: ANN401
         """Ensure that a value matches the matching fact type."""
@@ -75,7 +87,9 @@ class FactRegistry:
 
     @classmethod
     def _clear(cls) -> None:
-        cls._registry = {}
+        with cls._lock:
+            cls._registry = {}
+            cls._version += 1
 
 
 def register_defaults() -> None:
@@ -0,0 +1,399 @@
+"""Persistent compliance history in SQLite."""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from core.rules_engine.model.condition import Condition, ConditionSet, NotCondition
+from shared.services import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+
+    from core.rules_engine.model import Rule
+
+STATUSES = ("passed", "failed", "pending", "suppressed")
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY,
+    rule_id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    results_end INTEGER,
+    facts_end INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    rule INTEGER NOT NULL,
+    pid INTEGER,
+    ts REAL NOT NULL,
+    status INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_rule_pid_ts ON results (rule, pid, ts);
+CREATE TABLE IF NOT EXISTS facts (
+    pid INTEGER,
+    ts REAL NOT NULL,
+    source TEXT NOT NULL,
+    facts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS facts_pid_ts ON facts (pid, ts);
+"""
+
+_INSERT_RULE = "INSERT OR IGNORE INTO rules (id, rule_id, name, description) VALUES (?, ?, ?, ?)"
+_INSERT_RESULT = "INSERT INTO results (rule, pid, ts, status) VALUES (?, ?, ?, ?)"
+_INSERT_FACTS = "INSERT INTO facts (pid, ts, source, facts) VALUES (?, ?, ?, ?)"
+_INSERT_CYCLE = (
+    "INSERT INTO cycles (id, ts, results_end, facts_end) "
+    "VALUES (?, ?, (SELECT max(rowid) FROM results), (SELECT max(rowid) FROM facts))"
+)
+
+_CLOSE = object()
+
+
+def referenced_paths(rule: Rule) -> tuple[str, ...]:
+    """Return the fact paths the condition of `rule` refers to, in order of appearance."""
+    paths: dict[str, None] = {}
+    stack = [rule.condition]
+    while stack:
+        expr = stack.pop()
+        if isinstance(expr, Condition):
+            paths[expr.field.path] = None
+        elif isinstance(expr, NotCondition):
+            stack.append(expr.condition)
+        elif isinstance(expr, ConditionSet):
+            stack.extend(reversed(expr.conditions))
+    return tuple(paths)
+
+
+class _Batch:
+    """One cycle to insert in one transaction."""
+
+    __slots__ = ("cycle", "factsheets", "results", "rules", "ts")
+
+    def __init__(
+        self,
+        cycle: int,
+        ts: float,
+        results: list[tuple[Rule, int | None, str]],
+        factsheets: dict[str, Any],
+    ) -> None:
+        self.cycle = cycle
+        self.ts = ts
+        self.results = results
+        self.factsheets = factsheets
+        self.rules: list[tuple] = []  # Rows of the rules first seen in this cycle.
+
+
+class SqliteHistory:
+    """
+    Audit results and the facts they were based on, kept across restarts.
+
+    Each cycle stores one row per (rule, PID) result, and one row per audited
+    process holding the facts the evaluated rules refer to (as JSON). A cycle is
+    inserted in a single transaction with `executemany` over fixed statements,
+    which `sqlite3` prepares once and reuses, fed by generators so a cycle's
+    rows are never all built in memory. Rule ids are stored as integer keys.
+    The database runs in WAL mode, so queries from other connections do not
+    block the writer. With `threaded`, rows are built and inserted on a writer
+    thread, and `record` only queues the cycle.
+
+    Results older than `retention` seconds are deleted every `compact_interval`
+    seconds, after which free pages are released and the WAL is truncated.
+    Every cycle records where its rows end, so retention deletes by rowid range
+    instead of scanning by time.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: Path | str,
+        *,
+        retention: float | None = None,
+        compact_interval: float = 3600.0,
+        threaded: bool = True,
+        max_pending: int = 4,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Open (or create) the history database at `path`.
+
+        Args:
+            path: database file; ":memory:" keeps the history in memory.
+            retention: seconds results are kept. None keeps them forever.
+            compact_interval: seconds between two retention and compaction runs.
+            threaded: insert on a writer thread.
+            max_pending: cycles waiting for the writer thread before `record` blocks.
+            clock: wall clock timestamping cycles.
+
+        """
+        self.path = str(path)
+        self.retention = retention
+        self.compact_interval = compact_interval
+        self.threaded = threaded
+        self.clock = clock
+        self.errors = 0
+        self._conn = self._connect(self.path)
+        self._conn.executescript(_SCHEMA)
+        self._rule_keys: dict[str, int] = dict(
+            self._conn.execute("SELECT rule_id, id FROM rules").fetchall(),
+        )
+        self._next_rule = max(self._rule_keys.values(), default=0) + 1
+        self._cycle = self._conn.execute("SELECT coalesce(max(id), 0) FROM cycles").fetchone()[0]
+        self._paths: dict[str, tuple[str, ...]] = {}
+        self._last_compaction = clock()
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._unwritten_rules: list[tuple] = []
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        """Open a connection in WAL mode with incremental vacuum."""
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def record(
+        self,
+        results: Iterable[tuple[Rule, int | None, str]],
+        factsheets: dict[str, Any],
+    ) -> int:
+        """
+        Store one cycle of `(rule, pid, result)` and the facts its rules refer to.
+
+        Returns:
+            int: the id of the cycle.
+
+        Raises:
+            RuntimeError: if the history is closed.
+
+        """
+        if self._closed:
+            msg = "History is closed"
+            raise RuntimeError(msg)
+        results = results if isinstance(results, list) else list(results)
+        with self._lock:
+            self._cycle += 1
+            batch = _Batch(self._cycle, self.clock(), results, factsheets)
+            # Queued under the lock, so cycles are written in id order.
+            if not self.threaded:
+                self._write(batch)
+            else:
+                self._ensure_thread()
+                self._queue.put(batch)
+        return batch.cycle
+
+    def _result_params(self, batch: _Batch, rules: dict[str, Rule]) -> Iterator[tuple]:
+        """Yield the result rows of `batch`, collecting its distinct rules into `rules`."""
+        keys = self._rule_keys
+        codes = _STATUS_CODES
+        ts = batch.ts
+        for rule, pid, status in batch.results:
+            key = keys.get(rule.id)
+            if key is None:
+                key = keys[rule.id] = self._next_rule
+                self._next_rule += 1
+                batch.rules.append((key, rule.id, rule.name, rule.description))
+            if rule.id not in rules:
+                rules[rule.id] = rule
+            yield key, pid, ts, codes[status]
+
+    def _fact_params(self, batch: _Batch, rules: dict[str, Rule]) -> Iterator[tuple]:
+        """Yield one row per audited process with the facts `rules` refer to."""
+        paths: dict[str, None] = {}
+        for rule_id, rule in rules.items():
+            rule_paths = self._paths.get(rule_id)
+            if rule_paths is None:
+                rule_paths = self._paths[rule_id] = referenced_paths(rule)
+            paths.update(dict.fromkeys(rule_paths))
+        for source, sheet in batch.factsheets.items():
+            for facts in sheet if isinstance(sheet, list) else [sheet]:
+                values = {path: facts[path] for path in paths if path in facts}
+                if values:
+                    encoded = json.dumps(values, separators=(",", ":"), default=str)
+                    yield facts.get("pid"), batch.ts, source, encoded
+
+    def results(
+        self,
+        rule_id: str,
+        pid: int | None = None,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[tuple[float, int | None, str]]:
+        """Return `(ts, pid, result)` of a rule, optionally for one process and time range."""
+        self.flush()
+        sql = (
+            "SELECT results.ts, results.pid, results.status FROM results "
+            "JOIN rules ON rules.id = results.rule WHERE rules.rule_id = ?"
+        )
+        params: list[Any] = [rule_id]
+        if pid is not None:
+            sql += " AND results.pid = ?"
+            params.append(pid)
+        if start is not None:
+            sql += " AND results.ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND results.ts <= ?"
+            params.append(end)
+        rows = self._query(sql + " ORDER BY results.ts", params)
+        return [(ts, row_pid, STATUSES[status]) for ts, row_pid, status in rows]
+
+    def facts(
+        self,
+        pid: int | None,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[tuple[float, dict[str, Any]]]:
+        """Return `(ts, facts)` recorded for a process, optionally in a time range."""
+        self.flush()
+        sql = "SELECT ts, facts FROM facts WHERE pid IS ?"
+        params: list[Any] = [pid]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts <= ?"
+            params.append(end)
+        rows = self._query(sql + " ORDER BY ts", params)
+        return [(ts, json.loads(facts)) for ts, facts in rows]
+
+    def prune(self, before: float) -> int:
+        """Delete the cycles recorded before `before`. Return the number of result rows deleted."""
+        self.flush()
+        return self._prune(before)
+
+    def _prune(self, before: float) -> int:
+        """Delete the cycles recorded before `before`, in one transaction."""
+        with self._write_lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                results_end, facts_end = conn.execute(
+                    "SELECT max(results_end), max(facts_end) FROM cycles WHERE ts < ?",
+                    (before,),
+                ).fetchone()
+                deleted = 0
+                if results_end is not None:
+                    deleted = conn.execute(
+                        "DELETE FROM results WHERE rowid <= ?",
+                        (results_end,),
+                    ).rowcount
+                if facts_end is not None:
+                    conn.execute("DELETE FROM facts WHERE rowid <= ?", (facts_end,))
+                conn.execute("DELETE FROM cycles WHERE ts < ?", (before,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return deleted
+
+    def compact(self) -> None:
+        """Release free pages to the file system and truncate the WAL."""
+        self.flush()
+        self._compact()
+
+    def _compact(self) -> None:
+        """Release free pages and truncate the WAL."""
+        with self._write_lock:
+            self._conn.execute("PRAGMA incremental_vacuum")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def flush(self) -> None:
+        """Wait until every recorded cycle is written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write the pending cycles and close the database."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None:
+            self._queue.put(_CLOSE)
+            self._thread.join()
+        with self._write_lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params: list[Any]) -> list[tuple]:
+        """Run a read query on its own connection, so it never waits for the writer."""
+        if self.path == ":memory:":
+            with self._write_lock:
+                return self._conn.execute(sql, params).fetchall()
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def _ensure_thread(self) -> None:
+        """Start the writer thread if it is not running."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="history-writer",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Write queued cycles until closed."""
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is _CLOSE:
+                    return
+                self._write(batch)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, batch: _Batch) -> None:
+        """Insert one cycle in a single transaction, then run retention if due."""
+        with self._write_lock:
+            conn = self._conn
+            try:
+                rules: dict[str, Rule] = {}
+                conn.execute("BEGIN")
+                conn.executemany(_INSERT_RESULT, self._result_params(batch, rules))
+                conn.executemany(_INSERT_RULE, self._unwritten_rules + batch.rules)
+                conn.executemany(_INSERT_FACTS, self._fact_params(batch, rules))
+                conn.execute(_INSERT_CYCLE, (batch.cycle, batch.ts))
+                conn.execute("COMMIT")
+            except sqlite3.Error as err:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self.errors += 1
+                logger.error(f"Could not record cycle {batch.cycle} in history: {err}")
+                # Rules first seen in this cycle are inserted with the next one.
+                self._unwritten_rules += batch.rules
+                return
+            self._unwritten_rules = []
+
+        if batch.ts - self._last_compaction >= self.compact_interval:
+            self._last_compaction = batch.ts
+            self._maintain(batch.ts)
+
+    def _maintain(self, now: float) -> None:
+        """Apply retention and compact the database."""
+        try:
+            if self.retention is not None:
+                deleted = self._prune(now - self.retention)
+                logger.info(f"History retention deleted {deleted} results")
+            self._compact()
+        except sqlite3.Error as err:
+            self.errors += 1
+            logger.error(f"History compaction failed: {err}")
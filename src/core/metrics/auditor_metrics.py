@@ -0,0 +1,84 @@
+"""The metrics the auditor exports about itself."""
+
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import psutil
+
+from core.metrics.metrics_registry import MetricsRegistry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from core.rules_engine.model import Rule
+
+
+class AuditorMetrics:
+    """
+    Metrics of the audit loop, updated as it runs.
+
+    - `auditor_stage_seconds{stage}`: time spent per cycle stage (collect, parse,
+      evaluate, report), as a sum and count.
+    - `auditor_probe_collect_seconds{probe}`: collection time per probe, over
+      every process it collected; not per PID, so the series stay bounded.
+    - `auditor_rule_results_total{rule,status}`: results per rule, counted once
+      per process evaluated.
+    - `auditor_action_queue_depth`: actions waiting for a dispatcher worker.
+    - `auditor_process_cpu_seconds_total`, `auditor_process_resident_memory_bytes`:
+      the auditor's own CPU time and RSS, read once per cycle.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        """Register the metrics in `registry`, or in a new one."""
+        self.registry = registry or MetricsRegistry()
+        self.stage_seconds = self.registry.summary(
+            "auditor_stage_seconds",
+            "Time spent in each stage of an audit cycle.",
+            ("stage",),
+        )
+        self.probe_seconds = self.registry.summary(
+            "auditor_probe_collect_seconds",
+            "Time spent collecting a snapshot from each probe.",
+            ("probe",),
+        )
+        self.rule_results = self.registry.counter(
+            "auditor_rule_results",
+            "Rule results by status, one per rule and process evaluated.",
+            ("rule", "status"),
+        )
+        self.action_queue_depth = self.registry.gauge(
+            "auditor_action_queue_depth",
+            "Rule actions waiting to run.",
+        ).labels()
+        self.cpu_seconds = self.registry.counter(
+            "auditor_process_cpu_seconds",
+            "User and system CPU time used by the auditor.",
+        ).labels()
+        self.resident_memory = self.registry.gauge(
+            "auditor_process_resident_memory_bytes",
+            "Resident memory of the auditor.",
+        ).labels()
+        self._process = psutil.Process()
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """Record the time one cycle spent in `stage`."""
+        self.stage_seconds.labels(stage).observe(seconds)
+
+    def observe_probe(self, probe: str, seconds: float) -> None:
+        """Record the time one collection from a probe took."""
+        self.probe_seconds.labels(probe).observe(seconds)
+
+    def count_results(self, rows: Iterable[tuple[Rule, int | None, str]]) -> None:
+        """Count one cycle of `(rule, pid, status)` results."""
+        counts = Counter((rule.id, status) for rule, _, status in rows)
+        for (rule_id, status), count in counts.items():
+            self.rule_results.labels(rule_id, status).inc(count)
+
+    def update_process(self, action_queue_depth: int = 0) -> None:
+        """Read the auditor's CPU time and RSS, and set the action queue depth."""
+        with self._process.oneshot():
+            times = self._process.cpu_times()
+            rss = self._process.memory_info().rss
+        self.cpu_seconds.set(times.user + times.system)
+        self.resident_memory.set(rss)
+        self.action_queue_depth.set(action_queue_depth)
@@ -0,0 +1,233 @@
+"""Metric families rendered incrementally as OpenMetrics or Prometheus text."""
+
+import math
+import threading
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value or help text."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    """Format a sample value."""
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+class MetricFamily:
+    """
+    A named metric and its samples, one child per set of label values.
+
+    Updating a child only stores its value and marks it changed; its sample
+    lines are rendered again at the next scrape, and the lines of unchanged
+    children are reused.
+    """
+
+    type_name = "gauge"
+    # Suffix of the family name in the Prometheus text TYPE line.
+    prometheus_suffix = ""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        """Initialize an empty family registered in `registry`."""
+        self.registry = registry
+        self.name = name
+        self.labelnames = labelnames
+        self._headers = {
+            openmetrics: (
+                f"# HELP {name}{suffix} {_escape(help_text)}\n"
+                f"# TYPE {name}{suffix} {self.type_name}\n"
+            )
+            for openmetrics, suffix in ((True, ""), (False, self.prometheus_suffix))
+        }
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._label_text: dict[tuple[str, ...], str] = {}
+        self._lines: dict[tuple[str, ...], str] = {}
+        self._changed: set[tuple[str, ...]] = set()
+        self._body: str | None = ""
+
+    def labels(self, *values: object) -> MetricChild:
+        """
+        Return the child of these label values, created on first use.
+
+        Raises:
+            ValueError: if the number of values does not match the label names.
+
+        """
+        if len(values) != len(self.labelnames):
+            msg = f"{self.name} takes {len(self.labelnames)} label values, got {len(values)}"
+            raise ValueError(msg)
+        key = tuple(str(value) for value in values)
+        with self.registry.lock:
+            if key not in self._values:
+                self._values[key] = self._initial()
+                pairs = ",".join(
+                    f'{name}="{_escape(value)}"'
+                    for name, value in zip(self.labelnames, key, strict=True)
+                )
+                self._label_text[key] = f"{{{pairs}}}" if pairs else ""
+                self._changed_locked(key)
+        return MetricChild(self, key)
+
+    def update(self, key: tuple[str, ...], value: float, *, add: bool) -> None:
+        """Set the value of the child `key`, or add to it."""
+        with self.registry.lock:
+            values = self._values[key]
+            values[0] = values[0] + value if add else value
+            self._changed_locked(key)
+
+    def observe(self, key: tuple[str, ...], value: float) -> None:
+        """Add one observation of `value` to the sum and count of the child `key`."""
+        with self.registry.lock:
+            values = self._values[key]
+            values[0] += value
+            values[1] += 1
+            self._changed_locked(key)
+
+    def text(self, *, openmetrics: bool) -> str:
+        """Return the family as exposition text. Must hold the registry lock."""
+        if self._body is None:
+            for key in self._changed:
+                self._lines[key] = self._render(self._label_text[key], self._values[key])
+            self._changed.clear()
+            self._body = "".join(self._lines.values())
+        return self._headers[openmetrics] + self._body
+
+    def _initial(self) -> list[float]:
+        return [0]
+
+    def _render(self, labels: str, values: list[float]) -> str:
+        return f"{self.name}{labels} {_number(values[0])}\n"
+
+    def _changed_locked(self, key: tuple[str, ...]) -> None:
+        """Mark a child changed. Must hold the registry lock."""
+        self._changed.add(key)
+        self._body = None
+        self.registry.invalidate()
+
+
+class MetricChild:
+    """The sample of one set of label values of a family."""
+
+    __slots__ = ("family", "key")
+
+    def __init__(self, family: MetricFamily, key: tuple[str, ...]) -> None:
+        """Initialize a handle on the child `key` of `family`."""
+        self.family = family
+        self.key = key
+
+    def set(self, value: float) -> None:
+        """Set the value (gauges, and counters mirroring a total kept elsewhere)."""
+        self.family.update(self.key, value, add=False)
+
+    def inc(self, amount: float = 1) -> None:
+        """Add `amount` to the value."""
+        self.family.update(self.key, amount, add=True)
+
+    def observe(self, value: float) -> None:
+        """Add one observation of `value` to a summary."""
+        self.family.observe(self.key, value)
+
+
+class Gauge(MetricFamily):
+    """A value that goes up and down."""
+
+
+class Counter(MetricFamily):
+    """A total that only goes up, exposed as `<name>_total`."""
+
+    type_name = "counter"
+    prometheus_suffix = "_total"
+
+    def _render(self, labels: str, values: list[float]) -> str:
+        return f"{self.name}_total{labels} {_number(values[0])}\n"
+
+
+class Summary(MetricFamily):
+    """The sum and count of observations, exposed as `<name>_sum` and `<name>_count`."""
+
+    type_name = "summary"
+
+    def _initial(self) -> list[float]:
+        return [0.0, 0]
+
+    def _render(self, labels: str, values: list[float]) -> str:
+        return (
+            f"{self.name}_sum{labels} {_number(values[0])}\n"
+            f"{self.name}_count{labels} {_number(values[1])}\n"
+        )
+
+
+class MetricsRegistry:
+    """
+    Metric families and their exposition text.
+
+    The text of each format is cached until a sample changes, and then only
+    the families with changed samples are rendered again, so a scrape costs
+    little more than copying the cached text.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.lock = threading.Lock()
+        self._families: dict[str, MetricFamily] = {}
+        self._cache: dict[bool, bytes] = {}
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Register a gauge."""
+        return self._register(Gauge(self, name, help_text, labelnames))
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Register a counter; `name` is given without the `_total` suffix."""
+        return self._register(Counter(self, name, help_text, labelnames))
+
+    def summary(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Summary:
+        """Register a summary (sum and count, without quantiles)."""
+        return self._register(Summary(self, name, help_text, labelnames))
+
+    def render(self, *, openmetrics: bool = True) -> bytes:
+        """Return the exposition text, in OpenMetrics or Prometheus text format."""
+        with self.lock:
+            cached = self._cache.get(openmetrics)
+            if cached is None:
+                text = "".join(
+                    family.text(openmetrics=openmetrics) for family in self._families.values()
+                )
+                if openmetrics:
+                    text += "# EOF\n"
+                cached = self._cache[openmetrics] = text.encode()
+            return cached
+
+    def invalidate(self) -> None:
+        """Drop the cached text. Must hold `lock`."""
+        self._cache.clear()
+
+    def _register[F: MetricFamily](self, family: F) -> F:
+        """
+        Add `family` to the registry.
+
+        Raises:
+            ValueError: if a family with the same name is registered.
+
+        """
+        with self.lock:
+            if family.name in self._families:
+                msg = f"Metric {family.name} is already registered"
+                raise ValueError(msg)
+            self._families[family.name] = family
+            self.invalidate()
+        return family
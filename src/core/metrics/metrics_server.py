@@ -0,0 +1,122 @@
+"""Serve metrics over HTTP on a local TCP port or a Unix socket."""
+
+import contextlib
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from core.metrics.metrics_registry import OPENMETRICS_CONTENT_TYPE, PROMETHEUS_CONTENT_TYPE
+
+if TYPE_CHECKING:
+    import socket
+
+    from core.metrics.metrics_registry import MetricsRegistry
+
+METRICS_PATH = "/metrics"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Answer GET /metrics with the registry's exposition text."""
+
+    server: _TcpServer | _UnixServer
+
+    def do_GET(self) -> None:
+        """Serve the metrics, in OpenMetrics format when the client accepts it."""
+        if self.path.split("?", 1)[0] != METRICS_PATH:
+            self.send_error(404)
+            return
+        openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+        body = self.server.registry.render(openmetrics=openmetrics)
+        self.send_response(200)
+        self.send_header(
+            "Content-Type",
+            OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE,
+        )
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Do not log scrapes."""
+
+
+class _TcpServer(ThreadingHTTPServer):
+    daemon_threads = True
+    registry: MetricsRegistry
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    registry: MetricsRegistry
+
+    def get_request(self) -> tuple[socket.socket, tuple[str, int]]:
+        # BaseHTTPRequestHandler expects a (host, port) client address.
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+
+class MetricsServer:
+    """
+    Serve the metrics of a registry at `/metrics`, from a background thread.
+
+    Listens on `host:port`, or on the Unix socket `unix_socket` when given.
+    Each scrape returns the registry's cached text, so scraping does not wait
+    on the audit loop beyond copying it.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        unix_socket: Path | str | None = None,
+    ) -> None:
+        """Initialize a server; `start` binds it. Port 0 picks a free port."""
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.unix_socket = Path(unix_socket) if unix_socket is not None else None
+        self._server: _TcpServer | _UnixServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> str:
+        """Return where the server listens: `host:port`, or the socket path."""
+        if self.unix_socket is not None:
+            return str(self.unix_socket)
+        return f"{self.host}:{self.port}"
+
+    def start(self) -> MetricsServer:
+        """Bind and start serving. Returns the server."""
+        if self.unix_socket is not None:
+            with contextlib.suppress(FileNotFoundError):
+                self.unix_socket.unlink()
+            server = _UnixServer(str(self.unix_socket), _MetricsHandler)
+            self.unix_socket.chmod(0o600)
+        else:
+            server = _TcpServer((self.host, self.port), _MetricsHandler)
+            self.port = server.server_address[1]
+        server.registry = self.registry
+        self._server = server
+        self._thread = threading.Thread(
+            target=server.serve_forever,
+            name="metrics-server",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop serving and release the address."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        if self.unix_socket is not None:
+            with contextlib.suppress(FileNotFoundError):
+                self.unix_socket.unlink()
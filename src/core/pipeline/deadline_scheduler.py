@@ -0,0 +1,136 @@
+"""Drift-free cycle scheduling on a monotonic interval grid."""
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class OverrunPolicy(Enum):
+    """What to do with the cycles that came due while a cycle overran."""
+
+    # Run the missed cycles back to back until the schedule is caught up.
+    CATCH_UP = "catch_up"
+    # Run one cycle at once in place of all those missed.
+    SKIP = "skip"
+
+
+@dataclass(slots=True)
+class SchedulerStats:
+    """Counters of a deadline scheduler."""
+
+    cycles: int = 0
+    # Cycles that ran past the next tick.
+    overruns: int = 0
+    # Ticks dropped by the skip policy.
+    skipped: int = 0
+    # Largest delay of a cycle start past its tick, in seconds.
+    max_lateness: float = 0.0
+
+
+class DeadlineScheduler:
+    """
+    Start cycles on the grid `origin + phase + k * interval`.
+
+    Deadlines are computed from the grid rather than from the end of the last
+    cycle, so the time a cycle takes, and sleeping, never shift later cycles.
+    When a cycle runs past the next tick, the next cycle starts at once, and
+    `policy` decides whether the other missed ticks are run back to back (catch
+    up) or dropped (skip). Either way later cycles return to the grid.
+
+    `jitter` spreads auditors started together on one host: each scheduler
+    picks a fixed phase in [0, jitter) seconds, so its cycles stay evenly
+    spaced but start at a different offset from those of other instances.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        interval: float,
+        *,
+        policy: OverrunPolicy = OverrunPolicy.SKIP,
+        jitter: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], object] = time.sleep,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Initialize a scheduler whose grid starts now, offset by its phase.
+
+        Args:
+            interval: seconds between two cycle starts; may be below one second. 0 runs
+                cycles back to back.
+            policy: how to handle ticks missed while a cycle overran.
+            jitter: upper bound of the phase offset, in seconds. 0 starts on time.
+            clock: monotonic clock of the grid.
+            sleep: waits a number of seconds, e.g. `threading.Event.wait`.
+            rng: source of the phase offset.
+
+        Raises:
+            ValueError: if `interval` or `jitter` is negative.
+
+        """
+        if interval < 0:
+            msg = f"Interval must not be negative, got {interval}"
+            raise ValueError(msg)
+        if jitter < 0:
+            msg = f"Jitter must not be negative, got {jitter}"
+            raise ValueError(msg)
+        self.interval = interval
+        self.policy = policy
+        self.clock = clock
+        self.sleep = sleep
+        rng = rng or random.Random()  # noqa: S311 - spreads load, not security-sensitive
+        self.phase = rng.uniform(0, jitter) if jitter else 0.0
+        self.origin = clock() + self.phase
+        self.stats = SchedulerStats()
+        self._tick = 0
+
+    @property
+    def cycle(self) -> int:
+        """Return the grid index of the cycle last started, counting skipped ticks."""
+        return self._tick - 1
+
+    @property
+    def next_deadline(self) -> float:
+        """Return the clock time the next cycle is due."""
+        return self.origin + self._tick * self.interval
+
+    def wait(self, until: float | None = None) -> bool:
+        """
+        Sleep until the next cycle is due, or until the clock time `until` if earlier.
+
+        Returns:
+            bool: True when the next cycle is due and should run now, False when
+                `until` came first.
+
+        """
+        now = self.clock()
+        deadline = self.next_deadline
+        if until is not None and until < deadline:
+            if until > now:
+                self.sleep(until - now)
+            return False
+        if deadline > now:
+            self.sleep(deadline - now)
+        elif now > deadline and self.interval:
+            self._late(now - deadline)
+        self.stats.cycles += 1
+        self._tick += 1
+        return True
+
+    def _late(self, lateness: float) -> None:
+        """Account for starting `lateness` seconds after the next tick, applying the policy."""
+        if self._tick:
+            self.stats.overruns += 1
+        missed = math.floor(lateness / self.interval)
+        if missed and self.policy is OverrunPolicy.SKIP:
+            # Run now in place of the latest tick due, dropping the earlier ones.
+            self.stats.skipped += missed
+            self._tick += missed
+            lateness -= missed * self.interval
+        self.stats.max_lateness = max(self.stats.max_lateness, lateness)
@@ -0,0 +1,116 @@
+"""Per-rule and per-source evaluation cadences on a shared cycle grid."""
+
+import math
+from typing import TYPE_CHECKING
+
+from shared.services import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from core.rules_engine.model import Rule
+
+# The grid tick is a whole number of steps of 1 / _STEPS_PER_SECOND seconds.
+_STEPS_PER_SECOND = 1000
+
+
+class RuleScheduler:
+    """
+    Pick the rules due in each cycle of a grid of `tick` seconds.
+
+    A rule is evaluated every `rule.interval` seconds, or else at the interval of
+    its source in `source_intervals`, or else every `default_interval`. An
+    interval that is not a whole number of ticks is rounded to the nearest one
+    (at least one tick), with a warning. A rule of period n
+    ticks is due once per slot of n cycles, in the first cycle run in the slot:
+    rules of the same cadence are evaluated together, every rule is due in
+    cycle 0, and a rule whose cycle was skipped runs in the next one. The
+    members of a mutually exclusive group are due together, as soon as one is.
+    """
+
+    def __init__(
+        self,
+        tick: float,
+        default_interval: float,
+        source_intervals: Mapping[str, float] | None = None,
+    ) -> None:
+        """Initialize a scheduler of cycles `tick` seconds apart."""
+        self.tick = tick
+        self.default_interval = default_interval
+        self.source_intervals = dict(source_intervals or {})
+        # Slot each rule was last due in.
+        self._slots: dict[str, int] = {}
+        # Intervals already warned about as not a whole number of ticks.
+        self._warned: set[float] = set()
+
+    @classmethod
+    def for_rules(
+        cls,
+        rules: Iterable[Rule],
+        default_interval: float,
+        source_intervals: Mapping[str, float] | None = None,
+    ) -> RuleScheduler:
+        """
+        Build a scheduler whose tick is the greatest common divisor of the intervals in use.
+
+        Every interval in use is then a whole number of ticks. Intervals are
+        counted in milliseconds, so the tick is at least 1 ms.
+        """
+        intervals = [default_interval, *(source_intervals or {}).values()]
+        intervals += [rule.interval for rule in rules if rule.interval]
+        steps = [
+            max(1, round(interval * _STEPS_PER_SECOND)) for interval in intervals if interval > 0
+        ]
+        tick = math.gcd(*steps) / _STEPS_PER_SECOND if steps else default_interval
+        return cls(tick, default_interval, source_intervals)
+
+    def interval(self, rule: Rule) -> float:
+        """Return the cadence of `rule`, in seconds."""
+        if rule.interval:
+            return rule.interval
+        source = getattr(rule.source, "value", None)
+        return self.source_intervals.get(source, self.default_interval)
+
+    def period(self, rule: Rule) -> int:
+        """Return the cadence of `rule`, in cycles."""
+        if self.tick <= 0:
+            return 1
+        interval = self.interval(rule)
+        ticks = interval / self.tick
+        period = max(1, math.floor(ticks + 0.5))
+        if not math.isclose(ticks, period) and interval not in self._warned:
+            self._warned.add(interval)
+            logger.warning(
+                f"Interval {interval} s is not a whole number of {self.tick} s ticks: "
+                f"rules with it run every {period * self.tick:g} s",
+            )
+        return period
+
+    def uniform(self, rules: Mapping[str, Rule]) -> bool:
+        """Return whether every rule of `rules` is due in every cycle."""
+        return all(self.period(rule) == 1 for rule in rules.values())
+
+    def due(self, rules: Mapping[str, Rule], cycle: int) -> dict[str, Rule]:
+        """Return the rules of `rules` due in cycle `cycle`, in their order."""
+        slots = {rule_id: cycle // self.period(rule) for rule_id, rule in rules.items()}
+        due = {rule_id for rule_id, slot in slots.items() if self._slots.get(rule_id) != slot}
+        groups = {
+            rules[rule_id].mutually_exclusive_group
+            for rule_id in due
+            if rules[rule_id].mutually_exclusive_group
+        }
+        if groups:
+            due.update(
+                rule_id
+                for rule_id, rule in rules.items()
+                if rule.mutually_exclusive_group in groups
+            )
+        # Rules no longer scheduled are forgotten.
+        self._slots = {rule_id: self._slots.get(rule_id, -1) for rule_id in rules}
+        self._slots.update((rule_id, slots[rule_id]) for rule_id in due)
+        return {rule_id: rule for rule_id, rule in rules.items() if rule_id in due}
+
+    @staticmethod
+    def sources(rules: Mapping[str, Rule]) -> set[str]:
+        """Return the sources `rules` read facts from."""
+        return {getattr(rule.source, "value", None) for rule in rules.values()} - {None}
@@ -0,0 +1,174 @@
+"""Threaded collection / evaluation pipeline."""
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from core.pipeline.deadline_scheduler import DeadlineScheduler, OverrunPolicy
+from shared.services import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclass(slots=True)
+class PipelineStats:
+    """Counters of a pipeline run."""
+
+    collected: int = 0
+    evaluated: int = 0
+    dropped: int = 0
+
+
+class ThreadedPipeline:
+    """
+    Run collection and evaluation concurrently.
+
+    A collector thread calls `collect` every `interval` seconds, on the grid of a
+    `DeadlineScheduler`, and hands the
+    result to `evaluators` evaluation threads through a bounded queue. When the
+    evaluators fall behind, the oldest pending collection is dropped, so
+    evaluation always works on the freshest data. `report` is called with each
+    evaluation result, one call at a time, in the order evaluations finish.
+
+    On a free-threaded build collection and evaluation run in parallel; with the
+    GIL they still overlap whenever collection waits on the operating system.
+    The first exception raised by any stage stops the pipeline and is re-raised
+    by `run`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        collect: Callable[[], Any],
+        evaluate: Callable[[Any], Any],
+        report: Callable[[Any], None],
+        *,
+        interval: float,
+        evaluators: int = 1,
+        queue_size: int = 1,
+        overrun_policy: OverrunPolicy = OverrunPolicy.SKIP,
+        jitter: float = 0.0,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            collect: produces the data of one cycle, or None when there is nothing to evaluate.
+            evaluate: turns the data of one cycle into a result.
+            report: consumes one result.
+            interval: seconds between the starts of two collections.
+            evaluators: number of evaluation threads.
+            queue_size: collections waiting for an evaluator before the oldest is dropped.
+            overrun_policy: what to do with the collections missed while one overran.
+            jitter: upper bound of the collection phase offset, in seconds.
+
+        """
+        self.collect = collect
+        self.evaluate = evaluate
+        self.report = report
+        self.interval = interval
+        self.overrun_policy = overrun_policy
+        self.jitter = jitter
+        self.scheduler: DeadlineScheduler | None = None
+        self.evaluators = max(1, evaluators)
+        self.stats = PipelineStats()
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._report_lock = threading.Lock()
+        self._error: BaseException | None = None
+
+    def run(self, is_active: Callable[[], bool], poll: float = 0.1) -> PipelineStats:
+        """
+        Run until `is_active` returns False or a stage fails.
+
+        Args:
+            is_active: checked by the calling thread every `poll` seconds.
+            poll: seconds between two checks of `is_active`.
+
+        Returns:
+            PipelineStats: the counters of this run.
+
+        """
+        self._stop.clear()
+        self.scheduler = DeadlineScheduler(
+            self.interval,
+            policy=self.overrun_policy,
+            jitter=self.jitter,
+            sleep=self._stop.wait,
+        )
+        threads = [threading.Thread(target=self._collect_loop, name="collector", daemon=True)]
+        threads += [
+            threading.Thread(target=self._evaluate_loop, name=f"evaluator-{i}", daemon=True)
+            for i in range(self.evaluators)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while not self._stop.is_set() and is_active():
+                self._stop.wait(poll)
+        finally:
+            self.stop()
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    def stop(self) -> None:
+        """Ask every stage to finish its current step and exit."""
+        self._stop.set()
+
+    def _fail(self, err: BaseException) -> None:
+        """Record the first failure and stop the pipeline."""
+        with self._lock:
+            if self._error is None:
+                self._error = err
+        self.stop()
+
+    def _collect_loop(self) -> None:
+        """Collect every `interval` seconds, on the scheduler's grid."""
+        while self.scheduler.wait() and not self._stop.is_set():
+            try:
+                item = self.collect()
+            except BaseException as err:  # noqa: BLE001 - re-raised by run()
+                self._fail(err)
+                return
+            if item is not None:
+                self._offer(item)
+
+    def _offer(self, item: Any) -> None:  # noqa: ANN401
+        """Queue `item`, dropping the oldest pending item when the queue is full."""
+        with self._lock:
+            self.stats.collected += 1
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    self.stats.dropped += 1
+                    logger.debug("Evaluation behind collection, dropped oldest snapshot")
+                else:
+                    return
+
+    def _evaluate_loop(self) -> None:
+        """Evaluate queued items until the pipeline stops."""
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            try:
+                result = self.evaluate(item)
+                with self._report_lock:
+                    self.report(result)
+            except BaseException as err:  # noqa: BLE001 - re-raised by run()
+                self._fail(err)
+                return
+            with self._lock:
+                self.stats.evaluated += 1
@@ -0,0 +1,210 @@
+"""Read recorded snapshots back from segment files."""
+
+import json
+import lzma
+import mmap
+import struct
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+from core.recording.snapshot_codec import (
+    BLOCK,
+    CODECS,
+    FULL,
+    HEADER,
+    INDEX_ENTRY,
+    INDEX_MAGIC,
+    MAGIC,
+    SUFFIX,
+    TRAILER,
+    Flat,
+    apply_delta,
+    decompress,
+    flatten,
+    unflatten,
+)
+from shared.custom_exceptions.custom_exception import InvalidSegmentError
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator
+
+# (snapshot time, PID, snapshot as plain data)
+Snapshot = tuple[float, int, dict[str, Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class BlockInfo:
+    """Where a block is in its segment, and which snapshots it holds."""
+
+    offset: int
+    length: int
+    records: int
+    first: float
+    last: float
+    # None when unknown: the segment has no index footer.
+    pids: frozenset[int] | None
+
+
+class SegmentReader:
+    """
+    Read a segment file through `mmap`.
+
+    The block index is read from the footer when the segment is opened; queries
+    then decompress only the blocks whose time range and PIDs match. A segment
+    without footer (still being written, or not closed) is indexed by walking its
+    block headers instead.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        Map the segment and read its index.
+
+        Raises:
+            InvalidSegmentError: if `path` is not a segment file.
+
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as file:
+            if self.path.stat().st_size < HEADER.size:
+                msg = f"{self.path} is not a snapshot segment"
+                raise InvalidSegmentError(msg)
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, codec = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or codec >= len(CODECS):
+            self._map.close()
+            msg = f"{self.path} is not a snapshot segment"
+            raise InvalidSegmentError(msg)
+        self.codec = CODECS[codec]
+        self.blocks = self._read_index()
+
+    def __enter__(self) -> Self:
+        """Return the reader."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Unmap the segment."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the segment."""
+        self._map.close()
+
+    def read(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        pids: Collection[int] | None = None,
+    ) -> Iterator[Snapshot]:
+        """
+        Yield the snapshots taken in [start, end], of `pids` if given, in recorded order.
+
+        Raises:
+            InvalidSegmentError: if a matching block is corrupt.
+
+        """
+        wanted = None if pids is None else frozenset(pids)
+        for block in self.blocks:
+            if start is not None and block.last < start:
+                continue
+            if end is not None and block.first > end:
+                continue
+            if wanted is not None and block.pids is not None and block.pids.isdisjoint(wanted):
+                continue
+            yield from self._read_block(block, start, end, wanted)
+
+    def _read_block(
+        self,
+        block: BlockInfo,
+        start: float | None,
+        end: float | None,
+        wanted: frozenset[int] | None,
+    ) -> Iterator[Snapshot]:
+        begin = block.offset + BLOCK.size
+        try:
+            lines = decompress(self.codec, self._map[begin : begin + block.length]).split(b"\n")
+        except (zlib.error, lzma.LZMAError) as err:
+            msg = f"Corrupt block at byte {block.offset} of {self.path}"
+            raise InvalidSegmentError(msg) from err
+
+        states: dict[int, Flat] = {}
+        for line in lines:
+            # Records start with "[timestamp,pid,": skip other processes unparsed.
+            if wanted is not None and int(line.split(b",", 2)[1]) not in wanted:
+                continue
+            record = json.loads(line)
+            timestamp, pid, kind = record[0], record[1], record[2]
+            if kind == FULL:
+                flat = flatten(record[3])
+            else:
+                flat = apply_delta(states[pid], record[3], record[4])
+            states[pid] = flat
+            if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                yield timestamp, pid, unflatten(flat)
+
+    def _read_index(self) -> list[BlockInfo]:
+        """Return the blocks listed in the footer, or found by walking the block headers."""
+        size = len(self._map)
+        if size < HEADER.size + TRAILER.size:
+            return self._scan()
+        offset, count, magic = TRAILER.unpack_from(self._map, size - TRAILER.size)
+        if magic != INDEX_MAGIC:
+            return self._scan()
+
+        blocks = []
+        try:
+            for _ in range(count):
+                entry = INDEX_ENTRY.unpack_from(self._map, offset)
+                offset += INDEX_ENTRY.size
+                pids = array("I")
+                pids.frombytes(self._map[offset : offset + entry[5] * pids.itemsize])
+                offset += entry[5] * pids.itemsize
+                blocks.append(BlockInfo(*entry[:5], pids=frozenset(pids)))
+        except (struct.error, ValueError) as err:
+            msg = f"Corrupt index footer in {self.path}"
+            raise InvalidSegmentError(msg) from err
+        return blocks
+
+    def _scan(self) -> list[BlockInfo]:
+        """Return the complete blocks of a segment without footer."""
+        blocks = []
+        offset = HEADER.size
+        size = len(self._map)
+        while offset + BLOCK.size <= size:
+            length, records, first, last = BLOCK.unpack_from(self._map, offset)
+            if offset + BLOCK.size + length > size:
+                break  # Block still being written.
+            blocks.append(BlockInfo(offset, length, records, first, last, pids=None))
+            offset += BLOCK.size + length
+        return blocks
+
+
+def segment_start(path: Path) -> float:
+    """Return the time of the first snapshot of a segment, from its name."""
+    return int(path.stem) / 1000
+
+
+def read_snapshots(
+    directory: Path | str,
+    start: float | None = None,
+    end: float | None = None,
+    pids: Collection[int] | None = None,
+) -> Iterator[Snapshot]:
+    """
+    Yield the snapshots recorded in `directory` taken in [start, end], oldest first.
+
+    Segments are picked by name: a segment ends where the next one starts, so
+    only the segments overlapping [start, end] are opened.
+    """
+    paths = sorted(Path(directory).glob(f"*{SUFFIX}"))
+    for i, path in enumerate(paths):
+        # Names are rounded down to the millisecond.
+        following = paths[i + 1] if i + 1 < len(paths) else None
+        if start is not None and following and segment_start(following) + 0.001 <= start:
+            continue
+        if end is not None and segment_start(path) > end:
+            break
+        with SegmentReader(path) as reader:
+            yield from reader.read(start, end, pids)
@@ -0,0 +1,122 @@
+"""Segment file layout, and the plain-data and delta encoding of recorded snapshots."""
+
+import dataclasses
+import lzma
+import struct
+import zlib
+from typing import Any
+
+# A snapshot flattened to its leaves: key path -> value.
+Flat = dict[tuple[str, ...], Any]
+
+# File header: magic, codec index in CODECS.
+MAGIC = b"SNP1"
+HEADER = struct.Struct("<4sB3x")
+# Block header: compressed length, record count, first and last snapshot time.
+BLOCK = struct.Struct("<IIdd")
+# Index entry: block offset, compressed length, record count, first and last
+# snapshot time, number of PIDs (followed by the PIDs, as unsigned 32-bit ints).
+INDEX_ENTRY = struct.Struct("<QIIddI")
+# Trailer: index offset, number of blocks, magic.
+INDEX_MAGIC = b"SNPX"
+TRAILER = struct.Struct("<QI4s")
+
+CODECS = ("zlib", "lzma")
+SUFFIX = ".seg"
+
+# Key added to each recorded snapshot: the time of the collection it was taken in.
+COLLECTION_TIME = "collection_time"
+
+# Record kinds: the whole snapshot, or the leaves that changed since the previous
+# record of the same process in the block.
+FULL = 0
+DELTA = 1
+
+
+def compress(codec: str, data: bytes) -> bytes:
+    """Compress a block with `codec`."""
+    if codec == "lzma":
+        return lzma.compress(data)
+    return zlib.compress(data)
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    """Decompress a block compressed with `codec`."""
+    if codec == "lzma":
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+def to_plain(value: Any) -> Any:  # noqa: ANN401
+    """
+    Convert a snapshot to JSON data.
+
+    Dataclasses and named tuples (psutil results) become dicts keyed by field
+    name, so fact paths such as `cpu.percent` resolve on the plain data as on the
+    snapshot. Other unknown values become their `str`.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: to_plain(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if isinstance(value, tuple) and hasattr(value, "_asdict"):
+        return {key: to_plain(item) for key, item in value._asdict().items()}
+    if isinstance(value, dict):
+        return {str(key): to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_plain(item) for item in value]
+    return str(value)
+
+
+def flatten(plain: dict[str, Any], prefix: tuple[str, ...] = (), out: Flat | None = None) -> Flat:
+    """Return the leaves of nested dicts by key path; empty dicts are leaves."""
+    if out is None:
+        out = {}
+    for key, value in plain.items():
+        path = (*prefix, key)
+        if isinstance(value, dict) and value:
+            flatten(value, path, out)
+        else:
+            out[path] = value
+    return out
+
+
+def unflatten(flat: Flat) -> dict[str, Any]:
+    """Rebuild the nested dicts of `flatten`."""
+    out: dict[str, Any] = {}
+    for path, value in flat.items():
+        node = out
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return out
+
+
+_MISSING = object()
+
+
+def diff(previous: Flat, current: Flat) -> tuple[list[list], list[list[str]]]:
+    """
+    Return the leaves of `current` that differ from `previous`, and those removed.
+
+    Returns:
+        tuple: `[path, value]` pairs to set, and paths to remove.
+
+    """
+    changed = []
+    for path, value in current.items():
+        old = previous.get(path, _MISSING)
+        if old is _MISSING or type(old) is not type(value) or old != value:
+            changed.append([list(path), value])
+    removed = [list(path) for path in previous if path not in current]
+    return changed, removed
+
+
+def apply_delta(previous: Flat, changed: list[list], removed: list[list[str]]) -> Flat:
+    """Return `previous` with the leaves of a `diff` removed and set."""
+    flat = dict(previous)
+    for path in removed:
+        flat.pop(tuple(path), None)
+    for path, value in changed:
+        flat[tuple(path)] = value
+    return flat
@@ -0,0 +1,251 @@
+"""Record process snapshots to compressed, time-indexed segment files."""
+
+import json
+import threading
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from core.probes.snapshot.process_snapshot.process_snapshot import ProcessSnapshot
+from core.recording.snapshot_codec import (
+    BLOCK,
+    CODECS,
+    COLLECTION_TIME,
+    DELTA,
+    FULL,
+    HEADER,
+    INDEX_ENTRY,
+    INDEX_MAGIC,
+    MAGIC,
+    SUFFIX,
+    TRAILER,
+    Flat,
+    compress,
+    diff,
+    flatten,
+    to_plain,
+)
+
+if TYPE_CHECKING:
+    from core.probes.snapshot.base import BaseSnapshot
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+DEFAULT_SEGMENT_DURATION = 3600.0
+
+
+class SegmentWriter:
+    """
+    Append snapshots to one segment file.
+
+    Records are JSON lines gathered into blocks of about `block_size` bytes;
+    each block is compressed and appended after a header holding its length,
+    record count and time range. The first record of a process in a block is the
+    whole snapshot and the next ones only the leaves that changed, so each block
+    decodes on its own. `close` appends the index footer: the offset, time range
+    and PIDs of each block.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        codec: str = "zlib",
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        """
+        Create the segment file.
+
+        Raises:
+            ValueError: if `codec` is not one of CODECS.
+            FileExistsError: if `path` already exists.
+
+        """
+        if codec not in CODECS:
+            msg = f"Unknown codec {codec!r}, expected one of {', '.join(CODECS)}"
+            raise ValueError(msg)
+        self.path = Path(path)
+        self.codec = codec
+        self.block_size = block_size
+        self._file = self.path.open("xb")
+        self._file.write(HEADER.pack(MAGIC, CODECS.index(codec)))
+        self.size = HEADER.size
+        self._index: list[bytes] = []
+        self._lines: list[bytes] = []
+        self._pending = 0
+        self._states: dict[int, Flat] = {}
+        self._first = float("inf")
+        self._last = float("-inf")
+
+    def append(self, timestamp: float, pid: int, plain: dict[str, Any]) -> None:
+        """Append the plain data of a snapshot of `pid` taken at `timestamp`."""
+        flat = flatten(plain)
+        record = None
+        previous = self._states.get(pid)
+        if previous is not None:
+            changed, removed = diff(previous, flat)
+            # A delta touching most leaves is no smaller than the snapshot.
+            if len(changed) + len(removed) <= len(flat) // 2:
+                record = [timestamp, pid, DELTA, changed, removed]
+        if record is None:
+            record = [timestamp, pid, FULL, plain]
+        self._states[pid] = flat
+
+        line = json.dumps(record, separators=(",", ":")).encode()
+        self._lines.append(line)
+        self._pending += len(line) + 1
+        self._first = min(self._first, timestamp)
+        self._last = max(self._last, timestamp)
+        if self._pending >= self.block_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Compress and write the pending records as one block."""
+        if not self._lines:
+            return
+        payload = compress(self.codec, b"\n".join(self._lines))
+        header = BLOCK.pack(len(payload), len(self._lines), self._first, self._last)
+        pids = array("I", sorted(self._states))
+        self._index.append(
+            INDEX_ENTRY.pack(
+                self.size, len(payload), len(self._lines), self._first, self._last, len(pids),
+            )
+            + pids.tobytes(),
+        )
+        self._file.write(header + payload)
+        self._file.flush()
+        self.size += len(header) + len(payload)
+        self._lines = []
+        self._pending = 0
+        self._states = {}
+        self._first = float("inf")
+        self._last = float("-inf")
+
+    def close(self) -> None:
+        """Write the pending block and the index footer, and close the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        footer = b"".join(self._index)
+        self._file.write(footer + TRAILER.pack(self.size, len(self._index), INDEX_MAGIC))
+        self.size += len(footer) + TRAILER.size
+        self._file.close()
+
+
+class SnapshotRecorder:
+    """
+    Record every process snapshot to rolling segment files in `directory`.
+
+    A new segment starts once the current one holds `segment_size` bytes or
+    spans `segment_duration` seconds. Segments are named after the time of their
+    first snapshot in milliseconds, so they sort in time order. Once the
+    segments take more than `max_bytes`, the oldest ones are deleted.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        directory: Path | str,
+        *,
+        codec: str = "zlib",
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        segment_duration: float = DEFAULT_SEGMENT_DURATION,
+        max_bytes: int | None = None,
+    ) -> None:
+        """
+        Initialize a recorder writing to `directory`, created if needed.
+
+        Raises:
+            ValueError: if `codec` is not one of CODECS.
+
+        """
+        if codec not in CODECS:
+            msg = f"Unknown codec {codec!r}, expected one of {', '.join(CODECS)}"
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.codec = codec
+        self.block_size = block_size
+        self.segment_size = segment_size
+        self.segment_duration = segment_duration
+        self.max_bytes = max_bytes
+        self._writer: SegmentWriter | None = None
+        self._segment_start = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, snapshots: dict[str, list[BaseSnapshot]]) -> int:
+        """
+        Record the process snapshots of one collection.
+
+        Each snapshot is recorded with the collection time (`COLLECTION_TIME`),
+        the time of the collection's last snapshot, so a replay groups the
+        snapshots back into their collections.
+
+        Returns:
+            int: the number of snapshots recorded.
+
+        """
+        process_snapshots = [
+            snapshot
+            for source_snapshots in snapshots.values()
+            for snapshot in source_snapshots
+            if isinstance(snapshot, ProcessSnapshot)
+        ]
+        collection_time = max((s.snapshot_time for s in process_snapshots), default=0.0)
+        with self._lock:
+            for snapshot in process_snapshots:
+                plain = to_plain(snapshot)
+                plain[COLLECTION_TIME] = collection_time
+                self._append(snapshot.snapshot_time, snapshot.pid, plain)
+        return len(process_snapshots)
+
+    def segments(self) -> list[Path]:
+        """Return the segment files, oldest first."""
+        return sorted(self.directory.glob(f"*{SUFFIX}"))
+
+    def flush(self) -> None:
+        """Write the pending records of the current segment."""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+
+    def close(self) -> None:
+        """Close the current segment."""
+        with self._lock:
+            self._close_segment()
+
+    def _append(self, timestamp: float, pid: int, plain: dict[str, Any]) -> None:
+        writer = self._writer
+        if writer is not None and (
+            writer.size >= self.segment_size
+            or timestamp - self._segment_start >= self.segment_duration
+        ):
+            self._close_segment()
+            writer = None
+        if writer is None:
+            writer = self._writer = self._open_segment(timestamp)
+        writer.append(timestamp, pid, plain)
+
+    def _open_segment(self, timestamp: float) -> SegmentWriter:
+        """Start a segment named after `timestamp`."""
+        millis = int(timestamp * 1000)
+        while (path := self.directory / f"{millis:016d}{SUFFIX}").exists():
+            millis += 1
+        self._segment_start = timestamp
+        return SegmentWriter(path, codec=self.codec, block_size=self.block_size)
+
+    def _close_segment(self) -> None:
+        """Close the current segment and delete the oldest ones beyond `max_bytes`."""
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        if self.max_bytes is None:
+            return
+        segments = self.segments()
+        total = sum(path.stat().st_size for path in segments)
+        for path in segments[:-1]:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink()
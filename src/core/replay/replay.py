@@ -0,0 +1,206 @@
+"""Replay recorded snapshots through fact parsing and rule evaluation."""
+
+import dataclasses
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from core.recording.segment_reader import SegmentReader, read_snapshots
+from core.recording.snapshot_codec import COLLECTION_TIME, SUFFIX
+from core.reporting.report import CycleReport
+from core.rules_engine.model.rule import Action, SourceEnum
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Iterator
+
+    from core.compliance_engine import ComplianceEngine
+    from core.fact_processor.fact_processor import FactProcessor
+    from core.recording.segment_reader import Snapshot
+    from core.reporting.report_writer import ReportWriter
+    from core.rules_engine.model import Rule
+
+DRY_RUN = Action(name="dry run", execute=lambda: None)
+
+# Result of a rule over a collection: the first of these on some snapshot, else passed.
+_STATUS_ORDER = ("failed", "pending", "suppressed")
+
+
+def read_recording(
+    path: Path | str,
+    start: float | None = None,
+    end: float | None = None,
+    pids: Collection[int] | None = None,
+) -> Iterator[Snapshot]:
+    """
+    Yield the snapshots of a recording taken in [start, end], of `pids` if given.
+
+    `path` is a directory of segment files, one segment file, or a JSON Lines
+    file of snapshot objects (with `snapshot_time` and `pid`).
+    """
+    path = Path(path)
+    if path.is_dir():
+        yield from read_snapshots(path, start, end, pids)
+    elif path.suffix == SUFFIX:
+        with SegmentReader(path) as reader:
+            yield from reader.read(start, end, pids)
+    else:
+        wanted = None if pids is None else set(pids)
+        with path.open() as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                snapshot = json.loads(line)
+                timestamp, pid = snapshot["snapshot_time"], snapshot["pid"]
+                if start is not None and timestamp < start:
+                    continue
+                if end is not None and timestamp > end:
+                    continue
+                if wanted is None or pid in wanted:
+                    yield timestamp, pid, snapshot
+
+
+def collections_of(snapshots: Iterable[Snapshot]) -> Iterator[tuple[float, list[dict[str, Any]]]]:
+    """
+    Group recorded snapshots back into the collections they were taken in.
+
+    Snapshots recorded by `SnapshotRecorder` carry their collection time
+    (`COLLECTION_TIME`): a new collection starts where it changes. Snapshots
+    without it, as in older recordings, are split at the first process seen
+    again, since a collection takes one snapshot per process. Yields the time of
+    each collection (else of its last snapshot), and its snapshots.
+    """
+    batch: list[dict[str, Any]] = []
+    pids: set[int] = set()
+    current = None
+    timestamp = 0.0
+    for snapshot_time, pid, snapshot in snapshots:
+        collection = snapshot.get(COLLECTION_TIME)
+        if batch and (pid in pids if collection is None else collection != current):
+            yield timestamp, batch
+            batch, pids = [], set()
+        batch.append(snapshot)
+        pids.add(pid)
+        current = collection
+        timestamp = snapshot_time if collection is None else collection
+    if batch:
+        yield timestamp, batch
+
+
+def merge_results(results: list[dict[str, list[Rule]]]) -> dict[str, list[Rule]]:
+    """
+    Merge the results of the snapshots of one collection into one result.
+
+    A rule is listed under the first of failed, pending and suppressed it got on
+    some snapshot, else under passed; rules keep their order of first appearance.
+    """
+    statuses: dict[str, set[str]] = {}
+    rules: dict[str, Rule] = {}
+    for result in results:
+        for status, status_rules in result.items():
+            for rule in status_rules:
+                rules.setdefault(rule.id, rule)
+                statuses.setdefault(rule.id, set()).add(status)
+    merged: dict[str, list[Rule]] = {status: [] for status in ("passed", *_STATUS_ORDER)}
+    for rule_id, rule in rules.items():
+        found = statuses[rule_id]
+        merged[next((s for s in _STATUS_ORDER if s in found), "passed")].append(rule)
+    return merged
+
+
+@dataclass(slots=True)
+class ReplayStats:
+    """What a replay evaluated, and how fast."""
+
+    cycles: int = 0
+    # Snapshots evaluated, each on its own.
+    snapshots: int = 0
+    elapsed: float = 0.0
+    # Results by status, over all evaluated snapshots.
+    statuses: Counter[str] = field(default_factory=Counter)
+    # Failing snapshots by rule id.
+    failures: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def rate(self) -> float:
+        """Return the snapshots evaluated per second."""
+        return self.snapshots / self.elapsed if self.elapsed else 0.0
+
+
+class Replay:
+    """
+    Run recorded snapshots through `FactProcessor.parse_fact_rows` and `ComplianceEngine.run`.
+
+    Each recorded collection is one cycle, evaluated as soon as the previous one
+    is done: nothing waits for the audit interval. Each snapshot of a collection
+    is evaluated on its own factsheet, so every recorded process is checked; the
+    cycle report lists each rule under its worst result over the collection (see
+    `merge_results`). Temporal state of processes absent from a collection is
+    dropped once the collection is done. The engine's temporal clock
+    follows the recorded snapshot times, so temporal rules see the recorded
+    durations. Unless `run_actions` is set, rule actions are replaced by a no-op,
+    so a backtest never acts on live processes.
+    """
+
+    def __init__(
+        self,
+        fact_processor: FactProcessor,
+        compliance_engine: ComplianceEngine,
+        rules: dict[str, Rule],
+        *,
+        report_writer: ReportWriter | None = None,
+        run_actions: bool = False,
+    ) -> None:
+        """Initialize a replay of `rules`, reporting each cycle to `report_writer` if given."""
+        self.fact_processor = fact_processor
+        self.compliance_engine = compliance_engine
+        if not run_actions:
+            rules = {
+                rule_id: dataclasses.replace(rule, action=DRY_RUN)
+                for rule_id, rule in rules.items()
+            }
+        self.rules = rules
+        self.report_writer = report_writer
+        self.now = 0.0
+        compliance_engine.temporal_clock = self.clock
+
+    def clock(self) -> float:
+        """Return the recorded time of the cycle being evaluated."""
+        return self.now
+
+    def run(self, snapshots: Iterable[Snapshot]) -> ReplayStats:
+        """
+        Evaluate every recorded collection of `snapshots`, in order.
+
+        Raises:
+            FactNotFoundError: if a snapshot lacks a registered fact.
+
+        """
+        stats = ReplayStats()
+        source = SourceEnum.PROCESS.value
+        start = time.perf_counter()
+        for timestamp, collection in collections_of(snapshots):
+            self.now = timestamp
+            rows = self.fact_processor.parse_fact_rows({source: collection})[source]
+            results = []
+            for row in rows:
+                result = self.compliance_engine.run(
+                    self.rules,
+                    {source: row},
+                    retain_temporal=False,
+                )
+                results.append(result)
+                stats.snapshots += 1
+                for status, rules in result.items():
+                    stats.statuses[status] += len(rules)
+                stats.failures.update(rule.id for rule in result.get("failed", ()))
+            self.compliance_engine.retain_processes(row.get("pid") for row in rows)
+            stats.cycles += 1
+            if self.report_writer is not None:
+                self.report_writer.submit(
+                    CycleReport.from_result(stats.cycles, timestamp, merge_results(results)),
+                )
+        stats.elapsed = time.perf_counter() - start
+        return stats
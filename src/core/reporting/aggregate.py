@@ -0,0 +1,143 @@
+"""Per-rule aggregates of one cycle's results over many processes."""
+
+import heapq
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from core.rules_engine.model.condition import Condition, ConditionSet, NotCondition
+from shared._common.operators import Operator
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from core.rules_engine.model import Rule
+
+DEFAULT_TOP_K = 5
+
+# Operators of an upper bound: failing processes are those with the highest values.
+_UPPER_BOUNDS = {Operator.LT, Operator.LTE}
+_LOWER_BOUNDS = {Operator.GT, Operator.GTE}
+
+
+def ranked_fact(rule: Rule) -> tuple[str, bool] | None:
+    """
+    Return the fact offenders of `rule` are ranked by, and whether higher is worse.
+
+    This is the first fact the condition bounds with <, <=, > or >=. A process
+    fails an upper bound by a high value and a lower bound by a low one,
+    reversed under a Not. None if the condition bounds no fact.
+    """
+    stack: list[tuple[Any, bool]] = [(rule.condition, False)]
+    while stack:
+        expr, negated = stack.pop()
+        if isinstance(expr, Condition):
+            if expr.operator in _UPPER_BOUNDS:
+                return expr.field.path, not negated
+            if expr.operator in _LOWER_BOUNDS:
+                return expr.field.path, negated
+        elif isinstance(expr, NotCondition):
+            stack.append((expr.condition, not negated))
+        elif isinstance(expr, ConditionSet):
+            stack.extend((condition, negated) for condition in reversed(expr.conditions))
+    return None
+
+
+class Offender(NamedTuple):
+    """A process failing a rule, with its value of the ranked fact."""
+
+    pid: int | None
+    name: str
+    value: float
+
+
+@dataclass(frozen=True, slots=True)
+class RuleAggregate:
+    """
+    The results of one rule over every process evaluated in one cycle.
+
+    `offenders` are the worst failing processes by the value of `fact`, worst
+    first; empty when the rule bounds no numeric fact. Failure times are the
+    snapshot times of the first and last failing process.
+    """
+
+    rule_id: str
+    processes: int
+    failing: int
+    fact: str | None
+    offenders: tuple[Offender, ...]
+    first_failure: float | None
+    last_failure: float | None
+
+
+class _Accumulator:
+    """The running aggregate of one rule."""
+
+    __slots__ = ("fact", "first", "heap", "higher_worse", "last", "pids", "processes")
+
+    def __init__(self, rule: Rule) -> None:
+        ranked = ranked_fact(rule)
+        self.fact, self.higher_worse = ranked or (None, True)
+        self.processes = 0
+        self.pids: set[int | None] = set()
+        # Min-heap of (badness, -seq, offender): the root is the least bad kept,
+        # the latest of equally bad ones.
+        self.heap: list[tuple[float, int, Offender]] = []
+        self.first: float | None = None
+        self.last: float | None = None
+
+    def add_failure(self, facts: Mapping[str, Any], now: float, seq: int, top_k: int) -> None:
+        pid = facts.get("pid")
+        self.pids.add(pid)
+        occurred = facts.get("snapshot_time", now)
+        if self.first is None or occurred < self.first:
+            self.first = occurred
+        if self.last is None or occurred > self.last:
+            self.last = occurred
+        value = facts.get(self.fact) if self.fact is not None else None
+        if top_k <= 0 or not isinstance(value, int | float) or isinstance(value, bool):
+            return
+        item = (
+            value if self.higher_worse else -value,
+            -seq,
+            Offender(pid, facts.get("name", ""), value),
+        )
+        if len(self.heap) < top_k:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+
+    def result(self, rule_id: str) -> RuleAggregate:
+        offenders = tuple(offender for _, _, offender in sorted(self.heap, reverse=True))
+        return RuleAggregate(
+            rule_id,
+            self.processes,
+            len(self.pids),
+            self.fact,
+            offenders,
+            self.first,
+            self.last,
+        )
+
+
+def aggregate(
+    results: Iterable[tuple[Rule, Mapping[str, Any], str]],
+    now: float,
+    top_k: int = DEFAULT_TOP_K,
+) -> tuple[RuleAggregate, ...]:
+    """
+    Aggregate one cycle of `(rule, facts, status)` results per rule, in one pass.
+
+    Each rule keeps its `top_k` worst offenders in a bounded heap, so memory
+    does not grow with the number of failing processes. Failures without a
+    `snapshot_time` fact occurred at `now`. Rules are returned in order of
+    first appearance.
+    """
+    accumulators: dict[str, _Accumulator] = {}
+    for seq, (rule, facts, status) in enumerate(results):
+        accumulator = accumulators.get(rule.id)
+        if accumulator is None:
+            accumulator = accumulators[rule.id] = _Accumulator(rule)
+        accumulator.processes += 1
+        if status == "failed":
+            accumulator.add_failure(facts, now, seq, top_k)
+    return tuple(accumulator.result(rule_id) for rule_id, accumulator in accumulators.items())
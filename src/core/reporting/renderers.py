@@ -0,0 +1,203 @@
+"""Renderers turning cycle reports into console text, JSON Lines or compact binary."""
+
+import json
+import struct
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from core.reporting.report import CycleReport, ReportRecord
+from shared.custom_exceptions.custom_exception import InvalidReportDataError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from core.reporting.aggregate import RuleAggregate
+
+
+class ReportRenderer(ABC):
+    """Render a whole cycle report in one piece, written with a single call."""
+
+    # Whether `render` returns bytes (binary streams) or str (text streams).
+    binary: bool = False
+
+    @abstractmethod
+    def render(self, report: CycleReport) -> str | bytes:
+        """Render `report`."""
+
+
+class ConsoleRenderer(ReportRenderer):
+    """The human-readable report, grouped by status, with the aggregates of failed rules."""
+
+    def render(self, report: CycleReport) -> str:
+        """Render `report` as console text."""
+        by_status: dict[str, list[ReportRecord]] = {status: [] for status in report.statuses}
+        for record in report.records:
+            by_status.setdefault(record.status, []).append(record)
+        aggregates = {aggregate.rule_id: aggregate for aggregate in report.aggregates}
+
+        parts = ["\n\t==============\tCompliance Report:\t==============\n\n\n"]
+        for status, records in by_status.items():
+            parts.append(f"{status}:\n\n")
+            for record in records:
+                parts.append(f"\t{record.name} : {record.description}\n")
+                aggregate = aggregates.get(record.rule_id)
+                if aggregate is not None and aggregate.failing:
+                    parts.append(self._describe(aggregate))
+                parts.append("\n")
+        return "".join(parts)
+
+    @staticmethod
+    def _describe(aggregate: RuleAggregate) -> str:
+        """Describe the failing processes of a rule: count, failure times and top offenders."""
+        first, last = (
+            time.strftime("%H:%M:%S", time.localtime(moment))
+            for moment in (aggregate.first_failure, aggregate.last_failure)
+        )
+        text = (
+            f"\t\tfailing on {aggregate.failing} of {aggregate.processes} processes, "
+            f"from {first} to {last}\n"
+        )
+        if aggregate.offenders:
+            offenders = ", ".join(
+                " ".join(filter(None, (str(offender.pid), offender.name, f"({offender.value:g})")))
+                for offender in aggregate.offenders
+            )
+            text += f"\t\ttop {aggregate.fact}: {offenders}\n"
+        return text
+
+
+class JsonLinesRenderer(ReportRenderer):
+    """
+    One JSON object per record, one record per line.
+
+    Records of aggregated rules also carry the rule's process counts, top
+    offenders and failure times.
+    """
+
+    def render(self, report: CycleReport) -> str:
+        """Render `report` as JSON Lines."""
+        aggregates = {aggregate.rule_id: aggregate for aggregate in report.aggregates}
+        return "".join(
+            json.dumps(
+                {
+                    "cycle": report.cycle,
+                    "timestamp": report.timestamp,
+                    "status": record.status,
+                    "rule_id": record.rule_id,
+                    "name": record.name,
+                    "description": record.description,
+                    **self._aggregate_fields(aggregates.get(record.rule_id)),
+                },
+                separators=(",", ":"),
+            )
+            + "\n"
+            for record in report.records
+        )
+
+    @staticmethod
+    def _aggregate_fields(aggregate: RuleAggregate | None) -> dict[str, Any]:
+        """Return the JSON fields of a rule's aggregate; none without one."""
+        if aggregate is None:
+            return {}
+        return {
+            "processes": aggregate.processes,
+            "failing_pids": aggregate.failing,
+            "fact": aggregate.fact,
+            "offenders": [offender._asdict() for offender in aggregate.offenders],
+            "first_failure": aggregate.first_failure,
+            "last_failure": aggregate.last_failure,
+        }
+
+
+class BinaryRenderer(ReportRenderer):
+    """
+    Length-prefixed binary frames, one per cycle.
+
+    A frame is the magic `MAGIC`, the payload length, then the payload: cycle,
+    timestamp, the status names, and each record as a status index followed by
+    its rule id, name and description. Strings are UTF-8 with a length prefix.
+    Aggregates are not part of the frame. Use `decode` to read frames back.
+    """
+
+    binary = True
+    MAGIC = b"CRP1"
+    _FRAME = struct.Struct("<4sI")
+    _HEADER = struct.Struct("<QdBI")
+    _RECORD = struct.Struct("<BIII")
+    _LENGTH = struct.Struct("<B")
+
+    def render(self, report: CycleReport) -> bytes:
+        """Render `report` as one binary frame."""
+        index = {status: i for i, status in enumerate(report.statuses)}
+        statuses = list(report.statuses)
+        for record in report.records:
+            if record.status not in index:
+                index[record.status] = len(statuses)
+                statuses.append(record.status)
+
+        header = (report.cycle, report.timestamp, len(statuses), len(report.records))
+        parts = [self._HEADER.pack(*header)]
+        for status in statuses:
+            encoded = status.encode()
+            parts += [self._LENGTH.pack(len(encoded)), encoded]
+        for record in report.records:
+            strings = [record.rule_id.encode(), record.name.encode(), record.description.encode()]
+            parts.append(self._RECORD.pack(index[record.status], *map(len, strings)))
+            parts += strings
+        payload = b"".join(parts)
+        return self._FRAME.pack(self.MAGIC, len(payload)) + payload
+
+    @classmethod
+    def decode(cls, data: bytes) -> Iterator[CycleReport]:
+        """
+        Read the frames of `data` back into reports.
+
+        Raises:
+            InvalidReportDataError: if `data` is not a sequence of complete frames.
+
+        """
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            if len(view) - offset < cls._FRAME.size:
+                msg = f"Truncated report frame at byte {offset}"
+                raise InvalidReportDataError(msg)
+            magic, length = cls._FRAME.unpack_from(view, offset)
+            offset += cls._FRAME.size
+            if magic != cls.MAGIC or len(view) - offset < length:
+                msg = f"Invalid report frame at byte {offset - cls._FRAME.size}"
+                raise InvalidReportDataError(msg)
+            try:
+                yield cls._decode_payload(view[offset : offset + length])
+            except (struct.error, IndexError, UnicodeDecodeError) as err:
+                msg = f"Corrupt report frame at byte {offset - cls._FRAME.size}: {err}"
+                raise InvalidReportDataError(msg) from err
+            offset += length
+
+    @classmethod
+    def _decode_payload(cls, payload: memoryview) -> CycleReport:
+        """Decode the payload of one frame."""
+        cycle, timestamp, n_statuses, n_records = cls._HEADER.unpack_from(payload)
+        offset = cls._HEADER.size
+
+        def read(size: int) -> str:
+            nonlocal offset
+            if offset + size > len(payload):
+                msg = "string past the end of the frame"
+                raise IndexError(msg)
+            text = bytes(payload[offset : offset + size]).decode()
+            offset += size
+            return text
+
+        statuses = []
+        for _ in range(n_statuses):
+            (size,) = cls._LENGTH.unpack_from(payload, offset)
+            offset += cls._LENGTH.size
+            statuses.append(read(size))
+        records = []
+        for _ in range(n_records):
+            status, *sizes = cls._RECORD.unpack_from(payload, offset)
+            offset += cls._RECORD.size
+            records.append(ReportRecord(statuses[status], *(read(size) for size in sizes)))
+        return CycleReport(cycle, timestamp, tuple(statuses), tuple(records))
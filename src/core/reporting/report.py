@@ -0,0 +1,52 @@
+"""Structured records of one compliance report."""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.reporting.aggregate import RuleAggregate
+    from core.rules_engine.model.rule import Rule
+
+
+@dataclass(frozen=True, slots=True)
+class ReportRecord:
+    """The outcome of one rule in one cycle."""
+
+    status: str
+    rule_id: str
+    name: str
+    description: str
+
+
+@dataclass(frozen=True, slots=True)
+class CycleReport:
+    """
+    Every record of one evaluation cycle.
+
+    `statuses` keeps the result categories in the engine's order, including
+    those without records, so renderers can show empty categories.
+    `aggregates` summarizes each rule over every process evaluated, when the
+    engine aggregates results.
+    """
+
+    cycle: int
+    timestamp: float
+    statuses: tuple[str, ...]
+    records: tuple[ReportRecord, ...]
+    aggregates: tuple[RuleAggregate, ...] = ()
+
+    @classmethod
+    def from_result(
+        cls,
+        cycle: int,
+        timestamp: float,
+        result: dict[str, list[Rule]],
+        aggregates: tuple[RuleAggregate, ...] = (),
+    ) -> CycleReport:
+        """Build the report of a `ComplianceEngine.run` result and its aggregates."""
+        records = tuple(
+            ReportRecord(status, rule.id, rule.name, rule.description)
+            for status, rules in result.items()
+            for rule in rules
+        )
+        return cls(cycle, timestamp, tuple(result), records, aggregates)
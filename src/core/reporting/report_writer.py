@@ -0,0 +1,139 @@
+"""Buffered writing of cycle reports to one or more sinks."""
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING
+
+from shared.services import logger
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from core.reporting.renderers import ReportRenderer
+    from core.reporting.report import CycleReport
+
+_CLOSE = object()
+
+
+@dataclass(slots=True)
+class ReportSink:
+    """
+    A renderer writing to a stream.
+
+    The stream must be binary for binary renderers and text otherwise. If
+    `owned`, the stream is closed with the sink.
+    """
+
+    renderer: ReportRenderer
+    stream: IO
+    owned: bool = False
+
+    @classmethod
+    def to_file(cls, renderer: ReportRenderer, path: Path) -> ReportSink:
+        """Append the reports to the file at `path`, creating its directory."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if renderer.binary:
+            return cls(renderer, path.open("ab"), owned=True)
+        return cls(renderer, path.open("a", encoding="utf-8"), owned=True)
+
+    def write(self, report: CycleReport) -> None:
+        """Render `report` and write it with a single call."""
+        data = self.renderer.render(report)
+        if data:
+            self.stream.write(data)
+            self.stream.flush()
+
+    def close(self) -> None:
+        """Flush the stream, and close it if owned."""
+        if self.owned:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+class ReportWriter:
+    """
+    Write each cycle report to every sink, in submission order.
+
+    With `threaded`, rendering and writing happen on a writer thread: `submit`
+    only queues the report, and blocks once `max_pending` reports are waiting so
+    a slow sink cannot buffer reports without bound. Otherwise `submit` writes
+    directly. A failing sink is logged and does not affect the other sinks.
+    """
+
+    def __init__(
+        self,
+        sinks: list[ReportSink],
+        *,
+        threaded: bool = True,
+        max_pending: int = 64,
+    ) -> None:
+        """Initialize the writer; the writer thread starts with the first report."""
+        self.sinks = list(sinks)
+        self.threaded = threaded
+        self.errors = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, report: CycleReport) -> None:
+        """Write `report` to every sink, now or on the writer thread."""
+        if self._closed:
+            msg = "Report writer is closed"
+            raise RuntimeError(msg)
+        if not self.threaded:
+            with self._lock:
+                self._write(report)
+            return
+        self._ensure_thread()
+        self._queue.put(report)
+
+    def flush(self) -> None:
+        """Wait until every submitted report is written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write the pending reports, stop the writer thread and close the sinks."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_CLOSE)
+            thread.join()
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except OSError as err:
+                logger.error(f"Could not close report sink: {err}")
+
+    def _ensure_thread(self) -> None:
+        """Start the writer thread if it is not running."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="report-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Write queued reports until closed."""
+        while True:
+            report = self._queue.get()
+            try:
+                if report is _CLOSE:
+                    return
+                self._write(report)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, report: CycleReport) -> None:
+        """Write `report` to every sink."""
+        for sink in self.sinks:
+            try:
+                sink.write(report)
+            except Exception as err:  # noqa: BLE001 - one sink must not stop the others
+                self.errors += 1
+                logger.error(f"Could not write report of cycle {report.cycle}: {err}")
@@ -0,0 +1,463 @@
+"""Static analysis of rule conditions."""
+
+import itertools
+import math
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any
+
+from core.rules_engine.model.condition import Condition, ConditionSet, Expression, NotCondition
+from core.rules_engine.model.import_action import ImportPathCallable
+from shared._common.operators import GroupOperator, Operator
+
+if TYPE_CHECKING:
+    from core.rules_engine.model import Rule
+    from core.rules_engine.model.rule import Action
+
+# An interval is stored as its bounds and whether each bound is closed.
+Interval = tuple[float, bool, float, bool]
+IntervalSet = tuple[Interval, ...]
+
+_INF = math.inf
+_FULL: IntervalSet = ((-_INF, False, _INF, False),)
+_EMPTY: IntervalSet = ()
+
+_NUMERIC_OPS = {Operator.GT, Operator.GTE, Operator.LT, Operator.LTE, Operator.EQ, Operator.NE}
+
+# Rules constraining more fields than this are not checked for subsumption.
+_MAX_SUBSUMPTION_KEYS = 8
+# Rules sharing the same constraint keys are compared pairwise; larger groups are skipped.
+_MAX_SUBSUMPTION_BUCKET = 256
+
+
+@dataclass(slots=True)
+class AnalysisReport:
+    """
+    Result of a static analysis pass over a rule set.
+
+    Attributes:
+        rules: the rule set after simplification and pruning.
+        simplified: ids of rules whose condition was rewritten.
+        unsatisfiable: ids of rules whose condition can never hold (always fail).
+        tautological: ids of rules whose condition always holds (never fail).
+        duplicates: id of a duplicate -> id of the first rule with the same condition.
+        subsumed: rule id -> ids of rules that always fail whenever it fails.
+        pruned: ids of rules removed from the rule set. A duplicate is only removed
+            when its name, action and interval are also those of the rule kept.
+
+    """
+
+    rules: dict[str, Rule]
+    simplified: list[str] = field(default_factory=list)
+    unsatisfiable: list[str] = field(default_factory=list)
+    tautological: list[str] = field(default_factory=list)
+    duplicates: dict[str, str] = field(default_factory=dict)
+    subsumed: dict[str, list[str]] = field(default_factory=dict)
+    pruned: list[str] = field(default_factory=list)
+
+
+class RuleAnalyzer:
+    """
+    Simplify rule conditions and find redundant rules before evaluation.
+
+    Numeric leaves (``cpu.percent > 60``) are modelled as unions of intervals on
+    their field, which lets the analyzer fold contradictions and tautologies,
+    merge overlapping bounds and compare rules against each other.
+    The analysis is conservative: a rule is only reported when the property
+    holds for every possible fact value.
+    """
+
+    def __init__(self, *, prune: bool = True) -> None:
+        """
+        Initialize the analyzer.
+
+        Args:
+            prune: drop tautological rules and interchangeable duplicates from the
+                analyzed rule set.
+
+        """
+        self.prune = prune
+
+    # ── Rule set ─────────────────────────────────────────────
+
+    def analyze(self, rules: dict[str, Rule]) -> AnalysisReport:
+        """Simplify every rule and report constant, duplicate and subsumed rules."""
+        report = AnalysisReport(rules={})
+        kept_by_key: dict[tuple, list[Rule]] = {}
+        boxes: dict[str, tuple] = {}
+
+        # Higher priority rules win duplicate resolution; ties keep load order.
+        for rule in sorted(rules.values(), key=lambda r: -(r.priority or 0)):
+            folded = self.simplify(rule.condition)
+
+            if folded is False:
+                report.unsatisfiable.append(rule.id)
+            elif folded is True:
+                report.tautological.append(rule.id)
+                if self.prune:
+                    report.pruned.append(rule.id)
+                    continue
+            elif folded != rule.condition:
+                rule = replace(rule, condition=folded)  # noqa: PLW2901
+                report.simplified.append(rule.id)
+
+            if not isinstance(folded, bool):
+                # Rules only compare under the same source and temporal qualifier.
+                scope = (repr(rule.source), rule.temporal)
+                key = (scope, self.canonical(folded))
+                kept = kept_by_key.setdefault(key, [])
+                if kept:
+                    report.duplicates[rule.id] = kept[0].id
+                    # A rule only stands in for one that would do the same thing.
+                    if self.prune and any(self._interchangeable(rule, k) for k in kept):
+                        report.pruned.append(rule.id)
+                        continue
+                kept.append(rule)
+                box = self._box(folded)
+                if box is not None:
+                    boxes[rule.id] = (scope, box)
+
+            report.rules[rule.id] = rule
+
+        # Restore load order for the surviving rules.
+        report.rules = {rid: report.rules[rid] for rid in rules if rid in report.rules}
+        report.subsumed = self._find_subsumed(boxes, report.duplicates)
+        return report
+
+    @staticmethod
+    def _interchangeable(rule: Rule, other: Rule) -> bool:
+        """Return True if `rule` and `other` have the same name, action and interval."""
+        return (
+            rule.name == other.name
+            and rule.interval == other.interval
+            and _action_key(rule.action) == _action_key(other.action)
+        )
+
+    def _find_subsumed(  # noqa: C901
+        self,
+        boxes: dict[str, tuple],
+        duplicates: dict[str, str],
+    ) -> dict[str, list[str]]:
+        """
+        Find rules whose condition is implied by another rule's condition.
+
+        If A implies B, every state failing B also fails A. Rules are indexed by
+        the set of constraints they carry, so each rule is only compared against
+        rules constraining a subset of its own fields. Buckets larger than
+        _MAX_SUBSUMPTION_BUCKET are skipped to keep the pass near-linear.
+        """
+        index: dict[tuple, list[str]] = {}
+        for rule_id, (source, (numeric, other)) in boxes.items():
+            index.setdefault((source, frozenset(numeric), other), []).append(rule_id)
+
+        subsumed: dict[str, list[str]] = {}
+        for rule_id, (source, (numeric, other)) in boxes.items():
+            keys = list(numeric) + [("leaf", leaf) for leaf in other]
+            if len(keys) > _MAX_SUBSUMPTION_KEYS:
+                continue
+            for size in range(1, len(keys) + 1):
+                for combo in itertools.combinations(keys, size):
+                    fields = frozenset(k for k in combo if not isinstance(k, tuple))
+                    leaves = frozenset(k[1] for k in combo if isinstance(k, tuple))
+                    bucket = index.get((source, fields, leaves), ())
+                    if len(bucket) > _MAX_SUBSUMPTION_BUCKET:
+                        continue
+                    for other_id in bucket:
+                        if other_id == rule_id or duplicates.get(other_id) == rule_id:
+                            continue
+                        if duplicates.get(rule_id) == other_id:
+                            continue
+                        other_numeric = boxes[other_id][1][0]
+                        if all(
+                            _is_subset(numeric[path], other_numeric[path]) for path in fields
+                        ):
+                            # rule implies other: other fails => rule fails
+                            subsumed.setdefault(other_id, []).append(rule_id)
+        return subsumed
+
+    # ── Expressions ──────────────────────────────────────────
+
+    def simplify(self, expr: Expression) -> Expression | bool:  # noqa: PLR0911
+        """
+        Return an equivalent, simpler expression, or a bool if it is constant.
+
+        - removes double negation and negated numeric leaves
+        - removes single-child condition sets and flattens nested sets
+        - folds contradictions and tautologies to constants
+        - merges numeric bounds on the same field
+        """
+        if isinstance(expr, Condition):
+            intervals = self._leaf_intervals(expr)
+            if intervals == _EMPTY:
+                return False
+            if intervals == _FULL:
+                return True
+            return expr
+
+        if isinstance(expr, NotCondition):
+            inner = self.simplify(expr.condition)
+            if isinstance(inner, bool):
+                return not inner
+            if isinstance(inner, NotCondition):
+                return inner.condition
+            intervals = self._leaf_intervals(inner) if isinstance(inner, Condition) else None
+            if intervals is not None:
+                leaves = _to_leaves(inner, _complement(intervals), GroupOperator.ALL)
+                if leaves is not None and len(leaves) == 1:
+                    return leaves[0]
+            return NotCondition(inner)
+
+        if isinstance(expr, ConditionSet):
+            return self._simplify_set(expr)
+
+        return expr
+
+    def _simplify_set(self, expr: ConditionSet) -> Expression | bool:
+        """Simplify an ALL / ANY condition set."""
+        is_all = expr.group_operator is GroupOperator.ALL
+        absorbing = not is_all  # False absorbs ALL, True absorbs ANY
+
+        children: list[Expression] = []
+        for child in expr.conditions:
+            folded = self.simplify(child)
+            if isinstance(folded, bool):
+                if folded is absorbing:
+                    return absorbing
+                continue
+            if isinstance(folded, ConditionSet) and folded.group_operator is expr.group_operator:
+                children.extend(folded.conditions)
+            else:
+                children.append(folded)
+
+        merged = self._merge_numeric(children, expr.group_operator)
+        if isinstance(merged, bool):
+            return merged
+
+        unique = list({self.canonical(c): c for c in reversed(merged)}.values())[::-1]
+        if not unique:
+            return is_all
+        if len(unique) == 1:
+            return unique[0]
+        return ConditionSet(expr.group_operator, tuple(unique))
+
+    def _merge_numeric(  # noqa: C901, PLR0912
+        self,
+        children: list[Expression],
+        operator: GroupOperator,
+    ) -> list[Expression] | bool:
+        """Combine numeric leaves on the same field into their tightest equivalent."""
+        by_path: dict[str, list[tuple[int, Condition, IntervalSet]]] = {}
+        for pos, child in enumerate(children):
+            if isinstance(child, Condition):
+                intervals = self._leaf_intervals(child)
+                if intervals is not None:
+                    by_path.setdefault(child.field.path, []).append((pos, child, intervals))
+
+        replacements: dict[int, list[Expression]] = {}
+        for leaves in by_path.values():
+            combine = _intersect if operator is GroupOperator.ALL else _union
+            combined = leaves[0][2]
+            for _, _, intervals in leaves[1:]:
+                combined = combine(combined, intervals)
+
+            if combined == _EMPTY:
+                if operator is GroupOperator.ALL:
+                    return False
+                continue
+            if combined == _FULL:
+                if operator is GroupOperator.ANY:
+                    return True
+                continue
+            if len(leaves) == 1:
+                continue
+
+            rebuilt = _to_leaves(leaves[0][1], combined, operator)
+            if rebuilt is not None and len(rebuilt) <= len(leaves):
+                first, *rest = (pos for pos, _, _ in leaves)
+                replacements[first] = rebuilt
+                for pos in rest:
+                    replacements[pos] = []
+
+        if not replacements:
+            return children
+        result: list[Expression] = []
+        for pos, child in enumerate(children):
+            result.extend(replacements.get(pos, [child]))
+        return result
+
+    @staticmethod
+    def _leaf_intervals(expr: Condition) -> IntervalSet | None:
+        """Return the values satisfying a numeric leaf, or None if it is not numeric."""
+        field_ref = expr.field
+        if getattr(field_ref, "type", None) not in (int, float):
+            return None
+        value = expr.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+            return None
+        return _LEAF_INTERVALS[expr.operator](value) if expr.operator in _NUMERIC_OPS else None
+
+    def _box(self, expr: Expression) -> tuple[dict[str, IntervalSet], frozenset] | None:
+        """
+        Describe a conjunction as per-field intervals plus its other leaves.
+
+        Returns None for expressions that are not a leaf or an ALL of leaves.
+        """
+        parts = (
+            expr.conditions
+            if isinstance(expr, ConditionSet) and expr.group_operator is GroupOperator.ALL
+            else (expr,)
+        )
+        numeric: dict[str, IntervalSet] = {}
+        other = set()
+        for part in parts:
+            intervals = self._leaf_intervals(part) if isinstance(part, Condition) else None
+            if intervals is not None:
+                path = part.field.path
+                numeric[path] = _intersect(numeric.get(path, _FULL), intervals)
+            elif isinstance(part, (Condition, NotCondition)):
+                other.add(self.canonical(part))
+            else:
+                return None
+        return numeric, frozenset(other)
+
+    @classmethod
+    def canonical(cls, expr: Expression) -> tuple:
+        """Return an order-independent key identifying an expression."""
+        if isinstance(expr, Condition):
+            path = getattr(expr.field, "path", expr.field)
+            return ("c", str(path), expr.operator.value, repr(expr.value))
+        if isinstance(expr, NotCondition):
+            return ("n", cls.canonical(expr.condition))
+        if isinstance(expr, ConditionSet):
+            children = sorted(cls.canonical(c) for c in expr.conditions)
+            return ("s", expr.group_operator.value, tuple(children))
+        return ("?", repr(expr))
+
+
+def _action_key(action: Action) -> tuple:
+    """Return a key equal for actions that do the same thing."""
+    execute = action.execute
+    if isinstance(execute, ImportPathCallable):
+        return ("call", execute.path, execute.args, repr(execute.kwargs))
+    # Functions of the same code and closure, e.g. TOML log actions, are equivalent.
+    return (
+        action.name,
+        getattr(execute, "__code__", execute),
+        getattr(execute, "__closure__", None),
+    )
+
+
+# ── Interval arithmetic ──────────────────────────────────────
+
+
+def _normalize(intervals: list[Interval]) -> IntervalSet:
+    """Sort intervals, drop empty ones and merge those that overlap or touch."""
+    valid = [i for i in intervals if i[0] < i[2] or (i[0] == i[2] and i[1] and i[3])]
+    valid.sort(key=lambda i: (i[0], not i[1]))
+    merged: list[Interval] = []
+    for lo, lo_closed, hi, hi_closed in valid:
+        if merged:
+            m_lo, m_lo_closed, m_hi, m_hi_closed = merged[-1]
+            if lo < m_hi or (lo == m_hi and (m_hi_closed or lo_closed)):
+                if hi > m_hi:
+                    merged[-1] = (m_lo, m_lo_closed, hi, hi_closed)
+                elif hi == m_hi:
+                    merged[-1] = (m_lo, m_lo_closed, m_hi, m_hi_closed or hi_closed)
+                continue
+        merged.append((lo, lo_closed, hi, hi_closed))
+    return tuple(merged)
+
+
+def _intersect(a: IntervalSet, b: IntervalSet) -> IntervalSet:
+    """Intersect two interval sets."""
+    out = []
+    for a_lo, a_lo_c, a_hi, a_hi_c in a:
+        for b_lo, b_lo_c, b_hi, b_hi_c in b:
+            if a_lo > b_lo:
+                lo, lo_c = a_lo, a_lo_c
+            elif b_lo > a_lo:
+                lo, lo_c = b_lo, b_lo_c
+            else:
+                lo, lo_c = a_lo, a_lo_c and b_lo_c
+            if a_hi < b_hi:
+                hi, hi_c = a_hi, a_hi_c
+            elif b_hi < a_hi:
+                hi, hi_c = b_hi, b_hi_c
+            else:
+                hi, hi_c = a_hi, a_hi_c and b_hi_c
+            out.append((lo, lo_c, hi, hi_c))
+    return _normalize(out)
+
+
+def _union(a: IntervalSet, b: IntervalSet) -> IntervalSet:
+    """Union two interval sets."""
+    return _normalize([*a, *b])
+
+
+def _complement(a: IntervalSet) -> IntervalSet:
+    """Return every value not in the interval set."""
+    out = []
+    lo, lo_closed = -_INF, False
+    for i_lo, i_lo_c, i_hi, i_hi_c in a:
+        out.append((lo, lo_closed, i_lo, not i_lo_c))
+        lo, lo_closed = i_hi, not i_hi_c
+    out.append((lo, lo_closed, _INF, False))
+    return _normalize(out)
+
+
+def _is_subset(a: IntervalSet, b: IntervalSet) -> bool:
+    """Return True if every value in a is also in b."""
+    return _intersect(a, b) == a
+
+
+def _to_leaves(  # noqa: C901
+    template: Condition,
+    intervals: IntervalSet,
+    operator: GroupOperator,
+) -> list[Condition] | None:
+    """
+    Rebuild numeric leaves describing an interval set under the given group operator.
+
+    Returns None when the set cannot be written as a flat list of leaves.
+    """
+
+    def leaf(op: Operator, value: Any) -> Condition:  # noqa: ANN401
+        return replace(template, operator=op, value=value)
+
+    # x != v is the only two-interval set both operators can express with one leaf.
+    if len(intervals) == 2:  # noqa: PLR2004
+        (lo1, _, hi1, hi1_c), (lo2, lo2_c, hi2, _) = intervals
+        if lo1 == -_INF and hi2 == _INF and hi1 == lo2 and not hi1_c and not lo2_c:
+            return [leaf(Operator.NE, hi1)]
+
+    def bounds(lo: float, lo_c: bool, hi: float, hi_c: bool) -> list[Condition]:  # noqa: FBT001
+        if lo == hi:
+            return [leaf(Operator.EQ, lo)]
+        parts = []
+        if lo != -_INF:
+            parts.append(leaf(Operator.GTE if lo_c else Operator.GT, lo))
+        if hi != _INF:
+            parts.append(leaf(Operator.LTE if hi_c else Operator.LT, hi))
+        return parts
+
+    if operator is GroupOperator.ALL:
+        if len(intervals) != 1:
+            return None
+        return bounds(*intervals[0])
+
+    leaves = []
+    for interval in intervals:
+        parts = bounds(*interval)
+        if len(parts) != 1:
+            return None
+        leaves.extend(parts)
+    return leaves
+
+
+_LEAF_INTERVALS = {
+    Operator.GT: lambda v: ((v, False, _INF, False),),
+    Operator.GTE: lambda v: ((v, True, _INF, False),),
+    Operator.LT: lambda v: ((-_INF, False, v, False),),
+    Operator.LTE: lambda v: ((-_INF, False, v, True),),
+    Operator.EQ: lambda v: ((v, True, v, True),),
+    Operator.NE: lambda v: ((-_INF, False, v, False), (v, False, _INF, False)),
+}
@@ -0,0 +1,248 @@
+"""On-disk cache of compiled rule sets."""
+
+import hashlib
+import marshal
+import sys
+import zlib
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import core.rules_engine
+from core.rules_engine.analysis.rule_analyzer import AnalysisReport
+from core.rules_engine.model.condition import (
+    Condition,
+    ConditionSet,
+    Expression,
+    NotCondition,
+)
+from core.rules_engine.model.field import FieldRef
+from core.rules_engine.model.rule import Rule
+from shared._common import operators
+from shared._common.operators import GroupOperator, Operator
+from shared.services import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from shared._common.facts import FactSpecProtocol
+
+CACHE_FORMAT_VERSION = 2
+
+_MAGIC = b"PCARULES"
+
+# Code whose behaviour is baked into a compiled rule set: every module of the
+# rules engine package, which parses, validates, analyzes and caches rules.
+_CODE_PACKAGE = Path(core.rules_engine.__file__).parent
+_CODE_FILES = (Path(operators.__file__),)
+
+_FIELD_TYPES: dict[str, type] = {
+    t.__name__: t for t in (int, float, str, bool, dict, list, tuple, object)
+}
+
+_OPERATORS = {op.value: op for op in Operator}
+_GROUP_OPERATORS = {op.value: op for op in GroupOperator}
+
+
+class RuleCacheError(Exception):
+    """Raised when a rule set cannot be encoded for the cache."""
+
+
+class RuleCache:
+    """
+    Compact binary cache of a validated, analyzed rule set.
+
+    The cache is keyed by a hash of the rule file contents, the registered facts,
+    the built-in rules and the code that compiles rules, so any change to one of
+    them results in a miss. TOML rules are stored as their raw table plus an
+    encoded condition tree; built-in rules are stored by id and re-attached to
+    their in-memory objects on load. Tables of rules pruned by analysis are kept
+    too, so a later reload can tell them apart from new rules.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the cache stored at `path`."""
+        self.path = path
+        self._code_fingerprint: bytes | None = None
+
+    def key(
+        self,
+        rule_files: Iterable[bytes],
+        facts: Mapping[str, FactSpecProtocol],
+        builtin_rules: Iterable[Rule],
+    ) -> bytes:
+        """Return the cache key for a set of rule file contents, facts and built-in rules."""
+        h = hashlib.sha256()
+        h.update(f"{CACHE_FORMAT_VERSION}:{sys.version}".encode())
+        h.update(self._code_version())
+        for content in rule_files:
+            h.update(hashlib.sha256(content).digest())
+        for path in sorted(facts):
+            fact = facts[path]
+            operators = sorted(getattr(op, "value", str(op)) for op in fact.allowed_operators or ())
+            values = sorted(map(repr, fact.allowed_values or ()))
+            h.update(f"{path}|{fact.type.__name__}|{operators}|{values}".encode())
+        for rule in builtin_rules:
+            h.update(f"{rule.id}|{rule.condition.describe()}".encode())
+        return h.digest()
+
+    def load(
+        self,
+        key: bytes,
+        builtin_rules: Iterable[Rule],
+    ) -> tuple[dict[str, Rule], dict[str, dict], AnalysisReport] | None:
+        """
+        Load a cached rule set.
+
+        Returns:
+            (rules, toml tables by rule id, analysis report), or None on a miss.
+
+        """
+        try:
+            blob = self.path.read_bytes()
+        except OSError:
+            return None
+        if not blob.startswith(_MAGIC) or blob[len(_MAGIC) : len(_MAGIC) + len(key)] != key:
+            return None
+
+        try:
+            body = zlib.decompress(blob[len(_MAGIC) + len(key) :])
+            payload = marshal.loads(body)  # noqa: S302 - only reads files written by store()
+            return self._decode(payload, {rule.id: rule for rule in builtin_rules})
+        except (ValueError, EOFError, TypeError, KeyError, zlib.error) as err:
+            logger.warning(f"Ignoring unreadable rule cache {self.path}: {err}")
+            return None
+
+    def store(
+        self,
+        key: bytes,
+        rules: Mapping[str, Rule],
+        toml_tables: Mapping[str, dict],
+        report: AnalysisReport | None,
+    ) -> bool:
+        """
+        Write a rule set to the cache.
+
+        Returns:
+            bool: True if the cache was written.
+
+        """
+        try:
+            payload = marshal.dumps(self._encode(rules, toml_tables, report))
+        except (ValueError, RuleCacheError) as err:
+            logger.warning(f"Rule set not cached: {err}")
+            return False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_bytes(_MAGIC + key + zlib.compress(payload))
+        tmp.replace(self.path)
+        return True
+
+    def _code_version(self) -> bytes:
+        """Hash the source of the code that compiles rules."""
+        if self._code_fingerprint is None:
+            h = hashlib.sha256()
+            for path in sorted(_CODE_PACKAGE.rglob("*.py")):
+                h.update(path.relative_to(_CODE_PACKAGE).as_posix().encode())
+                h.update(path.read_bytes())
+            for path in _CODE_FILES:
+                h.update(path.read_bytes())
+            self._code_fingerprint = h.digest()
+        return self._code_fingerprint
+
+    # ── Encoding ─────────────────────────────────────────────
+
+    @classmethod
+    def _encode(
+        cls,
+        rules: Mapping[str, Rule],
+        toml_tables: Mapping[str, dict],
+        report: AnalysisReport | None,
+    ) -> tuple:
+        entries = []
+        for rule_id, rule in rules.items():
+            condition = cls.encode_expression(rule.condition)
+            if rule_id in toml_tables:
+                entries.append(("t", rule_id, toml_tables[rule_id], condition))
+            else:
+                entries.append(("b", rule_id, condition))
+        entries.extend(
+            ("p", rule_id, table) for rule_id, table in toml_tables.items() if rule_id not in rules
+        )
+
+        summary = None
+        if report is not None:
+            summary = (
+                report.simplified,
+                report.unsatisfiable,
+                report.tautological,
+                report.duplicates,
+                report.subsumed,
+                report.pruned,
+            )
+        return tuple(entries), summary
+
+    @classmethod
+    def _decode(
+        cls,
+        payload: tuple,
+        builtins: dict[str, Rule],
+    ) -> tuple[dict[str, Rule], dict[str, dict], AnalysisReport | None]:
+        entries, summary = payload
+        rules: dict[str, Rule] = {}
+        toml_tables: dict[str, dict] = {}
+        for entry in entries:
+            if entry[0] == "t":
+                _, rule_id, table, condition = entry
+                rules[rule_id] = Rule.restore(
+                    rule_id,
+                    table,
+                    cls.decode_expression(condition),
+                )
+                toml_tables[rule_id] = table
+            elif entry[0] == "p":
+                _, rule_id, table = entry
+                toml_tables[rule_id] = table
+            else:
+                _, rule_id, condition = entry
+                rule = builtins[rule_id]
+                decoded = cls.decode_expression(condition)
+                if decoded != rule.condition:
+                    rule = replace(rule, condition=decoded)
+                rules[rule_id] = rule
+
+        report = AnalysisReport(rules, *summary) if summary is not None else None
+        return rules, toml_tables, report
+
+    @classmethod
+    def encode_expression(cls, expr: Expression) -> tuple:
+        """Encode an expression tree into nested tuples of primitives."""
+        if isinstance(expr, Condition):
+            type_name = getattr(expr.field.type, "__name__", None)
+            if _FIELD_TYPES.get(type_name) is not expr.field.type:
+                msg = f"Unsupported field type {expr.field.type!r} for {expr.field.path}"
+                raise RuleCacheError(msg)
+            return ("c", expr.field.path, type_name, expr.operator.value, expr.value)
+        if isinstance(expr, NotCondition):
+            return ("n", cls.encode_expression(expr.condition))
+        if isinstance(expr, ConditionSet):
+            children = tuple(cls.encode_expression(c) for c in expr.conditions)
+            return ("s", expr.group_operator.value, children)
+        msg = f"Unsupported expression type {type(expr)}"
+        raise RuleCacheError(msg)
+
+    @classmethod
+    def decode_expression(cls, data: tuple) -> Expression:
+        """Rebuild an expression tree encoded by `encode_expression`."""
+        tag = data[0]
+        if tag == "c":
+            _, path, type_name, operator, value = data
+            return Condition(FieldRef(path, _FIELD_TYPES[type_name]), _OPERATORS[operator], value)
+        if tag == "n":
+            return NotCondition(cls.decode_expression(data[1]))
+        if tag == "s":
+            children: Any = tuple(cls.decode_expression(c) for c in data[2])
+            return ConditionSet(_GROUP_OPERATORS[data[1]], children)
+        msg = f"Unknown expression tag {tag!r}"
+        raise ValueError(msg)
@@ -11,17 +11,34 @@ class ConditionEvaluator:
     """Container of methods for evaluating conditions."""
 
     @staticmethod
-    def evaluate(expression: Expression, facts: dict) -> bool:
-        """Entry point for evaluation."""
+    def evaluate(expression: Expression, facts: dict, memo: dict | None = None) -> bool:
+        """
+        Entry point for evaluation.
+
+        Args:
+            expression: expression to evaluate.
+            facts: facts of the expression's source.
+            memo: optional cache of leaf results, shared between expressions evaluated
+                against the same facts.
+
+        """
         if isinstance(expression, Condition):
-            return ConditionEvaluator._evaluate_single(expression, facts)
+            if memo is None:
+                return ConditionEvaluator._evaluate_single(expression, facts)
+            try:
+                return memo[expression]
+            except KeyError:
+                result = memo[expression] = ConditionEvaluator._evaluate_single(expression, facts)
+                return result
+            except TypeError:  # unhashable value
+                return ConditionEvaluator._evaluate_single(expression, facts)
 
         if isinstance(expression, NotCondition):
             # Recursively evaluate the inner condition and invert it
-            return not ConditionEvaluator.evaluate(expression.condition, facts)
+            return not ConditionEvaluator.evaluate(expression.condition, facts, memo)
 
         if isinstance(expression, ConditionSet):
-            return ConditionEvaluator._evaluate_set(expression, facts)
+            return ConditionEvaluator._evaluate_set(expression, facts, memo)
 
         msg = f"Unknown expression type: {type(expression)}"
         raise TypeError(msg)
@@ -33,9 +50,9 @@ class ConditionEvaluator:
         return ConditionEvaluator.apply_operator(condition.operator, field_value, condition.value)
 
     @staticmethod
-    def _evaluate_set(condition_set: ConditionSet, facts: dict) -> bool:
+    def _evaluate_set(condition_set: ConditionSet, facts: dict, memo: dict | None = None) -> bool:
         """Handle AND (ALL) and OR (ANY) logic."""
-        results = (ConditionEvaluator.evaluate(c, facts) for c in condition_set.conditions)
+        results = (ConditionEvaluator.evaluate(c, facts, memo) for c in condition_set.conditions)
 
         if condition_set.group_operator == GroupOperator.ALL:
             return all(results)
@@ -0,0 +1,233 @@
+"""Secondary indexes over a loaded rule set."""
+
+import bisect
+import fnmatch
+import re
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+from shared.custom_exceptions import InvalidRuleFilterError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from core.rules_engine.model import Rule
+
+_MISSING = object()
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+class RuleIndex:
+    """
+    Lookup tables over a rule set, built once per load or reload.
+
+    Every lookup returns rule ids in load order. Names are indexed as lists, so
+    rules sharing a name are all returned instead of shadowing each other.
+    """
+
+    def __init__(self, rules: Mapping[str, Rule]) -> None:
+        """Build the indexes for `rules`."""
+        self.rules = rules
+        self._order = {rule_id: i for i, rule_id in enumerate(rules)}
+        self._by_name: dict[str, list[str]] = defaultdict(list)
+        self._by_group: dict[str, list[str]] = defaultdict(list)
+        self._by_source: dict[str | None, list[str]] = defaultdict(list)
+        self._by_enabled: dict[bool, list[str]] = defaultdict(list)
+        self._by_metadata_key: dict[str, list[str]] = defaultdict(list)
+        by_priority: dict[int, list[str]] = defaultdict(list)
+
+        for rule_id, rule in rules.items():
+            self._by_name[rule.name].append(rule_id)
+            self._by_group[rule.group or ""].append(rule_id)
+            self._by_source[getattr(rule.source, "value", None)].append(rule_id)
+            self._by_enabled[bool(rule.enabled)].append(rule_id)
+            for key in rule.metadata or ():
+                self._by_metadata_key[key].append(rule_id)
+            by_priority[rule.priority].append(rule_id)
+
+        self._priorities = sorted(by_priority)
+        self._priority_ids = [by_priority[p] for p in self._priorities]
+        self._names = sorted(self._by_name)
+
+    # ── Exact lookups ────────────────────────────────────────
+
+    def named(self, name: str) -> list[str]:
+        """Return the ids of all rules called `name`."""
+        return list(self._by_name.get(name, ()))
+
+    def in_group(self, group: str) -> list[str]:
+        """Return the ids of all rules in `group`."""
+        return list(self._by_group.get(group, ()))
+
+    def from_source(self, source: str | None) -> list[str]:
+        """Return the ids of all rules reading facts from `source`."""
+        return list(self._by_source.get(source, ()))
+
+    def enabled(self, *, enabled: bool = True) -> list[str]:
+        """Return the ids of all enabled (or disabled) rules."""
+        return list(self._by_enabled.get(enabled, ()))
+
+    def with_metadata(self, key: str, value: Any = _MISSING) -> list[str]:  # noqa: ANN401
+        """Return the ids of rules whose metadata has `key`, optionally equal to `value`."""
+        ids = self._by_metadata_key.get(key, ())
+        if value is _MISSING:
+            return list(ids)
+        return [rule_id for rule_id in ids if self.rules[rule_id].metadata[key] == value]
+
+    # ── Ranges and patterns ──────────────────────────────────
+
+    def with_priority(self, low: int | None = None, high: int | None = None) -> list[str]:
+        """Return the ids of rules with `low <= priority <= high`; either bound may be open."""
+        start = 0 if low is None else bisect.bisect_left(self._priorities, low)
+        stop = (
+            len(self._priorities)
+            if high is None
+            else bisect.bisect_right(self._priorities, high)
+        )
+        return self._in_order(rule_id for ids in self._priority_ids[start:stop] for rule_id in ids)
+
+    def glob(self, pattern: str) -> list[str]:
+        """Return the ids of rules whose name matches the shell-style `pattern`."""
+        prefix = _GLOB_CHARS.split(pattern, maxsplit=1)[0]
+        matcher = re.compile(fnmatch.translate(pattern))
+        return self._names_matching(prefix, matcher.match)
+
+    def regex(self, pattern: str) -> list[str]:
+        """
+        Return the ids of rules whose name matches the regular expression `pattern`.
+
+        Raises:
+            InvalidRuleFilterError: if `pattern` is not a valid regular expression.
+
+        """
+        try:
+            matcher = re.compile(pattern)
+        except re.error as err:
+            msg = f"Invalid rule name pattern {pattern!r}: {err}"
+            raise InvalidRuleFilterError(msg) from err
+        return self._names_matching("", matcher.search)
+
+    def _names_matching(self, prefix: str, match: Callable[[str], object]) -> list[str]:
+        """Return the ids of rules whose name starts with `prefix` and satisfies `match`."""
+        start = bisect.bisect_left(self._names, prefix)
+        stop = len(self._names)
+        if prefix:
+            stop = bisect.bisect_left(self._names, prefix + "\U0010ffff")
+        return self._in_order(
+            rule_id
+            for name in self._names[start:stop]
+            if match(name)
+            for rule_id in self._by_name[name]
+        )
+
+    # ── Selectors ────────────────────────────────────────────
+
+    def resolve(self, selector: str) -> list[str]:  # noqa: C901, PLR0911
+        """
+        Return the ids of the rules matched by a selector string.
+
+        A selector is a rule id, a rule name (every rule with that name), or a
+        `kind:argument` pair:
+          - group:<group>
+          - source:<source>
+          - priority:<low>..<high>, with either bound optional, or priority:<n>
+          - enabled:true / enabled:false
+          - meta:<key> or meta:<key>=<value>
+          - name:<glob pattern>
+          - re:<regular expression>
+
+        Raises:
+            InvalidRuleFilterError: if the argument of a selector is malformed.
+
+        """
+        if selector in self.rules:
+            return [selector]
+        if selector in self._by_name:
+            return self.named(selector)
+
+        kind, sep, arg = selector.partition(":")
+        if not sep:
+            return []
+        match kind:
+            case "group":
+                return self.in_group(arg)
+            case "source":
+                return self.from_source(arg)
+            case "priority":
+                return self.with_priority(*self._parse_priority_range(arg))
+            case "enabled" if arg.lower() in {"true", "false"}:
+                return self.enabled(enabled=arg.lower() == "true")
+            case "meta":
+                key, has_value, value = arg.partition("=")
+                if not has_value:
+                    return self.with_metadata(key)
+                return [
+                    rule_id
+                    for rule_id in self.with_metadata(key)
+                    if str(self.rules[rule_id].metadata[key]) == value
+                ]
+            case "name":
+                return self.glob(arg)
+            case "re":
+                return self.regex(arg)
+        return []
+
+    @staticmethod
+    def _parse_priority_range(arg: str) -> tuple[int | None, int | None]:
+        low, sep, high = arg.partition("..")
+        try:
+            if not sep:
+                return int(low), int(low)
+            return (int(low) if low else None), (int(high) if high else None)
+        except ValueError as err:
+            msg = (
+                f"Invalid priority range {arg!r}. "
+                "Expected <n>, <low>..<high>, <low>.. or ..<high>"
+            )
+            raise InvalidRuleFilterError(msg) from err
+
+    # ── Combination ──────────────────────────────────────────
+
+    def select(  # noqa: PLR0913
+        self,
+        *,
+        group: str | None = None,
+        source: str | None = None,
+        priority: tuple[int | None, int | None] | None = None,
+        enabled: bool | None = None,
+        metadata_key: str | None = None,
+        name_glob: str | None = None,
+        name_regex: str | None = None,
+    ) -> dict[str, Rule]:
+        """
+        Return the rules matching every given criterion, in load order.
+
+        Criteria left as None are not applied; with no criteria all rules are returned.
+        """
+        candidates = [
+            ids
+            for ids in (
+                None if group is None else self.in_group(group),
+                None if source is None else self.from_source(source),
+                None if priority is None else self.with_priority(*priority),
+                None if enabled is None else self.enabled(enabled=enabled),
+                None if metadata_key is None else self.with_metadata(metadata_key),
+                None if name_glob is None else self.glob(name_glob),
+                None if name_regex is None else self.regex(name_regex),
+            )
+            if ids is not None
+        ]
+        if not candidates:
+            return dict(self.rules)
+
+        # Intersect starting from the smallest candidate set.
+        candidates.sort(key=len)
+        selected = set(candidates[0])
+        for ids in candidates[1:]:
+            selected.intersection_update(ids)
+        return {rule_id: self.rules[rule_id] for rule_id in self._in_order(selected)}
+
+    def _in_order(self, ids: Iterable[str]) -> list[str]:
+        """Return `ids` sorted by load order."""
+        return sorted(ids, key=self._order.__getitem__)
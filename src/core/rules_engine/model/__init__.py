@@ -1,9 +1,12 @@
 from .operators import GroupOperator, Operator
 from .rule import Action, Rule
+from .temporal import Temporal, TemporalKind
 
 __all__ = [
     "Action",
     "GroupOperator",
     "Operator",
     "Rule",
+    "Temporal",
+    "TemporalKind",
 ]
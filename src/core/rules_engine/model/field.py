@@ -21,10 +21,14 @@ class FieldRef[T]:
 
         Args:
             facts (dict): a dict of facts, can traverse nested items with
-                dot notation.
+                dot notation. Flat factsheets keyed by the full path are
+                looked up directly.
 
         """
-        value = resolve_path(facts, self.path)
+        if isinstance(facts, dict) and self.path in facts:
+            value = facts[self.path]
+        else:
+            value = resolve_path(facts, self.path)
         if value is None:
             return None
         if not isinstance(value, self.type):
@@ -0,0 +1,87 @@
+"""Actions referring to a callable by import path."""
+
+import functools
+import importlib
+import re
+from typing import Any
+
+from shared.custom_exceptions.custom_exception import InvalidRuleDataError
+
+_DOTTED_NAME = r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*"
+_IMPORT_PATH = re.compile(rf"(?P<module>{_DOTTED_NAME}):(?P<attr>{_DOTTED_NAME})")
+
+
+def is_import_path(text: str) -> bool:
+    """Return True if `text` looks like "package.module:function"."""
+    return _IMPORT_PATH.fullmatch(text.strip()) is not None
+
+
+@functools.cache
+def resolve(path: str) -> Any:  # noqa: ANN401
+    """
+    Import "package.module:attribute" and return the attribute.
+
+    Resolved callables are cached, so rules sharing a handler import it once.
+
+    Raises:
+        InvalidRuleDataError: if the module or attribute cannot be found.
+
+    """
+    match = _IMPORT_PATH.fullmatch(path.strip())
+    if match is None:
+        msg = f"Invalid action '{path}', expected 'package.module:function'"
+        raise InvalidRuleDataError(msg)
+    try:
+        target = importlib.import_module(match["module"])
+        for name in match["attr"].split("."):
+            target = getattr(target, name)
+    except (ImportError, AttributeError) as err:
+        msg = f"Cannot resolve action '{path}': {err}"
+        raise InvalidRuleDataError(msg) from err
+    if not callable(target):
+        msg = f"Action '{path}' is not callable"
+        raise InvalidRuleDataError(msg)
+    return target
+
+
+class ImportPathCallable:
+    """
+    Call "package.module:function" with fixed arguments, importing it on first call.
+
+    Nothing is imported when the rule is loaded: the module is imported the first
+    time the action fires, and the callable is then kept.
+    """
+
+    __slots__ = ("_target", "args", "kwargs", "path")
+
+    def __init__(self, path: str, args: tuple = (), kwargs: dict | None = None) -> None:
+        """
+        Initialize the action; it calls the target as `target(*args, **kwargs)`.
+
+        Raises:
+            InvalidRuleDataError: if `path` is not of the form "package.module:function".
+
+        """
+        if not is_import_path(path):
+            msg = f"Invalid action '{path}', expected 'package.module:function'"
+            raise InvalidRuleDataError(msg)
+        self.path = path.strip()
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        self._target = None
+
+    @property
+    def resolved(self) -> bool:
+        """Return True once the callable has been imported."""
+        return self._target is not None
+
+    def __call__(self) -> Any:  # noqa: ANN401
+        """Import the callable if needed and call it."""
+        target = self._target
+        if target is None:
+            target = self._target = resolve(self.path)
+        return target(*self.args, **self.kwargs)
+
+    def __repr__(self) -> str:
+        """Return the import path and arguments."""
+        return f"ImportPathCallable({self.path!r}, args={self.args!r}, kwargs={self.kwargs!r})"
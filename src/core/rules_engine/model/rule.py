@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING
 
+from core.rules_engine.model.import_action import ImportPathCallable, is_import_path
+from core.rules_engine.model.temporal import Temporal, parse_duration
 from shared.custom_exceptions.custom_exception import InvalidRuleDataError
 
 if TYPE_CHECKING:
@@ -36,7 +38,12 @@ class Action:
 
 @dataclass(frozen=True, slots=True)
 class Rule:
-    """A Rule object."""
+    """
+    A Rule object.
+
+    `interval` is the rule's own evaluation cadence in seconds; None evaluates it
+    at the cadence of its source, or every cycle.
+    """
 
     name: str
     description: str
@@ -48,6 +55,8 @@ class Rule:
     enabled: bool = field(default=True)
     priority: int = field(default=0)
     metadata: dict = field(default_factory=dict)
+    temporal: Temporal | None = None
+    interval: float | None = None
     id: str = field(init=False)
 
     def __post_init__(self) -> None:
@@ -70,44 +79,59 @@ class Rule:
         return f"{prefix}-{numeric_id}"
 
     @classmethod
-    def from_toml(cls, toml_data: dict) -> Rule:  # noqa: PLR0915, PLR0912, C901
+    def from_toml(cls, toml_data: dict) -> Rule:
         """
         Create a Rule object from a TOML dictionary.
 
         Expects keys:
           - name
           - description
-          - model (string or nested dict for complex conditions)
-          - action (string message or callable reference)
+          - model (string or nested dict for complex conditions, optionally with a
+            temporal qualifier, see `Temporal`)
+          - action (string message, "package.module:function" import path, or a
+            table with `call`, `args` and `kwargs`)
           - source (string or list of strings, optional)
           - group (optional)
           - mutually_exclusive_group (optional)
           - enabled (optional, defaults to True)
           - priority (optional, defaults to 0)
-          - metadata (optional, dict).
+          - metadata (optional, dict)
+          - interval (optional, seconds or a duration such as "1s" or "5m").
         """
-        from core.rules_engine.rule_builder.combinators import all_of, any_of  # noqa: PLC0415
-        from core.rules_engine.rule_builder.parsers import cond  # noqa: PLC0415
+        fields = cls._parse_toml_fields(toml_data)
+        condition = cls._parse_model(toml_data.get("model"))
+        action = cls._parse_action(toml_data.get("action"))
+
+        # Construct Rule instance
+        return cls(condition=condition, action=action, **fields)
+
+    @classmethod
+    def restore(cls, rule_id: str, toml_data: dict, condition: Expression) -> Rule:
+        """
+        Rebuild a TOML rule from an already compiled condition and a known id.
+
+        Used by the rule cache: skips condition parsing and id generation.
+        """
+        rule = object.__new__(cls)
+        values = {
+            **cls._parse_toml_fields(toml_data),
+            "condition": condition,
+            "action": cls._parse_action(toml_data.get("action")),
+            "id": rule_id,
+        }
+        for name, value in values.items():
+            object.__setattr__(rule, name, value)
+        return rule
 
+    @staticmethod
+    def _parse_toml_fields(toml_data: dict) -> dict:
+        """Parse the plain (non model, non action) fields of a TOML rule."""
         # Required fields
         name = toml_data.get("name")
         if not name:
             msg = "TOML rule must have a 'name'"
             raise InvalidRuleDataError(msg)
 
-        description = toml_data.get("description", "")
-
-        # Grouping
-        group = toml_data.get("group", "")
-        mutually_exclusive_group = toml_data.get("mutually_exclusive_group", "")
-
-        # Enabled and priority
-        enabled = toml_data.get("enabled", True)
-        priority = toml_data.get("priority", 0)
-
-        # Metadata
-        metadata = toml_data.get("metadata", {})
-
         # Source handling
         raw_source = toml_data.get("source")
         if raw_source is None:
@@ -118,15 +142,39 @@ class Rule:
             msg = f"Invalid source type: {type(raw_source)}"
             raise InvalidRuleDataError(msg)
 
-        # Parse model/condition
-        raw_condition = toml_data.get("model")
+        return {
+            "name": name,
+            "description": toml_data.get("description", ""),
+            "source": source,
+            # Grouping
+            "group": toml_data.get("group", ""),
+            "mutually_exclusive_group": toml_data.get("mutually_exclusive_group", ""),
+            # Enabled and priority
+            "enabled": toml_data.get("enabled", True),
+            "priority": toml_data.get("priority", 0),
+            # Metadata
+            "metadata": toml_data.get("metadata", {}),
+            # Temporal qualifier of the model
+            "temporal": Temporal.from_toml(toml_data.get("model")),
+            # Evaluation cadence
+            "interval": (
+                parse_duration(toml_data["interval"]) if "interval" in toml_data else None
+            ),
+        }
+
+    @classmethod
+    def _parse_model(cls, raw_condition: str | dict | None) -> Expression:
+        """Parse the model of a TOML rule into an Expression."""
+        from core.rules_engine.rule_builder.combinators import all_of, any_of  # noqa: PLC0415
+        from core.rules_engine.rule_builder.parsers import cond  # noqa: PLC0415
+
         if raw_condition is None:
             msg = "TOML rule must have a 'model'"
             raise InvalidRuleDataError(msg)
 
         if isinstance(raw_condition, str):
-            condition = cond(raw_condition)
-        elif isinstance(raw_condition, dict):
+            return cond(Temporal.split(raw_condition)[0])
+        if isinstance(raw_condition, dict):
             op = raw_condition.get("operator", "all").lower()
             children = raw_condition.get("conditions", [])
             child_conditions = []
@@ -138,38 +186,52 @@ class Rule:
                 else:
                     msg = f"Invalid model type: {type(c)}"
                     raise InvalidRuleDataError(msg)
-            condition = all_of(*child_conditions) if op == "all" else any_of(*child_conditions)
-        else:
-            msg = f"Invalid model type: {type(raw_condition)}"
-            raise InvalidRuleDataError(msg)
+            return all_of(*child_conditions) if op == "all" else any_of(*child_conditions)
+
+        msg = f"Invalid model type: {type(raw_condition)}"
+        raise InvalidRuleDataError(msg)
+
+    @staticmethod
+    def _parse_action(raw_action: object) -> Action:
+        """
+        Parse the action of a TOML rule.
 
-        # Parse action
-        raw_action = toml_data.get("action")
+        A "package.module:function" string, or a `{call, args, kwargs}` table,
+        calls that function. It is imported the first time the action fires, not
+        when the rule is loaded. Any other string is a log message.
+        """
+        if isinstance(raw_action, dict):
+            return Rule._parse_call_action(raw_action)
+        if isinstance(raw_action, str) and is_import_path(raw_action):
+            return Action(name=raw_action.strip(), execute=ImportPathCallable(raw_action))
         if isinstance(raw_action, str):
 
             def execute_action() -> None:
                 pass
 
-            action = Action(name="Log", execute=execute_action)
-        elif callable(raw_action):
-            action = Action(name=getattr(raw_action, "__name__", "Inline"), execute=raw_action)
-        else:
-            msg = f"Invalid action type: {type(raw_action)}"
-            raise InvalidRuleDataError(msg)
+            return Action(name="Log", execute=execute_action)
+        if callable(raw_action):
+            return Action(name=getattr(raw_action, "__name__", "Inline"), execute=raw_action)
+        msg = f"Invalid action type: {type(raw_action)}"
+        raise InvalidRuleDataError(msg)
 
-        # Construct Rule instance
-        return cls(
-            name=name,
-            description=description,
-            condition=condition,
-            action=action,
-            source=source,
-            group=group,
-            mutually_exclusive_group=mutually_exclusive_group,
-            enabled=enabled,
-            priority=priority,
-            metadata=metadata,
-        )
+    @staticmethod
+    def _parse_call_action(raw_action: dict) -> Action:
+        """Parse an action table: `call = "package.module:function"`, `args`, `kwargs`."""
+        unknown = raw_action.keys() - {"call", "args", "kwargs"}
+        if unknown:
+            msg = f"Unknown action keys {sorted(unknown)}: use 'call', 'args' and 'kwargs'"
+            raise InvalidRuleDataError(msg)
+        path = raw_action.get("call")
+        args = raw_action.get("args", [])
+        kwargs = raw_action.get("kwargs", {})
+        if not isinstance(path, str):
+            msg = "Action table must have a 'call' string"
+            raise InvalidRuleDataError(msg)
+        if not isinstance(args, list) or not isinstance(kwargs, dict):
+            msg = "Action 'args' must be an array and 'kwargs' a table"
+            raise InvalidRuleDataError(msg)
+        return Action(name=path.strip(), execute=ImportPathCallable(path, tuple(args), kwargs))
 
     @staticmethod
     def _parse_nested_condition(data: dict) -> Expression:
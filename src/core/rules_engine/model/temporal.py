@@ -0,0 +1,133 @@
+"""Temporal qualifiers of rules."""
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+
+from shared.custom_exceptions.custom_exception import InvalidRuleDataError
+
+
+class TemporalKind(Enum):
+    """How repeated failures of a condition turn into a failing rule."""
+
+    FOR = "for"
+    CONSECUTIVE = "consecutive"
+    WITHIN = "within"
+
+
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_DURATION = r"\d+(?:\.\d+)?\s*(?:ms|s|m|h)"
+_DURATION_PATTERN = re.compile(r"(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>ms|s|m|h)")
+_SUFFIX_PATTERN = re.compile(
+    rf"\s+(?:for\s+(?P<for>{_DURATION})"
+    r"|for\s+(?P<consecutive>\d+)\s+consecutive"
+    rf"|(?P<times>\d+)\s+times\s+within\s+(?P<within>{_DURATION}))\s*$",
+)
+
+# Upper bound on `count`: the WITHIN state keeps one timestamp per counted failure.
+MAX_COUNT = 1024
+
+
+def parse_duration(text: str | float) -> float:
+    """Parse "500ms", "30s", "10m" or "1h" (or a number of seconds) into seconds."""
+    if isinstance(text, int | float) and not isinstance(text, bool):
+        seconds = float(text)
+    else:
+        match = _DURATION_PATTERN.fullmatch(str(text).strip())
+        if match is None:
+            msg = f"Invalid duration '{text}', expected e.g. '500ms', '30s', '10m' or '1h'"
+            raise InvalidRuleDataError(msg)
+        seconds = float(match["amount"]) * _UNITS[match["unit"]]
+    if seconds <= 0:
+        msg = f"Duration must be positive, got '{text}'"
+        raise InvalidRuleDataError(msg)
+    return seconds
+
+
+@dataclass(frozen=True, slots=True)
+class Temporal:
+    """
+    A temporal qualifier: the rule fails only once its condition keeps failing.
+
+    - FOR: the condition has been failing continuously for `seconds`.
+    - CONSECUTIVE: the condition failed in the last `count` evaluations.
+    - WITHIN: the condition failed at least `count` times in the last `seconds`.
+    """
+
+    kind: TemporalKind
+    count: int = 0
+    seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Validate the qualifier."""
+        valid_count = isinstance(self.count, int) and 0 < self.count <= MAX_COUNT
+        if self.kind is not TemporalKind.FOR and not valid_count:
+            msg = f"Temporal count must be between 1 and {MAX_COUNT}, got {self.count}"
+            raise InvalidRuleDataError(msg)
+        if self.kind is not TemporalKind.CONSECUTIVE and self.seconds <= 0:
+            msg = f"Temporal duration must be positive, got {self.seconds}"
+            raise InvalidRuleDataError(msg)
+
+    def __str__(self) -> str:
+        """Return the model syntax of the qualifier."""
+        if self.kind is TemporalKind.FOR:
+            return f"for {self.seconds:g}s"
+        if self.kind is TemporalKind.CONSECUTIVE:
+            return f"for {self.count} consecutive"
+        return f"{self.count} times within {self.seconds:g}s"
+
+    @classmethod
+    def split(cls, model: str) -> tuple[str, Temporal | None]:
+        """
+        Split a qualifier suffix off a model string.
+
+        "cpu.percent < 80 for 30s" gives ("cpu.percent < 80", FOR 30s). The
+        suffixes are "for <duration>", "for <n> consecutive" and
+        "<n> times within <duration>".
+        """
+        match = _SUFFIX_PATTERN.search(model)
+        if match is None:
+            return model, None
+        if match["for"]:
+            temporal = cls(TemporalKind.FOR, seconds=parse_duration(match["for"]))
+        elif match["consecutive"]:
+            temporal = cls(TemporalKind.CONSECUTIVE, count=int(match["consecutive"]))
+        else:
+            temporal = cls(
+                TemporalKind.WITHIN,
+                count=int(match["times"]),
+                seconds=parse_duration(match["within"]),
+            )
+        return model[: match.start()], temporal
+
+    @classmethod
+    def from_toml(cls, raw_model: str | dict | None) -> Temporal | None:
+        """
+        Read the qualifier of a TOML `model`.
+
+        A string model takes a suffix (see `split`). A table model takes one of
+        `for = "30s"`, `consecutive = 3` or `times = 5` with `within = "10m"`.
+        """
+        if isinstance(raw_model, str):
+            return cls.split(raw_model)[1]
+        if not isinstance(raw_model, dict):
+            return None
+
+        keys = {"for", "consecutive", "times", "within"} & raw_model.keys()
+        if not keys:
+            return None
+        if keys == {"for"}:
+            return cls(TemporalKind.FOR, seconds=parse_duration(raw_model["for"]))
+        if keys == {"consecutive"}:
+            return cls(TemporalKind.CONSECUTIVE, count=raw_model["consecutive"])
+        if keys == {"times", "within"}:
+            return cls(
+                TemporalKind.WITHIN,
+                count=raw_model["times"],
+                seconds=parse_duration(raw_model["within"]),
+            )
+        msg = (
+            f"Invalid temporal qualifier {sorted(keys)}: use 'for', 'consecutive' "
+            "or 'times' with 'within'"
+        )
+        raise InvalidRuleDataError(msg)
@@ -1,5 +1,6 @@
 """Helper functions for parsing rules."""
 
+import functools
 import re
 
 from core.fact_processor.fact_registry import FactRegistry
@@ -27,58 +28,72 @@ def cast_value(value_str: str, expected_type: type) -> object:
         return value_str
 
 
+# Longest operators first, so "<=" wins over "<" and "is not" over "is".
+_OPERATORS = sorted(Operator, key=lambda op: -len(op.value))
+_OPERATOR_LOOKUP = {op.value: op for op in Operator}
+_EXPRESSION_PATTERN = re.compile(
+    r"(?P<field>\S+)\s+(?P<operator>"
+    + "|".join(re.escape(op.value) for op in _OPERATORS)
+    + r")\s+(?P<value>.+)",
+    re.DOTALL,
+)
+
+_PARSE_CACHE_SIZE = 65536
+
+
 def cond(expr: str) -> Condition:
     """
     Parse a string like "cpu.percent > 80" or "process.running == true:bool".
 
     Explicit type hints are optional and validated against the registry type.
+    Parsed conditions are memoized by expression string and fact registry version.
 
     Returns:
         Condition
 
     """
-    expr = expr.strip()
-    sorted_ops = sorted(Operator, key=lambda op: -len(op.value))  # <=, >= first
-
-    for op_enum in sorted_ops:
-        pattern = rf"\s{re.escape(op_enum.value)}\s"
-        match = re.search(pattern, f" {expr} ")
-        if match:
-            field_str, value_str = map(str.strip, re.split(pattern, expr, maxsplit=1))
-
-            declared_type: type | None = None
-            if ":" in value_str:
-                raw_value, type_name = value_str.rsplit(":", 1)
-                value_str = raw_value.strip()
-                declared_type = TYPE_MAP.get(type_name.strip())
-                if declared_type is None:
-                    msg = f"Unknown explicit type '{type_name}' in expression '{expr}'."
-                    raise InvalidRuleError(msg)
-
-            try:
-                field_fact = FactRegistry.get_fact(field_str)
-                fact_type = field_fact.type
-            except KeyError as err:
-                msg = (
-                    f"Could not find field '{field_str}' for expression '{expr}' in fact registry."
-                )
-                logger.warning(msg)
-                raise InvalidRuleError(msg) from err
-                fact_type = str  # fallback for unknown fields
-
-            if declared_type and declared_type != fact_type:
-                msg = (
-                    f"Declared type '{declared_type.__name__}' does not match "
-                    f"fact registry type '{fact_type.__name__}' for '{field_str}'."
-                )
-                raise InvalidRuleError(msg)
-
-            value = cast_value(value_str, fact_type)
-            try:
-                field_ref = FieldRef(field_str, fact_type)
-            except TypeError as err:
-                raise InvalidRuleError from err
-            return Condition(field=field_ref, operator=op_enum, value=value)
-
-    msg = f"Could not parse expression: {expr}"
-    raise ValueError(msg)
+    return _parse_condition(expr.strip(), FactRegistry.version())
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_condition(expr: str, registry_version: int) -> Condition:  # noqa: ARG001
+    """Tokenize and build a Condition in a single pass. Cached per registry version."""
+    match = _EXPRESSION_PATTERN.fullmatch(expr)
+    if match is None:
+        msg = f"Could not parse expression: {expr}"
+        raise ValueError(msg)
+
+    field_str = match["field"]
+    op_enum = _OPERATOR_LOOKUP[match["operator"]]
+    value_str = match["value"].strip()
+
+    declared_type: type | None = None
+    if ":" in value_str:
+        raw_value, type_name = value_str.rsplit(":", 1)
+        value_str = raw_value.strip()
+        declared_type = TYPE_MAP.get(type_name.strip())
+        if declared_type is None:
+            msg = f"Unknown explicit type '{type_name}' in expression '{expr}'."
+            raise InvalidRuleError(msg)
+
+    try:
+        field_fact = FactRegistry.get_fact(field_str)
+        fact_type = field_fact.type
+    except KeyError as err:
+        msg = f"Could not find field '{field_str}' for expression '{expr}' in fact registry."
+        logger.warning(msg)
+        raise InvalidRuleError(msg) from err
+
+    if declared_type and declared_type != fact_type:
+        msg = (
+            f"Declared type '{declared_type.__name__}' does not match "
+            f"fact registry type '{fact_type.__name__}' for '{field_str}'."
+        )
+        raise InvalidRuleError(msg)
+
+    value = cast_value(value_str, fact_type)
+    try:
+        field_ref = FieldRef(field_str, fact_type)
+    except TypeError as err:
+        raise InvalidRuleError from err
+    return Condition(field=field_ref, operator=op_enum, value=value)
@@ -24,6 +24,7 @@ rule3 = RuleBuilder.define("flagged_or_vip", "Flagged users or VIP in allowed re
 from typing import TYPE_CHECKING
 
 from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.model.temporal import Temporal, TemporalKind, parse_duration
 from core.rules_engine.rule_builder.parsers import cond
 
 if TYPE_CHECKING:
@@ -44,6 +45,8 @@ class RuleBuilder:
         .when(model)
         .and_(model)
         .or_(model)
+        .for_("30s")  # optional: consecutive(3) or within(5, "10m")
+        .every("1m")  # optional: evaluation cadence, defaults to every cycle
         .then(action)
     )
     """
@@ -60,6 +63,8 @@ class RuleBuilder:
         self._mutually_exclusive_group = None
         self._enabled = True
         self._metadata = {}
+        self._temporal = None
+        self._interval = None
 
     def define(self, name: str, description: str) -> RuleBuilder:
         """Set the name and description of the rule."""
@@ -156,6 +161,39 @@ class RuleBuilder:
         self._mutually_exclusive_group = name
         return self
 
+    def for_(self, duration: str | float) -> RuleBuilder:
+        """Fail only once the condition has been failing for `duration` ("30s", "10m")."""
+        return self._set_temporal(Temporal(TemporalKind.FOR, seconds=parse_duration(duration)))
+
+    def consecutive(self, count: int) -> RuleBuilder:
+        """Fail only once the condition failed in `count` consecutive evaluations."""
+        return self._set_temporal(Temporal(TemporalKind.CONSECUTIVE, count=count))
+
+    def within(self, count: int, window: str | float) -> RuleBuilder:
+        """Fail only once the condition failed `count` times within `window` ("10m")."""
+        return self._set_temporal(
+            Temporal(TemporalKind.WITHIN, count=count, seconds=parse_duration(window)),
+        )
+
+    def every(self, interval: str | float) -> RuleBuilder:
+        """Evaluate the rule every `interval` ("1s", "5m") instead of every cycle."""
+        self._interval = parse_duration(interval)
+        return self
+
+    def _set_temporal(self, temporal: Temporal) -> RuleBuilder:
+        """
+        Set the temporal qualifier of the rule.
+
+        Raises:
+            ValueError: If it has already been defined.
+
+        """
+        if self._temporal is not None:
+            msg = "temporal qualifier already set"
+            raise ValueError(msg)
+        self._temporal = temporal
+        return self
+
     def then(self, action: Callable) -> Rule:
         """
         Define the action to be executed when the rule is untrue, create the rule.
@@ -186,4 +224,6 @@ class RuleBuilder:
             enabled=self._enabled,
             priority=self._priority,
             metadata=self._metadata,
+            temporal=self._temporal,
+            interval=self._interval,
         )
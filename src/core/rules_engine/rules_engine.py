@@ -1,15 +1,21 @@
 """Rules engine."""
 
+import json
 import tomllib
 from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from core.rules_engine.analysis.rule_analyzer import AnalysisReport, RuleAnalyzer
 from core.rules_engine.builtin_rules import ALL_BUILTIN_RULES
+from core.rules_engine.index.rule_index import RuleIndex
 from core.rules_engine.model import Rule
-from core.rules_engine.model.condition import Condition, ConditionSet, Expression, NotCondition
+from core.rules_engine.model.condition import Condition, ConditionSet, NotCondition
+from core.rules_engine.watcher.rule_watcher import RuleFileWatcher, expand_rule_paths
 from shared._common.facts import FactSpecProtocol
 from shared.custom_exceptions import (
     InvalidRuleDataError,
+    InvalidRuleError,
     InvalidRuleFilterError,
     RuleWithNoAvailableFactError,
 )
@@ -19,6 +25,8 @@ from shared.utils import cfg, project_root
 if TYPE_CHECKING:
     import pathlib
 
+    from core.rules_engine.cache.rule_cache import RuleCache
+
 FactCheck = Callable[[dict], bool]
 
 
@@ -29,6 +37,67 @@ _rules_file_path = project_root / cfg.get("rules_path")
 _builtin_rules = ALL_BUILTIN_RULES
 
 
+@dataclass(slots=True)
+class RuleSetDiff:
+    """Rule ids added, changed and removed by a reload."""
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    def __bool__(self) -> bool:
+        """Return True if the active rule set changed."""
+        return bool(self.added or self.changed or self.removed)
+
+
+@dataclass(slots=True)
+class ValidationReport:
+    """Outcome of validating rules against the available facts."""
+
+    valid: dict[str, Rule] = field(default_factory=dict)
+    errors: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """Return True if every rule is valid."""
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """
+        Raise if any rule is invalid.
+
+        Raises:
+            RuleWithNoAvailableFactError: listing the invalid rule ids.
+
+        """
+        if self.errors:
+            raise RuleWithNoAvailableFactError("\n".join(self.errors))
+
+
+def _check_leaf(expr: Condition, available_facts: Mapping[str, FactSpecProtocol]) -> str | None:
+    """Return the error of a condition leaf against the available facts, or None if valid."""
+    path = expr.field.path
+    if path not in available_facts:
+        return f"Condition field not found: {path}"
+
+    fact = available_facts[path]
+    msg = ""
+    if expr.field.type != fact.type:
+        msg += f"Condition type mismatch. Expected {fact.type}, got {expr.field.type}. "
+
+    if fact.allowed_operators and expr.operator not in fact.allowed_operators:
+        msg += (
+            f"Condition operator mismatch. Expected {fact.allowed_operators}, "
+            f"got {expr.operator}. "
+        )
+
+    if fact.allowed_values and expr.value not in fact.allowed_values:
+        msg += f"Condition value mismatch. Expected {fact.allowed_values}, got {expr.value}. "
+
+    return msg or None
+
+
 class RulesEngine:
     """Control Access and Understanding of Rules."""
 
@@ -38,16 +107,42 @@ class RulesEngine:
         *,
         toml_rules_path: pathlib.Path = _rules_file_path,
         builtin_rules: list[Rule] = _builtin_rules,
+        analyzer: RuleAnalyzer | None = None,
+        cache: RuleCache | None = None,
     ) -> None:
-        """Initialize a RulesEngine object."""
+        """
+        Initialize a RulesEngine object.
+
+        Args:
+            fact_provider: callable returning the available facts, used for validation.
+            toml_rules_path: path to the TOML rules file, or a directory of `*.toml` rule files.
+            builtin_rules: rules defined in code.
+            analyzer: static analyzer run after validation. Defaults to a pruning RuleAnalyzer.
+            cache: compiled rule set cache. When its key matches, rules are loaded from it
+                without parsing, validation or analysis.
+
+        """
         self.fact_provider = fact_provider
         self.builtin_rules = builtin_rules or []
         self.toml_rules_path = toml_rules_path
+        self.analyzer = analyzer or RuleAnalyzer()
+        self.analysis: AnalysisReport | None = None
+        self.validation: ValidationReport | None = None
+        self.cache = cache
+        self.toml_tables: dict[str, dict] = {}
         self.rules = None
-        self.rules = self.get_rules()
-        self.rules_name_lookup = {rule.name: rule for rule in self.rules.values()}
 
-        self.validate_rules()
+        cache_key = self._cache_key()
+        if not self._load_cached_rules(cache_key):
+            self.rules = self.get_rules()
+            self.validate_rules()
+            self.analyze_rules()
+            # Invalid rules are only reported on a full load, so don't cache around them.
+            if cache_key is not None and (self.validation is None or self.validation.ok):
+                self.cache.store(cache_key, self.rules, self.toml_tables, self.analysis)
+
+        self.index = RuleIndex(self.rules)
+        self.watcher = RuleFileWatcher([self.toml_rules_path])
 
     def get_rules(self) -> dict[str, Rule]:
         """
@@ -56,103 +151,241 @@ class RulesEngine:
         Loads rules if not already loaded.
         """
         if self.rules is None:
-            rules = self._load_rules_from_toml(self.toml_rules_path) or []
+            rules = []
+            for path in self._rule_files():
+                rules += self._load_rules_from_toml(path) or []
             self.rules = {rule.id: rule for rule in rules + self.builtin_rules}
+            # Built-in rules win id clashes; forget the TOML tables they replaced.
+            for rule in self.builtin_rules:
+                self.toml_tables.pop(rule.id, None)
         return self.rules
 
-    def validate_rules(self) -> None:
+    def _cache_key(self) -> bytes | None:
+        """Return the cache key for the current rule files and facts, or None without a cache."""
+        if self.cache is None or self.fact_provider is None:
+            return None
+        contents = [self._read_rules_file(path) for path in self._rule_files()]
+        return self.cache.key(contents, self.fact_provider(), self.builtin_rules)
+
+    def _rule_files(self) -> list[pathlib.Path]:
+        """Return the rule files behind `toml_rules_path`."""
+        return expand_rule_paths([self.toml_rules_path])
+
+    def _load_cached_rules(self, cache_key: bytes | None) -> bool:
+        """Load rules from the cache. Returns True on a cache hit."""
+        if cache_key is None:
+            return False
+        cached = self.cache.load(cache_key, self.builtin_rules)
+        if cached is None:
+            return False
+        self.rules, self.toml_tables, self.analysis = cached
+        logger.info(f"Loaded {len(self.rules)} rules from cache {self.cache.path}")
+        return True
+
+    def reload_if_changed(self) -> RuleSetDiff | None:
+        """
+        Reload the rule files if the watcher saw them change.
+
+        Returns:
+            RuleSetDiff | None: the applied diff, or None if nothing was reloaded.
+
+        """
+        if not self.watcher.poll():
+            return None
+        return self.reload()
+
+    def reload(self) -> RuleSetDiff | None:  # noqa: C901
+        """
+        Re-read the rule files and apply the changed rules.
+
+        Tables whose content is unchanged keep their existing Rule object, so any
+        state held per rule survives the reload. Only new or edited tables, and
+        unchanged ones whose rule analysis pruned, are parsed; only new or edited
+        ones are validated. The whole merged rule set is then analyzed again, so a
+        rule pruned as the duplicate of an edited rule is admitted back. The new
+        rule set replaces `self.rules` in a single assignment.
+
+        Returns:
+            RuleSetDiff | None: the applied diff, or None if the new rules are invalid,
+                in which case the current rule set is kept.
+
+        """
+        try:
+            contents = [self._read_rules_file(path) for path in self._rule_files()]
+            tables = [table for content in contents for table in self._parse_rule_tables(content)]
+        except (OSError, UnicodeDecodeError, tomllib.TOMLDecodeError, InvalidRuleDataError) as err:
+            logger.error(f"Rule reload failed, keeping current rules: {err}")
+            return None
+
+        known = {self._table_key(table): rule_id for rule_id, table in self.toml_tables.items()}
+        builtin_ids = {rule.id for rule in self.builtin_rules}
+        pruned = set(self.analysis.pruned) if self.analysis is not None else set()
+        merged: dict[str, Rule] = {}
+        kept: dict[str, Rule] = {}
+        parsed: dict[str, Rule] = {}
+        toml_tables: dict[str, dict] = {}
+
+        for table in tables:
+            rule_id = known.get(self._table_key(table))
+            if rule_id is not None:
+                toml_tables[rule_id] = table
+                if rule_id in self.rules:
+                    kept[rule_id] = merged[rule_id] = self.rules[rule_id]
+                elif rule_id in pruned:
+                    merged[rule_id] = Rule.from_toml(table)
+                continue
+            try:
+                rule = Rule.from_toml(table)
+            except InvalidRuleDataError as e:
+                logger.warning(f"Skipping invalid rule_builder: {e}")
+                continue
+            except (InvalidRuleError, KeyError, ValueError) as err:
+                logger.error(f"Rule reload rejected, keeping current rules: {err}")
+                return None
+            if rule.id in builtin_ids:
+                continue
+            parsed[rule.id] = merged[rule.id] = rule
+            toml_tables[rule.id] = table
+
+        if parsed and not self._reload_validate(parsed):
+            return None
+        for rule in self.builtin_rules:
+            merged[rule.id] = self.rules.get(rule.id, rule)
+        report = self.analyzer.analyze(merged)
+        # Rules analysis leaves as they were keep their current object.
+        rules = {rule_id: kept.get(rule_id, rule) for rule_id, rule in report.rules.items()}
+        report.rules = rules
+
+        diff = RuleSetDiff(
+            added=[rule_id for rule_id in rules if rule_id not in self.rules],
+            changed=[rule_id for rule_id in parsed if rule_id in rules and rule_id in self.rules],
+            removed=[rule_id for rule_id in self.rules if rule_id not in rules],
+            unchanged=len(kept.keys() & rules.keys()),
+        )
+        self.rules = rules
+        self.analysis = report
+        self.toml_tables = toml_tables
+        self.index = RuleIndex(rules)
+        logger.info(
+            f"Reloaded rules: {len(diff.added)} added, {len(diff.changed)} changed, "
+            f"{len(diff.removed)} removed, {diff.unchanged} unchanged",
+        )
+
+        if self.cache is not None and self.fact_provider is not None:
+            key = self.cache.key(contents, self.fact_provider(), self.builtin_rules)
+            self.cache.store(key, self.rules, self.toml_tables, self.analysis)
+        return diff
+
+    def _reload_validate(self, rules: dict[str, Rule]) -> bool:
+        """Validate reloaded rules, logging errors instead of raising."""
+        if self.fact_provider is None:
+            return True
+        report = self.check_rules(rules, self.fact_provider())
+        for rule_id, messages in report.errors.items():
+            logger.error(
+                f"Rule reload rejected, keeping current rules. Invalid rule: {rule_id}: "
+                + " ".join(messages),
+            )
+        return report.ok
+
+    def validate_rules(self) -> ValidationReport:
         """
         Check that rules correspond to available facts.
 
-        Raises:
-            RuleWithNoAvailableFactError: if no fact is found for a rule's condition.
+        Invalid rules are logged and dropped from `self.rules` rather than aborting
+        the load.
+
+        Returns:
+            ValidationReport: the valid rules and the errors of every invalid rule.
 
         """
         if self.fact_provider is None:
             logger.warning(
                 f"No fact_provider defined for {type(self).__name__}. Validation skipped.",
             )
-            return
-
-        available_facts = self.fact_provider()
-        errors: list = []
-        valids = {}
-
-        for rule in self.rules.values():
-            self._validate_expression(
-                rule.condition,
-                available_facts,
-                rule,
-                errors,
-            )
-
-            if rule.id not in {r.id for _, r in errors}:
-                valids[rule.id] = rule
-            else:
-                errors.append(rule.name)
+            return ValidationReport(valid=self.rules)
+
+        report = self.check_rules(self.rules, self.fact_provider())
+        for rule_id, messages in report.errors.items():
+            rule = self.rules[rule_id]
+            logger.warning(f"Invalid rule: {rule.id}: {rule.name}\n\t" + "\n\t".join(messages))
+
+        self.rules = report.valid
+        self.validation = report
+        return report
+
+    @staticmethod
+    def check_rules(
+        rules: Mapping[str, Rule],
+        available_facts: Mapping[str, FactSpecProtocol],
+    ) -> ValidationReport:
+        """
+        Validate rules against the available facts in a single pass.
 
-        if errors:
-            for msg, _ in errors:
-                logger.warning(msg)
+        Leaf checks are memoized by (path, type, operator, value), so leaves shared
+        by many rules are checked once.
 
-            raise RuleWithNoAvailableFactError("\n".join(rule.name for _, rule in errors))
+        Returns:
+            ValidationReport: the valid rules and the errors of every invalid rule.
 
-        self.rules = valids
+        """
+        report = ValidationReport()
+        leaf_errors: dict[tuple, str | None] = {}
+
+        for rule_id, rule in rules.items():
+            messages = []
+            stack = [rule.condition]
+            while stack:
+                expr = stack.pop()
+                if isinstance(expr, Condition):
+                    key = (expr.field.path, expr.field.type, expr.operator, expr.value)
+                    try:
+                        error = leaf_errors[key]
+                    except KeyError:
+                        error = leaf_errors[key] = _check_leaf(expr, available_facts)
+                    except TypeError:  # unhashable value
+                        error = _check_leaf(expr, available_facts)
+                    if error is not None:
+                        messages.append(error)
+                elif isinstance(expr, NotCondition):
+                    stack.append(expr.condition)
+                elif isinstance(expr, ConditionSet):
+                    stack.extend(reversed(expr.conditions))
+                else:
+                    messages.append(f"Unknown expression type {type(expr)}")
+
+            if messages:
+                report.errors[rule_id] = messages
+            else:
+                report.valid[rule_id] = rule
+        return report
 
-    def _validate_expression(
-        self,
-        expr: Expression,
-        available_facts: dict[str, FactSpecProtocol],
-        rule: Rule,
-        errors: list,
-    ) -> None:
-        """Recursively validate a rule Expression, appends to `errors` on failure."""
-        # ── Leaf ──────────────────────────────────────────────
-        if isinstance(expr, Condition):
-            path = expr.field.path
-            msg = f"Invalid rule: {rule.id}: {rule.name}\n\t"
-
-            if path not in available_facts:
-                errors.append((msg + "Condition field not found", rule))
-                return
-
-            fact = available_facts[path]
-            failed = False
-
-            if expr.field.type != fact.type:
-                failed = True
-                msg += f"Condition type mismatch. Expected {fact.type}, got {expr.field.type}. "
-
-            if fact.allowed_operators and expr.operator not in fact.allowed_operators:
-                failed = True
-                msg += (
-                    f"Condition operator mismatch. Expected {fact.allowed_operators}, "
-                    f"got {expr.operator}. "
-                )
+    def analyze_rules(self) -> AnalysisReport:
+        """
+        Simplify validated rules and prune redundant ones before evaluation.
 
-            if fact.allowed_values and expr.value not in fact.allowed_values:
-                failed = True
-                msg += (
-                    f"Condition value mismatch. Expected {fact.allowed_values}, got {expr.value}. "
-                )
+        Unsatisfiable rules (always failing) and subsumed rules are kept and reported;
+        tautological rules (never failing) and duplicates with the same name, action
+        and interval are dropped when the analyzer prunes. Other duplicates are reported.
 
-            if failed:
-                errors.append((msg, rule))
-            return
+        Returns:
+            AnalysisReport: findings of the analysis pass.
 
-        # ── NOT ───────────────────────────────────────────────
-        if isinstance(expr, NotCondition):
-            self._validate_expression(expr.condition, available_facts, rule, errors)
-            return
+        """
+        report = self.analyzer.analyze(self.rules)
 
-        # ── AND / OR ──────────────────────────────────────────
-        if isinstance(expr, ConditionSet):
-            for child in expr.conditions:
-                self._validate_expression(child, available_facts, rule, errors)
-            return
+        for rule_id in report.unsatisfiable:
+            logger.warning(f"Rule {rule_id} can never pass: its condition is unsatisfiable.")
+        for rule_id in report.tautological:
+            logger.warning(f"Rule {rule_id} can never fail: its condition always holds.")
+        for rule_id, kept_id in report.duplicates.items():
+            logger.warning(f"Rule {rule_id} duplicates rule {kept_id}.")
+        if report.pruned:
+            logger.info(f"Pruned {len(report.pruned)} redundant rules: {report.pruned}")
 
-        # ── Unknown node ──────────────────────────────────────
-        errors.append((f"Invalid rule: {rule.id}: Unknown expression type {type(expr)}", rule))
+        self.rules = report.rules
+        self.analysis = report
+        return report
 
     def _load_rules_from_toml(self, rules_path: pathlib.Path) -> list[Rule] | None:
         """
@@ -160,52 +393,69 @@ class RulesEngine:
 
         Returns all rules defined in project.toml.
         """
-        if not rules_path.exists():
-            rules_path.parent.mkdir(parents=True, exist_ok=True)
-            rules_path.touch()
-        with rules_path.open("rb") as f:
-            uf_rules = tomllib.load(f).get("rules", [])
-        if not isinstance(uf_rules, list):
-            msg = "Expected 'rules' to be a list of tables in TOML"
-            raise InvalidRuleDataError(msg)
+        content = self._read_rules_file(rules_path)
         rules = []
-        for rule_data in uf_rules:
+        for rule_data in self._parse_rule_tables(content):
             try:
-                rules.append(Rule.from_toml(rule_data))
+                rule = Rule.from_toml(rule_data)
+                rules.append(rule)
+                self.toml_tables[rule.id] = rule_data
             except InvalidRuleDataError as e:
                 logger.warning(f"Skipping invalid rule_builder: {e}")
         return rules
 
+    @staticmethod
+    def _parse_rule_tables(content: bytes) -> list[dict]:
+        """Return the `[[rules]]` tables of a rules file."""
+        uf_rules = tomllib.loads(content.decode()).get("rules", [])
+        if not isinstance(uf_rules, list):
+            msg = "Expected 'rules' to be a list of tables in TOML"
+            raise InvalidRuleDataError(msg)
+        return uf_rules
+
+    @staticmethod
+    def _table_key(table: dict) -> str:
+        """Return a content key for a TOML rule table."""
+        return json.dumps(table, sort_keys=True, default=str)
+
+    @staticmethod
+    def _read_rules_file(rules_path: pathlib.Path) -> bytes:
+        """Return the raw content of a rules file, creating it if missing."""
+        if not rules_path.exists():
+            rules_path.parent.mkdir(parents=True, exist_ok=True)
+            rules_path.touch()
+        with rules_path.open("rb") as f:
+            return f.read()
+
     def match_rules(self, rules: dict[str, Rule], filters: list[str] | None) -> dict[str, Rule]:
         """
         Return only the rules matching the given filters.
 
         Args:
             rules: rules to filter
-            filters: filters to apply. Can be rule_builder.id or rule_builder.name
-                If filter is None, return all rules.
+            filters: filters to apply. Each filter is a rule id, a rule name or a
+                selector such as `group:cpu` or `priority:5..` (see RuleIndex.resolve).
+                The result is the union of all filters. If filter is None, return all rules.
 
         Returns:
             dict rule.path : Rule
 
         Raises:
-            InvalidRuleFilterError: if filter is invalid.
+            InvalidRuleFilterError: if a filter is malformed or matches no rule.
 
         """
         if filters is None:
             return rules
+        index = self.index if rules is self.rules else RuleIndex(rules)
         active_rules = dict[str, Rule]()
         for _filter in filters:
-            try:
-                active_rules[_filter] = rules[_filter]
-            except KeyError:
-                try:
-                    rule = self.rules_name_lookup[_filter]
-                    active_rules[rule.id] = rule
-                except KeyError as err:
-                    msg = (
-                        f"Invalid rule_builder passed to filter: "
-                        f"{"name" if isinstance(_filter, str) else "id"}: {_filter}"
-                    )
-                    raise InvalidRuleFilterError(msg) from err
+            ids = index.resolve(_filter)
+            if not ids:
+                msg = (
+                    f"Invalid rule_builder passed to filter: "
+                    f"{"name" if isinstance(_filter, str) else "id"}: {_filter}"
+                )
+                raise InvalidRuleFilterError(msg)
+            for rule_id in ids:
+                active_rules[rule_id] = rules[rule_id]
         return active_rules
@@ -0,0 +1,65 @@
+"""Change detection for rule files."""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pathlib
+
+FileSignature = tuple[int, int, int, int]
+
+
+class RuleFileWatcher:
+    """
+    Detect changes to rule files by polling their stat signature.
+
+    A watched path is either a rules file or a directory of `*.toml` rule files.
+    A file counts as changed when its device, inode, size or mtime changes, so
+    in-place edits and atomic replaces (write to temp, rename) are both seen.
+    Files appearing in or disappearing from a watched directory also count.
+    """
+
+    def __init__(self, paths: list[pathlib.Path]) -> None:
+        """Initialize the watcher and record the current state of `paths`."""
+        self.paths = paths
+        self._signatures = self._scan()
+
+    def files(self) -> list[pathlib.Path]:
+        """Return the rule files currently covered by the watched paths."""
+        return expand_rule_paths(self.paths)
+
+    def poll(self) -> bool:
+        """
+        Check the watched paths for changes since the last poll.
+
+        Returns:
+            bool: True if any rule file was modified, added or removed.
+
+        """
+        signatures = self._scan()
+        if signatures == self._signatures:
+            return False
+        self._signatures = signatures
+        return True
+
+    def _scan(self) -> dict[pathlib.Path, FileSignature | None]:
+        """Return the stat signature of every watched file."""
+        return {path: self._signature(path) for path in self.files()}
+
+    @staticmethod
+    def _signature(path: pathlib.Path) -> FileSignature | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def expand_rule_paths(paths: list[pathlib.Path]) -> list[pathlib.Path]:
+    """Expand rule directories into their `*.toml` files, keeping plain files as given."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.toml")))
+        else:
+            files.append(path)
+    return files
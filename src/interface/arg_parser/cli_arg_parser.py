@@ -76,12 +76,12 @@ class CliArgParser:
         """Return a list of rule_builder names or rule_builder ids, potentially intermingled."""
         return self._get_argument("rules")
 
-    def get_time_limit_arg(self) -> int | None:
+    def get_time_limit_arg(self) -> float | None:
         """Return the time limit for this application, in seconds."""
         print(f'TIME LIMIT ARG {self._get_argument("time-limit")}')
         return self._get_argument("time-limit")
 
-    def get_interval_arg(self) -> int | None:
+    def get_interval_arg(self) -> float | None:
         """Return the time interval between audits for this application, in seconds."""
         return self._get_argument("interval")
 
@@ -102,8 +102,8 @@ class CliContext:
 
     process: list[str] | int
     create_process_flag: bool
-    interval: int
-    time_limit: int
+    interval: float
+    time_limit: float | None
     rules: list[str]
 
 
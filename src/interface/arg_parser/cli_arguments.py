@@ -70,7 +70,7 @@ class CliArguments:
         ),
         _CliArgument(
             name_or_flags=("-t", "--time_limit"),
-            type=int,
+            type=float,
             nargs="?",
             default=default_time_limit,
             help="Time limit in seconds. Default to infinity.",
@@ -78,16 +78,17 @@ class CliArguments:
         _CliArgument(
             name_or_flags=("-i", "--interval"),
             nargs="?",
-            type=int,
+            type=float,
             default=default_interval,
-            help=f"Time interval in seconds between test checks."
+            help=f"Time interval in seconds between test checks, fractions allowed."
             f" Default is {default_interval}.",
         ),
         _CliArgument(
             name_or_flags=("-r", "--rules"),
             nargs="+",
             type=str,
-            help="Rule names or ids to test. Defaults to all available rules.",
+            help="Rule names, ids or selectors (group:, source:, priority:, enabled:, meta:,"
+            " name:, re:) to test. Defaults to all available rules.",
         ),
     )
 
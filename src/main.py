@@ -1,23 +1,43 @@
 """A tool to audit the behavior of apps and their compliance with defined security rules."""
 
+import sys
+import threading
 import time
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from collection.process_handler.process_handler import AuditedProcess, ProcessHandler
 from collection.snapshot_manager.snapshot_manager import SnapshotManager
-from core.compliance_engine import ComplianceEngine
+from core.compliance_engine import ComplianceEngine, ShardedComplianceEngine
+from core.compliance_engine.actions.action_dispatcher import ActionDispatcher, OverflowPolicy
+from core.compliance_engine.events.fail_event_store import FailEventStore
+from core.compliance_engine.profiling.rule_profiler import RuleProfiler
+from core.compliance_engine.transitions.transition_tracker import TransitionTracker
 from core.fact_processor.fact_processor import FactProcessor
+from core.history.sqlite_history import SqliteHistory
+from core.metrics.auditor_metrics import AuditorMetrics
+from core.metrics.metrics_server import MetricsServer
+from core.pipeline.deadline_scheduler import DeadlineScheduler, OverrunPolicy
+from core.pipeline.rule_scheduler import RuleScheduler
+from core.pipeline.threaded_pipeline import ThreadedPipeline
 from core.probes.probes import ProbeLibrary
+from core.recording.snapshot_recorder import SnapshotRecorder
+from core.reporting.renderers import BinaryRenderer, ConsoleRenderer, JsonLinesRenderer
+from core.reporting.report import CycleReport
+from core.reporting.report_writer import ReportSink, ReportWriter
+from core.rules_engine.cache.rule_cache import RuleCache
+from core.rules_engine.model.temporal import parse_duration
 from core.rules_engine.rules_engine import RulesEngine
 from interface.arg_parser.cli_arg_parser import CliArgParser, CliContext
-from shared.custom_exceptions import FactNotFoundError
+from shared.custom_exceptions import FactNotFoundError, InvalidRuleFilterError
 from shared.services import logger
+from shared.utils import cfg, project_root
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     from core.probes.snapshot.base import BaseSnapshot
+    from core.rules_engine.model import Rule
 
 
 @dataclass(slots=True)
@@ -35,13 +55,20 @@ class RuntimeBundle:
 
     process_handler: ProcessHandler
     snapshot_manager: SnapshotManager
+    report_writer: ReportWriter | None = None
+    recorder: SnapshotRecorder | None = None
+    metrics: AuditorMetrics | None = None
 
 
 @dataclass(slots=True)
 class AppContext:
-    """Immutable application configuration derived from CLI arguments."""
+    """Immutable application configuration derived from CLI arguments and project config."""
 
     cli: CliContext
+    pipeline_threads: int = 0
+    overrun_policy: OverrunPolicy = OverrunPolicy.SKIP
+    schedule_jitter: float = 0.0
+    source_intervals: dict[str, float] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -49,10 +76,15 @@ class RunCondition:
     """Condition for the main loop."""
 
     start: float
-    time_limit: int
-    interval: int
+    time_limit: float | None
+    interval: float
     process_num_active_caller: Callable[[], int]
 
+    @property
+    def end(self) -> float | None:
+        """Return the monotonic time the run ends, or None without a time limit."""
+        return self.start + self.time_limit if self.time_limit else None
+
     def is_active(self) -> bool:
         """
         Check if the timer is exceeded.
@@ -67,6 +99,14 @@ class RunCondition:
         return bool(not self.time_limit or self.time_limit > time.monotonic() - self.start)
 
 
+class ScheduledCycle(NamedTuple):
+    """The active rules, the ids of those due in one cycle, and the snapshots they read."""
+
+    rules: dict[str, Rule] | None
+    snapshots: dict[str, list[BaseSnapshot]]
+    due: frozenset[str] | None = None  # None when every rule is due.
+
+
 class Main:
     """Main project loop runner."""
 
@@ -84,11 +124,24 @@ class Main:
 
         self.process_handler = runtime.process_handler
         self.snapshot_manager = runtime.snapshot_manager
+        self.report_writer = runtime.report_writer or ReportWriter(
+            [ReportSink(ConsoleRenderer(), sys.stdout)],
+            threaded=False,
+        )
+        self.recorder = runtime.recorder
+        self.metrics = runtime.metrics
 
         self.cli_context = context.cli
+        self.pipeline_threads = context.pipeline_threads
+        self.overrun_policy = context.overrun_policy
+        self.schedule_jitter = context.schedule_jitter
+        self.source_intervals = context.source_intervals
 
         self.active_rules = None
         self.run_condition = None
+        self.rule_scheduler: RuleScheduler | None = None
+        self._rules_lock = threading.Lock()
+        self._cycle = 0
 
     def setup(self) -> None:
         """
@@ -116,6 +169,194 @@ class Main:
             self.process_handler.num_active,
         )
 
+    def refresh_rules(self) -> None:
+        """
+        Swap in reloaded rules if the rule files changed since the last cycle.
+
+        Rules whose definition did not change keep their objects, so only the
+        changed rules start from a clean state. If the CLI rule filters no longer
+        match the reloaded rules, the current active rules are kept.
+        """
+        if not self.rules_engine.reload_if_changed():
+            return
+        try:
+            self.active_rules = self.rules_engine.match_rules(
+                self.rules_engine.get_rules(),
+                self.cli_context.rules,
+            )
+        except InvalidRuleFilterError as err:
+            logger.error(f"Keeping current rules after reload: {err}")
+
+    def collect(self, sources: set[str] | None = None) -> dict[str, list[BaseSnapshot]]:
+        """Snapshot the probes of `sources` (all if None), recording them when a recorder is set."""
+        start = time.perf_counter()
+        snapshots = (
+            self.snapshot_manager.get_all_snapshots()
+            if sources is None
+            else self.snapshot_manager.get_all_snapshots(sources)
+        )
+        if self.recorder is not None:
+            self.recorder.record(snapshots)
+        self._observe_stage("collect", start)
+        return snapshots
+
+    def evaluate(
+        self,
+        snapshots: dict[str, list[BaseSnapshot]],
+        rules: dict[str, Rule] | None = None,
+        due: frozenset[str] | None = None,
+    ) -> dict:
+        """
+        Check one cycle of snapshots against `rules`, or the active rules.
+
+        With `due`, only the rules of these ids are checked; the others keep
+        their last result.
+
+        Safe to call from several threads: rule reloads are serialized, and each
+        call evaluates against the rules active when it started.
+        """
+        if rules is None:
+            with self._rules_lock:
+                self.refresh_rules()
+                rules = self.active_rules
+        start = time.perf_counter()
+        facts: dict[str, dict[str, Any]] = self.fact_processor.parse_facts(snapshots)
+        self._observe_stage("parse", start)
+
+        # TODO: #noqa: FIX002, TD003, TD002
+        # Fix code documentation: fully document all classes and functions to this point
+        # Fix logging so only log errors if not also raising exception, instead of both
+        # Test fact processor package - create a fake process snapshot and put it into
+        # the expected format and try to parse
+
+        start = time.perf_counter()
+        result = self.compliance_engine.run(rules, facts, due=due)
+        self._observe_stage("evaluate", start)
+        return result
+
+    def plan_cycles(self) -> float:
+        """
+        Set up the rule scheduler for a run and return its tick, in seconds.
+
+        The tick is the greatest common divisor of the rule, source and run
+        intervals; it stays fixed for the run, so a rule reloaded with an
+        interval that is not a whole number of ticks runs at the nearest one.
+        """
+        self.rule_scheduler = RuleScheduler.for_rules(
+            (self.active_rules or {}).values(),
+            self.run_condition.interval,
+            self.source_intervals,
+        )
+        return self.rule_scheduler.tick
+
+    def next_cycle(self, cycle: int) -> ScheduledCycle | None:
+        """
+        Collect cycle `cycle` of the tick grid for the rules due in it.
+
+        Only the sources the due rules read are collected. When every rule
+        runs every tick, all probes are collected as before. The cycle carries
+        every active rule, so the rules not due keep their last result. Returns
+        None when no rule is due.
+        """
+        with self._rules_lock:
+            self.refresh_rules()
+            active_rules = self.active_rules
+        if active_rules is None or self.rule_scheduler.uniform(active_rules):
+            return ScheduledCycle(active_rules, self.collect())
+        due = self.rule_scheduler.due(active_rules, cycle)
+        if not due:
+            return None
+        if len(due) == len(active_rules):
+            return ScheduledCycle(active_rules, self.collect())
+        sources = self.rule_scheduler.sources(due)
+        return ScheduledCycle(active_rules, self.collect(sources), frozenset(due))
+
+    def evaluate_cycle(self, cycle: ScheduledCycle) -> dict:
+        """Check the snapshots of a scheduled cycle against the rules due in it."""
+        return self.evaluate(cycle.snapshots, cycle.rules, cycle.due)
+
+    def report(self, output: dict) -> None:
+        """
+        Hand the compliance report of one cycle to the report writer.
+
+        The report carries the engine's per-rule aggregates of the cycle, which
+        this thread just evaluated. When the engine reports transitions only,
+        cycles without any change are not reported. With metrics, this also reads
+        the auditor's own resource use and the action queue depth, once per cycle.
+        """
+        start = time.perf_counter()
+        self._cycle += 1
+        if self.compliance_engine.transitions is None or any(output.values()):
+            self.report_writer.submit(
+                CycleReport.from_result(
+                    self._cycle,
+                    time.time(),
+                    output,
+                    self.compliance_engine.last_aggregates,
+                ),
+            )
+        if self.metrics is not None:
+            self._observe_stage("report", start)
+            dispatcher = self.compliance_engine.dispatcher
+            self.metrics.update_process(
+                dispatcher.metrics().queue_depth if dispatcher is not None else 0,
+            )
+
+    def _observe_stage(self, stage: str, start: float) -> None:
+        """Record the time spent in `stage` since `start` (a perf_counter reading)."""
+        if self.metrics is not None:
+            self.metrics.observe_stage(stage, time.perf_counter() - start)
+
+    def run_serial(self) -> None:
+        """
+        Collect, evaluate and report in turn every interval until the run condition ends.
+
+        Cycles start on the tick grid of a `DeadlineScheduler`; sleeping ends
+        early when the time limit is reached first. Each cycle evaluates only
+        the rules due in it.
+        """
+        scheduler = DeadlineScheduler(
+            self.plan_cycles(),
+            policy=self.overrun_policy,
+            jitter=self.schedule_jitter,
+        )
+        while self.run_condition.is_active():
+            if not scheduler.wait(self.run_condition.end):
+                continue
+            cycle = self.next_cycle(scheduler.cycle)
+            if cycle is not None:
+                self.report(self.evaluate_cycle(cycle))
+
+        stats = scheduler.stats
+        if stats.overruns:
+            logger.info(
+                f"{stats.overruns} of {stats.cycles} cycles overran the interval, "
+                f"{stats.skipped} skipped, at most {stats.max_lateness:.3f} s late",
+            )
+
+    def run_threaded(self) -> None:
+        """
+        Run collection and evaluation in separate threads until the run condition ends.
+
+        One collector thread snapshots the probes every interval while
+        `pipeline_threads` evaluator threads check the snapshots; if evaluation
+        falls behind, stale snapshots are dropped.
+        """
+        pipeline = ThreadedPipeline(
+            lambda: self.next_cycle(pipeline.scheduler.cycle),
+            self.evaluate_cycle,
+            self.report,
+            interval=self.plan_cycles(),
+            evaluators=self.pipeline_threads,
+            overrun_policy=self.overrun_policy,
+            jitter=self.schedule_jitter,
+        )
+        stats = pipeline.run(self.run_condition.is_active)
+        logger.info(
+            f"Pipeline collected {stats.collected} snapshots, evaluated {stats.evaluated}, "
+            f"dropped {stats.dropped}, overran {pipeline.scheduler.stats.overruns} intervals",
+        )
+
     def main(self) -> int:
         """
         Run the main function.
@@ -129,31 +370,10 @@ class Main:
         self.setup()
 
         try:
-            while self.run_condition.is_active():
-                loop_start = time.monotonic()
-
-                ps_output: dict[str, list[BaseSnapshot]] = self.snapshot_manager.get_all_snapshots()
-                facts: dict[str, dict[str, Any]] = self.fact_processor.parse_facts(ps_output)
-
-                # TODO: #noqa: FIX002, TD003, TD002
-                # Fix code documentation: fully document all classes and functions to this point
-                # Fix logging so only log errors if not also raising exception, instead of both
-                # Test fact processor package - create a fake process snapshot and put it into
-                # the expected format and try to parse
-
-                output = self.compliance_engine.run(self.active_rules, facts)
-                print("\n\t==============\tCompliance Report:\t==============\n\n")  # noqa: T201
-                for k, v in output.items():
-                    print(f"{k}:\n")  # noqa: T201
-                    for _val in v:
-                        print(f"\t{_val.name} : {_val.description}\n")  # noqa: T201
-
-                elapsed = time.monotonic() - loop_start
-                time.sleep(max(0,
-                               min(self.run_condition.interval - int(elapsed),
-                                   self.cli_context.time_limit - int(elapsed)
-                                   )
-                               ))
+            if self.pipeline_threads:
+                self.run_threaded()
+            else:
+                self.run_serial()
             print(f'While Loop Complete')
 
         except KeyboardInterrupt:
@@ -162,6 +382,10 @@ class Main:
             logger.error(err)
         finally:
             logger.info(f'Shutting down')
+            self.compliance_engine.close()
+            self.report_writer.close()
+            if self.recorder is not None:
+                self.recorder.close()
             if self.cli_context.create_process_flag:
                 # python created the process
                 self.process_handler.shutdown_all()
@@ -176,20 +400,127 @@ class Main:
 if __name__ == "__main__":
     fact_processor = FactProcessor()
 
+    profiler = (
+        RuleProfiler(
+            dump_path=project_root / cfg.get("profile_dump_path"),
+            dump_interval=cfg.get("profile_dump_interval"),
+        )
+        if cfg.get("profile_rules")
+        else None
+    )
+    dispatcher = (
+        ActionDispatcher(
+            workers=cfg.get("action_workers"),
+            max_queue=cfg.get("action_queue_size"),
+            cooldown=cfg.get("action_cooldown"),
+            policy=OverflowPolicy(cfg.get("action_overflow_policy")),
+        )
+        if cfg.get("action_workers")
+        else None
+    )
+    transitions = (
+        TransitionTracker(cfg.get("report_checkpoint_interval"))
+        if cfg.get("report_transitions")
+        else None
+    )
+    capacity = cfg.get("fail_event_capacity")
+    events = FailEventStore(capacity) if capacity else None
+    history = None
+    if cfg.get("history_path"):
+        history_path = project_root / cfg.get("history_path")
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        retention_days = cfg.get("history_retention_days")
+        history = SqliteHistory(
+            history_path,
+            retention=retention_days * 86400 if retention_days else None,
+            compact_interval=cfg.get("history_compact_interval"),
+        )
+    metrics = None
+    metrics_server = None
+    if cfg.get("metrics_port") or cfg.get("metrics_socket"):
+        metrics = AuditorMetrics()
+        metrics_socket = cfg.get("metrics_socket")
+        metrics_server = MetricsServer(
+            metrics.registry,
+            host=cfg.get("metrics_host"),
+            port=cfg.get("metrics_port") or 0,
+            unix_socket=project_root / metrics_socket if metrics_socket else None,
+        ).start()
+        logger.info(f"Serving metrics on {metrics_server.address}")
+    workers = cfg.get("evaluation_workers")
+    if not workers:
+        compliance_engine = ComplianceEngine(
+            budget=cfg.get("evaluation_budget"),
+            profiler=profiler,
+            dispatcher=dispatcher,
+            transitions=transitions,
+            events=events,
+            history=history,
+            metrics=metrics,
+            aggregate_top_k=cfg.get("report_top_offenders"),
+        )
+    else:
+        compliance_engine = ShardedComplianceEngine(
+            workers=workers,
+            dispatcher=dispatcher,
+            transitions=transitions,
+            events=events,
+            history=history,
+            metrics=metrics,
+            aggregate_top_k=cfg.get("report_top_offenders"),
+        )
+
     engines = EngineBundle(
-        rules=RulesEngine(fact_processor.get_all_facts),
-        compliance=ComplianceEngine(),
+        rules=RulesEngine(
+            fact_processor.get_all_facts,
+            cache=RuleCache(project_root / cfg.get("rules_cache_path")),
+        ),
+        compliance=compliance_engine,
         facts=fact_processor,
     )
 
+    report_sinks = []
+    if cfg.get("report_console"):
+        report_sinks.append(ReportSink(ConsoleRenderer(), sys.stdout))
+    if cfg.get("report_jsonl_path"):
+        report_sinks.append(
+            ReportSink.to_file(JsonLinesRenderer(), project_root / cfg.get("report_jsonl_path")),
+        )
+    if cfg.get("report_binary_path"):
+        report_sinks.append(
+            ReportSink.to_file(BinaryRenderer(), project_root / cfg.get("report_binary_path")),
+        )
+
+    recorder = (
+        SnapshotRecorder(
+            project_root / cfg.get("record_path"),
+            codec=cfg.get("record_codec"),
+            segment_size=cfg.get("record_segment_bytes"),
+            segment_duration=cfg.get("record_segment_seconds"),
+            max_bytes=cfg.get("record_max_bytes"),
+        )
+        if cfg.get("record_path")
+        else None
+    )
+
     runtime = RuntimeBundle(
         process_handler=ProcessHandler(),
-        snapshot_manager=SnapshotManager(),
+        snapshot_manager=SnapshotManager(metrics=metrics),
+        report_writer=ReportWriter(report_sinks, threaded=cfg.get("report_writer_thread")),
+        recorder=recorder,
+        metrics=metrics,
     )
 
     cli_arg_parser = CliArgParser()
     context = AppContext(
         cli=cli_arg_parser.get_context(),
+        pipeline_threads=cfg.get("pipeline_threads"),
+        overrun_policy=OverrunPolicy(cfg.get("schedule_overrun_policy")),
+        schedule_jitter=cfg.get("schedule_jitter"),
+        source_intervals={
+            source: parse_duration(interval)
+            for source, interval in (cfg.get("source_intervals") or {}).items()
+        },
     )
 
     main = Main(
@@ -197,4 +528,8 @@ if __name__ == "__main__":
         runtime=runtime,
         context=context,
     )
-    main.main()
+    try:
+        main.main()
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
@@ -0,0 +1,120 @@
+"""Replay recorded process snapshots through the active rules, as fast as they can be read."""
+
+import argparse
+import sys
+from pathlib import Path
+
+from core.compliance_engine import ComplianceEngine
+from core.fact_processor.fact_processor import FactProcessor
+from core.replay.replay import Replay, ReplayStats, read_recording
+from core.reporting.renderers import JsonLinesRenderer
+from core.reporting.report_writer import ReportSink, ReportWriter
+from core.rules_engine.rules_engine import RulesEngine
+from shared.custom_exceptions import (
+    FactNotFoundError,
+    InvalidRuleFilterError,
+    InvalidSegmentError,
+)
+from shared.services import logger
+
+TOP_FAILURES = 10
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the replay command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "recording",
+        type=Path,
+        help="Directory of segment files (record_path), one segment file, or a JSON Lines"
+        " file of snapshots.",
+    )
+    parser.add_argument(
+        "--rules-file",
+        type=Path,
+        help="TOML rule file, or directory of rule files, to test. Defaults to the project rules.",
+    )
+    parser.add_argument(
+        "-r",
+        "--rules",
+        nargs="+",
+        type=str,
+        help="Rule names, ids or selectors to test. Defaults to all available rules.",
+    )
+    parser.add_argument("--start", type=float, help="Replay snapshots taken from this time.")
+    parser.add_argument("--end", type=float, help="Replay snapshots taken up to this time.")
+    parser.add_argument(
+        "--pid",
+        type=int,
+        action="append",
+        help="Replay only the snapshots of this process. Repeatable.",
+    )
+    parser.add_argument("--report-jsonl", type=Path, help="Write each cycle's report here.")
+    parser.add_argument(
+        "--run-actions",
+        action="store_true",
+        help="Run the actions of failed rules. By default they are not run.",
+    )
+    return parser.parse_args(argv)
+
+
+def summary(stats: ReplayStats) -> str:
+    """Return the replay summary printed at the end of a replay."""
+    lines = [
+        (
+            f"Replayed {stats.snapshots} snapshots in {stats.cycles} cycles in "
+            f"{stats.elapsed:.2f} s ({stats.rate:,.0f} snapshots/s)"
+        ),
+        ", ".join(f"{status}: {count}" for status, count in stats.statuses.items()),
+    ]
+    if stats.failures:
+        lines.append("Most failed rules:")
+        lines.extend(
+            f"\t{rule_id}: {count}" for rule_id, count in stats.failures.most_common(TOP_FAILURES)
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Replay a recording and print its summary. Returns the exit status."""
+    args = parse_args(argv)
+    fact_processor = FactProcessor()
+    if args.rules_file is None:
+        rules_engine = RulesEngine(fact_processor.get_all_facts)
+    else:
+        rules_engine = RulesEngine(fact_processor.get_all_facts, toml_rules_path=args.rules_file)
+    try:
+        rules = rules_engine.match_rules(rules_engine.get_rules(), args.rules)
+    except InvalidRuleFilterError as err:
+        logger.error(err)
+        return 1
+
+    report_writer = (
+        ReportWriter([ReportSink.to_file(JsonLinesRenderer(), args.report_jsonl)])
+        if args.report_jsonl
+        else None
+    )
+    compliance_engine = ComplianceEngine()
+    replay = Replay(
+        fact_processor,
+        compliance_engine,
+        rules,
+        report_writer=report_writer,
+        run_actions=args.run_actions,
+    )
+    try:
+        stats = replay.run(read_recording(args.recording, args.start, args.end, args.pid))
+    except (FactNotFoundError, InvalidSegmentError, OSError, ValueError) as err:
+        logger.error(err)
+        return 1
+    finally:
+        compliance_engine.close()
+        if report_writer is not None:
+            report_writer.close()
+
+    sys.stdout.write(summary(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
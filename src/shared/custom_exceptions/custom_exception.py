@@ -31,3 +31,11 @@ class RuleWithNoAvailableFactError(Exception):
 
 class FactNotFoundError(Exception):
     """Raised when a Fact is not found or was not found."""
+
+
+class InvalidReportDataError(Exception):
+    """Raised when recorded report data cannot be decoded."""
+
+
+class InvalidSegmentError(Exception):
+    """Raised when a snapshot segment file cannot be read."""
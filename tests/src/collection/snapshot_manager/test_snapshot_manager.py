@@ -1,6 +1,6 @@
 from unittest.mock import MagicMock
 
-from collection.snapshot_manager.snapshot_manager import Probe
+from collection.snapshot_manager.snapshot_manager import Probe, SnapshotManager
 
 
 class TestSnapshotManager:
@@ -29,6 +29,26 @@ class TestSnapshotManager:
         assert len(all_snaps) == 1
         assert all_snaps[mock_probe.name][0] == {"data": "snapshot_result"}
 
+    def test_get_all_snapshots_of_sources(self, real_snapshot_manager, mock_probe):
+        """Only the probes named in `sources` are collected."""
+        real_snapshot_manager.add_probe(mock_probe)
+
+        assert real_snapshot_manager.get_all_snapshots(sources={"other"}) == {}
+        mock_probe.collect.assert_not_called()
+        assert list(real_snapshot_manager.get_all_snapshots(sources={"TestProbe"})) == ["TestProbe"]
+
     def test_empty_manager_returns_empty_dict(self, real_snapshot_manager):
         """Ensure no errors occur when calling snapshots on an empty manager."""
         assert real_snapshot_manager.get_all_snapshots() == {}
+
+    def test_collection_time_recorded_per_probe(self, mock_probe):
+        """With metrics, each probe's collection time is recorded under the probe name."""
+        metrics = MagicMock()
+        manager = SnapshotManager(metrics=metrics)
+        manager.add_probe(mock_probe)
+
+        manager.get_all_snapshots()
+
+        probe, seconds = metrics.observe_probe.call_args.args
+        assert probe == "TestProbe"
+        assert seconds >= 0
@@ -0,0 +1,213 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.compliance_engine import ComplianceEngine
+from core.compliance_engine.actions.action_dispatcher import ActionDispatcher, OverflowPolicy
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.rule_builder.parsers import cond
+
+
+def make_rule(name, execute=None):
+    return Rule(
+        name=name,
+        description=name,
+        condition=MagicMock(),
+        action=Action(name="act", execute=execute or MagicMock()),
+        source=SourceEnum.PROCESS,
+    )
+
+
+class Gate:
+    """Action blocking its worker until released, to fill the queue deterministically."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.started.set()
+        self.release.wait(5)
+
+
+@pytest.fixture
+def gate():
+    gate = Gate()
+    yield gate
+    gate.release.set()
+
+
+def blocked_dispatcher(gate, **kwargs: object):
+    """A one-worker dispatcher whose worker is busy with the gate action."""
+    dispatcher = ActionDispatcher(workers=1, **kwargs)
+    dispatcher.submit(make_rule("gate", gate))
+    assert gate.started.wait(5)
+    return dispatcher
+
+
+class TestActionDispatcher:
+    def test_runs_actions_off_thread(self):
+        ran_on = []
+        rule = make_rule("r", lambda: ran_on.append(threading.current_thread().name))
+        dispatcher = ActionDispatcher(workers=2)
+
+        assert dispatcher.submit(rule, 1)
+        assert dispatcher.join(5)
+
+        assert ran_on[0].startswith("action-worker")
+        metrics = dispatcher.metrics()
+        assert metrics.executed == 1
+        assert metrics.queue_depth == 0
+        dispatcher.close()
+
+    def test_pending_duplicates_are_dropped(self, gate):
+        dispatcher = blocked_dispatcher(gate)
+        rule = make_rule("r")
+
+        assert dispatcher.submit(rule, 1)
+        assert not dispatcher.submit(rule, 1)
+        assert dispatcher.submit(rule, 2)
+
+        gate.release.set()
+        dispatcher.close()
+        assert rule.action.execute.call_count == 2
+        assert dispatcher.metrics().deduplicated == 1
+
+    def test_cooldown(self):
+        now = [0.0]
+        rule = make_rule("r")
+        dispatcher = ActionDispatcher(cooldown=10, clock=lambda: now[0])
+
+        assert dispatcher.submit(rule, 1)
+        dispatcher.join(5)
+        now[0] = 5.0
+        assert not dispatcher.submit(rule, 1)
+        assert dispatcher.submit(rule, 2)
+        now[0] = 10.0
+        assert dispatcher.submit(rule, 1)
+
+        dispatcher.close()
+        assert rule.action.execute.call_count == 3
+        assert dispatcher.metrics().cooled_down == 1
+
+    def test_drop_new(self, gate):
+        dispatcher = blocked_dispatcher(gate, max_queue=2)
+        rules = [make_rule(f"r{i}") for i in range(4)]
+
+        accepted = [dispatcher.submit(rule) for rule in rules]
+
+        gate.release.set()
+        dispatcher.close()
+        assert accepted == [True, True, False, False]
+        assert [r.action.execute.call_count for r in rules] == [1, 1, 0, 0]
+        assert dispatcher.metrics().dropped == 2
+        assert dispatcher.metrics().max_queue_depth == 2
+
+    def test_drop_oldest(self, gate):
+        dispatcher = blocked_dispatcher(gate, max_queue=2, policy=OverflowPolicy.DROP_OLDEST)
+        rules = [make_rule(f"r{i}") for i in range(4)]
+
+        for rule in rules:
+            dispatcher.submit(rule)
+
+        gate.release.set()
+        dispatcher.close()
+        assert [r.action.execute.call_count for r in rules] == [0, 0, 1, 1]
+        assert dispatcher.metrics().dropped == 2
+
+    def test_coalesce(self, gate):
+        dispatcher = blocked_dispatcher(gate, max_queue=2, policy=OverflowPolicy.COALESCE)
+        first, second = make_rule("first"), make_rule("second")
+
+        assert dispatcher.submit(first, 1)
+        assert dispatcher.submit(second, 1)
+        assert dispatcher.submit(first, 2)  # merged into the waiting run of first
+        assert not dispatcher.submit(make_rule("third"), 1)
+        assert not dispatcher.submit(first, 2)  # already waiting, via the merged run
+
+        gate.release.set()
+        dispatcher.close()
+        assert first.action.execute.call_count == 1
+        metrics = dispatcher.metrics()
+        assert (metrics.coalesced, metrics.dropped, metrics.deduplicated) == (1, 1, 1)
+
+    def test_coalesce_keeps_one_waiting_run_per_rule(self, gate):
+        dispatcher = blocked_dispatcher(gate, policy=OverflowPolicy.COALESCE)
+        first, second = make_rule("first"), make_rule("second")
+
+        for pid in (1, 2, 3):
+            assert dispatcher.submit(first, pid)
+        assert dispatcher.submit(second, 1)
+
+        gate.release.set()
+        dispatcher.close()
+        assert first.action.execute.call_count == 1
+        assert second.action.execute.call_count == 1
+        assert dispatcher.metrics().coalesced == 2
+
+    def test_coalesce_after_run_started_queues_again(self, gate):
+        dispatcher = blocked_dispatcher(gate, policy=OverflowPolicy.COALESCE)
+        rule = make_rule("rule")
+        dispatcher.submit(rule, 1)
+        gate.release.set()
+        dispatcher.join()
+
+        assert dispatcher.submit(rule, 2)
+        dispatcher.close()
+        assert rule.action.execute.call_count == 2
+        assert dispatcher.metrics().coalesced == 0
+
+    def test_failing_action_counted(self):
+        def boom():
+            msg = "webhook down"
+            raise RuntimeError(msg)
+
+        dispatcher = ActionDispatcher()
+        dispatcher.submit(make_rule("boom", boom))
+        dispatcher.submit(make_rule("fine"))
+        dispatcher.close()
+
+        metrics = dispatcher.metrics()
+        assert (metrics.executed, metrics.errors) == (2, 1)
+
+    def test_latency_metrics(self, gate):
+        dispatcher = blocked_dispatcher(gate)
+        dispatcher.submit(make_rule("r"))
+        time.sleep(0.02)
+        gate.release.set()
+        dispatcher.close()
+
+        metrics = dispatcher.metrics()
+        assert metrics.max_wait >= 0.02
+        assert metrics.max_run >= 0.0
+        assert metrics.mean_wait > 0
+
+    def test_closed_dispatcher_rejects(self):
+        dispatcher = ActionDispatcher()
+        dispatcher.close()
+        assert not dispatcher.submit(make_rule("r"))
+
+
+def test_engine_never_blocks_on_actions(fake_fact_registry, gate):
+    dispatcher = ActionDispatcher(workers=1)
+    engine = ComplianceEngine(dispatcher=dispatcher)
+    slow = Rule(
+        name="slow",
+        description="slow",
+        condition=cond("age < 18"),
+        action=Action(name="gate", execute=gate),
+        source=SourceEnum.PROCESS,
+    )
+
+    start = time.perf_counter()
+    result = engine.run({"slow": slow}, {"process": {"pid": 4, "age": 30}})
+    elapsed = time.perf_counter() - start
+
+    assert result["failed"] == [slow]
+    assert gate.started.wait(5)
+    assert elapsed < 1
+    gate.release.set()
+    engine.close()
+    assert dispatcher.metrics().executed == 1
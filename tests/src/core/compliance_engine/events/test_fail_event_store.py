@@ -0,0 +1,97 @@
+import pytest
+
+from core.compliance_engine.compliance_engine import FailEvent
+from core.compliance_engine.events.fail_event_store import FailEventStore
+
+
+def make_event(rule_id, pid, at):
+    return FailEvent(
+        pid=pid,
+        proc_name="proc",
+        rule_id=rule_id,
+        rule_name=rule_id,
+        rule_message="",
+        time_registered=at,
+        time_occured=at,
+        failed_condition=None,
+    )
+
+
+def times(events):
+    return [event.time_registered for event in events]
+
+
+@pytest.fixture
+def store():
+    store = FailEventStore(capacity=5)
+    for i, (rule_id, pid) in enumerate([("a", 1), ("b", 1), ("a", 2), ("a", 1), ("c", 2)]):
+        store.add(make_event(rule_id, pid, float(i)))
+    return store
+
+
+class TestFailEventStore:
+    def test_fail_event_is_slotted(self):
+        assert not hasattr(make_event("a", 1, 0.0), "__dict__")
+
+    def test_capacity_must_be_positive(self):
+        with pytest.raises(ValueError, match="positive"):
+            FailEventStore(0)
+
+    def test_last_for_rule_newest_first(self, store):
+        assert times(store.last("a")) == [3.0, 2.0, 0.0]
+        assert times(store.last("a", 2)) == [3.0, 2.0]
+        assert store.last("a", 0) == []
+        assert store.last("missing") == []
+
+    def test_for_pid_in_time_range(self, store):
+        assert times(store.for_pid(1)) == [0.0, 1.0, 3.0]
+        assert times(store.for_pid(1, start=0.5, end=3.0)) == [1.0, 3.0]
+        assert times(store.for_pid(2, end=3.0)) == [2.0]
+        assert store.for_pid(99) == []
+
+    def test_between(self, store):
+        assert times(store.between(1.0, 3.5)) == [1.0, 2.0, 3.0]
+        assert times(store.between()) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_top_rules(self, store):
+        assert store.top_rules(2) == [("a", 3), ("b", 1)]
+
+    def test_ring_evicts_oldest_and_its_index_entries(self, store):
+        store.add(make_event("b", 3, 5.0))
+        store.add(make_event("b", 3, 6.0))
+
+        assert len(store) == 5
+        assert times(store.between()) == [2.0, 3.0, 4.0, 5.0, 6.0]
+        assert times(store.last("a")) == [3.0, 2.0]
+        assert times(store.last("b")) == [6.0, 5.0]
+        assert times(store.for_pid(1)) == [3.0]
+        assert store.top_rules(1) == [("a", 2)]
+
+    def test_indexes_stay_bounded(self):
+        store = FailEventStore(capacity=3)
+        for i in range(1000):
+            store.add(make_event(f"rule {i % 7}", i % 11, float(i)))
+
+        assert len(store) == 3
+        assert len(store._by_rule) == 3
+        assert sum(len(index.seqs) for index in store._by_pid.values()) <= 6
+        assert times(store.between()) == [997.0, 998.0, 999.0]
+
+    def test_earlier_registration_time_indexed_as_previous(self):
+        store = FailEventStore()
+        late = make_event("a", 1, 10.0)
+        early = make_event("a", 1, 5.0)
+        store.add(late)
+        store.add(early)
+
+        assert early.time_registered == 5.0
+        assert store.last("a") == [early, late]
+        assert store.between(9.0, 11.0) == [late, early]
+        assert store.between(4.0, 6.0) == []
+
+    def test_clear(self, store):
+        store.clear()
+
+        assert len(store) == 0
+        assert store.between() == []
+        assert store.top_rules() == []
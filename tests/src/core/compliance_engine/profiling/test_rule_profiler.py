@@ -0,0 +1,157 @@
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.compliance_engine import ComplianceEngine
+from core.compliance_engine.profiling.rule_profiler import ProfilingEvaluator, RuleProfiler
+from core.rules_engine.eval.condition_evaluator import ConditionEvaluator
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.rule_builder.combinators import all_of, any_of
+from core.rules_engine.rule_builder.parsers import cond
+
+
+def make_rule(name, condition, group="", priority=0):
+    return Rule(
+        name=name,
+        description=name,
+        condition=condition,
+        action=Action(name="noop", execute=MagicMock()),
+        source=SourceEnum.PROCESS,
+        mutually_exclusive_group=group,
+        priority=priority,
+    )
+
+
+@pytest.fixture
+def rules(fake_fact_registry):
+    rules = [
+        make_rule("adult", cond("age >= 18")),
+        make_rule("gold adult", all_of(cond("age >= 18"), cond("membership == gold"))),
+        make_rule("many cpus", any_of(cond("cpu_count > 64"), cond("cpu_count < 2"))),
+    ]
+    return {rule.id: rule for rule in rules}
+
+
+def by_name(stats, rules):
+    return {rules[rule_id].name: value for rule_id, value in stats.items()}
+
+
+class TestRuleProfiler:
+    def test_counts_rule_outcomes(self, rules):
+        profiler = RuleProfiler()
+        engine = ComplianceEngine(profiler=profiler)
+
+        engine.run(rules, {"process": {"age": 30, "membership": "silver", "cpu_count": 8}})
+        engine.run(rules, {"process": {"age": 10, "membership": "gold", "cpu_count": 8}})
+
+        stats = by_name(profiler.rule_stats(), rules)
+        assert stats["adult"].evaluations == 2
+        assert (stats["adult"].passed, stats["adult"].failed) == (1, 1)
+        assert (stats["gold adult"].passed, stats["gold adult"].failed) == (0, 2)
+        assert (stats["many cpus"].passed, stats["many cpus"].failed) == (0, 2)
+        assert stats["adult"].fired == 1
+        assert stats["adult"].last_failure is not None
+        assert stats["adult"].total_ns > 0
+        assert stats["adult"].max_ns <= stats["adult"].total_ns
+
+    def test_counts_leaves(self, rules):
+        profiler = RuleProfiler()
+        engine = ComplianceEngine(profiler=profiler)
+
+        engine.run(rules, {"process": {"age": 30, "membership": "silver", "cpu_count": 8}})
+
+        leaves = dict(profiler.slowest_leaves(n=10))
+        assert leaves["age >= 18"].evaluations == 2
+        assert leaves["age >= 18"].passed == 2
+        assert leaves["membership == 'gold'"].failed == 1
+        assert leaves["cpu_count > 64"].failed == 1
+        assert leaves["cpu_count < 2"].failed == 1
+
+    def test_leaves_disabled(self, rules):
+        profiler = RuleProfiler(leaves=False)
+        engine = ComplianceEngine(profiler=profiler)
+        assert engine.condition_evaluator is ConditionEvaluator
+
+        engine.run(rules, {"process": {"age": 30, "membership": "silver", "cpu_count": 8}})
+
+        assert profiler.leaf_stats() == {}
+        assert len(profiler.rule_stats()) == 3
+
+    def test_profiling_evaluator_matches_plain_evaluator(self, rules):
+        evaluator = ProfilingEvaluator(RuleProfiler())
+        for facts in (
+            {"age": 30, "membership": "gold", "cpu_count": 1},
+            {"age": 3, "membership": "silver", "cpu_count": 8},
+        ):
+            for rule in rules.values():
+                assert evaluator.evaluate(rule.condition, facts) == ConditionEvaluator.evaluate(
+                    rule.condition,
+                    facts,
+                )
+
+    def test_slowest_and_never_fired(self, rules):
+        profiler = RuleProfiler()
+        engine = ComplianceEngine(profiler=profiler)
+        engine.run(rules, {"process": {"age": 30, "membership": "gold", "cpu_count": 8}})
+
+        assert len(profiler.slowest(2)) == 2
+        never = profiler.never_fired(rules)
+        assert [rules[rule_id].name for rule_id in never] == ["adult", "gold adult"]
+
+    def test_threads_merge(self, rules):
+        profiler = RuleProfiler()
+        engine = ComplianceEngine(profiler=profiler)
+        facts = {"process": {"age": 30, "membership": "gold", "cpu_count": 8}}
+
+        def run():
+            for _ in range(50):
+                engine.run(rules, facts)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert {stats.evaluations for stats in profiler.rule_stats().values()} == {200}
+
+    def test_reset(self, rules):
+        profiler = RuleProfiler()
+        ComplianceEngine(profiler=profiler).run(rules, {"process": {"age": 1, "cpu_count": 8}})
+        profiler.reset()
+        assert profiler.rule_stats() == {}
+        assert profiler.leaf_stats() == {}
+
+
+class TestDump:
+    def test_periodic_dump(self, rules, tmp_path):
+        now = [0.0]
+        path = tmp_path / "profile" / "rules.json"
+        profiler = RuleProfiler(dump_path=path, dump_interval=10, clock=lambda: now[0])
+        engine = ComplianceEngine(profiler=profiler)
+        facts = {"process": {"age": 30, "membership": "gold", "cpu_count": 8}}
+
+        engine.run(rules, facts)
+        assert not path.exists()
+
+        now[0] = 10.0
+        engine.run(rules, facts)
+        data = json.loads(path.read_text())
+        assert {entry["name"] for entry in data["rules"].values()} == {
+            "adult",
+            "gold adult",
+            "many cpus",
+        }
+        assert all(entry["evaluations"] == 2 for entry in data["rules"].values())
+        assert "age >= 18" in data["leaves"]
+
+    def test_close_writes_final_dump(self, rules, tmp_path):
+        path = tmp_path / "rules.json"
+        engine = ComplianceEngine(profiler=RuleProfiler(dump_path=path))
+        engine.run(rules, {"process": {"age": 30, "membership": "gold", "cpu_count": 8}})
+
+        engine.close()
+
+        assert json.loads(path.read_text())["rules"]
@@ -0,0 +1,50 @@
+import pytest
+
+from core.compliance_engine.sharding.fact_columns import FactColumns
+
+
+def round_trip(rows):
+    packed = FactColumns.pack(rows)
+    try:
+        attached = FactColumns.attach(packed.name)
+        try:
+            return attached.rows()
+        finally:
+            attached.close()
+    finally:
+        packed.close()
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1, -2, 2**62],
+        [1.5, 2, -0.25],
+        [True, False, True],
+        ["gold", "", "naïve"],
+        [{"nested": 1}, [1, 2], "mixed"],
+        [2**70, 1, 2],
+    ],
+)
+def test_column_round_trip(values):
+    rows = [{"value": v} for v in values]
+    assert round_trip(rows) == rows
+
+
+def test_missing_and_none_preserved():
+    rows = [{"a": 1, "b": None}, {"b": "x"}, {}]
+    assert round_trip(rows) == rows
+
+
+def test_types_preserved_per_column():
+    rows = round_trip([{"i": 3, "f": 3.0, "b": True}])
+    assert [type(v) for v in rows[0].values()] == [int, float, bool]
+
+
+def test_empty_rows():
+    assert round_trip([]) == []
+
+
+def test_bytes_round_trip():
+    rows = [{"a": 1, "s": "x"}, {"a": None, "s": "yz"}]
+    assert FactColumns.decode(FactColumns.encode(rows)) == rows
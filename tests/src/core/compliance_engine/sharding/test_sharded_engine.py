@@ -0,0 +1,258 @@
+import pickle
+import subprocess
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.compliance_engine import (
+    ComplianceEngine,
+    InterpreterComplianceEngine,
+    ShardedComplianceEngine,
+)
+from core.compliance_engine.events.fail_event_store import FailEventStore
+from core.compliance_engine.sharding import interpreter_engine
+from core.compliance_engine.transitions.transition_tracker import TransitionTracker
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.model.temporal import Temporal, TemporalKind
+from core.rules_engine.rule_builder.parsers import cond
+
+
+def make_rule(name, expr, group="", priority=0):
+    return Rule(
+        name=name,
+        description=name,
+        condition=cond(expr),
+        action=Action(name="noop", execute=MagicMock()),
+        source=SourceEnum.PROCESS,
+        mutually_exclusive_group=group,
+        priority=priority,
+    )
+
+
+@pytest.fixture
+def rules(fake_fact_registry):
+    rules = [make_rule(f"age over {i}", f"age > {i}") for i in range(0, 60, 5)]
+    rules += [
+        make_rule("member", "membership == gold"),
+        make_rule("tier warn", "cpu_count < 4", group="cpu", priority=1),
+        make_rule("tier kill", "cpu_count < 16", group="cpu", priority=9),
+    ]
+    return {rule.id: rule for rule in rules}
+
+
+@pytest.fixture(params=[ShardedComplianceEngine, InterpreterComplianceEngine])
+def engine(request):
+    if (
+        request.param is InterpreterComplianceEngine
+        and interpreter_engine.InterpreterPoolExecutor is None
+    ):
+        pytest.skip("subinterpreters require Python 3.14")
+    engine = request.param(workers=2, shards=3)
+    yield engine
+    engine.close()
+
+
+def names(rules):
+    return [rule.name for rule in rules]
+
+
+def test_matches_in_process_engine(engine, rules):
+    factsheets = {"process": {"age": 22, "membership": "gold", "cpu_count": 32}}
+
+    expected = ComplianceEngine().run(rules, factsheets)
+    for rule in rules.values():
+        rule.action.execute.reset_mock()
+    result = engine.run(rules, factsheets)
+
+    assert {key: names(value) for key, value in result.items()} == {
+        key: names(value) for key, value in expected.items()
+    }
+    assert names(result["suppressed"]) == ["tier warn"]
+    for rule in result["failed"]:
+        rule.action.execute.assert_called_once()
+
+
+def test_rows_fail_rule_on_any_row(engine, rules):
+    rows = [
+        {"age": 70, "membership": "gold", "cpu_count": 32},
+        {"age": 12, "membership": "silver", "cpu_count": 32},
+    ]
+
+    result = engine.run(rules, {"process": rows})
+
+    failing = {rule.name: engine.last_failures[rule.id] for rule in result["failed"]}
+    assert failing["member"] == [1]
+    assert failing["age over 15"] == [1]
+    assert "age over 10" not in failing
+    assert failing["tier kill"] == [0, 1]
+    assert names(result["suppressed"]) == ["tier warn"]
+
+
+def test_group_decided_per_row(engine, fake_fact_registry):
+    crit = make_rule("tier crit", "cpu_count < 80", group="cpu", priority=9)
+    warn = make_rule("tier warn", "cpu_count < 60", group="cpu", priority=1)
+    rules = {crit.id: crit, warn.id: warn}
+    engine.dispatcher = MagicMock()
+    rows = [{"pid": 1, "cpu_count": 90}, {"pid": 2, "cpu_count": 70}]
+
+    result = engine.run(rules, {"process": rows})
+
+    assert names(result["failed"]) == ["tier crit", "tier warn"]
+    assert result["suppressed"] == []
+    assert engine.last_failures == {crit.id: [0], warn.id: [1]}
+    submitted = [(call.args[0].name, call.args[1]) for call in engine.dispatcher.submit.mock_calls]
+    assert submitted == [("tier crit", 1), ("tier warn", 2)]
+    rows_by_status = {
+        (rule.name, row["pid"]): status
+        for rule, row, status in engine._result_facts(result, {"process": rows})
+    }
+    assert rows_by_status[("tier warn", 1)] == "suppressed"
+    assert rows_by_status[("tier warn", 2)] == "failed"
+
+
+def test_pending_temporal_tier_does_not_suppress_lower_tiers(engine, fake_fact_registry):
+    crit = make_rule("tier crit", "cpu_count < 80", group="cpu", priority=9)
+    object.__setattr__(crit, "temporal", Temporal(TemporalKind.CONSECUTIVE, count=2))
+    warn = make_rule("tier warn", "cpu_count < 60", group="cpu", priority=1)
+    rules = {crit.id: crit, warn.id: warn}
+    factsheets = {"process": {"pid": 1, "cpu_count": 90}}
+
+    serial = ComplianceEngine()
+    expected = [serial.run(rules, factsheets) for _ in range(2)]
+    for rule in rules.values():
+        rule.action.execute.reset_mock()
+    results = [engine.run(rules, factsheets) for _ in range(2)]
+
+    for result, serial_result in zip(results, expected, strict=True):
+        assert {key: names(value) for key, value in result.items()} == {
+            key: names(value) for key, value in serial_result.items()
+        }
+    assert names(results[0]["pending"]) == ["tier crit"]
+    assert names(results[0]["failed"]) == ["tier warn"]
+    assert names(results[1]["suppressed"]) == ["tier warn"]
+    crit.action.execute.assert_called_once()
+    warn.action.execute.assert_called_once()
+
+
+def test_temporal_rule_applied_per_row(engine, fake_fact_registry):
+    rule = make_rule("young", "age < 20")
+    object.__setattr__(rule, "temporal", Temporal(TemporalKind.CONSECUTIVE, count=2))
+    rules = {rule.id: rule}
+
+    first = engine.run(rules, {"process": [{"pid": 1, "age": 30}, {"pid": 2, "age": 10}]})
+    # Rows are matched to their state by pid, not by position.
+    second = engine.run(rules, {"process": [{"pid": 2, "age": 30}, {"pid": 1, "age": 30}]})
+
+    assert first["pending"] == [rule]
+    assert second["failed"] == [rule]
+    rule.action.execute.assert_called_once()
+
+
+def test_transitions_tracked_per_row(engine, fake_fact_registry):
+    rule = make_rule("young", "age < 20")
+    rules = {rule.id: rule}
+    engine.transitions = TransitionTracker()
+    rows = [{"pid": 1, "age": 30}, {"pid": 2, "age": 30}]
+
+    engine.run(rules, {"process": rows})
+    rows[1]["age"] = 10
+    result = engine.run(rules, {"process": rows})
+
+    assert result["passed"] == [rule]
+    assert [(t.pid, t.previous, t.current) for t in engine.last_transitions] == [
+        (2, "failed", "passed"),
+    ]
+
+
+def test_fail_event_per_failing_row(engine, fake_fact_registry):
+    rule = make_rule("young", "age < 20")
+    engine.events = FailEventStore()
+    rows = [{"pid": 1, "age": 30}, {"pid": 2, "age": 10}, {"pid": 3, "age": 40}]
+
+    engine.run({rule.id: rule}, {"process": rows})
+
+    assert [event.pid for event in engine.events.last(rule.id)] == [3, 1]
+
+
+def test_pool_reused_until_rules_change(engine, rules):
+    factsheets = {"process": {"age": 99, "membership": "gold", "cpu_count": 1}}
+    engine.run(rules, factsheets)
+    pool = engine._pool
+
+    engine.run(dict(rules), factsheets)
+    assert engine._pool is pool
+
+    fewer = dict(list(rules.items())[1:])
+    engine.run(fewer, factsheets)
+    assert engine._pool is not pool
+
+
+def test_pool_kept_while_due_rules_vary(engine, rules):
+    factsheets = {"process": {"age": 99, "membership": "silver", "cpu_count": 1}}
+    engine.transitions = TransitionTracker()
+    engine.run(rules, factsheets)
+    pool = engine._pool
+    member = next(rule for rule in rules.values() if rule.name == "member")
+
+    result = engine.run(rules, factsheets, due={member.id})
+
+    assert engine._pool is pool
+    assert not any(result.values())
+    assert member.action.execute.call_count == 2
+    assert [t.rule.name for t in engine.last_transitions] == []
+
+
+def test_budget_rejected(engine, rules):
+    with pytest.raises(ValueError, match="Budgeted"):
+        engine.run(rules, {"process": {}}, budget=1.0)
+
+
+@pytest.mark.skipif(
+    interpreter_engine.InterpreterPoolExecutor is not None,
+    reason="subinterpreters available",
+)
+def test_interpreter_engine_requires_subinterpreters():
+    with pytest.raises(RuntimeError):
+        InterpreterComplianceEngine()
+
+
+# A fresh interpreter: unpickles the initializer arguments before running them,
+# without the project's source on sys.path.
+FRESH_WORKER = """
+import pickle, sys
+code, namespace = pickle.loads(sys.stdin.buffer.read())
+exec(code, namespace)
+from core.compliance_engine.sharding import worker
+print(sum(len(shard) for shard in worker._shards))
+"""
+
+
+def test_interpreter_bootstrap_runs_in_fresh_interpreter(rules):
+    shards = ShardedComplianceEngine(workers=1, shards=2)._partition(rules)
+
+    worker = subprocess.run(  # noqa: S603 - runs this interpreter on fixed code
+        [sys.executable, "-I", "-c", FRESH_WORKER],
+        input=pickle.dumps(interpreter_engine.bootstrap_args(shards)),
+        capture_output=True,
+        check=True,
+    )
+
+    assert int(worker.stdout) == sum(len(shard) for shard in shards)
+
+
+def test_aggregates_rows_per_rule(fake_fact_registry):
+    young = make_rule("young", "age < 40")
+    rows = [
+        {"pid": pid, "age": age, "membership": "gold", "cpu_count": 8}
+        for pid, age in [(1, 50), (2, 20), (3, 70)]
+    ]
+    engine = ShardedComplianceEngine(workers=1, aggregate_top_k=1)
+    try:
+        engine.run({young.id: young}, {"process": rows})
+    finally:
+        engine.close()
+
+    (aggregate,) = engine.last_aggregates
+    assert (aggregate.processes, aggregate.failing) == (3, 2)
+    assert [offender.pid for offender in aggregate.offenders] == [3]
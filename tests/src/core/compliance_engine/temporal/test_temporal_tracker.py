@@ -0,0 +1,95 @@
+from core.compliance_engine.temporal.temporal_tracker import TemporalTracker
+from core.rules_engine.model.temporal import Temporal, TemporalKind
+
+FOR_10S = Temporal(TemporalKind.FOR, seconds=10)
+THREE_IN_A_ROW = Temporal(TemporalKind.CONSECUTIVE, count=3)
+THREE_IN_60S = Temporal(TemporalKind.WITHIN, count=3, seconds=60)
+
+
+def feed(tracker, temporal, outcomes, pid=1, rule_id="r"):
+    """Observe (ok, now) pairs, returning whether the rule failed after each."""
+    return [tracker.observe(rule_id, temporal, pid, ok=ok, now=now) for ok, now in outcomes]
+
+
+class TestStateMachines:
+    def test_for_duration(self):
+        tracker = TemporalTracker()
+        assert feed(tracker, FOR_10S, [(False, 0), (False, 5), (False, 10), (False, 11)]) == [
+            False,
+            False,
+            True,
+            True,
+        ]
+
+    def test_for_resets_on_pass(self):
+        tracker = TemporalTracker()
+        assert feed(tracker, FOR_10S, [(False, 0), (True, 5), (False, 9), (False, 15)]) == [
+            False,
+            False,
+            False,
+            False,
+        ]
+        assert len(tracker) == 1
+
+    def test_consecutive(self):
+        tracker = TemporalTracker()
+        outcomes = [(False, 0), (False, 1), (True, 2), (False, 3), (False, 4), (False, 5)]
+        assert feed(tracker, THREE_IN_A_ROW, outcomes) == [
+            False,
+            False,
+            False,
+            False,
+            False,
+            True,
+        ]
+
+    def test_within_window(self):
+        tracker = TemporalTracker()
+        outcomes = [(False, 0), (True, 10), (False, 20), (False, 70), (False, 75)]
+        # The third failure at 70 is outside the window of the first at 0.
+        assert feed(tracker, THREE_IN_60S, outcomes) == [False, False, False, False, True]
+
+    def test_within_state_expires_after_window(self):
+        tracker = TemporalTracker()
+        feed(tracker, THREE_IN_60S, [(False, 0), (True, 30)])
+        assert len(tracker) == 1
+        feed(tracker, THREE_IN_60S, [(True, 61)])
+        assert len(tracker) == 0
+
+    def test_changed_qualifier_restarts(self):
+        tracker = TemporalTracker()
+        feed(tracker, THREE_IN_A_ROW, [(False, 0), (False, 1)])
+        assert feed(tracker, Temporal(TemporalKind.CONSECUTIVE, count=4), [(False, 2)]) == [False]
+
+
+class TestBoundedMemory:
+    def test_passing_rules_keep_no_state(self):
+        tracker = TemporalTracker()
+        for i in range(100):
+            tracker.observe(f"r{i}", FOR_10S, 1, ok=True, now=0)
+        assert len(tracker) == 0
+
+    def test_states_are_per_pid(self):
+        tracker = TemporalTracker()
+        feed(tracker, THREE_IN_A_ROW, [(False, 0), (False, 1)], pid=1)
+        assert feed(tracker, THREE_IN_A_ROW, [(False, 2)], pid=2) == [False]
+        assert feed(tracker, THREE_IN_A_ROW, [(False, 3)], pid=1) == [True]
+
+    def test_lru_eviction(self):
+        tracker = TemporalTracker(max_states=3)
+        for i in range(5):
+            tracker.observe(f"r{i}", FOR_10S, 1, ok=False, now=i)
+        assert len(tracker) == 3
+        assert tracker.evicted == 2
+        # r0 was evicted: its timer restarts.
+        assert not tracker.observe("r0", FOR_10S, 1, ok=False, now=20)
+        assert tracker.observe("r4", FOR_10S, 1, ok=False, now=20)
+
+    def test_dead_processes_evicted(self):
+        tracker = TemporalTracker()
+        for pid in (1, 2, 3):
+            tracker.observe("r", FOR_10S, pid, ok=False, now=0)
+        tracker.retain_processes([2])
+        assert len(tracker) == 1
+        tracker.forget_process(2)
+        assert len(tracker) == 0
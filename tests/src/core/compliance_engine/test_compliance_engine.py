@@ -1,9 +1,22 @@
-from unittest.mock import MagicMock
+import threading
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from core.compliance_engine import ComplianceEngine
+from core.compliance_engine.events.fail_event_store import FailEventStore
+from core.compliance_engine.transitions.transition_tracker import TransitionTracker
+from core.metrics.auditor_metrics import AuditorMetrics
+from core.reporting.aggregate import Offender
+from core.rules_engine.eval.condition_evaluator import ConditionEvaluator
+from core.rules_engine.model.condition import Condition
+from core.rules_engine.model.field import FieldRef
+from core.rules_engine.model.import_action import ImportPathCallable
 from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.model.temporal import Temporal, TemporalKind
+from core.rules_engine.rule_builder.combinators import all_of
+from core.rules_engine.rule_builder.parsers import cond
+from shared._common.operators import Operator
 
 
 @pytest.fixture
@@ -160,3 +173,407 @@ class TestExecutionContract:
         )
 
         rule.action.execute.assert_not_called()
+
+    def test_unresolvable_import_action_does_not_stop_the_cycle(
+        self, engine, evaluator, factsheets,
+    ):
+        broken = Rule(
+            name="broken",
+            description="broken",
+            condition=MagicMock(),
+            action=Action(name="missing", execute=ImportPathCallable("missing_module:handler")),
+            source=SourceEnum.PROCESS,
+        )
+        other = make_rule("other")
+        evaluator.evaluate.return_value = False
+
+        result = engine.run({"broken": broken, "other": other}, factsheets)
+
+        assert result["failed"] == [broken, other]
+        other.action.execute.assert_called_once()
+
+
+class FakeClock:
+    """Clock advancing by `step` seconds per call."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def make_rules(priorities):
+    rules = {}
+    for i, priority in enumerate(priorities):
+        rule = make_rule(name=f"rule {i}")
+        object.__setattr__(rule, "priority", priority)
+        rules[f"r{i}"] = rule
+    return rules
+
+
+class TestBudgetedEvaluation:
+    def test_no_budget_evaluates_everything(self, engine, evaluator, factsheets):
+        evaluator.evaluate.return_value = True
+        result = engine.run(make_rules([0, 1, 2]), factsheets)
+
+        assert len(result["passed"]) == 3
+        assert "deferred" not in result
+        assert engine.last_cycle is None
+
+    def test_higher_priority_evaluated_first(self, evaluator, factsheets):
+        evaluator.evaluate.return_value = True
+        engine = ComplianceEngine(evaluator, budget=2.5, min_stale=0, clock=FakeClock(1.0))
+        rules = make_rules([0, 5, 1, 9])
+
+        result = engine.run(rules, factsheets)
+
+        assert result["passed"] == [rules["r3"], rules["r1"]]
+        assert result["deferred"] == [rules["r2"], rules["r0"]]
+        assert engine.last_cycle.coverage == 0.5
+        assert engine.last_cycle.deferred == ["r2", "r0"]
+
+    def test_deferred_rules_round_robin(self, evaluator, factsheets):
+        evaluator.evaluate.return_value = True
+        engine = ComplianceEngine(evaluator, budget=1.5, min_stale=0, clock=FakeClock(1.0))
+        rules = make_rules([0, 0, 0])
+
+        seen = [
+            [r.name for r in engine.run(rules, factsheets)["passed"]] for _ in range(3)
+        ]
+
+        assert seen == [["rule 0"], ["rule 1"], ["rule 2"]]
+        assert engine.last_cycle.max_staleness == 2
+
+    def test_rules_not_due_keep_their_staleness(self, evaluator, factsheets):
+        evaluator.evaluate.return_value = True
+        engine = ComplianceEngine(evaluator, budget=1.5, min_stale=0, clock=FakeClock(1.0))
+        rules = make_rules([0, 0, 0])
+
+        seen = [
+            [r.name for r in engine.run(rules, factsheets, due=due)["passed"]]
+            for due in (None, {"r0"}, None)
+        ]
+
+        assert seen == [["rule 0"], ["rule 0"], ["rule 1"]]
+
+    def test_min_stale_prevents_starvation(self, evaluator, factsheets):
+        evaluator.evaluate.return_value = True
+        engine = ComplianceEngine(evaluator, budget=1.5, min_stale=1, clock=FakeClock(1.0))
+        rules = make_rules([9, 0, 0])
+
+        passed = [
+            [r.name for r in engine.run(rules, factsheets)["passed"]] for _ in range(2)
+        ]
+
+        assert passed == [["rule 0", "rule 1"], ["rule 0", "rule 2"]]
+
+    def test_run_budget_overrides_engine_budget(self, evaluator, factsheets):
+        evaluator.evaluate.return_value = False
+        engine = ComplianceEngine(evaluator, clock=FakeClock(1.0), min_stale=0)
+        rules = make_rules([0, 0])
+
+        result = engine.run(rules, factsheets, budget=1.5)
+
+        assert len(result["failed"]) == 1
+        rules[engine.last_cycle.deferred[0]].action.execute.assert_not_called()
+
+
+def make_group(name, priorities):
+    rules = make_rules(priorities)
+    for rule in rules.values():
+        object.__setattr__(rule, "mutually_exclusive_group", name)
+    return rules
+
+
+class TestMutuallyExclusiveGroups:
+    def test_group_stops_at_first_failure_by_priority(self, engine, evaluator, factsheets):
+        rules = make_group("cpu", [60, 95, 80])
+        failing = {rules["r2"].condition, rules["r0"].condition}
+        evaluator.evaluate.side_effect = lambda condition, *_: (
+            condition not in failing
+        )
+
+        result = engine.run(rules, factsheets)
+
+        assert result["passed"] == [rules["r1"]]
+        assert result["failed"] == [rules["r2"]]
+        assert result["suppressed"] == [rules["r0"]]
+        rules["r2"].action.execute.assert_called_once()
+        rules["r0"].action.execute.assert_not_called()
+        assert evaluator.evaluate.call_count == 2
+
+    def test_group_all_passing(self, engine, evaluator, factsheets):
+        rules = make_group("cpu", [1, 2])
+        evaluator.evaluate.return_value = True
+
+        result = engine.run(rules, factsheets)
+
+        assert result["passed"] == [rules["r1"], rules["r0"]]
+        assert result["suppressed"] == []
+
+    def test_groups_and_single_rules_keep_first_appearance_order(
+        self, engine, evaluator, factsheets,
+    ):
+        single = make_rule(name="single")
+        group = make_group("mem", [1, 2])
+        rules = {"g0": group["r0"], "s": single, "g1": group["r1"]}
+        evaluator.evaluate.return_value = True
+
+        result = engine.run(rules, factsheets)
+
+        assert result["passed"] == [group["r1"], group["r0"], single]
+
+    def test_group_members_share_leaf_evaluations(self, factsheets):
+        cpu = FieldRef("cpu_count", int)
+        shared = Condition(FieldRef("age", int), Operator.GT, 18)
+        tiers = {}
+        for i, threshold in enumerate([4, 16, 32]):
+            rule = Rule(
+                name=f"tier {i}",
+                description="tier",
+                condition=all_of(shared, Condition(cpu, Operator.LT, threshold)),
+                action=Action(name="noop", execute=MagicMock()),
+                source=SourceEnum.PROCESS,
+                mutually_exclusive_group="cpu",
+                priority=i,
+            )
+            tiers[rule.name] = rule
+
+        with patch.object(
+            ConditionEvaluator, "_evaluate_single", wraps=ConditionEvaluator._evaluate_single,
+        ) as single:
+            result = ComplianceEngine().run(tiers, factsheets)
+
+        # cpu_count is 8: "< 32" and "< 16" pass, "< 4" fails.
+        assert [r.name for r in result["passed"]] == ["tier 2", "tier 1"]
+        assert [r.name for r in result["failed"]] == ["tier 0"]
+        assert single.call_count == 4
+
+    def test_budgeted_mode_schedules_group_as_unit(self, evaluator, factsheets):
+        evaluator.evaluate.return_value = True
+        engine = ComplianceEngine(evaluator, budget=1.5, min_stale=0, clock=FakeClock(1.0))
+        rules = {**make_group("cpu", [1, 2]), "solo": make_rule(name="solo")}
+
+        result = engine.run(rules, factsheets)
+
+        assert [r.name for r in result["passed"]] == ["rule 1", "rule 0"]
+        assert engine.last_cycle.deferred == ["solo"]
+
+
+def make_temporal_rule(name, expr, temporal, group="", priority=0):
+    return Rule(
+        name=name,
+        description=name,
+        condition=cond(expr),
+        action=Action(name="noop", execute=MagicMock()),
+        source=SourceEnum.PROCESS,
+        mutually_exclusive_group=group,
+        priority=priority,
+        temporal=temporal,
+    )
+
+
+class TestTemporalRules:
+    def test_fails_after_consecutive_failures(self, fake_fact_registry):
+        rule = make_temporal_rule("young", "age < 20", Temporal(TemporalKind.CONSECUTIVE, count=3))
+        engine = ComplianceEngine()
+        facts = {"process": {"pid": 7, "age": 30}}
+
+        outcomes = [engine.run({"r": rule}, facts) for _ in range(3)]
+
+        assert [o["pending"] for o in outcomes[:2]] == [[rule], [rule]]
+        assert outcomes[2]["failed"] == [rule]
+        rule.action.execute.assert_called_once()
+
+    def test_for_duration_uses_temporal_clock(self, fake_fact_registry):
+        now = [0.0]
+        rule = make_temporal_rule("young", "age < 20", Temporal(TemporalKind.FOR, seconds=30))
+        engine = ComplianceEngine(temporal_clock=lambda: now[0])
+        facts = {"process": {"pid": 7, "age": 30}}
+
+        assert engine.run({"r": rule}, facts)["pending"] == [rule]
+        now[0] = 29.0
+        assert engine.run({"r": rule}, facts)["pending"] == [rule]
+        now[0] = 30.0
+        assert engine.run({"r": rule}, facts)["failed"] == [rule]
+
+        facts["process"]["age"] = 10
+        assert engine.run({"r": rule}, facts)["passed"] == [rule]
+        assert len(engine.temporal) == 0
+
+    def test_state_dropped_when_process_gone(self, fake_fact_registry):
+        rule = make_temporal_rule("young", "age < 20", Temporal(TemporalKind.CONSECUTIVE, count=5))
+        engine = ComplianceEngine()
+        engine.run({"r": rule}, {"process": {"pid": 7, "age": 30}})
+        assert len(engine.temporal) == 1
+
+        engine.run({"r": rule}, {"process": {"pid": 8, "age": 30}})
+
+        assert len(engine.temporal) == 1
+        engine.forget_process(8)
+        assert len(engine.temporal) == 0
+
+    def test_pending_tier_does_not_suppress_group(self, fake_fact_registry):
+        kill = make_temporal_rule(
+            "kill",
+            "cpu_count < 16",
+            Temporal(TemporalKind.CONSECUTIVE, count=2),
+            group="cpu",
+            priority=9,
+        )
+        warn = make_temporal_rule("warn", "cpu_count < 4", None, group="cpu", priority=1)
+        engine = ComplianceEngine()
+        facts = {"process": {"pid": 1, "cpu_count": 32}}
+
+        first = engine.run({"k": kill, "w": warn}, facts)
+        second = engine.run({"k": kill, "w": warn}, facts)
+
+        assert first["pending"] == [kill]
+        assert first["failed"] == [warn]
+        assert second["failed"] == [kill]
+        assert second["suppressed"] == [warn]
+
+
+class TestTransitions:
+    @pytest.fixture
+    def rules(self, fake_fact_registry):
+        young = make_temporal_rule("young", "age < 20", None)
+        old = make_temporal_rule("old", "age > 60", None)
+        return {"y": young, "o": old}
+
+    def test_only_changes_reported(self, rules):
+        engine = ComplianceEngine(transitions=TransitionTracker())
+        facts = {"process": {"pid": 7, "age": 30}}
+
+        first = engine.run(rules, facts)
+        steady = engine.run(rules, facts)
+        facts["process"]["age"] = 10
+        changed = engine.run(rules, facts)
+
+        assert first["failed"] == [rules["y"], rules["o"]]
+        assert not any(steady.values())
+        assert changed["passed"] == [rules["y"]]
+        assert changed["failed"] == []
+        assert [t.kind for t in engine.last_transitions] == ["changed"]
+
+    def test_actions_still_run_every_cycle(self, rules):
+        engine = ComplianceEngine(transitions=TransitionTracker())
+        facts = {"process": {"pid": 7, "age": 30}}
+
+        engine.run(rules, facts)
+        engine.run(rules, facts)
+
+        assert rules["y"].action.execute.call_count == 2
+
+    def test_gone_when_process_or_rule_disappears(self, rules):
+        engine = ComplianceEngine(transitions=TransitionTracker())
+        engine.run(rules, {"process": {"pid": 7, "age": 30}})
+
+        result = engine.run({"y": rules["y"]}, {"process": {"pid": 8, "age": 30}})
+
+        assert result["failed"] == [rules["y"]]
+        assert result["gone"] == [rules["y"], rules["o"]]
+        assert {(t.rule.name, t.pid, t.kind) for t in engine.last_transitions} == {
+            ("young", 8, "new"),
+            ("young", 7, "gone"),
+            ("old", 7, "gone"),
+        }
+
+    def test_checkpoint_reports_everything(self, rules):
+        engine = ComplianceEngine(transitions=TransitionTracker(checkpoint_interval=2))
+        facts = {"process": {"pid": 7, "age": 30}}
+
+        engine.run(rules, facts)
+        checkpoint = engine.run(rules, facts)
+
+        assert checkpoint["failed"] == [rules["y"], rules["o"]]
+        assert checkpoint["gone"] == []
+
+    def test_deferred_rules_keep_their_state(self, fake_fact_registry):
+        rules = {
+            f"r{i}": make_temporal_rule(f"r{i}", "age < 20", None, priority=i) for i in range(3)
+        }
+        clock = FakeClock(step=1.0)
+        engine = ComplianceEngine(clock=clock, transitions=TransitionTracker(), min_stale=0)
+        facts = {"process": {"pid": 7, "age": 30}}
+        engine.run(rules, facts)
+
+        result = engine.run(rules, facts, budget=1.5)
+
+        assert result["deferred"] == []
+        assert not any(result.values())
+
+    def test_rules_not_due_keep_their_state(self, rules):
+        engine = ComplianceEngine(transitions=TransitionTracker())
+        facts = {"process": {"pid": 7, "age": 30}}
+        engine.run(rules, facts)
+
+        result = engine.run(rules, facts, due={"y"})
+
+        assert not any(result.values())
+        assert engine.last_transitions == []
+        assert rules["o"].action.execute.call_count == 1
+
+
+class TestFailEvents:
+    def test_event_recorded_for_every_failure(self, fake_fact_registry):
+        young = make_temporal_rule("young", "age < 20", None)
+        old = make_temporal_rule("old", "age > 60", None)
+        store = FailEventStore()
+        engine = ComplianceEngine(events=store)
+        facts = {"process": {"pid": 7, "name": "app", "age": 30, "snapshot_time": 12.5}}
+
+        engine.run({"y": young, "o": old}, facts)
+        engine.run({"y": young, "o": old}, facts)
+
+        assert store.top_rules() == [(young.id, 2), (old.id, 2)]
+        (event, _) = store.last(young.id)
+        assert (event.pid, event.proc_name, event.rule_name) == (7, "app", "young")
+        assert event.time_occured == 12.5
+        assert event.failed_condition is young.condition
+        assert len(store.for_pid(7)) == 4
+
+    def test_group_records_only_the_firing_tier(self, fake_fact_registry):
+        kill = make_temporal_rule("kill", "cpu_count < 16", None, group="cpu", priority=9)
+        warn = make_temporal_rule("warn", "cpu_count < 4", None, group="cpu", priority=1)
+        store = FailEventStore()
+
+        ComplianceEngine(events=store).run({"k": kill, "w": warn}, {"process": {"cpu_count": 32}})
+
+        assert store.top_rules() == [(kill.id, 1)]
+        assert store.last(kill.id)[0].pid is None
+
+
+class TestMetrics:
+    def test_results_counted_per_rule_and_status(self, fake_fact_registry):
+        young = make_temporal_rule("young", "age < 20", None)
+        old = make_temporal_rule("old", "age > 20", None)
+        metrics = AuditorMetrics()
+        engine = ComplianceEngine(metrics=metrics)
+
+        engine.run({"y": young, "o": old}, {"process": {"pid": 7, "age": 30}})
+        engine.run({"y": young, "o": old}, {"process": {"pid": 8, "age": 40}})
+
+        text = metrics.registry.render().decode()
+        assert f'auditor_rule_results_total{{rule="{young.id}",status="failed"}} 2\n' in text
+        assert f'auditor_rule_results_total{{rule="{old.id}",status="passed"}} 2\n' in text
+
+    def test_results_aggregated_per_thread(self, fake_fact_registry):
+        young = make_temporal_rule("young", "age < 20", None)
+        engine = ComplianceEngine(aggregate_top_k=3)
+        facts = {"process": {"pid": 7, "name": "app", "age": 30, "snapshot_time": 12.5}}
+
+        engine.run({"y": young}, facts)
+        other_thread = []
+        thread = threading.Thread(target=lambda: other_thread.append(engine.last_aggregates))
+        thread.start()
+        thread.join()
+
+        (aggregate,) = engine.last_aggregates
+        assert (aggregate.rule_id, aggregate.processes, aggregate.failing) == (young.id, 1, 1)
+        assert aggregate.offenders == (Offender(7, "app", 30),)
+        assert aggregate.first_failure == 12.5
+        assert other_thread == [()]
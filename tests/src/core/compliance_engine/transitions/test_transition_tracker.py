@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.compliance_engine.transitions.transition_tracker import Transition, TransitionTracker
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+
+
+def make_rule(name):
+    return Rule(
+        name=name,
+        description=name,
+        condition=MagicMock(),
+        action=Action(name="noop", execute=lambda: None),
+        source=SourceEnum.PROCESS,
+    )
+
+
+@pytest.fixture
+def rules():
+    return make_rule("a"), make_rule("b")
+
+
+def kinds(transitions):
+    return [(t.rule.name, t.pid, t.previous, t.current, t.kind) for t in transitions]
+
+
+class TestTransitionTracker:
+    def test_first_cycle_is_new(self, rules):
+        a, b = rules
+        tracker = TransitionTracker()
+
+        transitions, checkpoint = tracker.update([(a, 1, "passed"), (b, 1, "failed")])
+
+        assert kinds(transitions) == [
+            ("a", 1, None, "passed", "new"),
+            ("b", 1, None, "failed", "new"),
+        ]
+        assert not checkpoint
+        assert len(tracker) == 2
+
+    def test_steady_state_is_silent(self, rules):
+        a, b = rules
+        tracker = TransitionTracker()
+        tracker.update([(a, 1, "passed"), (b, 1, "failed")])
+
+        transitions, _ = tracker.update([(a, 1, "passed"), (b, 1, "failed")])
+
+        assert transitions == []
+
+    def test_changes_and_gone(self, rules):
+        a, b = rules
+        tracker = TransitionTracker()
+        tracker.update([(a, 1, "passed"), (a, 2, "passed"), (b, 1, "failed")])
+
+        transitions, _ = tracker.update([(a, 1, "failed"), (b, 1, "passed")])
+
+        assert kinds(transitions) == [
+            ("a", 1, "passed", "failed", "changed"),
+            ("b", 1, "failed", "passed", "changed"),
+            ("a", 2, "passed", None, "gone"),
+        ]
+        assert len(tracker) == 2
+
+    def test_kept_rules_are_not_gone(self, rules):
+        a, b = rules
+        tracker = TransitionTracker()
+        tracker.update([(a, 1, "passed"), (b, 1, "failed")])
+
+        transitions, _ = tracker.update([(a, 1, "passed")], keep={b.id})
+        assert transitions == []
+
+        transitions, _ = tracker.update([(a, 1, "passed"), (b, 1, "failed")])
+        assert transitions == []
+
+    def test_checkpoints(self, rules):
+        a, _ = rules
+        tracker = TransitionTracker(checkpoint_interval=3)
+
+        checkpoints = [tracker.update([(a, 1, "passed")])[1] for _ in range(6)]
+
+        assert checkpoints == [False, False, True, False, False, True]
+
+    def test_clear(self, rules):
+        a, _ = rules
+        tracker = TransitionTracker()
+        tracker.update([(a, 1, "passed")])
+        tracker.clear()
+
+        transitions, _ = tracker.update([(a, 1, "passed")])
+
+        assert transitions == [Transition(a, 1, None, "passed")]
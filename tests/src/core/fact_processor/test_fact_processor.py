@@ -73,6 +73,19 @@ class TestParseFacts:
         with pytest.raises(FactNotFoundError):
             processor.parse_facts(snapshots)
 
+    def test_parse_fact_rows_keeps_one_row_per_snapshot(self, processor):
+        processor.get_all_facts()
+        snapshot = {"membership": "gold", "nested": {"key": "value"}, "cpu_count": 8}
+
+        snapshots = {
+            SourceEnum.PROCESS.value: [{**snapshot, "age": 30}, {**snapshot, "age": 40}],
+        }
+
+        rows = processor.parse_fact_rows(snapshots)[SourceEnum.PROCESS.value]
+
+        assert [row["age"] for row in rows] == [30, 40]
+        assert rows[1]["nested.key"] == "value"
+
 
 class TestLogging:
     def test_warning_logged_on_invalid_path(self, processor, monkeypatch):
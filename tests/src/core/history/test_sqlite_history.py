@@ -0,0 +1,146 @@
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.compliance_engine import ComplianceEngine
+from core.history.sqlite_history import SqliteHistory, referenced_paths
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.rule_builder.combinators import all_of, not_
+from core.rules_engine.rule_builder.parsers import cond
+
+
+def make_rule(name, condition):
+    return Rule(
+        name=name,
+        description=f"{name} rule",
+        condition=condition,
+        action=Action(name="noop", execute=MagicMock()),
+        source=SourceEnum.PROCESS,
+    )
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def rules(fake_fact_registry):
+    return (
+        make_rule("adult", cond("age >= 18")),
+        make_rule("gold", all_of(cond("membership == gold"), not_(cond("age > 90")))),
+    )
+
+
+@pytest.fixture(params=[True, False], ids=["threaded", "inline"])
+def history(request, tmp_path):
+    history = SqliteHistory(tmp_path / "history.db", threaded=request.param, clock=Clock())
+    yield history
+    history.close()
+
+
+def test_referenced_paths(rules):
+    assert referenced_paths(rules[0]) == ("age",)
+    assert referenced_paths(rules[1]) == ("membership", "age")
+
+
+def test_records_results_and_referenced_facts(history, rules):
+    adult, gold = rules
+    facts = {"process": [{"pid": 1, "age": 30, "membership": "gold", "other": "x"}]}
+
+    history.record([(adult, 1, "passed"), (gold, 1, "failed")], facts)
+    history.clock.now += 5
+    history.record([(adult, 1, "failed")], facts)
+
+    assert history.results(adult.id) == [(1000.0, 1, "passed"), (1005.0, 1, "failed")]
+    assert history.results(gold.id, pid=1) == [(1000.0, 1, "failed")]
+    assert history.results(adult.id, start=1001.0) == [(1005.0, 1, "failed")]
+    assert history.results(adult.id, pid=2) == []
+    assert history.facts(1) == [
+        (1000.0, {"age": 30, "membership": "gold"}),
+        (1005.0, {"age": 30}),
+    ]
+
+
+def test_cycle_is_one_transaction_on_indexed_tables(history, rules, tmp_path):
+    history.record([(rules[0], 1, "passed")], {"process": {"pid": 1, "age": 30}})
+    history.flush()
+
+    conn = sqlite3.connect(tmp_path / "history.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    indexes = {row[1] for row in conn.execute("SELECT * FROM sqlite_master WHERE type='index'")}
+    assert "results_rule_pid_ts" in indexes
+    assert conn.execute("SELECT id, results_end, facts_end FROM cycles").fetchall() == [(1, 1, 1)]
+    conn.close()
+
+
+def test_survives_restart(tmp_path, rules):
+    adult, gold = rules
+    path = tmp_path / "history.db"
+    first = SqliteHistory(path, clock=Clock())
+    first.record([(adult, 1, "passed")], {})
+    first.close()
+
+    second = SqliteHistory(path, clock=Clock())
+    assert second.record([(gold, 1, "failed"), (adult, 1, "pending")], {}) == 2
+    assert [status for _, _, status in second.results(adult.id)] == ["passed", "pending"]
+    assert second.results(gold.id) == [(1000.0, 1, "failed")]
+    second.close()
+
+
+def test_prune_deletes_old_cycles(history, rules):
+    adult = rules[0]
+    for _ in range(4):
+        history.record(
+            [(adult, 1, "passed"), (adult, 2, "failed")],
+            {"process": {"pid": 1, "age": 1}},
+        )
+        history.clock.now += 10
+
+    assert history.prune(before=1020.0) == 4
+    assert [ts for ts, _, _ in history.results(adult.id)] == [1020.0, 1020.0, 1030.0, 1030.0]
+    assert [ts for ts, _ in history.facts(1)] == [1020.0, 1030.0]
+    history.compact()
+
+
+def test_retention_runs_on_compact_interval(tmp_path, rules):
+    clock = Clock()
+    history = SqliteHistory(
+        tmp_path / "history.db",
+        retention=15,
+        compact_interval=20,
+        threaded=False,
+        clock=clock,
+    )
+    for _ in range(5):
+        history.record([(rules[0], 1, "passed")], {})
+        clock.now += 10
+
+    # Maintenance ran at 1020 (keeping >= 1005) and at 1040 (keeping >= 1025).
+    assert [ts for ts, _, _ in history.results(rules[0].id)] == [1030.0, 1040.0]
+    history.close()
+
+
+def test_closed_history_rejects_records(history, rules):
+    history.close()
+
+    with pytest.raises(RuntimeError):
+        history.record([(rules[0], 1, "passed")], {})
+
+
+def test_engine_records_full_results(tmp_path, rules):
+    history = SqliteHistory(tmp_path / "history.db", threaded=False)
+    engine = ComplianceEngine(history=history)
+    facts = {"process": {"pid": 7, "age": 10, "membership": "gold"}}
+
+    engine.run({"a": rules[0], "g": rules[1]}, facts)
+
+    assert [(pid, status) for _, pid, status in history.results(rules[0].id)] == [(7, "failed")]
+    assert [(pid, status) for _, pid, status in history.results(rules[1].id)] == [(7, "passed")]
+    engine.close()
+    with pytest.raises(RuntimeError):
+        history.record([], {})
@@ -0,0 +1,23 @@
+from unittest.mock import MagicMock
+
+from core.metrics.auditor_metrics import AuditorMetrics
+
+
+def test_records_auditor_metrics():
+    metrics = AuditorMetrics()
+    rule = MagicMock(id="RUL-1")
+
+    metrics.observe_stage("collect", 0.5)
+    metrics.observe_probe("process", 0.25)
+    metrics.observe_probe("process", 0.5)
+    metrics.count_results([(rule, 1, "failed"), (rule, 2, "failed"), (rule, 3, "passed")])
+    metrics.update_process(action_queue_depth=3)
+
+    text = metrics.registry.render().decode()
+    assert 'auditor_stage_seconds_sum{stage="collect"} 0.5\n' in text
+    assert 'auditor_probe_collect_seconds_count{probe="process"} 2\n' in text
+    assert 'auditor_rule_results_total{rule="RUL-1",status="failed"} 2\n' in text
+    assert 'auditor_rule_results_total{rule="RUL-1",status="passed"} 1\n' in text
+    assert "auditor_action_queue_depth 3\n" in text
+    assert "auditor_process_resident_memory_bytes 0\n" not in text
+    assert "auditor_process_cpu_seconds_total " in text
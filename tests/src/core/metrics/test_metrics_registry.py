@@ -0,0 +1,77 @@
+import pytest
+
+from core.metrics.metrics_registry import Counter, MetricsRegistry
+
+
+def test_openmetrics_and_prometheus_text():
+    registry = MetricsRegistry()
+    results = registry.counter("rule_results", "Results by status.", ("rule", "status"))
+    depth = registry.gauge("queue_depth", "Queued actions.")
+    stage = registry.summary("stage_seconds", "Stage time.", ("stage",))
+
+    results.labels("RUL-1", "failed").inc()
+    results.labels("RUL-1", "failed").inc(2)
+    depth.labels().set(4)
+    stage.labels("collect").observe(0.25)
+    stage.labels("collect").observe(0.5)
+
+    assert registry.render().decode() == (
+        "# HELP rule_results Results by status.\n"
+        "# TYPE rule_results counter\n"
+        'rule_results_total{rule="RUL-1",status="failed"} 3\n'
+        "# HELP queue_depth Queued actions.\n"
+        "# TYPE queue_depth gauge\n"
+        "queue_depth 4\n"
+        "# HELP stage_seconds Stage time.\n"
+        "# TYPE stage_seconds summary\n"
+        'stage_seconds_sum{stage="collect"} 0.75\n'
+        'stage_seconds_count{stage="collect"} 2\n'
+        "# EOF\n"
+    )
+    prometheus = registry.render(openmetrics=False).decode()
+    assert "# TYPE rule_results_total counter\n" in prometheus
+    assert "# EOF" not in prometheus
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.gauge("g", "Help with \\ and\nnewline.", ("name",)).labels('a"b\\c\nd').set(1.5)
+
+    text = registry.render().decode()
+
+    assert "# HELP g Help with \\\\ and\\nnewline.\n" in text
+    assert 'g{name="a\\"b\\\\c\\nd"} 1.5\n' in text
+
+
+def test_scrape_reuses_cached_text_and_unchanged_lines(monkeypatch):
+    registry = MetricsRegistry()
+    counter = registry.counter("c", "Counter.", ("rule",))
+    for rule in ("a", "b", "c"):
+        counter.labels(rule).inc()
+    first = registry.render()
+    rendered = []
+    original = Counter._render
+
+    def render(self, labels, values):
+        rendered.append(labels)
+        return original(self, labels, values)
+
+    monkeypatch.setattr(Counter, "_render", render)
+
+    assert registry.render() is first
+    counter.labels("b").inc()
+    text = registry.render().decode()
+
+    assert rendered == ['{rule="b"}']
+    assert 'c_total{rule="b"} 2\n' in text
+    assert 'c_total{rule="a"} 1\n' in text
+
+
+def test_label_count_and_duplicate_names_rejected():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("g", "Gauge.", ("a",))
+
+    with pytest.raises(ValueError, match="label values"):
+        gauge.labels()
+    with pytest.raises(ValueError, match="already registered"):
+        registry.counter("g", "Again.")
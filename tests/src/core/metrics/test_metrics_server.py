@@ -0,0 +1,53 @@
+import socket
+import urllib.error
+import urllib.request
+
+import pytest
+
+from core.metrics.metrics_registry import MetricsRegistry
+from core.metrics.metrics_server import MetricsServer
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.gauge("up", "Auditor running.").labels().set(1)
+    return registry
+
+
+def test_serves_metrics_over_tcp(registry):
+    server = MetricsServer(registry).start()
+    url = f"http://{server.address}/metrics"
+    try:
+        with urllib.request.urlopen(url) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert b"up 1\n" in response.read()
+
+        request = urllib.request.Request(url, headers={"Accept": "application/openmetrics-text"})
+        with urllib.request.urlopen(request) as response:  # noqa: S310
+            assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+            assert response.read().endswith(b"# EOF\n")
+
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"http://{server.address}/other")
+        assert err.value.code == 404
+    finally:
+        server.close()
+
+
+def test_serves_metrics_over_unix_socket(registry, tmp_path):
+    path = tmp_path / "metrics.sock"
+    server = MetricsServer(registry, unix_socket=path).start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(path))
+            client.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+    finally:
+        server.close()
+
+    assert response.startswith(b"HTTP/1.0 200")
+    assert response.endswith(b"up 1\n")
+    assert not path.exists()
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from core.pipeline.deadline_scheduler import DeadlineScheduler, OverrunPolicy
+
+
+class FakeClock:
+    """A monotonic clock that only moves when slept on or advanced."""
+
+    def __init__(self, now=100.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def scheduler(clock, interval=1.0, **kwargs):  # noqa: ANN003
+    return DeadlineScheduler(interval, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def starts(clock, schedule, durations):
+    """Run one cycle per duration; return the start time of each."""
+    times = []
+    for duration in durations:
+        assert schedule.wait()
+        times.append(clock.now)
+        clock.advance(duration)
+    return times
+
+
+def test_cycles_stay_on_the_grid():
+    clock = FakeClock()
+    schedule = scheduler(clock, interval=0.25)
+
+    assert starts(clock, schedule, [0.1, 0.2, 0.01, 0.24]) == [100.0, 100.25, 100.5, 100.75]
+    assert schedule.stats.overruns == 0
+
+
+def test_skip_drops_missed_ticks_and_returns_to_the_grid():
+    clock = FakeClock()
+    schedule = scheduler(clock, policy=OverrunPolicy.SKIP)
+
+    assert starts(clock, schedule, [2.5, 0.1, 0.1]) == [100.0, 102.5, 103.0]
+    assert (schedule.stats.overruns, schedule.stats.skipped) == (1, 1)
+    assert schedule.stats.max_lateness == pytest.approx(0.5)
+
+
+def test_catch_up_runs_missed_ticks_back_to_back():
+    clock = FakeClock()
+    schedule = scheduler(clock, policy=OverrunPolicy.CATCH_UP)
+
+    assert starts(clock, schedule, [2.5, 0.1, 0.1, 0.1]) == [100.0, 102.5, 102.6, 103.0]
+    assert (schedule.stats.overruns, schedule.stats.skipped) == (2, 0)
+    assert schedule.stats.max_lateness == pytest.approx(1.5)
+
+
+def test_wait_ends_early_at_until():
+    clock = FakeClock()
+    schedule = scheduler(clock, interval=5.0)
+    schedule.wait()
+
+    assert not schedule.wait(until=101.5)
+    assert clock.now == 101.5
+    assert schedule.wait(until=None)
+    assert clock.now == 105.0
+
+
+def test_jitter_offsets_the_grid():
+    clock = FakeClock()
+    schedule = scheduler(clock, jitter=0.5, rng=random.Random(7))  # noqa: S311
+
+    assert 0 < schedule.phase < 0.5
+    assert starts(clock, schedule, [0.1, 0.1]) == [100 + schedule.phase, 101 + schedule.phase]
+
+
+def test_zero_interval_runs_back_to_back():
+    clock = FakeClock()
+    schedule = scheduler(clock, interval=0)
+
+    assert starts(clock, schedule, [0.5, 0.5]) == [100.0, 100.5]
+    assert schedule.stats.overruns == 0
+
+
+@pytest.mark.parametrize(("interval", "jitter"), [(-1, 0), (1, -0.5)])
+def test_invalid_arguments(interval, jitter):
+    with pytest.raises(ValueError, match="negative"):
+        DeadlineScheduler(interval, jitter=jitter)
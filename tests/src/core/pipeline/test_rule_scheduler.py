@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+from core.pipeline.rule_scheduler import RuleScheduler
+from core.rules_engine.model.rule import SourceEnum
+
+
+def rule(interval=None, group="", source=SourceEnum.PROCESS):
+    return SimpleNamespace(interval=interval, mutually_exclusive_group=group, source=source)
+
+
+def due_cycles(scheduler, rules, cycles):
+    """Return, per rule ID, the cycles of `cycles` it was due in."""
+    runs = {rule_id: [] for rule_id in rules}
+    for cycle in cycles:
+        for rule_id in scheduler.due(rules, cycle):
+            runs[rule_id].append(cycle)
+    return runs
+
+
+def test_tick_is_the_shortest_interval():
+    rules = [rule(60), rule(), rule(0.5)]
+
+    assert RuleScheduler.for_rules(rules, 5, {"process": 2}).tick == 0.5
+    assert RuleScheduler.for_rules([rule()], 5).tick == 5
+
+
+def test_tick_divides_every_interval():
+    assert RuleScheduler.for_rules([rule(2)], 5).tick == 1
+    assert RuleScheduler.for_rules([rule(7)], 5).tick == 1
+    assert RuleScheduler.for_rules([rule(0.3)], 5).tick == 0.1
+
+
+def test_cadences_not_multiples_of_each_other_kept():
+    rules = {"two": rule(2), "seven": rule(7), "default": rule()}
+    scheduler = RuleScheduler.for_rules(rules.values(), 5)
+
+    assert due_cycles(scheduler, rules, range(15)) == {
+        "two": [0, 2, 4, 6, 8, 10, 12, 14],
+        "seven": [0, 7, 14],
+        "default": [0, 5, 10],
+    }
+
+
+def test_interval_off_the_grid_rounded_with_warning(caplog):
+    scheduler = RuleScheduler(2, 5)
+
+    assert scheduler.period(rule()) == 3
+    assert scheduler.period(rule()) == 3
+    assert scheduler.period(rule(4)) == 2
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert warnings == [
+        "Interval 5 s is not a whole number of 2 s ticks: rules with it run every 6 s",
+    ]
+
+
+def test_interval_falls_back_to_source_then_default():
+    scheduler = RuleScheduler(1, 5, {"process": 2})
+
+    assert scheduler.interval(rule(60)) == 60
+    assert scheduler.interval(rule()) == 2
+    assert scheduler.interval(rule(source=[])) == 5
+
+
+def test_rules_due_at_their_own_cadence():
+    rules = {"fast": rule(1), "slow": rule(3), "default": rule()}
+    scheduler = RuleScheduler(1, 2)
+
+    assert due_cycles(scheduler, rules, range(6)) == {
+        "fast": [0, 1, 2, 3, 4, 5],
+        "slow": [0, 3],
+        "default": [0, 2, 4],
+    }
+    assert not scheduler.uniform(rules)
+    assert scheduler.uniform({"fast": rules["fast"]})
+
+
+def test_rule_of_a_skipped_cycle_runs_in_the_next():
+    rules = {"slow": rule(3)}
+    scheduler = RuleScheduler(1, 1)
+
+    assert due_cycles(scheduler, rules, [0, 1, 4, 5, 6, 7]) == {"slow": [0, 4, 6]}
+
+
+def test_mutually_exclusive_group_is_due_together():
+    rules = {"a": rule(1, group="level"), "b": rule(4, group="level"), "c": rule(4)}
+    scheduler = RuleScheduler(1, 1)
+
+    assert list(scheduler.due(rules, 0)) == ["a", "b", "c"]
+    assert list(scheduler.due(rules, 1)) == ["a", "b"]
+
+
+def test_sources_of_rules():
+    assert RuleScheduler.sources({"a": rule(), "b": rule(source=[])}) == {"process"}
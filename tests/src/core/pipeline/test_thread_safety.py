@@ -0,0 +1,211 @@
+"""Stress tests for the components shared between pipeline threads."""
+
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from collection.process_handler.audited_process import AuditedProcess
+from collection.process_handler.process_handler import ProcessHandler
+from collection.snapshot_manager.snapshot_manager import SnapshotManager
+from core.compliance_engine import ComplianceEngine
+from core.fact_processor.fact_registry import FactRegistry
+from core.pipeline.threaded_pipeline import ThreadedPipeline
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.rule_builder.parsers import cond
+from shared._common.facts import FactSpec
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+from shared._common.operators import Operator
+
+THREADS = 8
+ROUNDS = 200
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    """Switch threads as often as possible, to surface races on GIL builds too."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+class StubProbe:
+    name = "process"
+
+    def collect(self):
+        return {}
+
+
+class StubProcess(AuditedProcess):
+    def __init__(self):
+        pass
+
+    def is_alive(self):
+        return True
+
+
+def hammer(*targets: Callable[[], object]):
+    """Run every target in its own thread, started together, and re-raise the first error."""
+    barrier = threading.Barrier(len(targets))
+    errors = []
+
+    def run(target):
+        barrier.wait()
+        try:
+            target()
+        except Exception as err:  # noqa: BLE001
+            errors.append(err)
+
+    threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def test_fact_registry_concurrent_registration(monkeypatch):
+    monkeypatch.setattr(FactRegistry, "_registry", FactRegistry.all_facts())
+    before = len(FactRegistry.all_facts())
+    version = FactRegistry.version()
+
+    def register(worker):
+        def target():
+            for i in range(ROUNDS):
+                FactRegistry.register_fact(
+                    FactSpec(f"stress.{worker}.{i}", int, SourceEnum.PROCESS, set(Operator)),
+                )
+
+        return target
+
+    def read():
+        for _ in range(ROUNDS):
+            facts = FactRegistry.all_facts()
+            for path in facts:
+                FactRegistry.get_fact(path)
+
+    hammer(*(register(w) for w in range(THREADS)), read, read)
+
+    assert len(FactRegistry.all_facts()) == before + THREADS * ROUNDS
+    assert FactRegistry.version() == version + THREADS * ROUNDS
+
+
+def test_fact_registry_duplicate_registered_once(monkeypatch):
+    monkeypatch.setattr(FactRegistry, "_registry", FactRegistry.all_facts())
+    accepted = []
+
+    def register():
+        try:
+            FactRegistry.register_fact(FactSpec("stress.dup", int, SourceEnum.PROCESS, set()))
+            accepted.append(True)
+        except ValueError:
+            pass
+
+    hammer(*[register] * THREADS)
+
+    assert accepted == [True]
+
+
+def test_snapshot_manager_add_while_collecting():
+    manager = SnapshotManager()
+
+    def add():
+        for _ in range(ROUNDS):
+            manager.add_probe(StubProbe())
+
+    def collect():
+        for _ in range(ROUNDS // 10):
+            snapshots = manager.get_all_snapshots()
+            assert len(snapshots.get("process", [])) <= THREADS * ROUNDS
+
+    hammer(*[add] * THREADS, collect, collect)
+
+    assert len(manager.get_all_snapshots()["process"]) == THREADS * ROUNDS
+
+
+def test_process_handler_add_while_counting():
+    handler = ProcessHandler()
+
+    def add():
+        for _ in range(ROUNDS):
+            handler.add_process(StubProcess())
+
+    def count():
+        for _ in range(ROUNDS // 10):
+            handler.num_active()
+            # Callers get a copy; clearing it does not untrack anything.
+            handler.get_processes().clear()
+
+    hammer(*[add] * THREADS, count)
+
+    assert handler.num_active() == THREADS * ROUNDS
+
+
+def test_budgeted_engine_concurrent_cycles(fake_fact_registry):
+    engine = ComplianceEngine(budget=10.0)
+    rules = {
+        f"r{i}": Rule(
+            name=f"rule {i}",
+            description="stress",
+            condition=cond(f"cpu_count > {i}"),
+            action=Action(name="noop", execute=lambda: None),
+            source=SourceEnum.PROCESS,
+        )
+        for i in range(20)
+    }
+    factsheets = {"process": {"cpu_count": 10}}
+
+    def run():
+        for _ in range(ROUNDS // 4):
+            result = engine.run(rules, factsheets)
+            assert len(result["passed"]) + len(result["failed"]) == len(rules)
+
+    hammer(*[run] * THREADS)
+
+    assert engine.last_cycle.cycle == THREADS * (ROUNDS // 4)
+
+
+def test_pipeline_end_to_end_with_real_engine(fake_fact_registry):
+    engine = ComplianceEngine()
+    fired = []
+    lock = threading.Lock()
+
+    def record():
+        with lock:
+            fired.append(1)
+
+    rules = {
+        f"r{i}": Rule(
+            name=f"rule {i}",
+            description="stress",
+            condition=cond(f"cpu_count > {i}"),
+            action=Action(name="record", execute=record),
+            source=SourceEnum.PROCESS,
+        )
+        for i in range(20)
+    }
+    reports = []
+    done = threading.Event()
+
+    def report(result):
+        reports.append(result)
+        if len(reports) >= 50:
+            done.set()
+
+    pipeline = ThreadedPipeline(
+        lambda: {"process": {"cpu_count": 10}},
+        lambda factsheets: engine.run(rules, factsheets),
+        report,
+        interval=0,
+        evaluators=4,
+        queue_size=4,
+    )
+    pipeline.run(lambda: not done.is_set(), poll=0.01)
+
+    assert all(len(r["failed"]) == 10 and len(r["passed"]) == 10 for r in reports)
+    assert len(fired) == 10 * len(reports)
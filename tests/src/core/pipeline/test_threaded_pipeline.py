@@ -0,0 +1,134 @@
+import itertools
+import threading
+
+import pytest
+
+from core.pipeline.threaded_pipeline import ThreadedPipeline
+
+
+def run_until(pipeline, done):
+    """Run `pipeline` until the `done` event is set."""
+    return pipeline.run(lambda: not done.is_set(), poll=0.01)
+
+
+class TestThreadedPipeline:
+    def test_collected_items_are_evaluated_and_reported(self):
+        counter = itertools.count()
+        reported = []
+        done = threading.Event()
+
+        def report(result):
+            reported.append(result)
+            if len(reported) == 5:
+                done.set()
+
+        pipeline = ThreadedPipeline(
+            lambda: next(counter),
+            lambda item: item * 10,
+            report,
+            interval=0.001,
+            queue_size=8,
+        )
+        stats = run_until(pipeline, done)
+
+        assert reported[:5] == [0, 10, 20, 30, 40]
+        assert stats.evaluated >= 5
+        assert stats.collected >= stats.evaluated
+
+    def test_empty_collections_are_not_evaluated(self):
+        counter = itertools.count()
+        reported = []
+        done = threading.Event()
+
+        def report(result):
+            reported.append(result)
+            if len(reported) == 3:
+                done.set()
+
+        pipeline = ThreadedPipeline(
+            lambda: n if (n := next(counter)) % 2 else None,
+            lambda item: item,
+            report,
+            interval=0.001,
+            queue_size=8,
+        )
+        run_until(pipeline, done)
+
+        assert reported[:3] == [1, 3, 5]
+
+    def test_slow_evaluation_drops_oldest(self):
+        release = threading.Event()
+        seen = []
+        done = threading.Event()
+
+        def evaluate(item):
+            release.wait()
+            return item
+
+        def report(result):
+            seen.append(result)
+            done.set()
+
+        counter = itertools.count()
+
+        def collect():
+            item = next(counter)
+            if item == 20:
+                release.set()
+            return item
+
+        pipeline = ThreadedPipeline(collect, evaluate, report, interval=0.001)
+        stats = run_until(pipeline, done)
+
+        # Item 0 blocked the evaluator while items 1..20 were collected into a queue of one.
+        assert seen[0] == 0
+        assert stats.dropped >= 18
+
+    @pytest.mark.parametrize("stage", ["collect", "evaluate", "report"])
+    def test_stage_error_is_reraised(self, stage):
+        def fail(*_: object):
+            msg = f"{stage} failed"
+            raise RuntimeError(msg)
+
+        stages = {"collect": lambda: 1, "evaluate": lambda item: item, "report": lambda _: None}
+        stages[stage] = fail
+        pipeline = ThreadedPipeline(
+            stages["collect"],
+            stages["evaluate"],
+            stages["report"],
+            interval=0.001,
+        )
+
+        with pytest.raises(RuntimeError, match=f"{stage} failed"):
+            pipeline.run(lambda: True, poll=0.01)
+
+    def test_reports_are_serialized_across_evaluators(self):
+        inside = 0
+        overlaps = 0
+        count = 0
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def report(_):
+            nonlocal inside, overlaps, count
+            with lock:
+                inside += 1
+                overlaps += inside > 1
+            threading.Event().wait(0.0005)
+            with lock:
+                inside -= 1
+                count += 1
+                if count >= 30:
+                    done.set()
+
+        pipeline = ThreadedPipeline(
+            object,
+            lambda item: item,
+            report,
+            interval=0,
+            evaluators=4,
+            queue_size=4,
+        )
+        run_until(pipeline, done)
+
+        assert overlaps == 0
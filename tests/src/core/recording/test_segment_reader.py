@@ -0,0 +1,44 @@
+import pytest
+
+from core.recording.segment_reader import SegmentReader
+from core.recording.snapshot_recorder import SegmentWriter
+from shared.custom_exceptions import InvalidSegmentError
+
+
+def test_rejects_non_segment_files(tmp_path):
+    empty = tmp_path / "empty.seg"
+    empty.write_bytes(b"")
+    other = tmp_path / "other.seg"
+    other.write_bytes(b"not a segment at all")
+
+    for path in (empty, other):
+        with pytest.raises(InvalidSegmentError):
+            SegmentReader(path)
+
+
+def test_corrupt_block(tmp_path):
+    path = tmp_path / "a.seg"
+    writer = SegmentWriter(path)
+    writer.append(1.0, 1, {"pid": 1})
+    writer.close()
+    data = bytearray(path.read_bytes())
+    data[40:44] = b"\xff\xff\xff\xff"
+    path.write_bytes(bytes(data))
+
+    with SegmentReader(path) as reader, pytest.raises(InvalidSegmentError):
+        list(reader.read())
+
+
+def test_truncated_block_is_ignored(tmp_path):
+    path = tmp_path / "a.seg"
+    writer = SegmentWriter(path)
+    writer.append(1.0, 1, {"pid": 1})
+    writer.flush()
+    writer.append(2.0, 1, {"pid": 1})
+    writer.flush()
+    size = writer.size
+    writer.close()
+    path.write_bytes(path.read_bytes()[: size - 3])
+
+    with SegmentReader(path) as reader:
+        assert [ts for ts, _, _ in reader.read()] == [1.0]
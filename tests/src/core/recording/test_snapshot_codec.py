@@ -0,0 +1,78 @@
+from typing import NamedTuple
+
+import pytest
+
+from core.probes.snapshot.process_snapshot.process_snapshot import CpuSnapshot, ProcessSnapshot
+from core.recording.snapshot_codec import (
+    CODECS,
+    apply_delta,
+    compress,
+    decompress,
+    diff,
+    flatten,
+    to_plain,
+    unflatten,
+)
+from shared.utils.resolve_path import resolve_path
+
+
+class MemInfo(NamedTuple):
+    rss: int
+    vms: int
+
+
+class TestToPlain:
+    def test_snapshot_keeps_fact_paths(self):
+        snapshot = ProcessSnapshot(pid=7, name="app", create_time=1.0, snapshot_time=2.0)
+        snapshot.cpu = CpuSnapshot(percent=12.5, times=None, affinity=[0, 1], cpu_num=1)
+        snapshot.memory = {"info": MemInfo(10, 20), "maps": [MemInfo(1, 2)]}
+        snapshot.identity["status"] = object()
+
+        plain = to_plain(snapshot)
+
+        assert plain["pid"] == 7
+        assert resolve_path(plain, "cpu.percent") == 12.5
+        assert resolve_path(plain, "cpu.affinity") == [0, 1]
+        assert resolve_path(plain, "memory.info.rss") == 10
+        assert plain["memory"]["maps"] == [{"rss": 1, "vms": 2}]
+        assert isinstance(plain["identity"]["status"], str)
+        assert plain["extensions"] == {}
+
+
+class TestDelta:
+    def test_flatten_round_trip(self):
+        plain = {"a": {"b": 1, "c": {}}, "d": [1, 2], "e": None}
+
+        assert flatten(plain) == {("a", "b"): 1, ("a", "c"): {}, ("d",): [1, 2], ("e",): None}
+        assert unflatten(flatten(plain)) == plain
+
+    @pytest.mark.parametrize(
+        ("before", "after"),
+        [
+            ({"a": {"b": 1}}, {"a": {"b": 2}}),
+            ({"a": {"b": 1}}, {"a": 5}),
+            ({"a": 5}, {"a": {"b": 1}}),
+            ({"a": {"b": 1, "c": 2}}, {"a": {"b": 1}}),
+            ({"a": 1}, {"a": True}),
+            ({"a": 1}, {"a": 1.0}),
+        ],
+    )
+    def test_apply_diff_restores_current(self, before, after):
+        previous, current = flatten(before), flatten(after)
+
+        changed, removed = diff(previous, current)
+
+        assert changed or removed
+        assert unflatten(apply_delta(previous, changed, removed)) == after
+
+    def test_unchanged_snapshot_has_empty_diff(self):
+        flat = flatten({"a": {"b": 1}, "c": [1]})
+
+        assert diff(flat, dict(flat)) == ([], [])
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_compress_round_trip(codec):
+    data = b"snapshot " * 100
+
+    assert decompress(codec, compress(codec, data)) == data
@@ -0,0 +1,136 @@
+import pytest
+
+from core.probes.snapshot.process_snapshot.process_snapshot import CpuSnapshot, ProcessSnapshot
+from core.recording.segment_reader import SegmentReader, read_snapshots
+from core.recording.snapshot_codec import COLLECTION_TIME, DELTA, FULL
+from core.recording.snapshot_recorder import SegmentWriter, SnapshotRecorder
+
+
+def make_snapshot(pid, ts, cpu=1.0):
+    snapshot = ProcessSnapshot(pid=pid, name=f"proc {pid}", create_time=1.0, snapshot_time=ts)
+    snapshot.cpu = CpuSnapshot(percent=cpu, times=None, affinity=[0], cpu_num=0)
+    snapshot.identity.update({"ppid": 1, "cmdline": ["app", "--flag"], "status": "running"})
+    return snapshot
+
+
+def record_cycles(recorder, cycles, pids=(1, 2, 3), start=1000.0):
+    for cycle in range(cycles):
+        ts = start + cycle
+        recorder.record({"process": [make_snapshot(pid, ts, cpu=float(cycle % 5)) for pid in pids]})
+
+
+class TestSnapshotRecorder:
+    def test_round_trip(self, tmp_path):
+        recorder = SnapshotRecorder(tmp_path)
+        snapshot = make_snapshot(1, 1000.0, cpu=12.5)
+
+        assert recorder.record({"process": [snapshot], "other": [object()]}) == 1
+        recorder.close()
+
+        [(ts, pid, plain)] = read_snapshots(tmp_path)
+        assert (ts, pid) == (1000.0, 1)
+        assert plain["cpu"]["percent"] == 12.5
+        assert plain["identity"]["cmdline"] == ["app", "--flag"]
+
+    def test_snapshots_carry_collection_time(self, tmp_path):
+        recorder = SnapshotRecorder(tmp_path)
+        recorder.record({"process": [make_snapshot(1, 1000.0), make_snapshot(2, 1000.5)]})
+        recorder.record({"process": [make_snapshot(1, 1001.0)]})
+        recorder.close()
+
+        assert [(pid, plain[COLLECTION_TIME]) for _, pid, plain in read_snapshots(tmp_path)] == [
+            (1, 1000.5),
+            (2, 1000.5),
+            (1, 1001.0),
+        ]
+
+    @pytest.mark.parametrize("codec", ["zlib", "lzma"])
+    def test_deltas_rebuild_every_snapshot(self, tmp_path, codec):
+        recorder = SnapshotRecorder(tmp_path, codec=codec, block_size=2048)
+        record_cycles(recorder, 50)
+        recorder.close()
+
+        snapshots = list(read_snapshots(tmp_path))
+
+        assert len(snapshots) == 150
+        assert [(ts, pid) for ts, pid, _ in snapshots[:4]] == [
+            (1000.0, 1), (1000.0, 2), (1000.0, 3), (1001.0, 1),
+        ]
+        for ts, pid, plain in snapshots:
+            assert plain["snapshot_time"] == ts
+            assert plain["pid"] == pid
+            assert plain["cpu"]["percent"] == float((ts - 1000) % 5)
+            assert plain["identity"]["status"] == "running"
+
+    def test_time_and_pid_queries_skip_blocks(self, tmp_path):
+        recorder = SnapshotRecorder(tmp_path, block_size=1024)
+        record_cycles(recorder, 100)
+        recorder.close()
+
+        [segment] = recorder.segments()
+        with SegmentReader(segment) as reader:
+            assert len(reader.blocks) > 3
+            assert all(block.pids == {1, 2, 3} for block in reader.blocks)
+            result = list(reader.read(1050.0, 1052.0, pids=[2]))
+
+        assert [(ts, pid) for ts, pid, _ in result] == [(1050.0, 2), (1051.0, 2), (1052.0, 2)]
+        assert list(read_snapshots(tmp_path, pids=[9])) == []
+
+    def test_segments_roll_by_duration_and_size(self, tmp_path):
+        recorder = SnapshotRecorder(tmp_path, segment_duration=10)
+        record_cycles(recorder, 35)
+        recorder.close()
+
+        segments = recorder.segments()
+        assert [path.name for path in segments] == [
+            "0000000001000000.seg", "0000000001010000.seg",
+            "0000000001020000.seg", "0000000001030000.seg",
+        ]
+        snapshots = read_snapshots(tmp_path, 1019.5, 1021.0, pids=[1])
+        assert [ts for ts, _, _ in snapshots] == [1020.0, 1021.0]
+
+        sized = SnapshotRecorder(tmp_path / "sized", block_size=512, segment_size=1024)
+        record_cycles(sized, 30)
+        sized.close()
+        assert len(sized.segments()) > 1
+        assert len(list(read_snapshots(tmp_path / "sized"))) == 90
+
+    def test_oldest_segments_deleted_beyond_max_bytes(self, tmp_path):
+        recorder = SnapshotRecorder(tmp_path, segment_duration=10, max_bytes=1)
+        record_cycles(recorder, 35)
+        recorder.close()
+
+        [segment] = recorder.segments()
+        assert segment.name == "0000000001030000.seg"
+
+    def test_open_segment_is_readable(self, tmp_path):
+        recorder = SnapshotRecorder(tmp_path)
+        record_cycles(recorder, 3)
+        recorder.flush()
+        record_cycles(recorder, 2, start=2000.0)
+
+        with SegmentReader(recorder.segments()[0]) as reader:
+            assert [block.pids for block in reader.blocks] == [None]
+            assert len(list(reader.read())) == 9
+        recorder.close()
+        assert len(list(read_snapshots(tmp_path))) == 15
+
+
+class TestSegmentWriter:
+    def test_first_record_of_block_is_full(self, tmp_path):
+        writer = SegmentWriter(tmp_path / "a.seg")
+        plain = {"pid": 1, "cpu": {"percent": 1.0}, "identity": {"a": 1, "b": 2}}
+
+        writer.append(1.0, 1, plain)
+        writer.append(2.0, 1, {**plain, "cpu": {"percent": 2.0}})
+        kinds = [line.split(b",")[2] for line in writer._lines]
+        writer.flush()
+        writer.append(3.0, 1, plain)
+
+        assert kinds == [str(FULL).encode(), str(DELTA).encode()]
+        assert writer._lines[0].split(b",")[2] == str(FULL).encode()
+        writer.close()
+
+    def test_unknown_codec(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown codec"):
+            SegmentWriter(tmp_path / "a.seg", codec="snappy")
@@ -0,0 +1,181 @@
+import json
+from collections import Counter
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.compliance_engine import ComplianceEngine
+from core.fact_processor.fact_processor import FactProcessor
+from core.recording.snapshot_codec import COLLECTION_TIME
+from core.recording.snapshot_recorder import SegmentWriter
+from core.replay.replay import Replay, collections_of, merge_results, read_recording
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.model.temporal import Temporal, TemporalKind
+from core.rules_engine.rule_builder.parsers import cond
+from shared._common.facts import FactSpec
+from shared._common.operators import Operator
+
+
+class AgeFacts:
+    @staticmethod
+    def all_facts() -> dict:
+        return {
+            path: FactSpec(path, int, SourceEnum.PROCESS, "", set(Operator))
+            for path in ("pid", "age")
+        }
+
+
+def make_rule(name, expr, temporal=None):
+    return Rule(
+        name=name,
+        description=name,
+        condition=cond(expr),
+        action=Action(name="act", execute=MagicMock()),
+        source=SourceEnum.PROCESS,
+        temporal=temporal,
+    )
+
+
+def recorded(*rows: tuple):
+    return [(ts, pid, {"pid": pid, "age": age, "snapshot_time": ts}) for ts, pid, age in rows]
+
+
+def collected(*collections: tuple):
+    """Snapshots of `(collection time, [(pid, age), ...])` collections, as recorded."""
+    snapshots = []
+    for ts, rows in collections:
+        for pid, age in rows:
+            snapshot = {"pid": pid, "age": age, "snapshot_time": ts, COLLECTION_TIME: ts}
+            snapshots.append((ts, pid, snapshot))
+    return snapshots
+
+
+def test_collections_grouped_by_collection_time():
+    # Process 2 starts between the two collections, and is collected first.
+    snapshots = collected((1.0, [(1, 0)]), (2.0, [(2, 0), (1, 0)]))
+
+    grouped = [(ts, [s["pid"] for s in batch]) for ts, batch in collections_of(snapshots)]
+
+    assert grouped == [(1.0, [1]), (2.0, [2, 1])]
+
+
+def test_collections_split_at_repeated_process():
+    snapshots = recorded((1.0, 1, 0), (1.1, 2, 0), (2.0, 1, 0), (2.1, 2, 0), (3.0, 1, 0))
+
+    grouped = [(ts, [s["pid"] for s in batch]) for ts, batch in collections_of(snapshots)]
+
+    assert grouped == [(1.1, [1, 2]), (2.1, [1, 2]), (3.0, [1])]
+
+
+class TestReadRecording:
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+        path.write_text(
+            "\n".join(json.dumps(s) for _, _, s in recorded((1.0, 1, 5), (2.0, 2, 6), (3.0, 1, 7)))
+            + "\n\n",
+        )
+
+        assert [s["age"] for _, _, s in read_recording(path)] == [5, 6, 7]
+        assert [s["age"] for _, _, s in read_recording(path, start=1.5, pids=[1])] == [7]
+
+    def test_segment_file_and_directory(self, tmp_path):
+        writer = SegmentWriter(tmp_path / "0000000000001000.seg")
+        for ts, pid, snapshot in recorded((1.0, 1, 5), (2.0, 1, 6)):
+            writer.append(ts, pid, snapshot)
+        writer.close()
+
+        assert [s["age"] for _, _, s in read_recording(tmp_path)] == [5, 6]
+        assert [s["age"] for _, _, s in read_recording(writer.path, end=1.5)] == [5]
+
+
+@pytest.mark.usefixtures("fake_fact_registry")
+class TestReplay:
+    def test_runs_every_cycle_without_actions(self):
+        rule = make_rule("adult", "age >= 18")
+        replay = Replay(FactProcessor(AgeFacts), ComplianceEngine(), {rule.id: rule})
+
+        stats = replay.run(recorded((1.0, 1, 20), (2.0, 1, 10), (3.0, 1, 30), (4.0, 1, 12)))
+
+        assert (stats.cycles, stats.snapshots) == (4, 4)
+        assert stats.statuses["passed"] == 2
+        assert stats.statuses["failed"] == 2
+        assert stats.failures == {rule.id: 2}
+        rule.action.execute.assert_not_called()
+
+    def test_run_actions(self):
+        rule = make_rule("adult", "age >= 18")
+        replay = Replay(
+            FactProcessor(AgeFacts), ComplianceEngine(), {rule.id: rule}, run_actions=True,
+        )
+
+        replay.run(recorded((1.0, 1, 10)))
+
+        rule.action.execute.assert_called_once()
+
+    def test_every_process_of_a_collection_evaluated(self):
+        rule = make_rule("adult", "age >= 18")
+        writer = MagicMock()
+        replay = Replay(
+            FactProcessor(AgeFacts), ComplianceEngine(), {rule.id: rule}, report_writer=writer,
+        )
+
+        stats = replay.run(collected((1.0, [(1, 10), (2, 30)]), (2.0, [(1, 10), (2, 30)])))
+
+        assert (stats.cycles, stats.snapshots) == (2, 4)
+        assert stats.statuses == Counter(passed=2, failed=2)
+        assert stats.failures == {rule.id: 2}
+        reports = [call.args[0] for call in writer.submit.call_args_list]
+        assert [[r.status for r in report.records] for report in reports] == [
+            ["failed"],
+            ["failed"],
+        ]
+
+    def test_temporal_state_kept_for_every_process(self):
+        rule = make_rule("adult", "age >= 18", Temporal(TemporalKind.FOR, seconds=30))
+        replay = Replay(FactProcessor(AgeFacts), ComplianceEngine(), {rule.id: rule})
+
+        stats = replay.run(
+            collected(
+                (100.0, [(1, 10), (2, 30)]),
+                (120.0, [(1, 10), (2, 30)]),
+                (130.0, [(1, 10), (2, 30)]),
+            ),
+        )
+
+        assert stats.statuses == Counter(passed=3, pending=2, failed=1)
+        assert stats.failures == {rule.id: 1}
+
+    def test_temporal_rules_follow_recorded_time(self):
+        rule = make_rule("adult", "age >= 18", Temporal(TemporalKind.FOR, seconds=30))
+        replay = Replay(FactProcessor(AgeFacts), ComplianceEngine(), {rule.id: rule})
+
+        stats = replay.run(recorded((100.0, 1, 10), (120.0, 1, 10), (130.0, 1, 10)))
+
+        assert stats.statuses["pending"] == 2
+        assert stats.failures == {rule.id: 1}
+
+    def test_reports_each_cycle_at_recorded_time(self):
+        rule = make_rule("adult", "age >= 18")
+        writer = MagicMock()
+        replay = Replay(
+            FactProcessor(AgeFacts), ComplianceEngine(), {rule.id: rule}, report_writer=writer,
+        )
+
+        replay.run(recorded((1.0, 1, 20), (2.0, 1, 10)))
+
+        reports = [call.args[0] for call in writer.submit.call_args_list]
+        assert [(r.cycle, r.timestamp) for r in reports] == [(1, 1.0), (2, 2.0)]
+        assert [r.status for r in reports[1].records] == ["failed"]
+
+
+@pytest.mark.usefixtures("fake_fact_registry")
+def test_merge_results_keeps_worst_status():
+    adult, young = make_rule("adult", "age >= 18"), make_rule("young", "age < 18")
+    merged = merge_results(
+        [
+            {"passed": [adult], "failed": [young]},
+            {"pending": [adult], "passed": [young]},
+        ],
+    )
+
+    assert merged == {"passed": [], "failed": [young], "pending": [adult], "suppressed": []}
@@ -0,0 +1,103 @@
+import pytest
+
+from core.reporting.aggregate import Offender, aggregate, ranked_fact
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.rule_builder.combinators import all_of, not_
+from core.rules_engine.rule_builder.parsers import cond
+
+
+def make_rule(name, condition):
+    return Rule(
+        name=name,
+        description=name,
+        condition=condition,
+        action=Action(name="noop", execute=lambda: None),
+        source=SourceEnum.PROCESS,
+    )
+
+
+@pytest.mark.usefixtures("fake_fact_registry")
+class TestRankedFact:
+    def test_upper_bound_ranks_highest_first(self):
+        assert ranked_fact(make_rule("r", cond("age < 60"))) == ("age", True)
+
+    def test_lower_bound_ranks_lowest_first(self):
+        rule = make_rule("r", all_of(cond("membership == gold"), cond("cpu_count >= 4")))
+
+        assert ranked_fact(rule) == ("cpu_count", False)
+
+    def test_not_reverses_the_bound(self):
+        assert ranked_fact(make_rule("r", not_(cond("age > 60")))) == ("age", True)
+
+    def test_no_bounded_fact(self):
+        assert ranked_fact(make_rule("r", cond("membership == gold"))) is None
+
+
+@pytest.mark.usefixtures("fake_fact_registry")
+class TestAggregate:
+    def test_counts_failures_times_and_top_offenders(self):
+        rule = make_rule("young", cond("age < 60"))
+        rows = [
+            (rule, {"pid": pid, "name": f"p{pid}", "age": age, "snapshot_time": 100 + pid}, status)
+            for pid, age, status in [
+                (1, 70, "failed"),
+                (2, 30, "passed"),
+                (3, 90, "failed"),
+                (4, 65, "failed"),
+                (5, 80, "failed"),
+            ]
+        ]
+
+        (result,) = aggregate(rows, now=0.0, top_k=3)
+
+        assert (result.rule_id, result.processes, result.failing) == (rule.id, 5, 4)
+        assert result.fact == "age"
+        assert result.offenders == (
+            Offender(3, "p3", 90),
+            Offender(5, "p5", 80),
+            Offender(1, "p1", 70),
+        )
+        assert (result.first_failure, result.last_failure) == (101.0, 105.0)
+
+    def test_lower_bound_offenders_are_the_lowest(self):
+        rule = make_rule("cpus", cond("cpu_count >= 8"))
+        rows = [(rule, {"pid": n, "cpu_count": n}, "failed") for n in (4, 1, 2, 6)]
+
+        (result,) = aggregate(rows, now=50.0, top_k=2)
+
+        assert [offender.pid for offender in result.offenders] == [1, 2]
+        assert (result.first_failure, result.last_failure) == (50.0, 50.0)
+
+    def test_ties_keep_the_first_processes(self):
+        rule = make_rule("young", cond("age < 60"))
+        rows = [(rule, {"pid": pid, "age": 70}, "failed") for pid in range(5)]
+
+        (result,) = aggregate(rows, now=0.0, top_k=2)
+
+        assert [offender.pid for offender in result.offenders] == [0, 1]
+
+    def test_rules_without_numeric_values_keep_no_offenders(self):
+        gold = make_rule("gold", cond("membership == gold"))
+        young = make_rule("young", cond("age < 60"))
+        rows = [
+            (gold, {"pid": 1, "membership": "silver"}, "failed"),
+            (young, {"pid": 1, "age": "unknown"}, "failed"),
+            (young, {"pid": 2, "age": 10}, "pending"),
+        ]
+
+        results = aggregate(rows, now=0.0)
+
+        assert [(r.rule_id, r.processes, r.failing, r.offenders) for r in results] == [
+            (gold.id, 1, 1, ()),
+            (young.id, 2, 1, ()),
+        ]
+
+    def test_one_pass_over_results(self):
+        rule = make_rule("young", cond("age < 60"))
+        rows = iter([(rule, {"pid": 1, "age": 70}, "failed")])
+
+        assert aggregate(rows, now=0.0)[0].failing == 1
+        assert next(rows, None) is None
+
+    def test_no_results(self):
+        assert aggregate([], now=0.0) == ()
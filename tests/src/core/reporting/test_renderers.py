@@ -0,0 +1,145 @@
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.reporting.aggregate import Offender, RuleAggregate
+from core.reporting.renderers import BinaryRenderer, ConsoleRenderer, JsonLinesRenderer
+from core.reporting.report import CycleReport, ReportRecord
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from shared.custom_exceptions import InvalidReportDataError
+
+
+def make_rule(name, description):
+    return Rule(
+        name=name,
+        description=description,
+        condition=MagicMock(),
+        action=Action(name="noop", execute=lambda: None),
+        source=SourceEnum.PROCESS,
+    )
+
+
+@pytest.fixture
+def report():
+    ok = make_rule("Cpu", "cpu below 80")
+    bad = make_rule("Mémoire", "memory ≤ 60")
+    result = {"passed": [ok], "failed": [bad], "pending": []}
+    return CycleReport.from_result(3, 1700000000.5, result)
+
+
+@pytest.fixture
+def aggregated(report):
+    bad = report.records[1]
+    aggregate = RuleAggregate(
+        bad.rule_id,
+        processes=10,
+        failing=2,
+        fact="memory.percent",
+        offenders=(Offender(42, "db", 91.5), Offender(7, "", 75)),
+        first_failure=1700000000.0,
+        last_failure=1700000003.0,
+    )
+    return CycleReport(3, report.timestamp, report.statuses, report.records, (aggregate,))
+
+
+class TestCycleReport:
+    def test_from_result(self, report):
+        assert report.cycle == 3
+        assert report.statuses == ("passed", "failed", "pending")
+        assert [(r.status, r.name) for r in report.records] == [
+            ("passed", "Cpu"),
+            ("failed", "Mémoire"),
+        ]
+        assert report.records[0].rule_id == make_rule("Cpu", "cpu below 80").id
+
+
+class TestConsoleRenderer:
+    def test_matches_previous_print_output(self, report):
+        expected = (
+            "\n\t==============\tCompliance Report:\t==============\n\n\n"
+            "passed:\n\n"
+            "\tCpu : cpu below 80\n\n"
+            "failed:\n\n"
+            "\tMémoire : memory ≤ 60\n\n"
+            "pending:\n\n"
+        )
+
+        assert ConsoleRenderer().render(report) == expected
+
+    def test_failed_rules_show_their_aggregate(self, aggregated):
+        first, last = (time.strftime("%H:%M:%S", time.localtime(t)) for t in (1.7e9, 1.7e9 + 3))
+
+        text = ConsoleRenderer().render(aggregated)
+
+        assert (
+            "\tMémoire : memory ≤ 60\n"
+            f"\t\tfailing on 2 of 10 processes, from {first} to {last}\n"
+            "\t\ttop memory.percent: 42 db (91.5), 7 (75)\n\n"
+        ) in text
+
+
+class TestJsonLinesRenderer:
+    def test_one_line_per_record(self, report):
+        lines = JsonLinesRenderer().render(report).splitlines()
+
+        assert [json.loads(line) for line in lines] == [
+            {
+                "cycle": 3,
+                "timestamp": 1700000000.5,
+                "status": record.status,
+                "rule_id": record.rule_id,
+                "name": record.name,
+                "description": record.description,
+            }
+            for record in report.records
+        ]
+
+    def test_aggregate_fields(self, aggregated):
+        passed, failed = map(json.loads, JsonLinesRenderer().render(aggregated).splitlines())
+
+        assert "offenders" not in passed
+        assert failed["processes"] == 10
+        assert failed["failing_pids"] == 2
+        assert failed["fact"] == "memory.percent"
+        assert failed["offenders"][0] == {"pid": 42, "name": "db", "value": 91.5}
+        assert (failed["first_failure"], failed["last_failure"]) == (1700000000.0, 1700000003.0)
+
+    def test_empty_report(self):
+        assert JsonLinesRenderer().render(CycleReport(1, 0.0, ("passed",), ())) == ""
+
+
+class TestBinaryRenderer:
+    def test_round_trip(self, report):
+        second = CycleReport(4, 1.25, ("passed",), (ReportRecord("passed", "RUL-1", "a", ""),))
+        renderer = BinaryRenderer()
+
+        data = renderer.render(report) + renderer.render(second)
+
+        assert list(BinaryRenderer.decode(data)) == [report, second]
+
+    def test_status_missing_from_statuses(self):
+        report = CycleReport(1, 0.0, (), (ReportRecord("deferred", "RUL-1", "a", "b"),))
+
+        (decoded,) = BinaryRenderer.decode(BinaryRenderer().render(report))
+
+        assert decoded.statuses == ("deferred",)
+        assert decoded.records == report.records
+
+    def test_more_compact_than_json_lines(self, report):
+        binary = BinaryRenderer().render(report)
+        assert len(binary) < len(JsonLinesRenderer().render(report).encode())
+
+    @pytest.mark.parametrize("cut", [3, 10, -1])
+    def test_truncated(self, report, cut):
+        data = BinaryRenderer().render(report)[:cut]
+
+        with pytest.raises(InvalidReportDataError):
+            list(BinaryRenderer.decode(data))
+
+    def test_bad_magic(self, report):
+        data = b"XXXX" + BinaryRenderer().render(report)[4:]
+
+        with pytest.raises(InvalidReportDataError):
+            list(BinaryRenderer.decode(data))
@@ -0,0 +1,119 @@
+import io
+import threading
+
+import pytest
+
+from core.reporting.renderers import BinaryRenderer, ConsoleRenderer, JsonLinesRenderer
+from core.reporting.report import CycleReport, ReportRecord
+from core.reporting.report_writer import ReportSink, ReportWriter
+
+
+def make_report(cycle):
+    return CycleReport(
+        cycle,
+        float(cycle),
+        ("passed",),
+        (ReportRecord("passed", "RUL-1", "r", "d"),),
+    )
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+class BlockingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.entered = threading.Event()
+
+    def write(self, s):
+        self.entered.set()
+        self.release.wait(5)
+        return super().write(s)
+
+
+class FailingRenderer(ConsoleRenderer):
+    def render(self, report):
+        msg = "boom"
+        raise ValueError(msg)
+
+
+class TestReportWriter:
+    @pytest.mark.parametrize("threaded", [True, False])
+    def test_writes_each_report_once_per_cycle(self, threaded):
+        stream = CountingStream()
+        writer = ReportWriter([ReportSink(ConsoleRenderer(), stream)], threaded=threaded)
+
+        for cycle in range(1, 4):
+            writer.submit(make_report(cycle))
+        writer.close()
+
+        assert stream.writes == 3
+        expected = "".join(ConsoleRenderer().render(make_report(c)) for c in range(1, 4))
+        assert stream.getvalue() == expected
+
+    def test_submit_does_not_wait_for_the_sink(self):
+        stream = BlockingStream()
+        writer = ReportWriter([ReportSink(ConsoleRenderer(), stream)], max_pending=4)
+
+        writer.submit(make_report(1))
+        assert stream.entered.wait(5)
+        writer.submit(make_report(2))
+
+        assert stream.getvalue() == ""
+        stream.release.set()
+        writer.flush()
+        assert stream.getvalue().count("Compliance Report") == 2
+        writer.close()
+
+    def test_failing_sink_does_not_stop_others(self):
+        good = io.StringIO()
+        writer = ReportWriter(
+            [ReportSink(FailingRenderer(), io.StringIO()), ReportSink(JsonLinesRenderer(), good)],
+        )
+
+        writer.submit(make_report(1))
+        writer.close()
+
+        assert writer.errors == 1
+        assert '"cycle":1' in good.getvalue()
+
+    def test_closed_writer_rejects_reports(self):
+        writer = ReportWriter([])
+        writer.close()
+        writer.close()
+
+        with pytest.raises(RuntimeError):
+            writer.submit(make_report(1))
+
+    def test_file_sinks(self, tmp_path):
+        jsonl = tmp_path / "reports" / "report.jsonl"
+        binary = tmp_path / "reports" / "report.bin"
+        writer = ReportWriter(
+            [
+                ReportSink.to_file(JsonLinesRenderer(), jsonl),
+                ReportSink.to_file(BinaryRenderer(), binary),
+            ],
+        )
+
+        writer.submit(make_report(1))
+        writer.submit(make_report(2))
+        writer.close()
+
+        assert len(jsonl.read_text().splitlines()) == 2
+        assert list(BinaryRenderer.decode(binary.read_bytes())) == [make_report(1), make_report(2)]
+
+    def test_shared_stream_is_not_closed(self):
+        stream = io.StringIO()
+        writer = ReportWriter([ReportSink(ConsoleRenderer(), stream)])
+
+        writer.close()
+
+        assert not stream.closed
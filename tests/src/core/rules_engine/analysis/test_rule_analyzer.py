@@ -0,0 +1,191 @@
+from dataclasses import replace
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.rules_engine.analysis.rule_analyzer import RuleAnalyzer
+from core.rules_engine.model import GroupOperator, Operator
+from core.rules_engine.model.condition import Condition, ConditionSet, NotCondition
+from core.rules_engine.model.field import FieldRef
+from core.rules_engine.model.import_action import ImportPathCallable
+from core.rules_engine.model.rule import Action, Rule, SourceEnum
+from core.rules_engine.model.temporal import Temporal, TemporalKind
+
+CPU = FieldRef("cpu.percent", float)
+MEM = FieldRef("memory.percent", float)
+NAME = FieldRef("name", str)
+
+
+def leaf(field, op, value):
+    return Condition(field, op, value)
+
+
+NOOP = Action(name="noop", execute=MagicMock())
+
+
+def make_rule(name, condition, priority=0, action=NOOP, description=None):
+    return Rule(
+        name=name,
+        description=description or f"{name} description",
+        condition=condition,
+        action=action,
+        source=SourceEnum.PROCESS,
+        priority=priority,
+    )
+
+
+@pytest.fixture
+def analyzer():
+    return RuleAnalyzer()
+
+
+class TestSimplify:
+    def test_double_negation_removed(self, analyzer):
+        name_check = leaf(NAME, Operator.EQ, "init")
+        assert analyzer.simplify(NotCondition(NotCondition(name_check))) == name_check
+
+    def test_negated_numeric_leaf_is_inverted(self, analyzer):
+        expr = NotCondition(leaf(CPU, Operator.GT, 60.0))
+        assert analyzer.simplify(expr) == leaf(CPU, Operator.LTE, 60.0)
+
+    def test_single_child_set_removed(self, analyzer):
+        cpu = leaf(CPU, Operator.GT, 60.0)
+        expr = ConditionSet(GroupOperator.ALL, (cpu, cpu))
+        assert analyzer.simplify(expr) == cpu
+
+    def test_contradiction_folds_to_false(self, analyzer):
+        expr = ConditionSet.all(leaf(CPU, Operator.GT, 60.0), leaf(CPU, Operator.LT, 60.0))
+        assert analyzer.simplify(expr) is False
+
+    def test_boundary_is_satisfiable(self, analyzer):
+        expr = ConditionSet.all(leaf(CPU, Operator.GTE, 60.0), leaf(CPU, Operator.LTE, 60.0))
+        assert analyzer.simplify(expr) == leaf(CPU, Operator.EQ, 60.0)
+
+    def test_tautology_folds_to_true(self, analyzer):
+        expr = ConditionSet.any(leaf(CPU, Operator.GT, 60.0), leaf(CPU, Operator.LTE, 60.0))
+        assert analyzer.simplify(expr) is True
+
+    def test_not_equal_or_equal_is_tautology(self, analyzer):
+        expr = ConditionSet.any(leaf(CPU, Operator.NE, 5.0), leaf(CPU, Operator.EQ, 5.0))
+        assert analyzer.simplify(expr) is True
+
+    def test_bounds_are_merged(self, analyzer):
+        expr = ConditionSet.all(
+            leaf(CPU, Operator.GT, 10.0),
+            leaf(MEM, Operator.LT, 50.0),
+            leaf(CPU, Operator.GT, 20.0),
+        )
+        assert analyzer.simplify(expr) == ConditionSet.all(
+            leaf(CPU, Operator.GT, 20.0),
+            leaf(MEM, Operator.LT, 50.0),
+        )
+
+    def test_constant_child_is_folded_into_parent(self, analyzer):
+        contradiction = ConditionSet.all(leaf(CPU, Operator.GT, 60.0), leaf(CPU, Operator.LT, 50.0))
+        name_check = leaf(NAME, Operator.EQ, "init")
+        assert analyzer.simplify(ConditionSet.any(contradiction, name_check)) == name_check
+
+    def test_non_numeric_leaves_untouched(self, analyzer):
+        expr = ConditionSet.all(leaf(NAME, Operator.EQ, "a"), leaf(NAME, Operator.EQ, "b"))
+        assert analyzer.simplify(expr) == expr
+
+
+class TestAnalyze:
+    def test_unsatisfiable_rule_reported_and_kept(self, analyzer):
+        rule = make_rule(
+            "never",
+            ConditionSet.all(leaf(CPU, Operator.GT, 60.0), leaf(CPU, Operator.LT, 60.0)),
+        )
+        report = analyzer.analyze({rule.id: rule})
+        assert report.unsatisfiable == [rule.id]
+        assert rule.id in report.rules
+
+    def test_tautological_rule_pruned(self, analyzer):
+        rule = make_rule(
+            "always",
+            ConditionSet.any(leaf(CPU, Operator.GT, 60.0), leaf(CPU, Operator.LTE, 60.0)),
+        )
+        report = analyzer.analyze({rule.id: rule})
+        assert report.tautological == [rule.id]
+        assert report.pruned == [rule.id]
+        assert report.rules == {}
+
+    def test_duplicates_keep_highest_priority(self, analyzer):
+        low = make_rule(
+            "limits",
+            ConditionSet.all(leaf(CPU, Operator.LT, 60.0), leaf(MEM, Operator.LT, 60.0)),
+        )
+        high = make_rule(
+            "limits",
+            ConditionSet.all(leaf(MEM, Operator.LT, 60.0), leaf(CPU, Operator.LT, 60.0)),
+            priority=5,
+            description="tighter limits",
+        )
+        report = analyzer.analyze({low.id: low, high.id: high})
+        assert report.duplicates == {low.id: high.id}
+        assert list(report.rules) == [high.id]
+
+    def test_duplicates_with_other_name_action_or_interval_are_kept(self, analyzer):
+        logged = make_rule("cpu", leaf(CPU, Operator.LT, 60.0))
+        renamed = make_rule("cpu low", leaf(CPU, Operator.LT, 60.0))
+        handled = make_rule(
+            "cpu",
+            leaf(CPU, Operator.LT, 60.0),
+            priority=1,
+            action=Action(name="pkg.mod:fn", execute=ImportPathCallable("pkg.mod:fn")),
+            description="handled",
+        )
+        slower = replace(logged, description="slower", interval=60)
+        rules = {rule.id: rule for rule in (logged, renamed, handled, slower)}
+
+        report = analyzer.analyze(rules)
+
+        assert report.duplicates == {
+            logged.id: handled.id,
+            renamed.id: handled.id,
+            slower.id: handled.id,
+        }
+        assert report.pruned == []
+        assert list(report.rules) == list(rules)
+
+    def test_different_temporal_qualifiers_are_not_duplicates(self, analyzer):
+        instant = make_rule("instant", leaf(CPU, Operator.LT, 60.0))
+        sustained = replace(
+            make_rule("sustained", leaf(CPU, Operator.LT, 60.0)),
+            temporal=Temporal(TemporalKind.FOR, seconds=30),
+        )
+        report = analyzer.analyze({instant.id: instant, sustained.id: sustained})
+        assert report.duplicates == {}
+        assert list(report.rules) == [instant.id, sustained.id]
+
+    def test_no_pruning_keeps_all_rules(self):
+        first = make_rule("first", leaf(CPU, Operator.LT, 60.0))
+        second = make_rule("second", leaf(CPU, Operator.LT, 60.0))
+        report = RuleAnalyzer(prune=False).analyze({first.id: first, second.id: second})
+        assert report.duplicates == {second.id: first.id}
+        assert list(report.rules) == [first.id, second.id]
+
+    def test_simplified_rule_keeps_id(self, analyzer):
+        rule = make_rule("negated", NotCondition(leaf(CPU, Operator.GT, 60.0)))
+        report = analyzer.analyze({rule.id: rule})
+        assert report.simplified == [rule.id]
+        assert report.rules[rule.id].condition == leaf(CPU, Operator.LTE, 60.0)
+
+    def test_subsumed_rules(self, analyzer):
+        cpu_low = make_rule("cpu low", leaf(CPU, Operator.LT, 60.0))
+        both_low = make_rule(
+            "both low",
+            ConditionSet.all(leaf(CPU, Operator.LT, 60.0), leaf(MEM, Operator.LT, 60.0)),
+        )
+        cpu_high = make_rule("cpu high", leaf(CPU, Operator.GT, 60.0))
+        rules = {r.id: r for r in (cpu_low, both_low, cpu_high)}
+
+        report = analyzer.analyze(rules)
+
+        # whenever "cpu low" fails, "both low" fails too
+        assert report.subsumed == {cpu_low.id: [both_low.id]}
+
+    def test_opaque_conditions_are_ignored(self, analyzer):
+        rule = make_rule("opaque", MagicMock())
+        report = analyzer.analyze({rule.id: rule})
+        assert report.rules == {rule.id: rule}
@@ -0,0 +1,148 @@
+from unittest.mock import patch
+
+import pytest
+
+from core.fact_processor.fact_registry import FactRegistry
+from core.rules_engine.cache.rule_cache import RuleCache
+from core.rules_engine.model import GroupOperator, Operator
+from core.rules_engine.model.condition import Condition, ConditionSet, NotCondition
+from core.rules_engine.model.field import FieldRef
+from core.rules_engine.model.rule import Rule
+from core.rules_engine.rules_engine import RulesEngine
+
+TOML_RULES = """
+[[rules]]
+name = "cpu_check"
+description = "Count cpus"
+group = "cpu"
+model = "cpu_count == 4"
+action = "log"
+source = "process"
+priority = 3
+
+[[rules]]
+name = "adult_or_member"
+description = "Adults or members"
+source = "process"
+action = "log"
+[rules.model]
+operator = "any"
+conditions = ["age >= 18", "membership == gold"]
+"""
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    path = tmp_path / "rules.toml"
+    path.write_text(TOML_RULES)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RuleCache(tmp_path / "cache" / "rules.bin")
+
+
+def make_engine(rules_file, cache, builtin_rules=()):
+    return RulesEngine(
+        FactRegistry.all_facts,
+        toml_rules_path=rules_file,
+        builtin_rules=list(builtin_rules),
+        cache=cache,
+    )
+
+
+class TestRuleCacheRoundTrip:
+    def test_expression_round_trip(self):
+        expr = ConditionSet(
+            GroupOperator.ALL,
+            (
+                Condition(FieldRef("age", int), Operator.GT, 18),
+                NotCondition(Condition(FieldRef("membership", str), Operator.EQ, "gold")),
+            ),
+        )
+        encoded = RuleCache.encode_expression(expr)
+        assert RuleCache.decode_expression(encoded) == expr
+
+    def test_second_engine_loads_from_cache(self, fake_fact_registry, rules_file, cache):
+        first = make_engine(rules_file, cache)
+        assert cache.path.exists()
+
+        with patch.object(Rule, "from_toml", side_effect=AssertionError("parsed")):
+            second = make_engine(rules_file, cache)
+
+        assert list(second.rules) == list(first.rules)
+        for rule_id, rule in first.rules.items():
+            cached = second.rules[rule_id]
+            assert cached.id == rule.id
+            assert cached.name == rule.name
+            assert cached.priority == rule.priority
+            assert cached.condition == rule.condition
+            assert callable(cached.action.execute)
+        assert second.toml_tables.keys() == first.toml_tables.keys()
+        assert second.analysis.rules is second.rules
+
+    def test_builtin_rules_reattached(self, fake_fact_registry, rules_file, cache, sample_rule):
+        make_engine(rules_file, cache, [sample_rule])
+        with patch.object(Rule, "from_toml", side_effect=AssertionError("parsed")):
+            second = make_engine(rules_file, cache, [sample_rule])
+        assert second.rules[sample_rule.id] is sample_rule
+
+    def test_changed_rule_file_misses(self, fake_fact_registry, rules_file, cache):
+        make_engine(rules_file, cache)
+        rules_file.write_text(TOML_RULES.replace("cpu_count == 4", "cpu_count == 8"))
+
+        engine = make_engine(rules_file, cache)
+
+        values = [r.condition.value for r in engine.rules.values() if r.name == "cpu_check"]
+        assert values == [8]
+
+    def test_changed_facts_miss(self, fake_fact_registry, rules_file, cache):
+        first = make_engine(rules_file, cache)
+        FactRegistry.register_raw("extra", int, None, set(Operator))
+
+        assert cache.load(b"x" * 32, []) is None
+        key = cache.key([rules_file.read_bytes()], FactRegistry.all_facts(), [])
+        assert cache.load(key, []) is None
+        assert make_engine(rules_file, cache).rules.keys() == first.rules.keys()
+
+    def test_changed_rules_engine_code_misses(self, tmp_path, cache):
+        package = tmp_path / "rules_engine"
+        (package / "model").mkdir(parents=True)
+        temporal = package / "model" / "temporal.py"
+        temporal.write_text("A = 1\n")
+
+        with (
+            patch("core.rules_engine.cache.rule_cache._CODE_PACKAGE", package),
+            patch("core.rules_engine.cache.rule_cache._CODE_FILES", ()),
+        ):
+            before = RuleCache(cache.path).key([], {}, [])
+            temporal.write_text("A = 2\n")
+            after = RuleCache(cache.path).key([], {}, [])
+
+        assert before != after
+
+    def test_corrupt_cache_is_ignored(self, fake_fact_registry, rules_file, cache):
+        first = make_engine(rules_file, cache)
+        blob = cache.path.read_bytes()
+        cache.path.write_bytes(blob[:-10])
+
+        assert make_engine(rules_file, cache).rules.keys() == first.rules.keys()
+
+    def test_rule_set_with_invalid_rules_not_cached(self, fake_fact_registry, rules_file, cache):
+        FactRegistry.register_raw("unlisted", int, None, set(Operator))
+        rules_file.write_text(
+            TOML_RULES + '\n[[rules]]\nname = "bad"\nsource = "process"\naction = "log"\n'
+            'model = "unlisted > 1"\n',
+        )
+        facts = {k: v for k, v in FactRegistry.all_facts().items() if k != "unlisted"}
+
+        engine = RulesEngine(
+            lambda: facts,
+            toml_rules_path=rules_file,
+            builtin_rules=[],
+            cache=cache,
+        )
+
+        assert len(engine.validation.errors) == 1
+        assert not cache.path.exists()
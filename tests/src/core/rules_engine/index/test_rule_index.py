@@ -0,0 +1,121 @@
+import itertools
+import pathlib
+
+import pytest
+
+from core.rules_engine.index.rule_index import RuleIndex
+from core.rules_engine.rule_builder.rule_builder import RuleBuilder
+from core.rules_engine.rules_engine import RulesEngine
+from shared.custom_exceptions import InvalidRuleFilterError
+
+_thresholds = itertools.count()
+
+
+def make_rule(name, description, **options: object):
+    builder = RuleBuilder().define(name, description).from_("process")
+    if "group" in options:
+        builder = builder.group(options["group"])
+    if "priority" in options:
+        builder = builder.priority(options["priority"])
+    if "metadata" in options:
+        builder = builder.set_metadata(options["metadata"])
+    if options.get("disabled"):
+        builder = builder.disable()
+    return builder.when(f"age > {next(_thresholds)}").then(print)
+
+
+@pytest.fixture
+def rules(fake_fact_registry):
+    rules = [
+        make_rule("Cpu Percent", "first", group="cpu", priority=1),
+        make_rule("Cpu Percent", "second", group="cpu", priority=5),
+        make_rule("Memory Percent", "third", group="mem", priority=10, metadata={"owner": "ops"}),
+        make_rule("Memory Limit", "fourth", priority=5, disabled=True, metadata={"owner": "sec"}),
+    ]
+    return {rule.id: rule for rule in rules}
+
+
+@pytest.fixture
+def index(rules):
+    return RuleIndex(rules)
+
+
+def names(index, ids):
+    return [index.rules[rule_id].description for rule_id in ids]
+
+
+class TestLookups:
+    def test_duplicate_names_do_not_shadow(self, index):
+        assert names(index, index.named("Cpu Percent")) == ["first", "second"]
+
+    def test_group_source_enabled(self, index):
+        assert names(index, index.in_group("cpu")) == ["first", "second"]
+        assert names(index, index.in_group("")) == ["fourth"]
+        assert len(index.from_source("process")) == 4
+        assert names(index, index.enabled(enabled=False)) == ["fourth"]
+
+    def test_metadata(self, index):
+        assert names(index, index.with_metadata("owner")) == ["third", "fourth"]
+        assert names(index, index.with_metadata("owner", "sec")) == ["fourth"]
+        assert index.with_metadata("missing") == []
+
+    def test_priority_range(self, index):
+        assert names(index, index.with_priority(5, 10)) == ["second", "third", "fourth"]
+        assert names(index, index.with_priority(high=4)) == ["first"]
+        assert names(index, index.with_priority(low=6)) == ["third"]
+        assert index.with_priority(11) == []
+
+    def test_glob_and_regex(self, index):
+        assert names(index, index.glob("Memory*")) == ["third", "fourth"]
+        assert names(index, index.glob("*Percent")) == ["first", "second", "third"]
+        assert names(index, index.regex("Limit$")) == ["fourth"]
+        with pytest.raises(InvalidRuleFilterError):
+            index.regex("(")
+
+    def test_select_intersects_criteria(self, index):
+        selected = index.select(priority=(5, None), name_glob="*Percent")
+        assert names(index, selected) == ["second", "third"]
+        assert index.select() == index.rules
+
+
+class TestResolve:
+    @pytest.mark.parametrize(
+        ("selector", "expected"),
+        [
+            ("Cpu Percent", ["first", "second"]),
+            ("group:mem", ["third"]),
+            ("source:process", ["first", "second", "third", "fourth"]),
+            ("priority:5", ["second", "fourth"]),
+            ("priority:..4", ["first"]),
+            ("enabled:false", ["fourth"]),
+            ("meta:owner=ops", ["third"]),
+            ("name:Memory *", ["third", "fourth"]),
+            ("re:^Cpu", ["first", "second"]),
+            ("unknown", []),
+            ("kind:unknown", []),
+        ],
+    )
+    def test_selectors(self, index, selector, expected):
+        assert names(index, index.resolve(selector)) == expected
+
+    def test_rule_id(self, index, rules):
+        rule_id = next(iter(rules))
+        assert index.resolve(rule_id) == [rule_id]
+
+    def test_bad_priority_range(self, index):
+        with pytest.raises(InvalidRuleFilterError):
+            index.resolve("priority:high")
+
+
+def test_match_rules_accepts_selectors(rules, fake_fact_registry):
+    engine = RulesEngine(
+        None,
+        builtin_rules=list(rules.values()),
+        toml_rules_path=pathlib.Path("/dev/null"),
+    )
+
+    matched = engine.match_rules(engine.rules, ["Cpu Percent", "group:mem"])
+    assert [rule.description for rule in matched.values()] == ["first", "second", "third"]
+
+    with pytest.raises(InvalidRuleFilterError):
+        engine.match_rules(engine.rules, ["group:none"])
@@ -2,6 +2,7 @@ import pytest
 
 from core.rules_engine.model import GroupOperator, Operator
 from core.rules_engine.model.condition import Condition, ConditionSet, NotCondition
+from core.rules_engine.model.field import FieldRef
 from core.rules_engine.rule_builder.combinators import all_of, any_of
 
 
@@ -111,3 +112,13 @@ class TestNotCondition:
         assert isinstance(double_not, Condition)
         assert double_not == adult
         assert double_not.describe() == adult.describe()
+
+
+class TestFieldRef:
+    def test_flat_factsheet_uses_full_path(self):
+        field = FieldRef("cpu.percent", float)
+        assert field.evaluate({"cpu.percent": 12}) == 12.0
+
+    def test_nested_facts_resolved_by_dot_path(self):
+        field = FieldRef("cpu.percent", float)
+        assert field.evaluate({"cpu": {"percent": 3.5}}) == 3.5
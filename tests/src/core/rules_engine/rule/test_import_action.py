@@ -0,0 +1,158 @@
+import sys
+
+import pytest
+
+from core.rules_engine.model.import_action import ImportPathCallable, is_import_path, resolve
+from core.rules_engine.model.rule import Rule
+from shared.custom_exceptions.custom_exception import InvalidRuleDataError
+
+HANDLERS = """
+calls = []
+
+
+def record(*args, **kwargs):
+    calls.append((args, kwargs))
+
+
+class Nested:
+    @staticmethod
+    def handler():
+        calls.append("nested")
+
+
+not_callable = 42
+"""
+
+
+@pytest.fixture
+def handlers(tmp_path, monkeypatch):
+    """Provide a fresh, not yet imported `lazy_handlers` module."""
+    (tmp_path / "lazy_handlers.py").write_text(HANDLERS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_handlers", raising=False)
+    resolve.cache_clear()
+    yield "lazy_handlers"
+    sys.modules.pop("lazy_handlers", None)
+    resolve.cache_clear()
+
+
+def toml_rule(action):
+    return {"name": "lazy", "description": "d", "model": "age >= 18", "action": action}
+
+
+class TestIsImportPath:
+    @pytest.mark.parametrize(
+        "text",
+        ["pkg.mod:func", "mod:func", "pkg.mod:Class.method", " mod:f "],
+    )
+    def test_valid(self, text):
+        assert is_import_path(text)
+
+    @pytest.mark.parametrize(
+        "text",
+        ["log", "Block access", "mod:", ":func", "pkg.mod", "a b:c", "mod:func()"],
+    )
+    def test_invalid(self, text):
+        assert not is_import_path(text)
+
+
+class TestImportPathCallable:
+    def test_not_imported_until_called(self, handlers):
+        action = ImportPathCallable(f"{handlers}:record")
+
+        assert handlers not in sys.modules
+        assert not action.resolved
+
+        action()
+
+        assert handlers in sys.modules
+        assert action.resolved
+        assert sys.modules[handlers].calls == [((), {})]
+
+    def test_passes_arguments(self, handlers):
+        ImportPathCallable(f"{handlers}:record", ("a", 1), {"level": "high"})()
+
+        assert sys.modules[handlers].calls == [(("a", 1), {"level": "high"})]
+
+    def test_resolution_is_cached(self, handlers):
+        first = ImportPathCallable(f"{handlers}:record")
+        second = ImportPathCallable(f"{handlers}:record")
+        first()
+        second()
+        first()
+
+        info = resolve.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+        assert len(sys.modules[handlers].calls) == 3
+
+    def test_attribute_path(self, handlers):
+        ImportPathCallable(f"{handlers}:Nested.handler")()
+
+        assert sys.modules[handlers].calls == ["nested"]
+
+    def test_invalid_path_rejected_without_import(self):
+        with pytest.raises(InvalidRuleDataError):
+            ImportPathCallable("not an import path")
+
+    @pytest.mark.parametrize(
+        "path",
+        ["lazy_handlers:missing", "lazy_handlers:not_callable", "no_such_module_xyz:func"],
+    )
+    def test_unresolvable_raises_when_fired(self, handlers, path):
+        action = ImportPathCallable(path)
+
+        with pytest.raises(InvalidRuleDataError):
+            action()
+        assert not action.resolved
+
+
+@pytest.mark.usefixtures("fake_fact_registry")
+class TestRuleImportActions:
+    def test_string_import_path(self, handlers):
+        rule = Rule.from_toml(toml_rule(f"{handlers}:record"))
+
+        assert rule.action.name == f"{handlers}:record"
+        assert handlers not in sys.modules
+
+        rule.action.execute()
+
+        assert sys.modules[handlers].calls == [((), {})]
+
+    def test_call_table(self, handlers):
+        action = {"call": f"{handlers}:record", "args": ["cpu"], "kwargs": {"limit": 80}}
+        rule = Rule.from_toml(toml_rule(action))
+
+        assert handlers not in sys.modules
+        rule.action.execute()
+
+        assert sys.modules[handlers].calls == [(("cpu",), {"limit": 80})]
+
+    def test_restore_keeps_lazy_action(self, handlers):
+        data = toml_rule(f"{handlers}:record")
+        rule = Rule.from_toml(data)
+
+        restored = Rule.restore(rule.id, data, rule.condition)
+
+        assert handlers not in sys.modules
+        restored.action.execute()
+        assert len(sys.modules[handlers].calls) == 1
+
+    def test_plain_string_is_log(self):
+        rule = Rule.from_toml(toml_rule("Block access"))
+
+        assert rule.action.name == "Log"
+
+    @pytest.mark.parametrize(
+        "action",
+        [
+            {"args": [1]},
+            {"call": "mod:func", "args": "x"},
+            {"call": "mod:func", "kwargs": [1]},
+            {"call": "mod:func", "extra": 1},
+            {"call": "not a path"},
+        ],
+    )
+    def test_invalid_call_table(self, action):
+        with pytest.raises(InvalidRuleDataError):
+            Rule.from_toml(toml_rule(action))
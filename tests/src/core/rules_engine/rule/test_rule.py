@@ -127,6 +127,18 @@ class TestRule(TestActionBase):
         assert rule.id.startswith("BUI-")
         assert len(rule.id) == 10  # 3-char prefix + '-' + 6 digits
 
+    def test_from_toml_interval(self, fake_fact_registry):
+        toml_data = {
+            "name": "adult_check",
+            "model": "age >= 18",
+            "action": "Block access",
+            "source": "process",
+        }
+
+        assert Rule.from_toml(toml_data).interval is None
+        assert Rule.from_toml({**toml_data, "interval": "5m"}).interval == 300
+        assert Rule.from_toml({**toml_data, "interval": 2}).interval == 2
+
     def test_from_toml_nested_conditions(self, fake_fact_registry):
         toml_data = {
             "name": "special_access",
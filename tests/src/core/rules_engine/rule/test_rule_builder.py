@@ -3,6 +3,7 @@ from dataclasses import MISSING, fields
 
 import pytest
 
+from core.fact_processor.fact_registry import FactRegistry
 from core.rules_engine.model import GroupOperator, Operator
 from core.rules_engine.model.condition import Condition, ConditionSet, NotCondition
 from core.rules_engine.model.field import FieldRef
@@ -53,6 +54,29 @@ class TestCondParsing(TestRuleBuilderBase):
         with pytest.raises(ValueError, match="Could not parse expression"):
             cond("invalid expression")
 
+    def test_cond_parsing_multiword_operator(self, fake_fact_registry):
+        c = cond("membership not in admins")
+        assert c.operator == Operator.NOT_IN
+        assert c.value == "admins"
+
+    def test_cond_parsing_prefers_first_operator(self, fake_fact_registry):
+        c = cond("membership == contains gold")
+        assert c.operator == Operator.EQ
+        assert c.value == "contains gold"
+
+    def test_cond_parsing_is_memoized(self, fake_fact_registry):
+        assert cond("age < 18") is cond("  age < 18 ")
+
+    def test_cond_cache_follows_fact_registry(self, fake_fact_registry):
+        assert cond("age < 18").value == 18
+
+        FactRegistry._clear()
+        FactRegistry.register_raw("age", float, SourceEnum.PROCESS, set(Operator))
+
+        c = cond("age < 18")
+        assert c.field == FieldRef(path="age", type=float)
+        assert isinstance(c.value, float)
+
 
 class TestRuleBuilderChaining(TestRuleBuilderBase):
 
@@ -278,6 +302,8 @@ class TestRuleBuilderAllAttributesDynamic:
             .disable()
             .priority(4)
             .set_metadata({"ex": "val"})
+            .consecutive(3)
+            .every("1m")
             .then(grant_access)
         )
 
@@ -0,0 +1,122 @@
+import pytest
+
+from core.rules_engine.model.condition import Condition
+from core.rules_engine.model.rule import Rule
+from core.rules_engine.model.temporal import Temporal, TemporalKind, parse_duration
+from core.rules_engine.rule_builder.rule_builder import RuleBuilder
+from shared.custom_exceptions.custom_exception import InvalidRuleDataError
+
+
+class TestParseDuration:
+    @pytest.mark.parametrize(
+        ("text", "seconds"),
+        [("500ms", 0.5), ("30s", 30.0), ("10m", 600.0), ("1.5h", 5400.0), (45, 45.0)],
+    )
+    def test_units(self, text, seconds):
+        assert parse_duration(text) == seconds
+
+    @pytest.mark.parametrize("text", ["30", "ten minutes", "0s", -5, "5d"])
+    def test_invalid(self, text):
+        with pytest.raises(InvalidRuleDataError):
+            parse_duration(text)
+
+
+class TestTemporalSyntax:
+    @pytest.mark.parametrize(
+        ("model", "expr", "temporal"),
+        [
+            (
+                "cpu.percent < 80 for 30s",
+                "cpu.percent < 80",
+                Temporal(TemporalKind.FOR, seconds=30),
+            ),
+            (
+                "cpu.percent < 80 for 3 consecutive",
+                "cpu.percent < 80",
+                Temporal(TemporalKind.CONSECUTIVE, count=3),
+            ),
+            (
+                "cpu.percent < 80 5 times within 10m",
+                "cpu.percent < 80",
+                Temporal(TemporalKind.WITHIN, count=5, seconds=600),
+            ),
+            ("name == for 30 days", "name == for 30 days", None),
+            ("cpu.percent < 80", "cpu.percent < 80", None),
+        ],
+    )
+    def test_split(self, model, expr, temporal):
+        assert Temporal.split(model) == (expr, temporal)
+
+    def test_table_keys(self):
+        assert Temporal.from_toml({"conditions": [], "for": "1m"}) == Temporal(
+            TemporalKind.FOR,
+            seconds=60,
+        )
+        assert Temporal.from_toml({"consecutive": 2}).count == 2
+        assert Temporal.from_toml({"times": 4, "within": 30}) == Temporal(
+            TemporalKind.WITHIN,
+            count=4,
+            seconds=30,
+        )
+        assert Temporal.from_toml({"conditions": []}) is None
+
+    @pytest.mark.parametrize(
+        "model",
+        [{"for": "1m", "consecutive": 2}, {"times": 3}, {"consecutive": 0}, {"consecutive": "3"}],
+    )
+    def test_invalid_table(self, model):
+        with pytest.raises(InvalidRuleDataError):
+            Temporal.from_toml(model)
+
+    def test_str_round_trip(self):
+        for temporal in [
+            Temporal(TemporalKind.FOR, seconds=30),
+            Temporal(TemporalKind.CONSECUTIVE, count=3),
+            Temporal(TemporalKind.WITHIN, count=5, seconds=600),
+        ]:
+            assert Temporal.split(f"age > 1 {temporal}")[1] == temporal
+
+
+class TestTemporalRules:
+    def test_from_toml_string_model(self, fake_fact_registry):
+        rule = Rule.from_toml(
+            {
+                "name": "old",
+                "model": "age < 80 for 3 consecutive",
+                "action": "log",
+                "source": "process",
+            },
+        )
+        assert isinstance(rule.condition, Condition)
+        assert rule.condition.value == 80
+        assert rule.temporal == Temporal(TemporalKind.CONSECUTIVE, count=3)
+
+    def test_from_toml_table_model(self, fake_fact_registry):
+        rule = Rule.from_toml(
+            {
+                "name": "old",
+                "model": {"conditions": ["age < 80", "cpu_count > 1"], "for": "30s"},
+                "action": "log",
+                "source": "process",
+            },
+        )
+        assert rule.temporal == Temporal(TemporalKind.FOR, seconds=30)
+
+    def test_restore_keeps_temporal(self, fake_fact_registry):
+        table = {"name": "old", "model": "age < 80 for 10s", "action": "log", "source": "process"}
+        rule = Rule.from_toml(table)
+        assert Rule.restore(rule.id, table, rule.condition).temporal == rule.temporal
+
+    def test_builder(self, fake_fact_registry):
+        rule = (
+            RuleBuilder()
+            .define("n", "d")
+            .from_("process")
+            .when("age < 80")
+            .within(5, "10m")
+            .then(lambda: None)
+        )
+        assert rule.temporal == Temporal(TemporalKind.WITHIN, count=5, seconds=600)
+
+        with pytest.raises(ValueError, match="temporal"):
+            RuleBuilder().for_("1s").consecutive(2)
@@ -6,9 +6,11 @@ import pytest
 
 from core.fact_processor.fact_registry import FactRegistry
 from core.rules_engine.model import Operator
-from core.rules_engine.model.rule import SourceEnum
-from core.rules_engine.rules_engine import InvalidRuleFilterError, RulesEngine
+from core.rules_engine.model.rule import Rule, SourceEnum
+from core.rules_engine.rule_builder.rule_builder import RuleBuilder
+from core.rules_engine.rules_engine import InvalidRuleFilterError, RulesEngine, ValidationReport
 from shared._common.facts import FactSpecProtocol
+from shared.custom_exceptions import RuleWithNoAvailableFactError
 from shared.utils import cfg, project_root
 
 if TYPE_CHECKING:
@@ -109,3 +111,212 @@ def test_filter_rules_no_filters_returns_all(sample_rule, mock_fact_provider):
     )
     filtered = engine.match_rules(engine.rules, None)
     assert filtered == engine.rules
+
+
+def test_redundant_rules_pruned_after_validation(mock_fact_provider):
+    duplicate_a = (
+        RuleBuilder().define("dup", "first").from_("process").when("age > 18").then(print)
+    )
+    duplicate_b = (
+        RuleBuilder().define("dup", "second copy").from_("process").when("age > 18").then(print)
+    )
+    renamed = (
+        RuleBuilder().define("dup b", "third").from_("process").when("age > 18").then(print)
+    )
+    engine = RulesEngine(
+        mock_fact_provider,
+        builtin_rules=[duplicate_a, duplicate_b, renamed],
+        toml_rules_path=pathlib.Path("/dev/null"),
+    )
+
+    assert list(engine.rules) == [duplicate_a.id, renamed.id]
+    assert engine.analysis.duplicates == {
+        duplicate_b.id: duplicate_a.id,
+        renamed.id: duplicate_a.id,
+    }
+    assert engine.index.named("dup b") == [renamed.id]
+
+
+RELOAD_RULES = """
+[[rules]]
+name = "age check"
+description = "Adults only"
+source = "process"
+action = "log"
+model = "age >= 18"
+
+[[rules]]
+name = "membership check"
+description = "Gold members"
+source = "process"
+action = "log"
+model = "membership == gold"
+"""
+
+
+class TestReload:
+    def test_unchanged_rules_keep_their_objects(self, mock_fact_provider, tmp_path):
+        path = tmp_path / "rules.toml"
+        path.write_text(RELOAD_RULES)
+        engine = RulesEngine(mock_fact_provider, builtin_rules=[], toml_rules_path=path)
+        before = dict(engine.rules)
+        age_id = engine.index.named("age check")[0]
+        member_id = engine.index.named("membership check")[0]
+
+        path.write_text(
+            RELOAD_RULES.replace("membership == gold", "membership == silver")
+            + '\n[[rules]]\nname = "new"\ndescription = "New"\nsource = "process"\n'
+            'action = "log"\nmodel = "age < 99"\n',
+        )
+        with patch.object(Rule, "from_toml", wraps=Rule.from_toml) as from_toml:
+            diff = engine.reload()
+
+        assert from_toml.call_count == 2
+        assert engine.rules[age_id] is before[age_id]
+        assert diff.changed == [member_id]
+        assert diff.added == [engine.index.named("new")[0]]
+        assert diff.removed == []
+        assert diff.unchanged == 1
+        assert engine.rules[member_id].condition.value == "silver"
+
+    def test_removed_rules_reported(self, mock_fact_provider, tmp_path):
+        path = tmp_path / "rules.toml"
+        path.write_text(RELOAD_RULES)
+        engine = RulesEngine(mock_fact_provider, builtin_rules=[], toml_rules_path=path)
+        member_id = engine.index.named("membership check")[0]
+
+        path.write_text(RELOAD_RULES.split("\n\n[[rules]]", 1)[0])
+        diff = engine.reload()
+
+        assert diff.removed == [member_id]
+        assert member_id not in engine.rules
+        assert engine.index.named("membership check") == []
+
+    def test_invalid_reload_keeps_current_rules(self, mock_fact_provider, tmp_path):
+        path = tmp_path / "rules.toml"
+        path.write_text(RELOAD_RULES)
+        engine = RulesEngine(mock_fact_provider, builtin_rules=[], toml_rules_path=path)
+        before = engine.rules
+
+        path.write_text(RELOAD_RULES.replace("age >= 18", "no_such_fact >= 18"))
+        assert engine.reload() is None
+        assert engine.rules is before
+
+        path.write_text("[[rules]\n")
+        assert engine.reload() is None
+        assert engine.rules is before
+
+    def test_reload_if_changed_uses_watcher(self, mock_fact_provider, tmp_path):
+        path = tmp_path / "rules.toml"
+        path.write_text(RELOAD_RULES)
+        engine = RulesEngine(mock_fact_provider, builtin_rules=[], toml_rules_path=path)
+
+        assert engine.reload_if_changed() is None
+
+        path.write_text(RELOAD_RULES.replace("Gold members", "Gold members only"))
+        diff = engine.reload_if_changed()
+        assert diff
+        assert len(diff.added) == 1
+        assert len(diff.removed) == 1
+
+    def test_pruned_duplicate_readmitted_when_its_twin_changes(self, mock_fact_provider, tmp_path):
+        duplicate = RELOAD_RULES.split("\n\n[[rules]]", 1)[0].replace(
+            "Adults only",
+            "Adults only, again",
+        )
+        path = tmp_path / "rules.toml"
+        path.write_text(RELOAD_RULES + duplicate)
+        engine = RulesEngine(mock_fact_provider, builtin_rules=[], toml_rules_path=path)
+        age_id, member_id = engine.rules
+        duplicate_id = next(iter(engine.analysis.duplicates))
+        assert engine.analysis.pruned == [duplicate_id]
+
+        path.write_text(RELOAD_RULES.replace("age >= 18", "age >= 21") + duplicate)
+        diff = engine.reload()
+
+        assert list(engine.rules) == [age_id, member_id, duplicate_id]
+        assert diff.added == [duplicate_id]
+        assert diff.changed == [age_id]
+        assert engine.analysis.pruned == []
+        assert engine.analysis.rules is engine.rules
+
+    def test_rules_directory(self, mock_fact_provider, tmp_path):
+        first, second = RELOAD_RULES.split("\n\n[[rules]]")
+        (tmp_path / "a.toml").write_text(first)
+        (tmp_path / "b.toml").write_text("[[rules]]" + second)
+        engine = RulesEngine(mock_fact_provider, builtin_rules=[], toml_rules_path=tmp_path)
+
+        assert {r.name for r in engine.rules.values()} == {"age check", "membership check"}
+
+        (tmp_path / "b.toml").unlink()
+        diff = engine.reload_if_changed()
+        assert len(diff.removed) == 1
+        assert {r.name for r in engine.rules.values()} == {"age check"}
+
+
+class TestValidation:
+    def _rule(self, name, expr):
+        return RuleBuilder().define(name, name).from_("process").when(expr).then(print)
+
+    def test_report_separates_valid_and_invalid_rules(self, mock_fact_provider):
+        valid = self._rule("valid", "age > 18")
+        bad_type = self._rule("bad type", "age > 18")
+        facts = {"age": MockFact(str)}
+
+        report = RulesEngine.check_rules({valid.id: valid}, mock_fact_provider())
+        assert report.ok
+        assert report.valid == {valid.id: valid}
+
+        report = RulesEngine.check_rules({bad_type.id: bad_type}, facts)
+        assert not report.ok
+        assert report.valid == {}
+        assert "type mismatch" in report.errors[bad_type.id][0]
+
+    def test_errors_collected_per_leaf(self, mock_fact_provider):
+        rule = (
+            RuleBuilder()
+            .define("two bad leaves", "")
+            .from_("process")
+            .when("age > 18")
+            .and_("membership == gold")
+            .then(print)
+        )
+        facts = {"age": MockFact(int, allowed_ops=[Operator.EQ]), "membership": MockFact(int)}
+
+        report = RulesEngine.check_rules({rule.id: rule}, facts)
+
+        assert len(report.errors[rule.id]) == 2
+        assert "operator mismatch" in report.errors[rule.id][0]
+        assert "type mismatch" in report.errors[rule.id][1]
+
+    def test_missing_fact_reported(self, mock_fact_provider):
+        rule = self._rule("missing", "age > 18")
+        report = RulesEngine.check_rules({rule.id: rule}, {})
+        assert report.errors == {rule.id: ["Condition field not found: age"]}
+
+    def test_shared_leaves_checked_once(self, mock_fact_provider):
+        rules = [self._rule(f"rule {i}", "age > 18") for i in range(50)]
+        with patch("core.rules_engine.rules_engine._check_leaf", return_value=None) as check:
+            report = RulesEngine.check_rules({r.id: r for r in rules}, mock_fact_provider())
+
+        assert check.call_count == 1
+        assert len(report.valid) == 50
+
+    def test_invalid_rules_dropped_without_raising(self, mock_fact_provider):
+        valid = self._rule("valid", "age == 1")
+        invalid = self._rule("invalid", "age == 2")
+        facts = {"age": MockFact(int, allowed_vals=[1])}
+
+        engine = RulesEngine(
+            lambda: facts,
+            builtin_rules=[valid, invalid],
+            toml_rules_path=pathlib.Path("/dev/null"),
+        )
+
+        assert list(engine.rules) == [valid.id]
+        assert list(engine.validation.errors) == [invalid.id]
+
+    def test_raise_for_errors(self):
+        ValidationReport().raise_for_errors()
+        with pytest.raises(RuleWithNoAvailableFactError):
+            ValidationReport(errors={"RUL-000001": ["bad"]}).raise_for_errors()
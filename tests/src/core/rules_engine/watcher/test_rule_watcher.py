@@ -0,0 +1,68 @@
+import os
+
+from core.rules_engine.watcher.rule_watcher import RuleFileWatcher, expand_rule_paths
+
+
+def bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_file_not_reported(tmp_path):
+    path = tmp_path / "rules.toml"
+    path.write_text("")
+    watcher = RuleFileWatcher([path])
+
+    assert not watcher.poll()
+
+
+def test_modified_file_reported_once(tmp_path):
+    path = tmp_path / "rules.toml"
+    path.write_text("")
+    watcher = RuleFileWatcher([path])
+
+    path.write_text("[[rules]]\n")
+    bump_mtime(path)
+
+    assert watcher.poll()
+    assert not watcher.poll()
+
+
+def test_replaced_file_reported(tmp_path):
+    path = tmp_path / "rules.toml"
+    path.write_text("a")
+    watcher = RuleFileWatcher([path])
+
+    tmp = tmp_path / "rules.toml.tmp"
+    tmp.write_text("b")
+    tmp.replace(path)
+
+    assert watcher.poll()
+
+
+def test_directory_files_added_and_removed(tmp_path):
+    (tmp_path / "a.toml").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+    watcher = RuleFileWatcher([tmp_path])
+    assert watcher.files() == [tmp_path / "a.toml"]
+
+    (tmp_path / "b.toml").write_text("")
+    assert watcher.poll()
+
+    (tmp_path / "a.toml").unlink()
+    assert watcher.poll()
+    assert watcher.files() == [tmp_path / "b.toml"]
+
+
+def test_missing_file_appearing_is_reported(tmp_path):
+    path = tmp_path / "rules.toml"
+    watcher = RuleFileWatcher([path])
+
+    path.write_text("")
+
+    assert watcher.poll()
+
+
+def test_expand_rule_paths_keeps_files(tmp_path):
+    path = tmp_path / "rules.toml"
+    assert expand_rule_paths([path]) == [path]
@@ -43,6 +43,11 @@ class TestCLIArgParserArguments:
         parser = CliArgParser()
         assert parser.get_interval_arg() == 15
 
+    def test_sub_second_interval_argument(self, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["program", "1234", "-i", "0.25"])
+        parser = CliArgParser()
+        assert parser.get_interval_arg() == 0.25
+
 
 class TestCLIArgParserFlags:
     def test_create_process_flag_true(self, monkeypatch):
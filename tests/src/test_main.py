@@ -1,3 +1,5 @@
+import threading
+import time
 import typing
 from unittest.mock import MagicMock, patch
 
@@ -6,10 +8,13 @@ import pytest
 from core.compliance_engine import ComplianceEngine
 from core.fact_processor.fact_processor import FactProcessor
 from core.fact_processor.fact_registry import FactRegistry
+from core.pipeline.deadline_scheduler import SchedulerStats
 from core.rules_engine.model.rule import Action, Rule, SourceEnum
 from core.rules_engine.rule_builder.parsers import cond
-from main import AppContext, EngineBundle, Main, RuntimeBundle
+from core.rules_engine.rules_engine import RuleSetDiff
+from main import AppContext, EngineBundle, Main, RunCondition, RuntimeBundle
 from shared._common.operators import Operator
+from shared.custom_exceptions import InvalidRuleFilterError
 
 
 class FakeSnapshot:
@@ -17,6 +22,19 @@ class FakeSnapshot:
         self.data = data
 
 
+class GridScheduler:
+    """A deadline scheduler whose cycles are always due, without sleeping."""
+
+    def __init__(self, interval, **_: object):
+        self.interval = interval
+        self.cycle = -1
+        self.stats = SchedulerStats()
+
+    def wait(self, until=None):
+        self.cycle += 1
+        return True
+
+
 class TestMainE2E:
     @pytest.fixture(autouse=True)
     def setup_fixtures(self):
@@ -212,3 +230,217 @@ class TestMainE2E:
         # ProcessHandler add/remove calls
         fake_process_handler.add_process.assert_called_once_with(mock_proc)
         fake_process_handler.remove_all.assert_called_once()
+
+    def _main(self):
+        return Main(
+            engines=EngineBundle(
+                rules=self.fake_rules_engine,
+                compliance=self.fake_compliance_engine,
+                facts=self.fake_fact_processor,
+            ),
+            runtime=RuntimeBundle(
+                process_handler=self.fake_process_handler,
+                snapshot_manager=self.fake_snapshot_manager,
+            ),
+            context=AppContext(cli=self.cli_context),
+        )
+
+    def test_refresh_rules_swaps_active_rules(self):
+        main = self._main()
+        main.active_rules = {"r1": self.rule}
+        self.fake_rules_engine.match_rules.return_value = {}
+
+        self.fake_rules_engine.reload_if_changed.return_value = None
+        main.refresh_rules()
+        assert main.active_rules == {"r1": self.rule}
+
+        self.fake_rules_engine.reload_if_changed.return_value = RuleSetDiff(removed=["r1"])
+        main.refresh_rules()
+        assert main.active_rules == {}
+
+    def test_refresh_rules_keeps_rules_on_invalid_filter(self):
+        main = self._main()
+        main.active_rules = {"r1": self.rule}
+        self.fake_rules_engine.reload_if_changed.return_value = RuleSetDiff(removed=["r1"])
+        self.fake_rules_engine.match_rules.side_effect = InvalidRuleFilterError("r1")
+
+        main.refresh_rules()
+
+        assert main.active_rules == {"r1": self.rule}
+
+    @patch("main.AuditedProcess")
+    def test_main_threaded_pipeline(self, MockProcess):
+        MockProcess.return_value = MagicMock()
+        evaluated = threading.Event()
+        self.fake_compliance_engine.run.side_effect = lambda *_, **__: (
+            evaluated.set() or {"passed": [self.rule], "failed": []}
+        )
+        main = Main(
+            engines=EngineBundle(
+                rules=self.fake_rules_engine,
+                compliance=self.fake_compliance_engine,
+                facts=self.fake_fact_processor,
+            ),
+            runtime=RuntimeBundle(
+                process_handler=self.fake_process_handler,
+                snapshot_manager=self.fake_snapshot_manager,
+            ),
+            context=AppContext(cli=self.cli_context, pipeline_threads=2),
+        )
+        main.setup = MagicMock()
+        main.run_condition = MagicMock(interval=0.01)
+        main.run_condition.is_active.side_effect = lambda: not evaluated.is_set()
+
+        assert main.main() == 0
+
+        self.fake_compliance_engine.run.assert_called()
+        self.fake_fact_processor.parse_facts.assert_called_with(
+            self.fake_snapshot_manager.get_all_snapshots(),
+        )
+        self.fake_compliance_engine.close.assert_called_once()
+        self.fake_process_handler.remove_all.assert_called_once()
+
+    def test_run_serial_without_time_limit(self):
+        main = self._main()
+        main.active_rules = {"r1": self.rule}
+        active_processes = iter([1, 1, 1, 0])
+        main.run_condition = RunCondition(time.monotonic(), None, 0.001, active_processes.__next__)
+
+        main.run_serial()
+
+        assert self.fake_compliance_engine.run.call_count == 3
+
+    def test_run_serial_evaluates_rules_at_their_own_interval(self):
+        slow = Rule(
+            name="SlowRule",
+            description="desc",
+            condition=MagicMock(),
+            action=Action(name="noop", execute=MagicMock()),
+            source=SourceEnum.PROCESS,
+            interval=0.003,
+        )
+        main = self._main()
+        main.active_rules = {"r1": self.rule, "slow": slow}
+        self.fake_rules_engine.reload_if_changed.return_value = None
+        active_processes = iter([1, 1, 1, 1, 0])
+        main.run_condition = RunCondition(time.monotonic(), None, 0.001, active_processes.__next__)
+
+        with patch("main.DeadlineScheduler", GridScheduler):
+            main.run_serial()
+
+        calls = self.fake_compliance_engine.run.call_args_list
+        assert all(list(call.args[0]) == ["r1", "slow"] for call in calls)
+        assert [call.kwargs["due"] for call in calls] == [None, {"r1"}, {"r1"}, None]
+        self.fake_snapshot_manager.get_all_snapshots.assert_any_call({"process"})
+
+    def test_source_interval_applies_to_its_rules(self):
+        main = Main(
+            engines=EngineBundle(
+                rules=self.fake_rules_engine,
+                compliance=self.fake_compliance_engine,
+                facts=self.fake_fact_processor,
+            ),
+            runtime=RuntimeBundle(
+                process_handler=self.fake_process_handler,
+                snapshot_manager=self.fake_snapshot_manager,
+            ),
+            context=AppContext(cli=self.cli_context, source_intervals={"process": 10}),
+        )
+        main.active_rules = {"r1": self.rule}
+        main.run_condition = RunCondition(time.monotonic(), None, 5, lambda: 1)
+
+        assert main.plan_cycles() == 5
+        assert main.next_cycle(0).due is None
+        assert main.next_cycle(1) is None
+        assert main.next_cycle(2).due is None
+
+    def test_report_goes_through_report_writer(self, capsys):
+        writer = MagicMock()
+        main = Main(
+            engines=EngineBundle(
+                rules=self.fake_rules_engine,
+                compliance=self.fake_compliance_engine,
+                facts=self.fake_fact_processor,
+            ),
+            runtime=RuntimeBundle(
+                process_handler=self.fake_process_handler,
+                snapshot_manager=self.fake_snapshot_manager,
+                report_writer=writer,
+            ),
+            context=AppContext(cli=self.cli_context),
+        )
+
+        main.report({"passed": [self.rule], "failed": []})
+        main.report({"passed": [], "failed": [self.rule]})
+
+        reports = [call.args[0] for call in writer.submit.call_args_list]
+        assert [report.cycle for report in reports] == [1, 2]
+        assert [(r.status, r.name) for r in reports[1].records] == [("failed", "TestRule")]
+        assert reports[1].aggregates is self.fake_compliance_engine.last_aggregates
+        assert capsys.readouterr().out == ""
+
+    def test_default_report_prints_to_console(self, capsys):
+        self._main().report({"passed": [self.rule], "failed": []})
+
+        out = capsys.readouterr().out
+        assert "Compliance Report" in out
+        assert "\tTestRule : desc\n" in out
+
+    def test_unchanged_cycles_not_reported_in_transition_mode(self):
+        writer = MagicMock()
+        main = self._main()
+        main.report_writer = writer
+
+        self.fake_compliance_engine.transitions = None
+        main.report({"passed": [], "failed": []})
+        self.fake_compliance_engine.transitions = MagicMock()
+        main.report({"passed": [], "failed": [], "gone": []})
+        main.report({"passed": [], "failed": [self.rule], "gone": []})
+
+        assert [call.args[0].cycle for call in writer.submit.call_args_list] == [1, 3]
+
+    def test_collect_records_snapshots(self):
+        recorder = MagicMock()
+        main = Main(
+            engines=EngineBundle(
+                rules=self.fake_rules_engine,
+                compliance=self.fake_compliance_engine,
+                facts=self.fake_fact_processor,
+            ),
+            runtime=RuntimeBundle(
+                process_handler=self.fake_process_handler,
+                snapshot_manager=self.fake_snapshot_manager,
+                recorder=recorder,
+            ),
+            context=AppContext(cli=self.cli_context),
+        )
+
+        snapshots = main.collect()
+
+        assert snapshots == self.fake_snapshot_manager.get_all_snapshots()
+        recorder.record.assert_called_once_with(snapshots)
+
+    def test_stage_metrics(self):
+        metrics = MagicMock()
+        self.fake_compliance_engine.dispatcher = None
+        main = Main(
+            engines=EngineBundle(
+                rules=self.fake_rules_engine,
+                compliance=self.fake_compliance_engine,
+                facts=self.fake_fact_processor,
+            ),
+            runtime=RuntimeBundle(
+                process_handler=self.fake_process_handler,
+                snapshot_manager=self.fake_snapshot_manager,
+                report_writer=MagicMock(),
+                metrics=metrics,
+            ),
+            context=AppContext(cli=self.cli_context),
+        )
+        main.active_rules = {"r1": self.rule}
+
+        main.report(main.evaluate(main.collect()))
+
+        stages = [call.args[0] for call in metrics.observe_stage.call_args_list]
+        assert stages == ["collect", "parse", "evaluate", "report"]
+        metrics.update_process.assert_called_once_with(0)
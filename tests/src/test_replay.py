@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from core.fact_processor.fact_processor import FactProcessor
+from core.fact_processor.fact_registry import FactRegistry
+from core.rules_engine.model.rule import SourceEnum
+from replay import main
+from shared._common.facts import FactSpec
+from shared._common.operators import Operator
+
+RULES = """
+[[rules]]
+name = "Adult"
+description = "Process is old enough"
+source = "process"
+action = "log"
+model = "age >= 18"
+"""
+
+
+class AgeFacts:
+    @staticmethod
+    def all_facts() -> dict:
+        return {
+            path: FactSpec(path, int, SourceEnum.PROCESS, "", set(Operator))
+            for path in ("pid", "age")
+        }
+
+
+@pytest.fixture
+def rules_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(FactRegistry, "_registry", AgeFacts.all_facts())
+    monkeypatch.setattr("replay.FactProcessor", lambda: FactProcessor(AgeFacts))
+    path = tmp_path / "rules.toml"
+    path.write_text(RULES)
+    return path
+
+
+def test_replay_prints_summary(tmp_path, capsys, rules_file):
+    recording = tmp_path / "snapshots.jsonl"
+    rows = [(1.0, 20), (2.0, 10), (3.0, 12)]
+    recording.write_text(
+        "\n".join(json.dumps({"pid": 1, "snapshot_time": ts, "age": age}) for ts, age in rows),
+    )
+    report = tmp_path / "report.jsonl"
+
+    status = main([str(recording), "--rules-file", str(rules_file), "--report-jsonl", str(report)])
+
+    out = capsys.readouterr().out
+    assert status == 0
+    assert "Replayed 3 snapshots in 3 cycles" in out
+    assert "failed: 2" in out
+    assert len(report.read_text().splitlines()) == 3
+
+
+def test_replay_missing_recording(tmp_path, rules_file):
+    assert main([str(tmp_path / "missing.jsonl"), "--rules-file", str(rules_file)]) == 1